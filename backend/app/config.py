@@ -11,10 +11,28 @@ class Settings(BaseSettings):
     DATABASE_URL: str = "sqlite+aiosqlite:///./gharmitra.db"
     DATABASE_ECHO: bool = False  # Set to True to see SQL queries in logs
 
+    # PostgreSQL connection profile
+    DATABASE_POOL_MODE: str = "auto"  # "auto" (from the URL), "external" (pgbouncer/Supabase pooler: no local pool, no prepared statements) or "direct"
+    DATABASE_POOL_SIZE: int = 5  # Direct mode: connections kept open per API worker
+    DATABASE_MAX_OVERFLOW: int = 10  # Direct mode: extra connections opened under load, closed when returned
+    DATABASE_POOL_TIMEOUT_SECONDS: float = 30.0  # Direct mode: wait this long for a free connection
+    DATABASE_POOL_RECYCLE_SECONDS: int = 1800  # Direct mode: reconnect connections older than this (server/proxy idle limits)
+    DATABASE_STATEMENT_CACHE_SIZE: int = 256  # Direct mode: prepared statements kept per connection
+
+    # SQLite (standalone/desktop)
+    DATABASE_SQLITE_MODE: str = "single_writer"  # "single_writer" (one queued writer connection + read-only reader pool) or "shared" (one pool for both)
+    DATABASE_SQLITE_READERS: int = 4  # single_writer: read-only connections per API worker
+    DATABASE_SQLITE_WRITE_TIMEOUT_SECONDS: float = 30.0  # single_writer: wait this long in the writer queue
+    DATABASE_SQLITE_BUSY_TIMEOUT_MS: int = 5000  # Wait for a lock held by another process before "database is locked"
+    DATABASE_SQLITE_CACHE_SIZE_KB: int = 8000  # Page cache per connection
+    DATABASE_SQLITE_MMAP_SIZE: int = 268435456  # Memory-mapped I/O per connection (256MB); 0 disables
+
     # Security
     SECRET_KEY: str = "your-secret-key-change-in-production"
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 43200  # 30 days
+    PERMISSION_CACHE_TTL_SECONDS: int = 300  # Effective-permission cache per user (0 disables caching)
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 60  # Authenticated-user cache in get_current_user (0 disables caching)
 
     # Application
     DEBUG: bool = True
@@ -44,6 +62,28 @@ class Settings(BaseSettings):
     # Rate Limiting
     RATE_LIMIT_PER_MINUTE: int = 60
 
+    # Report rendering (PDF/Excel) process pool
+    RENDER_POOL_SIZE: int = -1  # Worker processes; -1 = min(4, CPUs - 1), 0 = render in a thread instead
+    RENDER_MAX_PENDING: int = 16  # Renders queued or running per API worker before new ones wait
+    RENDER_QUEUE_TIMEOUT_SECONDS: float = 10.0  # Wait for a slot this long, then reject with 503
+    RENDER_TIMEOUT_SECONDS: float = 120.0  # Give up on a single render after this long (504)
+    EXPORT_WARMUP_ON_STARTUP: bool = False  # Load reportlab/openpyxl (and start render workers) right after startup instead of on the first export
+    BILL_PDF_BATCH_SIZE: int = 25  # Bills rendered per worker call in bulk bill PDF jobs
+    BILL_PDF_JOB_TTL_SECONDS: int = 3600  # Finished bulk bill PDF jobs stay downloadable this long
+    REPORT_JOB_DIR: str = "./report_jobs"  # Completed report job files, one directory per society
+    REPORT_JOB_TTL_SECONDS: int = 86400  # Completed report jobs stay downloadable this long
+    REPORT_JOB_WORKERS: int = 4  # Report jobs running at once per API worker
+    REPORT_JOB_MAX_PER_SOCIETY: int = 2  # Report jobs of one society running at once; the rest wait
+    REPORT_JOB_MAX_QUEUED_PER_SOCIETY: int = 10  # Unfinished report jobs per society before new ones get 429
+
+    # Report result cache (keyed by ledger version, so entries never go stale)
+    REPORT_CACHE_BACKEND: str = "memory"  # "memory" (per worker), "database" (shared by all workers) or "none"
+    REPORT_CACHE_MAX_BYTES: int = 67108864  # 64MB of cached report payloads
+    REPORT_CACHE_MAX_ENTRIES: int = 2000
+    REPORT_SINGLE_FLIGHT_ENABLED: bool = True  # Concurrent identical report requests share one computation
+    DASHBOARD_SNAPSHOT_MAX_AGE_SECONDS: int = 300  # Recompute an unchanged dashboard after this long (relative times, "today"); 0 disables snapshots
+    SOCIETY_CONTEXT_TTL_SECONDS: int = 300  # Financial years and report header cached per worker this long (other workers' edits); 0 disables
+
     # Encryption (for sensitive fields like storage_location, verification_notes)
     ENCRYPTION_KEY: str = ""  # Must be set in .env file (generate with: python -c "import secrets; print(secrets.token_urlsafe(32))")
 
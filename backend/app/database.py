@@ -2,13 +2,17 @@
 SQLite database connection using SQLAlchemy (async)
 """
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
-from sqlalchemy.orm import declarative_base
-from typing import AsyncGenerator
+from sqlalchemy.orm import declarative_base, Session
+from typing import AsyncGenerator, Awaitable, Callable, Dict, List, Optional, Tuple
+from contextlib import contextmanager
 from app.config import settings
-from sqlalchemy import text
+from sqlalchemy import text, event
+from sqlalchemy.sql.elements import TextClause
 import logging
+import hashlib
 import shutil
 import os
+import time
 from datetime import datetime
 from urllib.parse import urlparse, urlunparse, quote
 
@@ -80,8 +84,21 @@ Base = declarative_base()
 # Global engine and session factory (initialized lazily in init_db)
 engine = None
 engine_url = None
+engine_pool_mode = None  # POOL_MODE_EXTERNAL / POOL_MODE_DIRECT for PostgreSQL engines
+reader_engine = None  # SQLite single_writer mode: read-only connection pool (engine is the writer)
 AsyncSessionLocal = None
 
+POOL_MODE_EXTERNAL = "external"  # pgbouncer / Supabase pooler in front of Postgres
+POOL_MODE_DIRECT = "direct"      # Straight to Postgres (Supabase direct host, self-hosted)
+EXTERNAL_POOLER_PORTS = {6432, 6543}  # pgbouncer default, Supabase transaction pooler
+
+SQLITE_MODE_SINGLE_WRITER = "single_writer"
+SQLITE_MODE_SHARED = "shared"
+# Leading keywords of raw SQL (text()) that need the writer connection
+SQLITE_WRITE_KEYWORDS = {
+    "INSERT", "UPDATE", "DELETE", "REPLACE", "CREATE", "ALTER", "DROP", "VACUUM", "REINDEX", "ANALYZE"
+}
+
 def get_database_url():
     """Get and normalize database URL - doesn't create connection"""
     database_url = settings.DATABASE_URL
@@ -101,18 +118,45 @@ def get_database_url():
         database_url = urlunsplit((parts.scheme, parts.netloc, parts.path, urlencode(query), parts.fragment))
     return database_url
 
+def get_pool_mode(database_url: str) -> str:
+    """
+    Connection profile for a PostgreSQL URL.
+
+    DATABASE_POOL_MODE wins when set to "external" or "direct"; on "auto" a
+    pooler host name (Supabase/Neon "pooler", "pgbouncer") or a pgbouncer port
+    means external, anything else direct.
+    """
+    mode = (settings.DATABASE_POOL_MODE or "auto").strip().lower()
+    if mode in (POOL_MODE_EXTERNAL, POOL_MODE_DIRECT):
+        return mode
+    if mode != "auto":
+        logger.warning(f"  ⚠ Unknown DATABASE_POOL_MODE '{settings.DATABASE_POOL_MODE}', detecting from the URL")
+
+    parsed = urlparse(database_url)
+    host = (parsed.hostname or "").lower()
+    try:
+        port = parsed.port
+    except ValueError:
+        port = None
+    if "pooler" in host or "pgbouncer" in host or port in EXTERNAL_POOLER_PORTS:
+        return POOL_MODE_EXTERNAL
+    return POOL_MODE_DIRECT
+
+
 def create_engine_instance(database_url_override=None):
     """Create engine instance - called during init_db, not at import time"""
-    global engine, engine_url, AsyncSessionLocal
+    global engine, engine_url, engine_pool_mode, reader_engine, AsyncSessionLocal
     if engine is not None:
         return engine  # Already created
 
     # Import here to avoid import-time crashes
     from sqlalchemy.ext.asyncio import create_async_engine
-    from sqlalchemy.pool import NullPool
+    from sqlalchemy.pool import NullPool, AsyncAdaptedQueuePool
 
     database_url = database_url_override or get_database_url()
     engine_url = database_url
+    engine_pool_mode = None
+    reader_engine = None
 
     # Log the database URL (masked for security)
     if "@" in database_url:
@@ -129,23 +173,43 @@ def create_engine_instance(database_url_override=None):
 
     # PostgreSQL-specific settings (including Supabase/Neon)
     if "postgres" in database_url:
-        logger.info(f"PostgreSQL detected in URL. Configuring for cloud database...")
-        # Use NullPool when connecting through external connection poolers (pgbouncer/Supabase)
-        # NullPool means SQLAlchemy doesn't maintain its own pool - pgbouncer handles pooling
-        engine_kwargs.update({
-            "poolclass": NullPool,
-        })
+        pool_mode = get_pool_mode(database_url)
+        engine_pool_mode = pool_mode
+        logger.info(f"PostgreSQL detected in URL. Connection profile: {pool_mode}")
 
-        # Base connect_args for all PostgreSQL connections
-        # These disable prepared statements which don't work through pgbouncer
         connect_args = {
-            "prepared_statement_cache_size": 0,  # Disable SQLAlchemy dialect's prepared stmt cache
-            "statement_cache_size": 0,            # Disable asyncpg's internal prepared stmt LRU cache
-            "prepared_statement_name_func": lambda: "",  # Use UNNAMED prepared stmts (no collision through pgbouncer)
             "timeout": 30,  # Connection timeout in seconds (asyncpg default is 60)
             "command_timeout": 30,  # Command execution timeout
         }
 
+        if pool_mode == POOL_MODE_EXTERNAL:
+            # Use NullPool when connecting through external connection poolers (pgbouncer/Supabase)
+            # NullPool means SQLAlchemy doesn't maintain its own pool - pgbouncer handles pooling
+            engine_kwargs.update({
+                "poolclass": NullPool,
+            })
+            # These disable prepared statements which don't work through pgbouncer
+            connect_args.update({
+                "prepared_statement_cache_size": 0,  # Disable SQLAlchemy dialect's prepared stmt cache
+                "statement_cache_size": 0,            # Disable asyncpg's internal prepared stmt LRU cache
+                "prepared_statement_name_func": lambda: "",  # Use UNNAMED prepared stmts (no collision through pgbouncer)
+            })
+        else:
+            # Direct connection: keep connections open across requests (no TCP+TLS handshake per
+            # request) and let each connection keep its named prepared statements
+            engine_kwargs.update({
+                "poolclass": AsyncAdaptedQueuePool,
+                "pool_size": settings.DATABASE_POOL_SIZE,
+                "max_overflow": settings.DATABASE_MAX_OVERFLOW,
+                "pool_timeout": settings.DATABASE_POOL_TIMEOUT_SECONDS,
+                "pool_recycle": settings.DATABASE_POOL_RECYCLE_SECONDS,
+                "pool_pre_ping": True,  # Replace connections the server or a proxy dropped while idle
+            })
+            connect_args.update({
+                "prepared_statement_cache_size": settings.DATABASE_STATEMENT_CACHE_SIZE,
+                "statement_cache_size": settings.DATABASE_STATEMENT_CACHE_SIZE,
+            })
+
         # SSL for cloud PostgreSQL (Supabase, Neon, Render, or any non-localhost)
         is_cloud = ("supabase" in database_url or "neon" in database_url
                     or "render" in database_url or "localhost" not in database_url)
@@ -158,7 +222,34 @@ def create_engine_instance(database_url_override=None):
 
         engine_kwargs["connect_args"] = connect_args
 
+    if "sqlite" in database_url:
+        sqlite_mode = get_sqlite_mode(database_url)
+        logger.info(f"SQLite engine mode: {sqlite_mode}")
+        if sqlite_mode == SQLITE_MODE_SINGLE_WRITER:
+            # One writer connection; sessions queue for it in the pool (FIFO) instead of
+            # failing on SQLite's write lock. Readers use their own read-only pool.
+            engine = create_async_engine(
+                database_url, **engine_kwargs, poolclass=AsyncAdaptedQueuePool, pool_size=1, max_overflow=0,
+                pool_timeout=settings.DATABASE_SQLITE_WRITE_TIMEOUT_SECONDS
+            )
+            reader_engine = create_async_engine(
+                database_url, **engine_kwargs, poolclass=AsyncAdaptedQueuePool,
+                pool_size=max(1, settings.DATABASE_SQLITE_READERS), max_overflow=0
+            )
+            _apply_sqlite_pragmas(engine)
+            _apply_sqlite_pragmas(reader_engine, read_only=True)
+            AsyncSessionLocal = async_sessionmaker(
+                class_=AsyncSession,
+                sync_session_class=SQLiteRoutingSession,
+                writer=engine.sync_engine,
+                reader=reader_engine.sync_engine,
+                expire_on_commit=False,
+            )
+            return engine
+
     engine = create_async_engine(database_url, **engine_kwargs)
+    if "sqlite" in database_url:
+        _apply_sqlite_pragmas(engine)
 
     # Create async session factory
     AsyncSessionLocal = async_sessionmaker(
@@ -170,16 +261,99 @@ def create_engine_instance(database_url_override=None):
     return engine
 
 
+def get_sqlite_mode(database_url: str) -> str:
+    """DATABASE_SQLITE_MODE, except in-memory databases (one per connection) always share one pool"""
+    if ":memory:" in database_url or "mode=memory" in database_url:
+        return SQLITE_MODE_SHARED
+    mode = (settings.DATABASE_SQLITE_MODE or SQLITE_MODE_SINGLE_WRITER).strip().lower()
+    if mode not in (SQLITE_MODE_SINGLE_WRITER, SQLITE_MODE_SHARED):
+        logger.warning(f"  ⚠ Unknown DATABASE_SQLITE_MODE '{settings.DATABASE_SQLITE_MODE}', using {SQLITE_MODE_SINGLE_WRITER}")
+        return SQLITE_MODE_SINGLE_WRITER
+    return mode
+
+
+def _apply_sqlite_pragmas(async_engine, read_only: bool = False):
+    """Set the per-connection PRAGMAs on every new connection of a SQLite engine"""
+    from sqlalchemy import event
+
+    pragmas = [
+        "PRAGMA journal_mode=WAL",
+        "PRAGMA synchronous=NORMAL",
+        "PRAGMA wal_autocheckpoint=1000",  # Checkpoint every 1000 pages
+        f"PRAGMA busy_timeout={int(settings.DATABASE_SQLITE_BUSY_TIMEOUT_MS)}",
+        f"PRAGMA cache_size=-{int(settings.DATABASE_SQLITE_CACHE_SIZE_KB)}",
+        f"PRAGMA mmap_size={int(settings.DATABASE_SQLITE_MMAP_SIZE)}",
+        "PRAGMA temp_store=MEMORY",
+    ]
+    if read_only:
+        # A write routed here by mistake fails loudly instead of taking the write lock
+        pragmas.append("PRAGMA query_only=ON")
+
+    @event.listens_for(async_engine.sync_engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma in pragmas:
+                cursor.execute(pragma)
+        finally:
+            cursor.close()
+
+
+def _is_write_statement(clause) -> bool:
+    """INSERT/UPDATE/DELETE constructs, DDL, and raw SQL starting with a write keyword"""
+    if clause is None:
+        return False
+    if getattr(clause, "is_dml", False) or getattr(clause, "is_ddl", False):
+        return True
+    if isinstance(clause, TextClause):
+        words = clause.text.split(None, 1)
+        return bool(words) and words[0].upper() in SQLITE_WRITE_KEYWORDS
+    return False
+
+
+class SQLiteRoutingSession(Session):
+    """
+    Session for SQLite single_writer mode.
+
+    Reads go to the read-only pool until the transaction first writes (a flush,
+    a DML/DDL statement or an explicit connection() call); from then on every
+    statement uses the writer connection, so the transaction reads its own
+    uncommitted rows. Commit or rollback hands the writer to the next session
+    in the queue.
+    """
+
+    def __init__(self, *args, writer=None, reader=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._writer_bind = writer
+        self._reader_bind = reader
+        self._uses_writer = False
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if self._uses_writer or self._flushing or clause is None or _is_write_statement(clause):
+            self._uses_writer = True
+            return self._writer_bind
+        return self._reader_bind
+
+
+@event.listens_for(SQLiteRoutingSession, "after_transaction_end")
+def _release_sqlite_writer(session, transaction):
+    if transaction.parent is None:
+        session._uses_writer = False
+
+
 async def recreate_engine(database_url: str):
     """Dispose the current engine and recreate with a new URL (used for fallbacks)."""
-    global engine, engine_url, AsyncSessionLocal
-    if engine is not None:
-        try:
-            await engine.dispose()
-        except Exception as e:
-            logger.warning(f"  ⚠ Could not dispose existing engine: {e}")
+    global engine, engine_url, engine_pool_mode, reader_engine, AsyncSessionLocal
+    for old_engine in (engine, reader_engine):
+        if old_engine is not None:
+            try:
+                await old_engine.dispose()
+            except Exception as e:
+                logger.warning(f"  ⚠ Could not dispose existing engine: {e}")
     engine = None
+    reader_engine = None
     engine_url = None
+    engine_pool_mode = None
     AsyncSessionLocal = None
     return create_engine_instance(database_url)
 def get_direct_supabase_url(database_url: str) -> str | None:
@@ -221,6 +395,82 @@ def import_models():
     """Import all models to register them with Base"""
     from app import models_db  # noqa: F401
     from app.models import audit_adjustment  # noqa: F401
+    # Registers the ORM flush hook that maintains account_daily_balances
+    from app.services import ledger_snapshot_service  # noqa: F401
+    # Registers the ORM flush hook that maintains monthly_account_rollups
+    from app.services import monthly_rollup_service  # noqa: F401
+    # Registers the ORM hooks that bump ledger_versions for the report cache
+    from app.services import report_cache_service  # noqa: F401
+    # Registers the ORM hooks that bump dashboard_snapshots data versions
+    from app.services import dashboard_snapshot_service  # noqa: F401
+    # Registers the mapper hooks that classify account heads on create/edit
+    from app.services import account_classification_service  # noqa: F401
+
+
+# ============ SCHEMA MIGRATION REGISTRY ============
+
+CREATE_ALL_MIGRATION = "0000_create_all"  # Recorded with a checksum of Base.metadata
+startup_timings: Dict[str, float] = {}  # Per-phase milliseconds of the last successful init_db
+
+
+@contextmanager
+def _phase(timings: Dict[str, float], name: str):
+    started = time.perf_counter()
+    yield
+    timings[name] = round((time.perf_counter() - started) * 1000, 2)
+
+
+class _WarningCounter(logging.Handler):
+    """Counts warnings this module logs while active - the migrations report failures that way"""
+
+    def __init__(self):
+        super().__init__(level=logging.WARNING)
+        self.count = 0
+
+    def emit(self, record):
+        self.count += 1
+
+    def __enter__(self):
+        logger.addHandler(self)
+        return self
+
+    def __exit__(self, *exc):
+        logger.removeHandler(self)
+        return False
+
+
+def get_metadata_checksum() -> str:
+    """Fingerprint of the mapped tables, columns and indexes; changes when a model does"""
+    parts = []
+    for table in sorted(Base.metadata.tables.values(), key=lambda t: t.name):
+        parts.append(table.name)
+        parts.extend(f"{c.name}:{c.type!r}:{c.nullable}" for c in table.columns)
+        parts.extend(sorted(str(i.name) for i in table.indexes))
+    return hashlib.sha256("|".join(parts).encode()).hexdigest()
+
+
+async def get_applied_migrations() -> Dict[str, Optional[str]]:
+    """name -> checksum of every recorded migration (empty before the table exists) in one query"""
+    try:
+        async with engine.connect() as conn:
+            result = await conn.execute(text("SELECT name, checksum FROM schema_migrations"))
+            return {row[0]: row[1] for row in result}
+    except Exception:
+        return {}
+
+
+async def record_migration(name: str, duration_ms: float, checksum: Optional[str] = None):
+    """Mark a migration as applied (re-recording replaces the checksum)"""
+    from app.models_db import SchemaMigration
+    async with AsyncSessionLocal() as db:
+        row = await db.get(SchemaMigration, name)
+        if row is None:
+            row = SchemaMigration(name=name)
+            db.add(row)
+        row.checksum = checksum
+        row.duration_ms = duration_ms
+        row.applied_at = datetime.utcnow()
+        await db.commit()
 
 
 async def init_db(retries: int = 5, delay: int = 3):
@@ -244,9 +494,11 @@ async def init_db(retries: int = 5, delay: int = 3):
         logger.info("DB connection mode: supabase direct")
     
     for attempt in range(1, retries + 1):
+        timings: Dict[str, float] = {}
         try:
             # 0. Perform automated backup before any operations (SQLite only)
-            await perform_automated_backup()
+            with _phase(timings, "backup"):
+                await perform_automated_backup()
             
             # 1. Test database connection first (important for cloud deployments)
             try:
@@ -268,8 +520,9 @@ async def init_db(retries: int = 5, delay: int = 3):
                 except Exception as parse_err:
                     logger.info(f"Attempting to connect to DB (url parsing failed: {parse_err})")
 
-                async with engine.connect() as conn:
-                    await conn.execute(text("SELECT 1"))
+                with _phase(timings, "connect"):
+                    async with engine.connect() as conn:
+                        await conn.execute(text("SELECT 1"))
             except (OSError, Exception) as e:
                 # Catch network unreachable errors common with Render -> Supabase IPv6 changes
                 error_str = str(e)
@@ -286,47 +539,53 @@ async def init_db(retries: int = 5, delay: int = 3):
             
             # 2. Database optimizations
             if "sqlite" in settings.DATABASE_URL:
-                 # Enable WAL mode for crash resilience and optimize settings
-                async with engine.connect() as conn:
-                    await conn.execute(text("PRAGMA journal_mode=WAL"))
-                    await conn.execute(text("PRAGMA synchronous=NORMAL"))
-
-                    # Additional optimizations for corruption prevention
-                    await conn.execute(text("PRAGMA wal_autocheckpoint=1000"))  # Checkpoint every 1000 pages
-                    await conn.execute(text("PRAGMA cache_size=-8000"))  # 8MB cache (better performance)
-                    await conn.execute(text("PRAGMA temp_store=MEMORY"))  # Use memory for temp tables
-                    await conn.execute(text("PRAGMA foreign_keys=ON"))  # Enable foreign key constraints
-                    await conn.execute(text("PRAGMA optimize"))  # Optimize the database
-
-                    # Run initial checkpoint
-                    await conn.execute(text("PRAGMA wal_checkpoint(PASSIVE)"))
-                    await conn.execute(text("PRAGMA analysis_limit=1000"))  # Limit for query analysis
-                    await conn.execute(text("PRAGMA automatic_index=ON"))  # Enable automatic indexing
-
-                    logger.info("  ✓ SQLite WAL mode enabled with optimizations")
+                # WAL, synchronous, busy_timeout, cache_size, mmap_size, temp_store and
+                # wal_autocheckpoint are set on every connection by _apply_sqlite_pragmas
+                with _phase(timings, "sqlite_pragmas"):
+                    async with engine.connect() as conn:
+                        await conn.execute(text("PRAGMA foreign_keys=ON"))  # Enable foreign key constraints
+                        await conn.execute(text("PRAGMA optimize"))  # Optimize the database
+
+                        # Run initial checkpoint
+                        await conn.execute(text("PRAGMA wal_checkpoint(PASSIVE)"))
+                        await conn.execute(text("PRAGMA analysis_limit=1000"))  # Limit for query analysis
+                        await conn.execute(text("PRAGMA automatic_index=ON"))  # Enable automatic indexing
+
+                logger.info("  ✓ SQLite WAL mode enabled with optimizations")
             else:
                  logger.info(f"  ✓ Connected to database: {settings.DATABASE_URL.split('@')[-1]}")
 
             # Import models first to register them
             import_models()
             logger.info(f"Initializing database at {settings.DATABASE_URL}")
-            async with engine.begin() as conn:
-                await conn.run_sync(Base.metadata.create_all)
-            
-            # Seed default data (Society and Admin User) - MUST RUN BEFORE MIGRATIONS
-            await seed_default_data()
-            
-            # Run migrations to add missing columns
-            await migrate_society_fields()
-            await migrate_physical_documents()
-            await migrate_physical_documents()
-            await migrate_user_consent_fields()
-            await migrate_member_privacy_fields() 
-            await migrate_vendor_schema() # Added vendor migration
-            await migrate_meeting_management()
-            await migrate_template_system()
-            await migrate_flats_bedrooms()  # Add bedrooms column to flats table
-            
+
+            # Tables, seed data and migrations run once per schema version (schema_migrations)
+            with _phase(timings, "version_check"):
+                applied = await get_applied_migrations()
+            metadata_checksum = get_metadata_checksum()
+            pending = [(name, migration) for name, migration in SCHEMA_MIGRATIONS if name not in applied]
+            if applied.get(CREATE_ALL_MIGRATION) == metadata_checksum and not pending:
+                logger.info(f"  ✓ Schema up to date ({len(applied)} migrations applied), skipping migrations")
+            else:
+                with _phase(timings, "create_all"):
+                    async with engine.begin() as conn:
+                        await conn.run_sync(Base.metadata.create_all)
+                await record_migration(CREATE_ALL_MIGRATION, timings["create_all"], metadata_checksum)
+
+                # Seed default data (Society and Admin User) is the first entry - MUST RUN BEFORE MIGRATIONS
+                for name, migration in pending:
+                    with _phase(timings, name), _WarningCounter() as warnings:
+                        await migration()
+                    if warnings.count:
+                        # Logged a failure: leave unrecorded so the next boot retries it
+                        logger.warning(f"  ⚠ Migration {name} did not complete; it will run again on next startup")
+                    else:
+                        await record_migration(name, timings[name])
+
+            timings["total"] = round(sum(timings.values()), 2)
+            startup_timings.clear()
+            startup_timings.update(timings)
+            logger.info("Startup timings (ms): " + ", ".join(f"{k}={v}" for k, v in timings.items()))
             logger.info("✅ Database initialized successfully")
             return  # Success - exit function
             
@@ -1666,10 +1925,183 @@ async def migrate_flats_bedrooms():
         # Don't raise - allow app to continue even if migration fails
 
 
+async def migrate_account_daily_balances():
+    """Backfill the account_daily_balances ledger snapshot table for existing databases"""
+    from sqlalchemy import select, func
+    from app.models_db import Transaction, AccountDailyBalance
+    from app.services.ledger_snapshot_service import rebuild_ledger_snapshots
+    try:
+        async with AsyncSessionLocal() as db:
+            snapshot_rows = (await db.execute(select(func.count(AccountDailyBalance.id)))).scalar() or 0
+            if snapshot_rows:
+                logger.info("  - account_daily_balances already populated")
+                return
+
+            has_transactions = (await db.execute(select(Transaction.id).limit(1))).first() is not None
+            if not has_transactions:
+                return
+
+            rows = await rebuild_ledger_snapshots(db)
+            await db.commit()
+            logger.info(f"  ✓ Backfilled account_daily_balances ({rows} daily rows)")
+    except Exception as e:
+        logger.warning(f"Ledger snapshot backfill failed: {e}")
+        # Don't raise - allow app to continue even if migration fails
+
+
+async def migrate_monthly_account_rollups():
+    """Backfill the monthly_account_rollups table for existing databases"""
+    from sqlalchemy import select, func
+    from app.models_db import Transaction, MonthlyAccountRollup
+    from app.services.monthly_rollup_service import rebuild_monthly_rollups
+    try:
+        async with AsyncSessionLocal() as db:
+            rollup_rows = (await db.execute(select(func.count(MonthlyAccountRollup.id)))).scalar() or 0
+            if rollup_rows:
+                logger.info("  - monthly_account_rollups already populated")
+                return
+
+            has_transactions = (await db.execute(select(Transaction.id).limit(1))).first() is not None
+            if not has_transactions:
+                return
+
+            rows = await rebuild_monthly_rollups(db)
+            await db.commit()
+            logger.info(f"  ✓ Backfilled monthly_account_rollups ({rows} monthly rows)")
+    except Exception as e:
+        logger.warning(f"Monthly rollup backfill failed: {e}")
+        # Don't raise - allow app to continue even if migration fails
+
+
+async def migrate_transaction_keyset_index():
+    """Add the (society_id, date, id) index used by paginated cash book / bank ledger"""
+    from sqlalchemy import text
+    try:
+        async with AsyncSessionLocal() as db:
+            await db.execute(text(
+                "CREATE INDEX IF NOT EXISTS ix_transactions_society_date_id ON transactions (society_id, date, id)"
+            ))
+            await db.commit()
+    except Exception as e:
+        logger.warning(f"  ⚠ Could not create ix_transactions_society_date_id: {e}")
+        # Don't raise - pages still work, just without the covering index
+
+
+async def migrate_member_ledger_indexes():
+    """Add the (flat_id, date) indexes used by date-bounded member ledgers"""
+    from sqlalchemy import text
+    try:
+        async with AsyncSessionLocal() as db:
+            await db.execute(text(
+                "CREATE INDEX IF NOT EXISTS ix_maintenance_bills_flat_created ON maintenance_bills (flat_id, created_at)"
+            ))
+            await db.execute(text(
+                "CREATE INDEX IF NOT EXISTS ix_payments_flat_date ON payments (flat_id, payment_date)"
+            ))
+            await db.commit()
+    except Exception as e:
+        logger.warning(f"  ⚠ Could not create member ledger indexes: {e}")
+        # Don't raise - the ledger still works through the flat_id indexes
+
+
+async def migrate_account_classification():
+    """Add and backfill the report classification columns of account_codes"""
+    from sqlalchemy import text
+    from app.services.account_classification_service import classify_accounts
+    try:
+        async with AsyncSessionLocal() as db:
+            columns = await get_table_columns(db, "account_codes")
+            for column, ddl in (
+                ("liquidity_class", "VARCHAR(10)"),
+                ("balance_sheet_group", "VARCHAR(30)"),
+                ("schedule", "VARCHAR(50)"),
+            ):
+                if column not in columns:
+                    await db.execute(text(f"ALTER TABLE account_codes ADD COLUMN {column} {ddl}"))
+                    logger.info(f"  ✓ Added {column} column to account_codes table")
+            await db.execute(text(
+                "CREATE INDEX IF NOT EXISTS ix_account_codes_society_liquidity ON account_codes (society_id, liquidity_class)"
+            ))
+            await db.execute(text(
+                "CREATE INDEX IF NOT EXISTS ix_account_codes_balance_sheet_group ON account_codes (balance_sheet_group)"
+            ))
+            classified = await classify_accounts(db, only_missing=True)
+            await db.commit()
+            if classified:
+                logger.info(f"  ✓ Classified {classified} account heads")
+    except Exception as e:
+        logger.warning(f"Account classification migration failed: {e}")
+        # Don't raise - allow app to continue even if migration fails
+
+
+async def migrate_opening_balance_unique_index():
+    """Make (financial_year_id, account_head_id) unique on databases created before the constraint was declared"""
+    from sqlalchemy import text, inspect
+
+    def has_unique_year_account(sync_conn) -> bool:
+        inspector = inspect(sync_conn)
+        unique_sets = [c["column_names"] for c in inspector.get_unique_constraints("opening_balances")]
+        unique_sets += [i["column_names"] for i in inspector.get_indexes("opening_balances") if i.get("unique")]
+        return any(set(columns) == {"financial_year_id", "account_head_id"} for columns in unique_sets)
+
+    try:
+        async with engine.connect() as conn:
+            if await conn.run_sync(has_unique_year_account):
+                return  # Created by create_all from the model's UniqueConstraint
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(text(
+                "SELECT financial_year_id, account_head_id, COUNT(*) FROM opening_balances "
+                "GROUP BY financial_year_id, account_head_id HAVING COUNT(*) > 1"
+            ))
+            duplicates = result.all()
+            if duplicates:
+                # Never delete opening balances here: they are financial records an admin must reconcile
+                for financial_year_id, account_head_id, count in duplicates[:20]:
+                    ids = (await db.execute(text(
+                        "SELECT id FROM opening_balances WHERE financial_year_id = :fy AND account_head_id = :account "
+                        "ORDER BY id"
+                    ), {"fy": financial_year_id, "account": account_head_id})).scalars().all()
+                    logger.warning(
+                        f"  ⚠ Duplicate opening balances for financial year {financial_year_id}, "
+                        f"account {account_head_id}: ids {ids}"
+                    )
+                logger.warning(
+                    f"  ⚠ {len(duplicates)} account/year pairs have several opening balances; "
+                    "remove the extra rows to enable year-end closing (uq_opening_balances_year_account not created)"
+                )
+                return
+            await db.execute(text(
+                "CREATE UNIQUE INDEX IF NOT EXISTS uq_opening_balances_year_account "
+                "ON opening_balances (financial_year_id, account_head_id)"
+            ))
+            await db.commit()
+    except Exception as e:
+        logger.warning(f"Opening balance unique index migration failed: {e}")
+        # Don't raise - allow app to continue even if migration fails
+
+
+async def migrate_document_sequences_shared_series():
+    """Drop the societies foreign key from document_sequences so bill series can use the shared row (society_id 0)"""
+    from sqlalchemy import text
+    if not is_postgresql():
+        return  # SQLite does not enforce the foreign key
+    try:
+        async with AsyncSessionLocal() as db:
+            await db.execute(text(
+                "ALTER TABLE document_sequences DROP CONSTRAINT IF EXISTS document_sequences_society_id_fkey"
+            ))
+            await db.commit()
+    except Exception as e:
+        logger.warning(f"  ⚠ Could not drop document_sequences society foreign key: {e}")
+        # Don't raise - bill generation fails on the shared series until this runs
+
+
 async def close_db():
     """Close database connection"""
     try:
         await engine.dispose()
+        if reader_engine is not None:
+            await reader_engine.dispose()
         logger.info("Database connection closed")
     except Exception as e:
         logger.error(f"Error closing database connection: {e}")
@@ -1736,6 +2168,28 @@ async def seed_default_data():
         logger.warning(f"  ⚠ Default data seeding failed: {e}")
 
 
+# Startup migrations in the order they run; each is recorded in schema_migrations once it
+# completes without logging a warning. Append new ones with the next number - never renumber.
+SCHEMA_MIGRATIONS: List[Tuple[str, Callable[[], Awaitable[None]]]] = [
+    ("0001_seed_default_data", seed_default_data),  # Society and admin user - must run before the rest
+    ("0002_society_fields", migrate_society_fields),
+    ("0003_physical_documents", migrate_physical_documents),
+    ("0004_user_consent_fields", migrate_user_consent_fields),
+    ("0005_member_privacy_fields", migrate_member_privacy_fields),
+    ("0006_vendor_schema", migrate_vendor_schema),
+    ("0007_meeting_management", migrate_meeting_management),
+    ("0008_template_system", migrate_template_system),
+    ("0009_flats_bedrooms", migrate_flats_bedrooms),  # Add bedrooms column to flats table
+    ("0010_account_daily_balances", migrate_account_daily_balances),  # Backfill ledger snapshot store
+    ("0011_monthly_account_rollups", migrate_monthly_account_rollups),  # Backfill monthly rollups
+    ("0012_transaction_keyset_index", migrate_transaction_keyset_index),  # (society_id, date, id) index for ledger pages
+    ("0013_member_ledger_indexes", migrate_member_ledger_indexes),  # (flat_id, date) indexes for member ledger slices
+    ("0014_account_classification", migrate_account_classification),  # Liquidity / balance sheet classification
+    ("0015_opening_balance_unique_index", migrate_opening_balance_unique_index),  # One opening balance per account and year
+    ("0016_document_sequences_shared_series", migrate_document_sequences_shared_series),  # Bill numbers from one series for all societies
+]
+
+
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """
     Dependency to get database session
@@ -3,7 +3,8 @@ FastAPI dependencies for authentication and authorization
 """
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from typing import Optional
+from typing import Dict, Hashable, NamedTuple, Optional
+import time
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, and_
 
@@ -18,6 +19,74 @@ from app.config import settings
 security = HTTPBearer()
 
 
+class CachedPrincipal(NamedTuple):
+    user: UserResponse
+    expires_at: float
+
+
+class PrincipalCache:
+    """
+    Short-lived cache of resolved principals keyed by (token subject, issued-at).
+
+    The token itself is still verified on every request; only the User/Flat
+    lookups are skipped while an entry is fresh. Profile, password and role
+    changes drop the user's entries explicitly; anything else is picked up
+    when the TTL runs out.
+    """
+
+    def __init__(self, ttl_seconds: int, max_entries: int = 10000):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: Dict[Hashable, CachedPrincipal] = {}
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get(self, key: Hashable) -> Optional[UserResponse]:
+        entry = self._entries.get(key)
+        if entry is not None and entry.expires_at > time.monotonic():
+            self.hits += 1
+            return entry.user.model_copy()
+        if entry is not None:
+            del self._entries[key]
+        self.misses += 1
+        return None
+
+    def set(self, key: Hashable, user: UserResponse) -> None:
+        if self.ttl_seconds <= 0:
+            return
+        if len(self._entries) >= self.max_entries:
+            # Dicts keep insertion order: drop the oldest entry
+            self._entries.pop(next(iter(self._entries)))
+        self._entries[key] = CachedPrincipal(user.model_copy(), time.monotonic() + self.ttl_seconds)
+
+    def invalidate_user(self, user_id) -> None:
+        """Drop every cached principal (any token) of a user"""
+        user_id = str(user_id)
+        stale = [key for key, entry in self._entries.items() if entry.user.id == user_id]
+        for key in stale:
+            del self._entries[key]
+        self.invalidations += len(stale)
+
+    def clear(self) -> None:
+        self.invalidations += len(self._entries)
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "invalidations": self.invalidations,
+            "ttl_seconds": self.ttl_seconds
+        }
+
+
+principal_cache = PrincipalCache(settings.PRINCIPAL_CACHE_TTL_SECONDS)
+
+
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: AsyncSession = Depends(get_db)
@@ -44,12 +113,17 @@ async def get_current_user(
     token = credentials.credentials
 
     user = None
+    cache_key = None
     # 1) Try Supabase JWT (RS256)
     if settings.SUPABASE_URL:
         try:
             supa_payload = verify_supabase_jwt(token, settings.SUPABASE_URL, settings.SUPABASE_JWT_AUD)
             email = supa_payload.get("email")
             if email:
+                cache_key = ("supabase", email, supa_payload.get("iat"))
+                cached_user = principal_cache.get(cache_key)
+                if cached_user is not None:
+                    return cached_user
                 try:
                     result = await db.execute(select(User).where(User.email == email))
                     user = result.scalar_one_or_none()
@@ -77,6 +151,12 @@ async def get_current_user(
         except (ValueError, TypeError):
             raise credentials_exception
 
+        # Tokens issued before "iat" was added are keyed by their expiry instead
+        cache_key = ("jwt", user_id, payload.get("iat", payload.get("exp")))
+        cached_user = principal_cache.get(cache_key)
+        if cached_user is not None:
+            return cached_user
+
         # Get user from database using SQLAlchemy
         try:
             result = await db.execute(select(User).where(User.id == user_id))
@@ -117,7 +197,7 @@ async def get_current_user(
         )
         flat_id = flat_result.scalar_one_or_none()
 
-    return UserResponse(
+    principal = UserResponse(
         id=str(user.id),
         email=user.email,
         name=user.name,
@@ -128,6 +208,9 @@ async def get_current_user(
         flat_id=flat_id,
         created_at=user.created_at
     )
+    if cache_key is not None:
+        principal_cache.set(cache_key, principal)
+    return principal
 
 
 async def get_current_active_user(
@@ -6,11 +6,16 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from contextlib import asynccontextmanager
+import asyncio
 import logging
 
 # Trigger reload - Schema update verified
 from app.config import settings
 from app.database import init_db, close_db
+from app.services.render_executor import render_executor
+from app.services.bill_pdf_jobs import bill_pdf_jobs
+from app.services.report_jobs import report_jobs
+from app.utils.lazy_import import warm_up, EXPORT_MODULES
 
 # Import routers (will create these)
 # Triggering reload for schema update - Retry 2
@@ -69,16 +74,32 @@ logging.getLogger('sqlalchemy.dialects').setLevel(logging.WARNING)
 logging.getLogger('sqlalchemy').setLevel(logging.WARNING)  # Catch-all for all SQLAlchemy loggers
 
 
+async def warm_up_exports():
+    """Import the export stack here and in the render workers, off the request path"""
+    timings = await asyncio.to_thread(warm_up, EXPORT_MODULES)
+    await render_executor.warm_up(EXPORT_MODULES)
+    logger.info(f"Export stack warmed up: {timings} (ms)")
+
+
 # Lifespan context manager for startup and shutdown events
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
     logger.info("Starting GharMitra API...")
     await init_db()
+    warmup_task = None
+    if settings.EXPORT_WARMUP_ON_STARTUP:
+        # reportlab/openpyxl are otherwise imported by the first export request
+        warmup_task = asyncio.create_task(warm_up_exports())
     logger.info("GharMitra API started successfully")
     yield
     # Shutdown
     logger.info("Shutting down GharMitra API...")
+    if warmup_task is not None and not warmup_task.done():
+        warmup_task.cancel()
+    bill_pdf_jobs.shutdown()
+    report_jobs.shutdown()
+    render_executor.shutdown()
     await close_db()
     logger.info("GharMitra API shut down successfully")
 
@@ -205,6 +205,32 @@ class BillGenerationResponse(BaseModel):
     month: int
     year: int
     bills: List[MaintenanceBill]
+    phase_timings: Optional[Dict[str, float]] = Field(None, description="Milliseconds spent per generation phase (validate, calculate, insert_bills, link_supplementary, commit, total)")
+
+
+class BulkBillPdfRequest(BaseModel):
+    """Request to render all bills of a month as one download"""
+    month: int = Field(..., ge=1, le=12)
+    year: int = Field(..., ge=2020)
+    format: Literal["zip", "pdf"] = Field("zip", description="zip: one PDF per flat in a ZIP archive; pdf: one merged PDF")
+
+
+class BulkBillPdfJobResponse(BaseModel):
+    """Status and progress of a bulk bill PDF job"""
+    job_id: str
+    status: Literal["queued", "running", "completed", "failed"]
+    format: Literal["zip", "pdf"]
+    month: int
+    year: int
+    total_bills: int
+    rendered_bills: int
+    progress_percent: float
+    size_bytes: int
+    elapsed_ms: Optional[float] = None
+    error: Optional[str] = None
+    created_at: datetime
+    finished_at: Optional[datetime] = None
+    download_ready: bool
 
 
 class ReverseBillRequest(BaseModel):
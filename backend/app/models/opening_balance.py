@@ -1,7 +1,7 @@
 """
 Opening Balance Model for Financial Year
 """
-from sqlalchemy import Column, Integer, String, Date, Boolean, DateTime, ForeignKey, Text, Numeric, Enum as SQLEnum
+from sqlalchemy import Column, Integer, String, Date, Boolean, DateTime, ForeignKey, Text, Numeric, UniqueConstraint, Enum as SQLEnum
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import enum
@@ -29,6 +29,10 @@ class OpeningBalance(Base):
     Balances are calculated from the previous year's closing balances.
     """
     __tablename__ = "opening_balances"
+    __table_args__ = (
+        # One opening balance per account and year; year-end closing upserts on it
+        UniqueConstraint("financial_year_id", "account_head_id", name="uq_opening_balances_year_account"),
+    )
 
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     society_id = Column(Integer, ForeignKey("societies.id", ondelete="CASCADE"), nullable=False, index=True)
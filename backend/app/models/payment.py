@@ -1,7 +1,7 @@
 """
 Payment Model for Bill Payment Collection
 """
-from sqlalchemy import Column, Integer, String, Date, DateTime, ForeignKey, Text, Numeric, Boolean, Enum as SQLEnum
+from sqlalchemy import Column, Integer, String, Date, DateTime, ForeignKey, Text, Numeric, Boolean, Index, Enum as SQLEnum
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import enum
@@ -41,6 +41,10 @@ class Payment(Base):
     Supports partial payments, multiple payment modes, and complete audit trail.
     """
     __tablename__ = "payments"
+    __table_args__ = (
+        # Date-bounded member ledger slices
+        Index("ix_payments_flat_date", "flat_id", "payment_date"),
+    )
 
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     society_id = Column(Integer, ForeignKey("societies.id", ondelete="CASCADE"), nullable=False, index=True)
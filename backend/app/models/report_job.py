@@ -0,0 +1,39 @@
+"""Report job models"""
+from pydantic import BaseModel, Field
+from typing import Optional, Literal, Dict, Any
+from datetime import date, datetime
+
+
+class ReportJobRequest(BaseModel):
+    """Request to export a report in the background"""
+    report: Literal[
+        "general-ledger", "receipts-and-payments", "income-and-expenditure", "balance-sheet",
+        "trial-balance", "cash-book", "bank-ledger", "member-ledger", "member-ledgers"
+    ] = Field(..., description="Report to export; 'member-ledgers' exports every flat's ledger in one file")
+    format: Literal["excel", "pdf", "csv"] = Field("excel", description="Output format (csv: General Ledger only)")
+    from_date: Optional[date] = Field(None, description="Start date")
+    to_date: Optional[date] = Field(None, description="End date")
+    as_on_date: Optional[date] = Field(None, description="Date for Trial Balance and Balance Sheet")
+    flat_id: Optional[int] = Field(None, description="Flat for the Member Ledger")
+    account_code: Optional[str] = Field(None, description="Specific bank account code for the Bank Ledger")
+
+
+class ReportJobResponse(BaseModel):
+    """Status and progress of a report job"""
+    job_id: str
+    status: Literal["queued", "running", "completed", "failed"]
+    stage: Literal["queued", "computing", "writing", "done"]
+    report: str
+    format: str
+    params: Dict[str, Any]
+    progress_percent: float
+    items_total: int
+    items_done: int
+    size_bytes: int
+    filename: Optional[str] = None
+    elapsed_ms: Optional[float] = None
+    error: Optional[str] = None
+    created_at: datetime
+    finished_at: Optional[datetime] = None
+    expires_at: Optional[datetime] = None
+    download_ready: bool
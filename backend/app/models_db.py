@@ -2,7 +2,7 @@
 SQLAlchemy Database Models
 All database tables defined here
 """
-from sqlalchemy import Column, Integer, String, Numeric, DateTime, Boolean, ForeignKey, Text, Date, Enum, JSON
+from sqlalchemy import Column, Integer, BigInteger, String, Numeric, Float, DateTime, Boolean, ForeignKey, Text, Date, Enum, JSON, UniqueConstraint, Index, LargeBinary
 from sqlalchemy.orm import relationship
 from datetime import datetime, date
 import enum
@@ -535,6 +535,10 @@ class WaterExpense(Base):
 # ============ MAINTENANCE BILL MODEL ============
 class MaintenanceBill(Base):
     __tablename__ = "maintenance_bills"
+    __table_args__ = (
+        # Date-bounded member ledger slices
+        Index("ix_maintenance_bills_flat_created", "flat_id", "created_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     society_id = Column(Integer, ForeignKey("societies.id"), nullable=False, default=1, index=True)  # PRD: Multi-tenancy
@@ -610,6 +614,10 @@ class SupplementaryBillFlat(Base):
 # ============ TRANSACTION MODEL ============
 class Transaction(Base):
     __tablename__ = "transactions"
+    __table_args__ = (
+        # Keyset pagination of cash book / bank ledger pages
+        Index("ix_transactions_society_date_id", "society_id", "date", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     society_id = Column(Integer, ForeignKey("societies.id"), nullable=False, default=1, index=True)  # PRD: Multi-tenancy
@@ -644,6 +652,56 @@ class Transaction(Base):
     flat = relationship("Flat", backref="transactions")
 
 
+# ============ ACCOUNT DAILY BALANCE MODEL (Ledger Snapshot Store) ============
+class AccountDailyBalance(Base):
+    """
+    Materialized per-account, per-day ledger totals.
+    running_balance is the cumulative (debit - credit) of all transactions for the
+    account up to and including `date`, so any "balance as on date" is a single
+    indexed lookup. Maintained by app.services.ledger_snapshot_service.
+    """
+    __tablename__ = "account_daily_balances"
+
+    id = Column(Integer, primary_key=True, index=True)
+    society_id = Column(Integer, ForeignKey("societies.id"), nullable=False)
+    account_code = Column(String(10), nullable=False)
+    date = Column(Date, nullable=False)
+    debit_total = Column(Numeric(18, 2), default=0, nullable=False)
+    credit_total = Column(Numeric(18, 2), default=0, nullable=False)
+    running_balance = Column(Numeric(18, 2), default=0, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint("society_id", "account_code", "date", name="uq_account_daily_balance"),
+        Index("ix_account_daily_balances_society_date", "society_id", "date"),
+    )
+
+
+# ============ MONTHLY ACCOUNT ROLLUP MODEL ============
+class MonthlyAccountRollup(Base):
+    """
+    Materialized per-account, per-month debit/credit totals and posting counts.
+    Dashboard trends and period summaries read a handful of these rows instead
+    of aggregating transactions. Maintained by app.services.monthly_rollup_service.
+    """
+    __tablename__ = "monthly_account_rollups"
+
+    id = Column(Integer, primary_key=True, index=True)
+    society_id = Column(Integer, ForeignKey("societies.id"), nullable=False)
+    account_code = Column(String(10), nullable=False)
+    year = Column(Integer, nullable=False)
+    month = Column(Integer, nullable=False)
+    debit_total = Column(Numeric(18, 2), default=0, nullable=False)
+    credit_total = Column(Numeric(18, 2), default=0, nullable=False)
+    txn_count = Column(Integer, default=0, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint("society_id", "account_code", "year", "month", name="uq_monthly_account_rollup"),
+        Index("ix_monthly_account_rollups_society_period", "society_id", "year", "month"),
+    )
+
+
 # ============ ASSET MODEL ============
 class Asset(Base):
     """Representation of society assets (Common Property)"""
@@ -719,6 +777,81 @@ class JournalEntry(Base):
     attachments = relationship("VoucherAttachment", back_populates="journal_entry", cascade="all, delete-orphan")
 
 
+# ============ DOCUMENT SEQUENCE MODEL ============
+class DocumentSequence(Base):
+    """Last number issued per document series (JV, RV, PV, QV, BILL-YYYY-MM) for allocating voucher numbers"""
+    __tablename__ = "document_sequences"
+    __table_args__ = (
+        UniqueConstraint("society_id", "prefix", "financial_year_id", name="uq_document_sequence"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    society_id = Column(Integer, nullable=False, index=True)  # 0 = series shared by all societies (bill numbers)
+    prefix = Column(String(30), nullable=False)  # e.g. JV, RV, PV, QV, BILL-2025-11
+    financial_year_id = Column(Integer, nullable=False, default=0)  # 0 = continuous series (not reset per financial year)
+    last_value = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+
+# ============ LEDGER VERSION MODEL ============
+class LedgerVersion(Base):
+    """
+    Per-society counter bumped in the same transaction as every write to ledger
+    tables (see report_cache_service). Cached report results are keyed by it.
+    society_id 0 is the global version, bumped by bulk writes whose society is unknown.
+    """
+    __tablename__ = "ledger_versions"
+
+    society_id = Column(Integer, primary_key=True, autoincrement=False)
+    version = Column(BigInteger, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+
+# ============ REPORT CACHE ENTRY MODEL ============
+class ReportCacheEntry(Base):
+    """Cached report result for the database report cache backend (shared by all API workers)"""
+    __tablename__ = "report_cache_entries"
+
+    cache_key = Column(String(64), primary_key=True)  # sha256 of (society, report, params, ledger version)
+    society_id = Column(Integer, nullable=False, index=True)
+    report_name = Column(String(50), nullable=False)
+    ledger_version = Column(String(50), nullable=False)
+    payload = Column(LargeBinary, nullable=False)
+    size_bytes = Column(Integer, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    last_hit_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
+
+
+# ============ SCHEMA MIGRATION MODEL ============
+class SchemaMigration(Base):
+    """Startup migration applied to this database (app.database.SCHEMA_MIGRATIONS); init_db skips recorded ones"""
+    __tablename__ = "schema_migrations"
+
+    name = Column(String(100), primary_key=True)  # e.g. 0009_flats_bedrooms
+    checksum = Column(String(64), nullable=True)  # Base.metadata fingerprint for 0000_create_all
+    duration_ms = Column(Float, nullable=True)
+    applied_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+
+# ============ DASHBOARD SNAPSHOT MODEL ============
+class DashboardSnapshot(Base):
+    """
+    Last computed dashboard summary of a society (see dashboard_snapshot_service).
+    data_version is bumped with every write to the non-ledger tables the dashboard
+    reads (complaints, members, flats, payments); the payload is current while
+    snapshot_version equals "<ledger version>.<data_version>".
+    """
+    __tablename__ = "dashboard_snapshots"
+
+    society_id = Column(Integer, primary_key=True, autoincrement=False)
+    data_version = Column(BigInteger, nullable=False, default=0)
+    snapshot_version = Column(String(80), nullable=True)
+    etag = Column(String(80), nullable=True)
+    payload = Column(LargeBinary, nullable=True)  # Serialized DashboardSummary JSON
+    computed_at = Column(DateTime, nullable=True)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+
 # ============ VOUCHER ATTACHMENT MODEL ============
 class VoucherAttachment(Base):
     """Attachments for accounting vouchers (SRS-025 Addendum)"""
@@ -757,6 +890,10 @@ class AccountCode(Base):
     current_balance = Column(Numeric(18, 2), default=0, nullable=False)
     is_fixed_expense = Column(Boolean, default=False, nullable=False, index=True)  # If True, include in fixed expenses calculation for maintenance bills
     utility_type = Column(String(50), nullable=True, index=True)  # e.g., 'water_tanker', 'water_municipal' for dynamic identification
+    # Report classification, derived from code/name/type by account_classification_service
+    liquidity_class = Column(String(10), nullable=True)  # 'cash', 'bank' or NULL (not a liquid account)
+    balance_sheet_group = Column(String(30), nullable=True, index=True)  # e.g. 'fixed_assets', 'capital_funds'
+    schedule = Column(String(50), nullable=True)  # Balance Sheet / I&E schedule heading
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
     
@@ -764,6 +901,10 @@ class AccountCode(Base):
     society = relationship("Society")
     opening_balances = relationship("OpeningBalance", back_populates="account_head")
 
+    __table_args__ = (
+        Index("ix_account_codes_society_liquidity", "society_id", "liquidity_class"),
+    )
+
 
 # ============ CHAT ROOM MODEL ============
 class ChatRoom(Base):
@@ -11,7 +11,7 @@ from app.models.user import UserCreate, UserLogin, Token, UserResponse, UserProf
 from app.utils.security import get_password_hash, verify_password, create_access_token
 from app.database import get_db
 from app.models_db import User, Society, UserRole
-from app.dependencies import get_current_user
+from app.dependencies import get_current_user, principal_cache
 from app.config import settings
 
 router = APIRouter()
@@ -256,6 +256,7 @@ async def update_profile(
         
     db_user.updated_at = datetime.utcnow()
     await db.commit()
+    principal_cache.invalidate_user(db_user.id)
     await db.refresh(db_user)
     
     # Fetch society name for response
@@ -311,4 +312,5 @@ async def reset_password(
     db_user.updated_at = datetime.utcnow()
     
     await db.commit()
+    principal_cache.invalidate_user(db_user.id)
     return {"message": "Password updated successfully"}
@@ -1,7 +1,7 @@
 """
 Dashboard API endpoints for summary statistics and widgets
 """
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Header, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func, and_, or_, desc
 from datetime import datetime, date, timedelta
@@ -23,9 +23,15 @@ from ..models_db import (
 from ..models.payment import Payment
 from ..dependencies import get_current_user
 from ..models.user import UserResponse
+from ..services.monthly_rollup_service import get_monthly_totals
+from ..services.dashboard_snapshot_service import dashboard_snapshots
 
 router = APIRouter(tags=["dashboard"])
 
+LIQUID_ACCOUNT_CODES = ("1000", "1001", "1010", "1200", "1210")  # Bank and cash heads
+DUES_ACCOUNT_CODE = "1100"  # Maintenance Dues Receivable
+MAINTENANCE_INCOME_CODE = "4000"  # Monthly Maintenance Charges
+
 
 class FinancialSummary(BaseModel):
     """Financial summary statistics"""
@@ -85,65 +91,53 @@ class DashboardSummary(BaseModel):
 @router.get("/summary", response_model=DashboardSummary)
 async def get_dashboard_summary(
     current_user: UserResponse = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    if_none_match: Optional[str] = Header(None)
 ):
     """
     Get comprehensive dashboard summary with financial stats,
-    pending payments, recent activities, and quick stats
+    pending payments, recent activities, and quick stats.
+
+    Served from the society's dashboard snapshot, recomputed only after a
+    relevant write; answers 304 when If-None-Match carries the current ETag.
     """
+    society_id = current_user.society_id
+    etag, payload = await dashboard_snapshots.get_or_compute(
+        db, society_id, lambda: _compute_dashboard_summary(society_id, db), if_none_match
+    )
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if payload is None:
+        return Response(status_code=304, headers=headers)
+    return Response(content=payload, media_type="application/json", headers=headers)
+
+
+async def _compute_dashboard_summary(society_id: int, db: AsyncSession) -> DashboardSummary:
+    """Build the dashboard summary of a society from the live tables"""
     today = date.today()
     first_day_of_month = date(today.year, today.month, 1)
     first_day_of_year = date(today.year, 1, 1)
     
-    society_id = current_user.society_id
-    
     # === FINANCIAL SUMMARY ===
     
-    # 1. Society Balance (Bank + Cash)
-    # Check for common Cash/Bank account codes: 1000, 1001, 1010, 1200, 1210
+    # 1-3. Society balance, dues pending and monthly billing from one read of
+    # the account heads involved
+    # Society Balance (Bank + Cash): common Cash/Bank account codes 1000, 1001, 1010, 1200, 1210
     # Priority: 1001 (HDFC Bank), 1000 (Bank Account), 1010 (Cash in Hand)
+    # Dues Pending: balance of Ledger account 1100 (Maintenance Dues Receivable)
+    # This Month Billing: balance of account 4000 (Maintenance Income)
     result = await db.execute(
-        select(func.coalesce(func.sum(AccountCode.current_balance), 0))
+        select(AccountCode.code, AccountCode.current_balance)
         .where(
             and_(
                 AccountCode.society_id == society_id,
-                or_(
-                    AccountCode.code == "1000",  # Bank Account - Main
-                    AccountCode.code == "1001",  # HDFC Bank - Main Account
-                    AccountCode.code == "1010",  # Cash in Hand
-                    AccountCode.code == "1200",  # Cash (alternative)
-                    AccountCode.code == "1210"   # Bank (alternative)
-                )
+                AccountCode.code.in_(LIQUID_ACCOUNT_CODES + (DUES_ACCOUNT_CODE, MAINTENANCE_INCOME_CODE))
             )
         )
     )
-    society_balance = float(result.scalar() or 0)
-    
-    # 2. Dues Pending (FETCH FROM ACCOUNT 1100 - LEDGER)
-    # User requested to fetch balance from Ledger account 1100 (Maintenance Dues Receivable)
-    result = await db.execute(
-        select(func.coalesce(AccountCode.current_balance, 0))
-        .where(
-            and_(
-                AccountCode.society_id == society_id,
-                AccountCode.code == "1100"
-            )
-        )
-    )
-    pending_dues_total = float(result.scalar() or 0)
-
-    # 3. This Month Billing (FETCH FROM ACCOUNT 4000 - INCOME)
-    # User says: revised amount is 70,937 (which matches Account 4000 current balance)
-    result = await db.execute(
-        select(func.abs(func.coalesce(AccountCode.current_balance, 0)))
-        .where(
-            and_(
-                AccountCode.society_id == society_id,
-                AccountCode.code == "4000"
-            )
-        )
-    )
-    billing_this_month = float(result.scalar() or 0)
+    balances = {code: float(balance or 0) for code, balance in result.all()}
+    society_balance = sum(balances.get(code, 0.0) for code in LIQUID_ACCOUNT_CODES)
+    pending_dues_total = balances.get(DUES_ACCOUNT_CODE, 0.0)
+    billing_this_month = abs(balances.get(MAINTENANCE_INCOME_CODE, 0.0))
     
     # Fallback to MaintenanceBill sum only if account 4000 is empty
     if billing_this_month == 0:
@@ -213,41 +207,21 @@ async def get_dashboard_summary(
     total_members = int(result.scalar() or 0)
 
     # === TREND DATA (Last 6 Months Collection) ===
-    trend_data = []
+    # Maintenance income credited per month, read from the monthly rollups
+    months = []
     for i in range(5, -1, -1):
-        # Calculate month range
-        # Logic to get start/end of month 'i' months ago
-        # simplified for brevity in this replace block, usually requires util
-        # Let's use simple date math
-        target_date = today - timedelta(days=i*30) 
-        # Correct handling of months is tricky with just days=30. 
-        # Using a safer approach:
         y, m = today.year, today.month - i
         while m <= 0:
             m += 12
             y -= 1
-        
-        m_start = date(y, m, 1)
-        if m == 12:
-            m_end = date(y+1, 1, 1) - timedelta(days=1)
-        else:
-            m_end = date(y, m+1, 1) - timedelta(days=1)
-            
-        result = await db.execute(
-            select(func.coalesce(func.sum(Transaction.amount), 0))
-            .where(
-                and_(
-                    Transaction.society_id == society_id,
-                    Transaction.type == "income",
-                    Transaction.category.like("%Maintenance%"), # Broad category match
-                    Transaction.date >= m_start,
-                    Transaction.date <= m_end
-                )
-            )
-        )
-        amount = float(result.scalar() or 0)
-        month_name = m_start.strftime("%b")
-        trend_data.append({"month": month_name, "amount": amount})
+        months.append((y, m))
+    monthly_totals = await get_monthly_totals(
+        db, society_id, months[0], months[-1], [MAINTENANCE_INCOME_CODE]
+    )
+    trend_data = []
+    for y, m in months:
+        _, credit, _ = monthly_totals.get((y, m), {}).get(MAINTENANCE_INCOME_CODE, (0, 0, 0))
+        trend_data.append({"month": date(y, m, 1).strftime("%b"), "amount": float(credit)})
     
     # Construct Quick Stats (Legacy support + New Grid Data)
     # Mapping new metrics to the structure expected by frontend or defining new structure?
@@ -95,3 +95,45 @@ async def restore_backup(
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Restore failed: {str(e)}")
+
+@router.post("/rebuild-ledger-snapshots")
+async def rebuild_ledger_snapshot_store(
+    current_user: UserResponse = Depends(get_current_admin_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Regenerate the account_daily_balances and monthly_account_rollups tables for
+    the user's society.
+    Use after editing the transactions table directly (fix scripts, manual SQL).
+    """
+    from app.services.ledger_snapshot_service import rebuild_ledger_snapshots
+    from app.services.monthly_rollup_service import rebuild_monthly_rollups
+    try:
+        rows = await rebuild_ledger_snapshots(db, society_id=current_user.society_id)
+        monthly_rows = await rebuild_monthly_rollups(db, society_id=current_user.society_id)
+        await db.commit()
+        return {"message": "Ledger snapshots rebuilt", "daily_rows": rows, "monthly_rows": monthly_rows}
+    except Exception as e:
+        await db.rollback()
+        raise HTTPException(status_code=500, detail=f"Rebuild failed: {str(e)}")
+
+@router.get("/startup-timings")
+async def get_startup_timings(
+    current_user: UserResponse = Depends(get_current_admin_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Per-phase milliseconds of this worker's last startup and the recorded schema migrations (admin only)"""
+    from sqlalchemy import select
+    from app import database
+    from app.models_db import SchemaMigration
+    result = await db.execute(select(SchemaMigration).order_by(SchemaMigration.name))
+    applied = result.scalars().all()
+    applied_names = {m.name for m in applied}
+    return {
+        "timings_ms": database.startup_timings,
+        "migrations": [
+            {"name": m.name, "applied_at": m.applied_at.isoformat(), "duration_ms": m.duration_ms}
+            for m in applied
+        ],
+        "pending": [name for name, _ in database.SCHEMA_MIGRATIONS if name not in applied_names]
+    }
@@ -8,6 +8,8 @@ from sqlalchemy import select, and_, or_, func, desc, update as sql_update
 from sqlalchemy.orm import selectinload
 from typing import List, Optional, Dict
 from datetime import datetime, date, timedelta
+from decimal import Decimal
+import logging
 from uuid import UUID, uuid4
 
 from ..database import get_db
@@ -35,6 +37,10 @@ from ..schemas.financial_year import (
 from ..dependencies import get_current_user
 from ..models.user import UserResponse
 from ..utils.audit import log_action
+from ..services.year_end_close_service import close_into_next_year
+from ..services.society_context_cache import society_context
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/financial-years", tags=["financial-years-enhanced"])
 
@@ -70,6 +76,7 @@ async def list_financial_years(
             year.is_active = False
             db.add(year)
         await db.commit()
+        society_context.invalidate(current_user.society_id)
         # Refresh the list
         result = await db.execute(query)
         years = result.scalars().all()
@@ -248,6 +255,7 @@ async def create_financial_year(
     try:
         db.add(new_year)
         await db.commit()
+        society_context.invalidate(current_user.society_id)
         await db.refresh(new_year)
         
         logger.info(f"Financial year created successfully: {new_year.id} - {new_year.year_name}")
@@ -272,7 +280,7 @@ async def create_financial_year(
 
 @router.post("/{year_id}/provisional-close", response_model=YearEndClosingSummary)
 async def provisional_close_financial_year(
-    year_id: UUID,
+    year_id: int,
     closing_request: ProvisionalClosingRequest,
     current_user: UserResponse = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
@@ -282,7 +290,7 @@ async def provisional_close_financial_year(
     
     Provisionally close the financial year. This:
     - Marks the year as 'provisional_close'
-    - Calculates closing balances for all accounts
+    - Calculates closing balances for all accounts as at the year end
     - Creates the next financial year (if doesn't exist)
     - Creates provisional opening balances for next year
     - Allows new year to start operations
@@ -320,41 +328,7 @@ async def provisional_close_financial_year(
     # TODO: Add journal entry validation here
     # For now, we'll skip this check
     
-    # Step 3: Calculate closing balances for all accounts
-    closing_balances = await calculate_closing_balances(db, current_user.society_id, year_id)
-    
-    # Calculate financial summary
-    bank_balance = next((b['closing_balance'] for b in closing_balances if b['account_code'] == '1210'), 0.0)
-    cash_balance = next((b['closing_balance'] for b in closing_balances if b['account_code'] == '1200'), 0.0)
-    
-    # Calculate total income and expenses
-    result = await db.execute(
-        select(func.coalesce(func.sum(Transaction.amount), 0)).where(
-            and_(
-                Transaction.society_id == current_user.society_id,
-                Transaction.type == "income",
-                Transaction.date >= fy.start_date,
-                Transaction.date <= fy.end_date
-            )
-        )
-    )
-    total_income = float(result.scalar() or 0)
-    
-    result = await db.execute(
-        select(func.coalesce(func.sum(Transaction.amount), 0)).where(
-            and_(
-                Transaction.society_id == current_user.society_id,
-                Transaction.type == "expense",
-                Transaction.date >= fy.start_date,
-                Transaction.date <= fy.end_date
-            )
-        )
-    )
-    total_expenses = float(result.scalar() or 0)
-    
-    net_surplus_deficit = total_income - total_expenses
-    
-    # Step 4: Create or get next financial year
+    # Step 3: Create or get next financial year
     next_fy_start = fy.end_date + timedelta(days=1)
     next_fy_end = date(next_fy_start.year + 1, 3, 31)  # March 31 next year
     
@@ -383,57 +357,27 @@ async def provisional_close_financial_year(
         db.add(next_fy)
         await db.flush()  # Get the ID
     
-    # Step 5: Create provisional opening balances for next year
-    opening_balances_created = 0
-    for balance_data in closing_balances:
-        if abs(balance_data['closing_balance']) > 0.01:
-            # Determine balance type
-            if balance_data['closing_balance'] > 0:
-                balance_type = BalanceType.DEBIT
-                opening_amount = balance_data['closing_balance']
-            else:
-                balance_type = BalanceType.CREDIT
-                opening_amount = abs(balance_data['closing_balance'])
-            
-            # Check if opening balance already exists
-            result = await db.execute(
-                select(OpeningBalance).where(
-                    and_(
-                        OpeningBalance.financial_year_id == next_fy.id,
-                        OpeningBalance.account_head_id == balance_data['account_id']
-                    )
-                )
-            )
-            existing_ob = result.scalar_one_or_none()
-            
-            if existing_ob:
-                # Update existing
-                existing_ob.opening_balance = opening_amount
-                existing_ob.balance_type = balance_type
-                existing_ob.status = BalanceStatus.PROVISIONAL
-                existing_ob.calculated_from_previous_year = True
-            else:
-                # Create new
-                opening_balance = OpeningBalance(
-                    society_id=current_user.society_id,
-                    financial_year_id=next_fy.id,
-                    account_head_id=balance_data['account_id'],
-                    account_name=balance_data['account_name'],
-                    opening_balance=opening_amount,
-                    balance_type=balance_type,
-                    status=BalanceStatus.PROVISIONAL,
-                    calculated_from_previous_year=True,
-                    manual_entry=False,
-                    created_by=UUID(current_user.id)
-                )
-                db.add(opening_balance)
-                opening_balances_created += 1
+    # Step 4: Closing balances (one grouped query) carried forward as the next
+    # year's provisional opening balances (one bulk upsert)
+    close_result = await close_into_next_year(
+        db, current_user.society_id, fy, next_fy, created_by=int(current_user.id)
+    )
+    bank_balance = float(close_result["bank_balance"].quantize(Decimal("0.01")))
+    cash_balance = float(close_result["cash_balance"].quantize(Decimal("0.01")))
+    total_income = float(close_result["total_income"].quantize(Decimal("0.01")))
+    total_expenses = float(close_result["total_expenses"].quantize(Decimal("0.01")))
+    net_surplus_deficit = float(close_result["net_surplus_deficit"].quantize(Decimal("0.01")))
+    logger.info(
+        f"Provisional close of {fy.year_name} (society {current_user.society_id}): "
+        f"{close_result['accounts_closed']} accounts, {close_result['opening_balances_inserted']} opening balances "
+        f"created, {close_result['opening_balances_updated']} updated in {close_result['timings_ms']['total']} ms"
+    )
     
-    # Step 6: Update current year status
+    # Step 5: Update current year status
     fy.status = YearStatus.PROVISIONAL_CLOSE
     fy.is_closed = True  # Legacy field
     fy.provisional_close_date = closing_request.closing_date
-    fy.provisional_closed_by = UUID(current_user.id)
+    fy.provisional_closed_by = int(current_user.id)
     fy.closing_notes = closing_request.notes
     fy.opening_balances_status = OpeningBalanceStatus.PROVISIONAL
     
@@ -449,6 +393,7 @@ async def provisional_close_financial_year(
     next_fy.is_active = True
     
     await db.commit()
+    society_context.invalidate(current_user.society_id)
     await db.refresh(fy)
     await db.refresh(next_fy)
     
@@ -479,6 +424,10 @@ async def provisional_close_financial_year(
         net_surplus_deficit=net_surplus_deficit,
         opening_balances_created=True,
         next_year_activated=True,
+        accounts_closed=close_result["accounts_closed"],
+        opening_balances_inserted=close_result["opening_balances_inserted"],
+        opening_balances_updated=close_result["opening_balances_updated"],
+        timings_ms=close_result["timings_ms"],
         message=f"Year {fy.year_name} provisionally closed. Next year {next_fy.year_name} is now active. "
                 f"Opening balances are PROVISIONAL and will be finalized after audit completion."
     )
@@ -714,6 +663,7 @@ async def final_close_financial_year(
         next_fy.opening_balances_status = OpeningBalanceStatus.FINALIZED
     
     await db.commit()
+    society_context.invalidate(current_user.society_id)
     
     # Log action
     await log_action(
@@ -759,33 +709,6 @@ async def final_close_financial_year(
 
 # Helper Functions
 
-async def calculate_closing_balances(
-    db: AsyncSession,
-    society_id: UUID,
-    year_id: UUID
-) -> List[Dict]:
-    """Calculate closing balances for all accounts in the financial year"""
-    # Get all account heads
-    result = await db.execute(
-        select(AccountCode).where(
-            AccountCode.society_id == society_id
-        )
-    )
-    account_heads = result.scalars().all()
-    
-    closing_balances = []
-    for account in account_heads:
-        # Get current balance (which becomes closing balance)
-        closing_balances.append({
-            'account_id': account.id,
-            'account_name': account.name,
-            'account_code': account.code,
-            'closing_balance': float(account.current_balance or 0)
-        })
-    
-    return closing_balances
-
-
 async def generate_adjustment_number(
     db: AsyncSession,
     society_id: UUID,
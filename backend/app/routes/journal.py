@@ -489,7 +489,7 @@ async def reverse_journal_entry(
             debit_amount=new_debit,
             credit_amount=new_credit,
             description=f"REVERSAL: {t.description}",
-            date=today,
+            date=reversal_date,
             expense_month=t.expense_month,
             journal_entry_id=new_entry.id,
             added_by=int(current_user.id),
@@ -4,10 +4,11 @@ from fastapi import APIRouter, HTTPException, Depends, status
 from typing import List, Optional
 from datetime import datetime, date
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, delete, and_, or_, func
+from sqlalchemy import select, delete, insert, update, and_, or_, func
 from sqlalchemy.orm import selectinload
 import calendar
 import math
+import time
 
 from app.database import get_db
 from app.models.maintenance import (
@@ -26,7 +27,9 @@ from app.models.maintenance import (
     CollectibleExpense,
     CollectibleExpensesResponse,
     ReverseBillRequest,
-    RegenerateBillRequest
+    RegenerateBillRequest,
+    BulkBillPdfRequest,
+    BulkBillPdfJobResponse
 )
 from app.models_db import (
     CalculationMethod,
@@ -54,6 +57,13 @@ from app.models.user import UserResponse
 from app.dependencies import get_current_user, get_current_admin_user
 from app.utils.number_to_words import number_to_words
 from app.utils.audit import log_action
+from app.services.ledger_snapshot_service import refresh_account_days
+from app.services.monthly_rollup_service import refresh_account_months
+from app.utils.document_numbering import reserve_document_numbers, SHARED_SERIES
+from app.services.render_executor import render_document
+from app.services.bill_pdf_jobs import (
+    bill_pdf_jobs, build_bill_pdf_data, build_bill_society_info, bill_pdf_filename, get_bill_payment_methods
+)
 
 # ============= HELPER FUNCTIONS =============
 
@@ -263,6 +273,47 @@ async def get_flat_balance(db: AsyncSession, society_id: int, flat_id: int, as_o
     # 3. Arrears = Billed - Paid
     return (total_billed - total_paid).quantize(Decimal("0.01"))
 
+
+async def get_flat_balances(db: AsyncSession, society_id: int, flat_ids: List[int], as_of_date: Optional[date] = None) -> dict:
+    """
+    get_flat_balance() for many flats at once: one grouped query for posted bills
+    and one for completed payments. Returns {flat_id: Decimal}, zero for flats
+    with no activity.
+    """
+    if as_of_date is None:
+        as_of_date = date.today()
+    if not flat_ids:
+        return {}
+
+    bill_res = await db.execute(
+        select(MaintenanceBillDB.flat_id, func.sum(MaintenanceBillDB.total_amount)).where(
+            and_(
+                MaintenanceBillDB.society_id == society_id,
+                MaintenanceBillDB.flat_id.in_(flat_ids),
+                MaintenanceBillDB.is_posted == True,
+                MaintenanceBillDB.created_at <= datetime.combine(as_of_date, datetime.max.time())
+            )
+        ).group_by(MaintenanceBillDB.flat_id)
+    )
+    billed = {flat_id: Decimal(str(total or "0.00")) for flat_id, total in bill_res.all()}
+
+    pay_res = await db.execute(
+        select(Payment.flat_id, func.sum(Payment.amount)).where(
+            and_(
+                Payment.society_id == society_id,
+                Payment.flat_id.in_(flat_ids),
+                Payment.status == "completed",
+                Payment.payment_date <= as_of_date
+            )
+        ).group_by(Payment.flat_id)
+    )
+    paid = {flat_id: Decimal(str(total or "0.00")) for flat_id, total in pay_res.all()}
+
+    return {
+        flat_id: (billed.get(flat_id, Decimal("0.00")) - paid.get(flat_id, Decimal("0.00"))).quantize(Decimal("0.01"))
+        for flat_id in flat_ids
+    }
+
 router = APIRouter()
 
 
@@ -984,13 +1035,54 @@ def generate_bill_number(society_id: int, month: int, year: int, sequence: int)
     return f"BILL-{year}-{month:02d}-{sequence:03d}"
 
 
+async def reserve_bill_numbers(db: AsyncSession, society_id: int, month: int, year: int, count: int) -> List[str]:
+    """
+    Reserve a contiguous block of `count` bill numbers for a month from the
+    BILL-YYYY-MM document sequence.
+
+    bill_number is unique across the whole table and does not carry the
+    society, so every society draws from one shared series per month. It is
+    seeded from the highest sequence already stored for that month.
+    """
+    prefix = f"BILL-{year}-{month:02d}"
+
+    async def last_issued() -> int:
+        result = await db.execute(
+            select(MaintenanceBillDB.bill_number).where(MaintenanceBillDB.bill_number.like(f"{prefix}-%"))
+        )
+        last_sequence = 0
+        for (bill_number,) in result.all():
+            suffix = bill_number[len(prefix) + 1:]
+            if suffix.isdigit():
+                last_sequence = max(last_sequence, int(suffix))
+        return last_sequence
+
+    sequences = await reserve_document_numbers(db, SHARED_SERIES, prefix, count=count, seed=last_issued)
+    return [generate_bill_number(society_id, month, year, sequence) for sequence in sequences]
+
+
+def _elapsed_ms(started: float) -> float:
+    """Milliseconds since a time.perf_counter() reading, rounded for API responses"""
+    return round((time.perf_counter() - started) * 1000, 2)
+
+
 @router.post("/generate-bills", response_model=BillGenerationResponse)
 async def generate_bills(
     request: BillGenerationRequest,
     current_user: UserResponse = Depends(get_current_admin_user),
     db: AsyncSession = Depends(get_db)
 ):
-    """Generate maintenance bills for all flats for a given month (admin only)"""
+    """
+    Generate maintenance bills for all flats for a given month (admin only).
+
+    Bills are computed in memory for every flat, numbered from a reserved block
+    and written with a single bulk INSERT ... RETURNING; supplementary charge
+    links are updated in one executemany. Per-phase timings are returned in
+    the response.
+    """
+    phase_timings = {}
+    request_started = time.perf_counter()
+    phase_started = request_started
 
     # CR-021: Validate that required maintenance accounts are configured
     validation = await validate_maintenance_accounts(db, current_user.society_id)
@@ -1136,7 +1228,11 @@ async def generate_bills(
             detail="No flats found. Add flats before generating bills."
         )
 
-    bills = []
+    phase_timings["validate_ms"] = _elapsed_ms(phase_started)
+    phase_started = time.perf_counter()
+
+    # (column values, supplementary charges) per flat, persisted in bulk below
+    pending_bills = []
     # Use Decimal for financial calculations as per user requirement
     total_amount = Decimal("0.0")
 
@@ -1271,45 +1367,15 @@ async def generate_bills(
                     {"title": sc.bill.title, "amount": float(Decimal(str(sc.amount)).quantize(Decimal("0.01")))} for sc in supp_charges
                 ]
 
-            new_bill = MaintenanceBillDB(
-                society_id=current_user.society_id,
-                flat_id=flat.id,
-                flat_number=flat.flat_number,
-                month=request.month,
-                year=request.year,
-                amount=amount,
-                maintenance_amount=amount,
-                water_amount=Decimal("0.00"),
-                total_amount=final_total,
-                breakdown=breakdown,
-                status=BillStatus.UNPAID,
-                is_posted=False,
-                created_at=datetime.utcnow(),
-                paid_date=None
-            )
-
-            db.add(new_bill)
-            await db.flush()
-            await db.refresh(new_bill)
-
-            # Mark supplementary charges as included
-            for sc in supp_charges:
-                sc.is_included_in_monthly = True
-                sc.maintenance_bill_id = new_bill.id
-                db.add(sc)
-
-            bills.append(MaintenanceBill(
-                id=str(new_bill.id),
-                flat_id=str(new_bill.flat_id),
-                flat_number=flat.flat_number,
-                month=new_bill.month,
-                year=new_bill.year,
-                amount=new_bill.total_amount,
-                breakdown=new_bill.breakdown if new_bill.breakdown else {},
-                status=new_bill.status.value if hasattr(new_bill.status, 'value') else str(new_bill.status),
-                created_at=new_bill.created_at,
-                paid_at=new_bill.paid_date
-            ))
+            pending_bills.append(({
+                "flat_id": flat.id,
+                "flat_number": flat.flat_number,
+                "amount": amount,
+                "maintenance_amount": amount,
+                "water_amount": Decimal("0.00"),
+                "total_amount": final_total,
+                "breakdown": breakdown,
+            }, supp_charges))
             total_amount += amount
 
     elif settings.maintenance_calculation_logic == "fixed":
@@ -1359,46 +1425,15 @@ async def generate_bills(
                     {"title": sc.bill.title, "amount": float(Decimal(str(sc.amount)).quantize(Decimal("0.01")))} for sc in supp_charges
                 ]
 
-            new_bill = MaintenanceBillDB(
-                society_id=current_user.society_id,
-                flat_id=flat.id,
-                flat_number=flat.flat_number,
-                month=request.month,
-                year=request.year,
-                amount=amount,
-                maintenance_amount=amount,
-                water_amount=Decimal("0.00"),
-                total_amount=final_total,
-                breakdown=breakdown,
-                status=BillStatus.UNPAID,
-                is_posted=False,
-                created_at=datetime.utcnow(),
-                paid_date=None
-            )
-            
-            db.add(new_bill)
-            await db.flush()
-            await db.refresh(new_bill)
-
-            # Mark supplementary charges as included
-            for sc in supp_charges:
-                sc.is_included_in_monthly = True
-                sc.maintenance_bill_id = new_bill.id
-                db.add(sc)
-            
-            bills.append(MaintenanceBill(
-                id=str(new_bill.id),
-                flat_id=str(new_bill.flat_id),
-                flat_number=flat.flat_number,
-                month=new_bill.month,
-                year=new_bill.year,
-                amount=new_bill.total_amount,
-                breakdown=new_bill.breakdown or {},
-                status=new_bill.status.value if hasattr(new_bill.status, 'value') else str(new_bill.status),
-                is_posted=new_bill.is_posted,
-                created_at=new_bill.created_at,
-                paid_at=new_bill.paid_date
-            ))
+            pending_bills.append(({
+                "flat_id": flat.id,
+                "flat_number": flat.flat_number,
+                "amount": amount,
+                "maintenance_amount": amount,
+                "water_amount": Decimal("0.00"),
+                "total_amount": final_total,
+                "breakdown": breakdown,
+            }, supp_charges))
             total_amount += final_total
 
     elif settings.maintenance_calculation_logic == "mixed":
@@ -1486,6 +1521,12 @@ async def generate_bills(
         interest_rate = Decimal(str(settings.interest_rate or 0)) / Decimal("100") 
         monthly_interest_rate = interest_rate / Decimal("12")
 
+        # Arrears for every flat in two grouped queries instead of two per flat
+        calculation_date = date(request.year, request.month, 1)
+        arrears_by_flat = await get_flat_balances(
+            db, current_user.society_id, [f.id for f in flats], calculation_date
+        )
+
         for flat in flats:
             area = Decimal(str(flat.area_sqft))
             is_vacant = flat in vacant_flats
@@ -1531,8 +1572,7 @@ async def generate_bills(
                 corpus_comp = corpus_comp_equal.quantize(Decimal("0.01"))
                 
             # 7. Arrears & Late Fee
-            calculation_date = date(request.year, request.month, 1)
-            arrears = await get_flat_balance(db, current_user.society_id, flat.id, calculation_date)
+            arrears = arrears_by_flat.get(flat.id, Decimal("0.00"))
             
             late_fee = Decimal("0.00")
             if arrears > 0 and settings.interest_on_overdue:
@@ -1586,51 +1626,19 @@ async def generate_bills(
                     {"title": sc.bill.title, "amount": float(Decimal(str(sc.amount)).quantize(Decimal("0.01")))} for sc in supp_charges
                 ]
 
-            new_bill = MaintenanceBillDB(
-                society_id=current_user.society_id,
-                flat_id=flat.id,
-                flat_number=flat.flat_number,
-                bill_number=f"BILL-{request.year}{request.month:02d}-{flat.flat_number}",
-                month=request.month,
-                year=request.year,
-                amount=monthly_charges, # Current charges (maint + water + fixed + sinking + repair + corpus + late + supp)
-                maintenance_amount=maint_comp,
-                water_amount=water_comp,
-                fixed_amount=fixed_comp,
-                sinking_fund_amount=sinking_comp,
-                arrears_amount=arrears,
-                late_fee_amount=late_fee,
-                total_amount=final_total, # Incl. Arrears
-                breakdown=breakdown,  # Includes repair_fund and corpus_fund
-                status=BillStatus.UNPAID,
-                is_posted=False,
-                created_at=datetime.utcnow(),
-                paid_date=None
-            )
-            
-            db.add(new_bill)
-            await db.flush()
-            await db.refresh(new_bill)
-
-            # Mark supplementary charges as included
-            for sc in supp_charges:
-                sc.is_included_in_monthly = True
-                sc.maintenance_bill_id = new_bill.id
-                db.add(sc)
-
-            bills.append(MaintenanceBill(
-                id=str(new_bill.id),
-                flat_id=str(new_bill.flat_id),
-                flat_number=flat.flat_number,
-                month=new_bill.month,
-                year=new_bill.year,
-                amount=new_bill.total_amount,
-                breakdown=new_bill.breakdown or {},
-                status=new_bill.status.value if hasattr(new_bill.status, 'value') else str(new_bill.status),
-                is_posted=new_bill.is_posted,
-                created_at=new_bill.created_at,
-                paid_at=new_bill.paid_date
-            ))
+            pending_bills.append(({
+                "flat_id": flat.id,
+                "flat_number": flat.flat_number,
+                "amount": monthly_charges,  # Current charges (maint + water + fixed + sinking + repair + corpus + late + supp)
+                "maintenance_amount": maint_comp,
+                "water_amount": water_comp,
+                "fixed_amount": fixed_comp,
+                "sinking_fund_amount": sinking_comp,
+                "arrears_amount": arrears,
+                "late_fee_amount": late_fee,
+                "total_amount": final_total,  # Incl. Arrears
+                "breakdown": breakdown,  # Includes repair_fund and corpus_fund
+            }, supp_charges))
             total_amount += monthly_charges
 
     else:  # 'water_based' or fallback
@@ -1728,47 +1736,75 @@ async def generate_bills(
                     {"title": sc.bill.title, "amount": float(Decimal(str(sc.amount)).quantize(Decimal("0.01")))} for sc in supp_charges
                 ]
 
-            new_bill = MaintenanceBillDB(
-                society_id=current_user.society_id,
-                flat_id=flat.id,
-                flat_number=flat.flat_number,
-                month=request.month,
-                year=request.year,
-                amount=amount,
-                maintenance_amount=amount - water_charges,
-                water_amount=water_charges,
-                total_amount=final_total,
-                breakdown=breakdown,
-                status=BillStatus.UNPAID,
-                is_posted=False,
-                created_at=datetime.utcnow(),
-                paid_date=None
-            )
-
-            db.add(new_bill)
-            await db.flush()
-            await db.refresh(new_bill)
-
-            # Mark supplementary charges as included
-            for sc in supp_charges:
-                sc.is_included_in_monthly = True
-                sc.maintenance_bill_id = new_bill.id
-                db.add(sc)
-
-            bills.append(MaintenanceBill(
-                id=str(new_bill.id),
-                flat_id=str(new_bill.flat_id),
-                flat_number=flat.flat_number,
-                month=new_bill.month,
-                year=new_bill.year,
-                amount=new_bill.total_amount,
-                breakdown=new_bill.breakdown if new_bill.breakdown else {},
-                status=new_bill.status.value if hasattr(new_bill.status, 'value') else str(new_bill.status),
-                created_at=new_bill.created_at,
-                paid_at=new_bill.paid_date
-            ))
+            pending_bills.append(({
+                "flat_id": flat.id,
+                "flat_number": flat.flat_number,
+                "amount": amount,
+                "maintenance_amount": amount - water_charges,
+                "water_amount": water_charges,
+                "total_amount": final_total,
+                "breakdown": breakdown,
+            }, supp_charges))
             total_amount += amount
 
+    phase_timings["calculate_ms"] = _elapsed_ms(phase_started)
+
+    # Bulk persist: reserve a block of bill numbers, insert every bill in one
+    # executemany (RETURNING ids), then link supplementary charges in one more
+    phase_started = time.perf_counter()
+    bill_numbers = await reserve_bill_numbers(db, current_user.society_id, request.month, request.year, len(pending_bills))
+    created_at = datetime.utcnow()
+    bill_rows = []
+    for (values, _), bill_number in zip(pending_bills, bill_numbers):
+        bill_rows.append({
+            "society_id": current_user.society_id,
+            "bill_number": bill_number,
+            "month": request.month,
+            "year": request.year,
+            "status": BillStatus.UNPAID,
+            "is_posted": False,
+            "created_at": created_at,
+            "updated_at": created_at,
+            **values,
+        })
+    bill_ids = {}
+    if bill_rows:
+        insert_result = await db.execute(
+            insert(MaintenanceBillDB).returning(MaintenanceBillDB.id, MaintenanceBillDB.bill_number),
+            bill_rows
+        )
+        bill_ids = {bill_number: bill_id for bill_id, bill_number in insert_result.all()}
+    phase_timings["insert_bills_ms"] = _elapsed_ms(phase_started)
+
+    # Mark supplementary charges as included
+    phase_started = time.perf_counter()
+    supp_links = [
+        {"id": sc.id, "is_included_in_monthly": True, "maintenance_bill_id": bill_ids[row["bill_number"]]}
+        for row, (_, supp_charges) in zip(bill_rows, pending_bills)
+        for sc in supp_charges
+    ]
+    if supp_links:
+        await db.execute(update(SupplementaryBillFlatDB), supp_links)
+    phase_timings["link_supplementary_ms"] = _elapsed_ms(phase_started)
+
+    bills = [
+        MaintenanceBill(
+            id=str(bill_ids[row["bill_number"]]),
+            flat_id=str(row["flat_id"]),
+            flat_number=row["flat_number"],
+            bill_number=row["bill_number"],
+            month=row["month"],
+            year=row["year"],
+            amount=row["total_amount"],
+            breakdown=row["breakdown"] or {},
+            status=row["status"].value,
+            is_posted=row["is_posted"],
+            created_at=row["created_at"],
+            paid_at=None
+        )
+        for row in bill_rows
+    ]
+
     # Log the collection action
     await log_action(
         db=db,
@@ -1785,14 +1821,18 @@ async def generate_bills(
         }
     )
     
+    phase_started = time.perf_counter()
     await db.commit()
-    
+    phase_timings["commit_ms"] = _elapsed_ms(phase_started)
+    phase_timings["total_ms"] = _elapsed_ms(request_started)
+
     return BillGenerationResponse(
         total_bills_generated=len(bills),
         total_amount=float(total_amount),
         month=request.month,
         year=request.year,
-        bills=bills
+        bills=bills,
+        phase_timings=phase_timings
     )
 
 
@@ -2433,6 +2473,18 @@ async def delete_bills_for_month(
             )
         )
         
+        # Core deletes bypass the ORM flush hook - re-derive the ledger snapshot buckets
+        await refresh_account_days(
+            db,
+            current_user.society_id,
+            [("4000", transaction_date), ("1100", transaction_date)]
+        )
+        await refresh_account_months(
+            db,
+            current_user.society_id,
+            [("4000", transaction_date), ("1100", transaction_date)]
+        )
+        
         # Reverse account balance updates
         # Get Maintenance Charges account (4000)
         result = await db.execute(
@@ -2530,45 +2582,24 @@ async def download_bill_pdf(
         )
     
     # Get flat member name
-    member_name = "N/A"
-    if bill.flat and bill.flat.primary_owner_name:
-        member_name = bill.flat.primary_owner_name
-    
-    # Generate bill number if not exists
-    bill_number = bill.bill_number or f"BILL-{bill.year}-{bill.month:02d}-{bill.flat_id}"
-    
-    # Prepare bill data for PDF
-    bill_data = {
-        'bill_number': bill_number,
-        'flat_number': bill.flat.flat_number if bill.flat else "N/A",
-        'member_name': member_name,
-        'month': bill.month,
-        'year': bill.year,
-        'amount': bill.total_amount,
-        'breakdown': bill.breakdown or {},
-        'status': bill.status.value if hasattr(bill.status, 'value') else str(bill.status),
-        'is_posted': bill.is_posted,
-        'created_at': bill.created_at.isoformat(),
-        'paid_at': bill.paid_date.isoformat() if bill.paid_date else None,
-        'payment_method': bill.payment_method or None
-    }
+    member_name = None
+    if bill.flat and bill.flat.owner_name:
+        member_name = bill.flat.owner_name
     
-    # Prepare society info
-    society_info = {
-        'name': society.name,
-        'address': society.address or "No address provided",
-        'logo_url': None  # Can be added later
-    }
+    # Prepare bill data and society info for PDF
+    payment_methods = await get_bill_payment_methods(db, [bill.id] if bill.status == BillStatus.PAID else [])
+    bill_data = build_bill_pdf_data(bill, member_name, payment_methods.get(bill.id))
+    bill_data['flat_number'] = bill.flat.flat_number if bill.flat else "N/A"
+    society_info = build_bill_society_info(society)
     
     # Generate PDF
     from app.utils.export_utils import create_maintenance_bill_pdf
     from fastapi.responses import StreamingResponse
     
-    pdf_file = create_maintenance_bill_pdf(bill_data, society_info)
+    pdf_file = await render_document(create_maintenance_bill_pdf, bill_data, society_info)
     
     # Generate filename
-    month_name = calendar.month_name[bill.month]
-    filename = f"Maintenance_Bill_{bill.flat.flat_number}_{month_name}_{bill.year}.pdf"
+    filename = bill_pdf_filename(bill.flat.flat_number, bill.month, bill.year)
     
     return StreamingResponse(
         pdf_file,
@@ -2577,6 +2608,95 @@ async def download_bill_pdf(
     )
 
 
+# ============= BULK BILL PDF JOBS =============
+
+@router.post("/bill-pdf-jobs", response_model=BulkBillPdfJobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def create_bulk_bill_pdf_job(
+    request: BulkBillPdfRequest,
+    current_user: UserResponse = Depends(get_current_admin_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Start rendering all bills of a month as one ZIP (one PDF per flat) or one merged PDF.
+    Poll GET /bill-pdf-jobs/{job_id} for progress; a ZIP can be downloaded while it is being built.
+    An identical job that is still running is returned instead of starting a new one.
+    """
+    bill_count = (await db.execute(
+        select(func.count(MaintenanceBillDB.id)).where(
+            MaintenanceBillDB.society_id == current_user.society_id,
+            MaintenanceBillDB.month == request.month,
+            MaintenanceBillDB.year == request.year
+        )
+    )).scalar() or 0
+    if bill_count == 0:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"No bills found for {calendar.month_name[request.month]} {request.year}"
+        )
+    
+    job = bill_pdf_jobs.submit(
+        society_id=current_user.society_id,
+        month=request.month,
+        year=request.year,
+        output_format=request.format,
+        requested_by=int(current_user.id)
+    )
+    if not job.total_bills:
+        job.total_bills = bill_count
+    return BulkBillPdfJobResponse(**job.to_dict())
+
+
+@router.get("/bill-pdf-jobs/{job_id}", response_model=BulkBillPdfJobResponse)
+async def get_bulk_bill_pdf_job(
+    job_id: str,
+    current_user: UserResponse = Depends(get_current_admin_user)
+):
+    """Progress of a bulk bill PDF job"""
+    job = bill_pdf_jobs.get(job_id, current_user.society_id)
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Bill PDF job not found or expired"
+        )
+    return BulkBillPdfJobResponse(**job.to_dict())
+
+
+@router.get("/bill-pdf-jobs/{job_id}/download")
+async def download_bulk_bill_pdf_job(
+    job_id: str,
+    current_user: UserResponse = Depends(get_current_admin_user)
+):
+    """
+    Download the output of a bulk bill PDF job.
+    ZIP output is streamed as bills are rendered; merged PDFs are available once the job completes.
+    """
+    from fastapi.responses import StreamingResponse
+    
+    job = bill_pdf_jobs.get(job_id, current_user.society_id)
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Bill PDF job not found or expired"
+        )
+    if job.status == "failed":
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Bill PDF job failed: {job.error}"
+        )
+    if job.format == "pdf" and job.status != "completed":
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Merged PDF is still being rendered",
+            headers={"Retry-After": "2"}
+        )
+    
+    return StreamingResponse(
+        job.stream(),
+        media_type=job.media_type,
+        headers={"Content-Disposition": f"attachment; filename={job.filename}"}
+    )
+
+
 # ============= CR-021_REVISED: INDIVIDUAL FLAT BILL REVERSAL =============
 
 @router.post("/reverse-bill", status_code=status.HTTP_200_OK)
@@ -2961,19 +3081,8 @@ async def regenerate_individual_bill(
         "regeneration_notes": request.notes or "Bill regenerated after reversal with auto-calculation"
     }
     
-    # Generate bill number
-    # Get sequence number for this month/year
-    result = await db.execute(
-        select(func.count(MaintenanceBillDB.id)).where(
-            and_(
-                MaintenanceBillDB.month == request.month,
-                MaintenanceBillDB.year == request.year,
-                MaintenanceBillDB.society_id == current_user.society_id
-            )
-        )
-    )
-    sequence = result.scalar() + 1
-    bill_number = generate_bill_number(current_user.society_id, request.month, request.year, sequence)
+    # Generate bill number from the month's bill sequence
+    bill_number = (await reserve_bill_numbers(db, current_user.society_id, request.month, request.year, 1))[0]
     
     # Create the bill
     new_bill = MaintenanceBillDB(
@@ -12,12 +12,6 @@ from pydantic import BaseModel
 from decimal import Decimal
 import io
 
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import A4
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, Image
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import cm
-
 from app.database import get_db
 from app.models.user import UserResponse
 from app.models_db import (
@@ -271,7 +265,13 @@ async def generate_ndc_pdf(
     owner = result.scalar_one_or_none()
     owner_name = owner.name if owner else "Owner"
 
-    # 3. Generate PDF
+    # 3. Generate PDF (reportlab is imported on first use, not at startup)
+    from reportlab.lib import colors
+    from reportlab.lib.pagesizes import A4
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.lib.units import cm
+
     buffer = io.BytesIO()
     doc = SimpleDocTemplate(buffer, pagesize=A4, rightMargin=2*cm, leftMargin=2*cm, topMargin=2*cm, bottomMargin=2*cm)
     styles = getSampleStyleSheet()
@@ -358,6 +358,12 @@ async def generate_police_verification_pdf(
     result = await db.execute(select(Society).where(Society.id == current_user.society_id))
     society = result.scalar_one()
 
+    from reportlab.lib import colors
+    from reportlab.lib.pagesizes import A4
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.lib.units import cm
+
     buffer = io.BytesIO()
     doc = SimpleDocTemplate(buffer, pagesize=A4)
     styles = getSampleStyleSheet()
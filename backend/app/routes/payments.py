@@ -39,7 +39,10 @@ from ..schemas.payment import (
 from ..dependencies import get_current_user
 from ..models.user import UserResponse
 from ..utils.audit import log_action
-from ..utils.export_utils import PDFExporter
+from ..utils.lazy_import import lazy_attribute
+from ..services.render_executor import render_document
+
+PDFExporter = lazy_attribute("app.utils.export_utils", "PDFExporter")  # reportlab loads on the first receipt PDF
 
 router = APIRouter(prefix="/payments", tags=["payments"])
 
@@ -718,8 +721,8 @@ async def download_payment_receipt(
     payment, bill, flat, member, society = payment_data
     
     # Generate PDF
-    pdf_exporter = PDFExporter()
-    pdf_buffer = pdf_exporter.create_payment_receipt_pdf(
+    pdf_buffer = await render_document(
+        PDFExporter.create_payment_receipt_pdf,
         receipt_number=payment.receipt_number,
         payment_date=payment.payment_date,
         payment_mode=payment.payment_mode.value,
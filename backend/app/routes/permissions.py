@@ -8,8 +8,8 @@ from typing import Optional, List
 from app.database import get_db
 from app.models.user import UserResponse
 from app.models_db import Permission, RolePermission, CustomRole, AuditLog, User
-from app.dependencies import get_current_admin_user, get_current_user
-from app.utils.permissions import SYSTEM_PERMISSIONS, initialize_permissions
+from app.dependencies import get_current_admin_user, get_current_user, principal_cache
+from app.utils.permissions import SYSTEM_PERMISSIONS, initialize_permissions, permission_cache
 from app.utils.audit import get_audit_logs
 
 router = APIRouter()
@@ -39,6 +39,17 @@ async def list_system_permissions(
     ]
 
 
+@router.get("/cache-stats", response_model=dict)
+async def get_permission_cache_stats(
+    current_user: UserResponse = Depends(get_current_admin_user)
+):
+    """Permission and principal cache counters for this worker process (admin only)"""
+    return {
+        "permissions": permission_cache.stats(),
+        "principals": principal_cache.stats()
+    }
+
+
 @router.get("/roles/{role_id}", response_model=dict)
 async def get_role_permissions(
     role_id: int,
@@ -155,6 +166,7 @@ async def update_role_permissions(
         db.add(role_perm)
     
     await db.commit()
+    permission_cache.invalidate_role(role_id)
     
     # Log action
     await log_action(
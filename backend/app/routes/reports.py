@@ -1,8 +1,9 @@
 """Financial Reports API routes"""
 from fastapi import APIRouter, HTTPException, Depends, Query, status
-from fastapi.responses import StreamingResponse
+from fastapi.responses import StreamingResponse, FileResponse
+from fastapi.encoders import jsonable_encoder
 from typing import Dict, Any, List, Optional
-from datetime import date, datetime
+from datetime import date, datetime, timedelta
 from decimal import Decimal
 from collections import defaultdict
 import logging
@@ -14,10 +15,29 @@ from app.database import get_db
 from app.models.user import UserResponse
 from app.models.journal import TrialBalanceResponse, TrialBalanceItem, LedgerResponse, LedgerEntry, BulkLedgerResponse
 from app.models.resource import ResourceFileResponse
-from app.models_db import Transaction, AccountCode, Flat, MaintenanceBill as MaintenanceBillDB, Society, BillStatus, FinancialYear, OpeningBalance, BalanceType, JournalEntry, TransactionType, AccountType, Asset, AcquisitionType
-from app.dependencies import get_current_user, get_current_accountant_user
+from app.models.report_job import ReportJobRequest, ReportJobResponse
+from app.models_db import Transaction, AccountCode, Flat, MaintenanceBill as MaintenanceBillDB, BillStatus, OpeningBalance, BalanceType, JournalEntry, TransactionType, AccountType, Asset, AcquisitionType, UserRole
+from app.dependencies import get_current_user, get_current_accountant_user, get_current_admin_user
 from app.utils.permissions import check_permission
-from app.utils.export_utils import ExcelExporter, PDFExporter
+from app.utils.lazy_import import lazy_attribute
+from app.services.render_executor import render_document, render_executor
+from app.services.trial_balance_service import compute_trial_balance
+from app.services.balance_sheet_service import compute_balance_sheet_sections
+from app.services.ledger_snapshot_service import get_net_movement
+from app.services.monthly_rollup_service import get_rollup_period_totals
+from app.services.member_dues_service import get_member_dues_report
+from app.services.member_ledger_service import get_member_ledger
+from app.services.report_cache_service import report_cache
+from app.services.single_flight import report_single_flight
+from app.services.ledger_pagination import get_ledger_page
+from app.services.general_ledger_export import get_general_ledger_accounts, stream_general_ledger_excel, stream_general_ledger_csv
+from app.services.account_classification_service import LIQUIDITY_CASH, LIQUIDITY_BANK, LIQUIDITY_CLASSES
+from app.services.report_jobs import report_jobs
+from app.services.society_context_cache import society_context
+
+# reportlab/openpyxl load on the first export, not at startup
+ExcelExporter = lazy_attribute("app.utils.export_utils", "ExcelExporter")
+PDFExporter = lazy_attribute("app.utils.export_utils", "PDFExporter")
 
 logger = logging.getLogger(__name__)
 
@@ -87,30 +107,10 @@ async def society_summary_report(
     Optimized bulk calculation for better performance and accuracy
     """
     # 1. Get Financial Year for to_date
-    res = await db.execute(
-        select(FinancialYear).where(
-            and_(
-                FinancialYear.society_id == current_user.society_id,
-                FinancialYear.start_date <= to_date,
-                FinancialYear.end_date >= to_date
-            )
-        ).order_by(FinancialYear.start_date.desc())
-    )
-    financial_year = res.scalars().first()
-    
+    financial_year = await society_context.find_financial_year(db, current_user.society_id, to_date)
+
     if not financial_year:
-        # Fallback to active year
-        res = await db.execute(
-            select(FinancialYear).where(
-                and_(
-                    FinancialYear.society_id == current_user.society_id,
-                    FinancialYear.is_active == True
-                )
-            ).order_by(FinancialYear.start_date.desc())
-        )
-        financial_year = res.scalars().first()
-        if not financial_year:
-             raise HTTPException(status_code=400, detail="Financial year not found")
+         raise HTTPException(status_code=400, detail="Financial year not found")
 
     fy_start_date = financial_year.start_date
 
@@ -127,27 +127,11 @@ async def society_summary_report(
     )
     ob_dict = {ob.account_code: ob for ob in ob_res.scalars().all()}
 
-    # 4. Bulk Aggregate Transactions (one query)
-    # We aggregate up to to_date for cumulative balance, 
-    # and separately for the period [from_date, to_date] for P&L items
-    txn_agg = await db.execute(
-        select(
-            Transaction.account_code,
-            func.sum(Transaction.debit_amount).label("debit"),
-            func.sum(Transaction.credit_amount).label("credit"),
-            # Period-specific sums for Income/Expense display
-            func.sum(case((and_(Transaction.date >= from_date, Transaction.date <= to_date), Transaction.debit_amount), else_=0)).label("period_debit"),
-            func.sum(case((and_(Transaction.date >= from_date, Transaction.date <= to_date), Transaction.credit_amount), else_=0)).label("period_credit")
-        ).where(
-            and_(
-                Transaction.society_id == current_user.society_id,
-                Transaction.date >= fy_start_date,
-                Transaction.date <= to_date,
-                Transaction.is_reversed == False
-            )
-        ).group_by(Transaction.account_code)
-    )
-    txns = {r.account_code: r for r in txn_agg.all()}
+    # 4. Account totals from the monthly rollups (whole months) and daily
+    # snapshots (partial months): cumulative from FY start up to to_date, and
+    # for the period [from_date, to_date] for P&L items
+    cumulative = await get_rollup_period_totals(db, current_user.society_id, fy_start_date, to_date)
+    period = await get_rollup_period_totals(db, current_user.society_id, max(from_date, fy_start_date), to_date)
 
     # 5. Process everything in memory
     total_assets = Decimal("0.00")
@@ -169,17 +153,16 @@ async def society_summary_report(
                 current_bal = -current_bal
         
         # B. Add Transactions up to to_date
-        txn_data = txns.get(code)
-        if txn_data:
-            debits = Decimal(str(txn_data.debit or 0.0))
-            credits = Decimal(str(txn_data.credit or 0.0))
+        if code in cumulative:
+            debits, credits = cumulative[code]
             current_bal = current_bal + debits - credits
             
             # C. Extract Period Totals for Income/Expenses
+            period_debit, period_credit = period.get(code, (Decimal("0.00"), Decimal("0.00")))
             if account.type == AccountType.INCOME:
-                total_income_period += Decimal(str(txn_data.period_credit or 0.0))
+                total_income_period += period_credit
             elif account.type == AccountType.EXPENSE:
-                total_expenses_period += Decimal(str(txn_data.period_debit or 0.0))
+                total_expenses_period += period_debit
 
         # D. Aggregate Assets/Liabilities
         if account.type == AccountType.ASSET:
@@ -269,21 +252,9 @@ async def get_audit_reports(
     return docs
 
 
-async def get_society_info(society_id: int, db: AsyncSession) -> Dict[str, Any]:
-    """Helper function to get society information for reports"""
-    result = await db.execute(select(Society).where(Society.id == society_id))
-    society = result.scalar_one_or_none()
-    if not society:
-        return {
-            "name": "Unknown Society",
-            "address": "",
-            "logo_url": None
-        }
-    return {
-        "name": society.name or "Unknown Society",
-        "address": society.address or "",
-        "logo_url": society.logo_url
-    }
+async def get_society_info(society_id: int, db: AsyncSession, include_logo: bool = False) -> Dict[str, Any]:
+    """Helper function to get society information for reports (logo_bytes too with include_logo, for exports)"""
+    return await society_context.society_info(db, society_id, include_logo)
 
 
 @router.get("/receipts-and-payments")
@@ -328,20 +299,22 @@ async def receipts_and_payments_report(
     if not has_permission:
         # Fallback: if they have one of the explicit roles above, we allow it even without explicit DB permission record
         pass
+
+    return await report_single_flight.run(
+        current_user.society_id, "receipts_and_payments",
+        {"from_date": from_date, "to_date": to_date},
+        lambda: _compute_receipts_and_payments(current_user.society_id, from_date, to_date, db)
+    )
+
+
+async def _compute_receipts_and_payments(society_id: int, from_date: date, to_date: date, db: AsyncSession) -> Dict[str, Any]:
+    """Receipts & Payments figures for a society, shared by concurrent identical requests"""
     # 1. Identify Cash and Bank accounts (Liquid Accounts)
     liquid_accounts_result = await db.execute(
         select(AccountCode).where(
             and_(
-                AccountCode.society_id == current_user.society_id,
-                or_(
-                    AccountCode.code.like('100%'), # Cash
-                    AccountCode.code.like('101%'), # Petty Cash
-                    AccountCode.code.like('102%'), # Bank Accounts
-                    AccountCode.code.like('103%'),
-                    AccountCode.code.like('104%'),
-                    AccountCode.code.like('105%'),
-                    AccountCode.code.like('106%')
-                )
+                AccountCode.society_id == society_id,
+                AccountCode.liquidity_class.in_(LIQUIDITY_CLASSES)
             )
         )
     )
@@ -349,35 +322,10 @@ async def receipts_and_payments_report(
     liquid_codes = [acc.code for acc in liquid_accounts]
     liquid_account_ids = [acc.id for acc in liquid_accounts]
 
-    if not liquid_codes:
-        # Fallback if codes don't match pattern - look for 'Cash' or 'Bank' in name
-        liquid_accounts_result = await db.execute(
-            select(AccountCode).where(
-                and_(
-                    AccountCode.society_id == current_user.society_id,
-                    or_(
-                        AccountCode.name.ilike('%Cash%'),
-                        AccountCode.name.ilike('%Bank%')
-                    ),
-                    AccountCode.type == AccountType.ASSET
-                )
-            )
-        )
-        liquid_accounts = liquid_accounts_result.scalars().all()
-        liquid_codes = [acc.code for acc in liquid_accounts]
-        liquid_account_ids = [acc.id for acc in liquid_accounts]
-
     # 2. Get Financial Year and Opening Balance for liquid accounts
-    result = await db.execute(
-        select(FinancialYear).where(
-            and_(
-                FinancialYear.society_id == current_user.society_id,
-                FinancialYear.start_date <= from_date,
-                FinancialYear.end_date >= from_date
-            )
-        ).order_by(FinancialYear.start_date.desc())
+    financial_year = await society_context.find_financial_year(
+        db, society_id, from_date, fallback_active=False
     )
-    financial_year = result.scalars().first()
     
     opening_liquid_balance = Decimal("0.00")
     if financial_year:
@@ -408,7 +356,7 @@ async def receipts_and_payments_report(
                     func.sum(Transaction.credit_amount).label("credit")
                 ).where(
                     and_(
-                        Transaction.society_id == current_user.society_id,
+                        Transaction.society_id == society_id,
                         Transaction.account_code.in_(liquid_codes),
                         Transaction.date >= fy_start_date,
                         Transaction.date < from_date
@@ -428,7 +376,7 @@ async def receipts_and_payments_report(
         select(Transaction)
         .where(
             and_(
-                Transaction.society_id == current_user.society_id,
+                Transaction.society_id == society_id,
                 Transaction.account_code.in_(liquid_codes),
                 Transaction.date >= from_date,
                 Transaction.date <= to_date
@@ -468,7 +416,7 @@ async def receipts_and_payments_report(
             total_payments += credit
 
     # Get society info
-    society_info = await get_society_info(current_user.society_id, db)
+    society_info = await get_society_info(society_id, db)
     
     closing_liquid_balance = opening_liquid_balance + total_receipts - total_payments
     
@@ -531,39 +479,27 @@ async def income_and_expenditure_report(
     if not has_permission:
         pass
     
+    return await report_cache.get_or_compute(
+        db, current_user.society_id, "income_and_expenditure",
+        {"from_date": from_date, "to_date": to_date},
+        lambda: _compute_income_and_expenditure(current_user.society_id, from_date, to_date, db)
+    )
+
+
+async def _compute_income_and_expenditure(society_id: int, from_date: date, to_date: date, db: AsyncSession) -> Dict[str, Any]:
+    """Income & Expenditure figures for a society (cached by ledger version)"""
     # Income & Expenditure Statement should ONLY include Income and Expense accounts
     # NOT Assets, Liabilities, or Capital accounts
     # IMPORTANT: Should match Trial Balance - calculate from Financial Year start to to_date
     
     # 1. Get Financial Year for the period
-    result = await db.execute(
-        select(FinancialYear).where(
-            and_(
-                FinancialYear.society_id == current_user.society_id,
-                FinancialYear.start_date <= to_date,
-                FinancialYear.end_date >= to_date
-            )
-        ).order_by(FinancialYear.start_date.desc())
-    )
-    financial_year = result.scalars().first()
-    
+    financial_year = await society_context.find_financial_year(db, society_id, to_date)
+
     if not financial_year:
-        # Fallback to active financial year
-        result = await db.execute(
-            select(FinancialYear).where(
-                and_(
-                    FinancialYear.society_id == current_user.society_id,
-                    FinancialYear.is_active == True
-                )
-            ).order_by(FinancialYear.start_date.desc())
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="No financial year found. Please create a financial year first."
         )
-        financial_year = result.scalars().first()
-        
-        if not financial_year:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="No financial year found. Please create a financial year first."
-            )
     
     fy_start_date = financial_year.start_date
     effective_date = min(to_date, financial_year.end_date)
@@ -572,7 +508,7 @@ async def income_and_expenditure_report(
     income_expense_accounts_result = await db.execute(
         select(AccountCode).where(
             and_(
-                AccountCode.society_id == current_user.society_id,
+                AccountCode.society_id == society_id,
                 or_(
                     AccountCode.type == AccountType.INCOME,
                     AccountCode.type == AccountType.EXPENSE
@@ -588,7 +524,7 @@ async def income_and_expenditure_report(
         # No income/expense accounts found
         return {
             "report_type": "Income & Expenditure Account",
-            "society": await get_society_info(current_user.society_id, db),
+            "society": await get_society_info(society_id, db),
             "period": {"from": from_date, "to": to_date},
             "generated_at": datetime.utcnow(),
             "income_items": [],
@@ -606,7 +542,7 @@ async def income_and_expenditure_report(
         ).where(
             and_(
                 OpeningBalance.financial_year_id == financial_year.id,
-                AccountCode.society_id == current_user.society_id,
+                AccountCode.society_id == society_id,
                 AccountCode.code.in_(income_expense_codes)
             )
         )
@@ -620,7 +556,7 @@ async def income_and_expenditure_report(
     result = await db.execute(
         select(Transaction).where(
             and_(
-                Transaction.society_id == current_user.society_id,
+                Transaction.society_id == society_id,
                 Transaction.account_code.in_(income_expense_codes),
                 Transaction.date >= fy_start_date,
                 Transaction.date <= effective_date
@@ -693,7 +629,7 @@ async def income_and_expenditure_report(
     surplus_or_deficit = total_income - total_expenditure
 
     # Get society info
-    society_info = await get_society_info(current_user.society_id, db)
+    society_info = await get_society_info(society_id, db)
 
     # Prepare items as lists for frontend (only include accounts with non-zero amounts)
     income_items = [
@@ -781,266 +717,54 @@ async def balance_sheet_report(
             detail=f"Error generating balance sheet: {str(e)}"
         )
     
-    # Find the financial year that contains as_on_date
-    result = await db.execute(
-        select(FinancialYear).where(
-            and_(
-                FinancialYear.society_id == current_user.society_id,
-                FinancialYear.start_date <= as_on_date,
-                FinancialYear.end_date >= as_on_date
-            )
-        ).order_by(FinancialYear.start_date.desc())
+    return await report_cache.get_or_compute(
+        db, current_user.society_id, "balance_sheet",
+        {"as_on_date": as_on_date},
+        lambda: _compute_balance_sheet(current_user.society_id, as_on_date, db)
     )
-    financial_year = result.scalars().first()
-    
+
+
+async def _compute_balance_sheet(society_id: int, as_on_date: date, db: AsyncSession) -> Dict[str, Any]:
+    """Balance Sheet figures for a society (cached by ledger version)"""
+    # Find the financial year that contains as_on_date
+    financial_year = await society_context.find_financial_year(db, society_id, as_on_date)
+
     if not financial_year:
-        # Fallback to active financial year
-        result = await db.execute(
-            select(FinancialYear).where(
-                and_(
-                    FinancialYear.society_id == current_user.society_id,
-                    FinancialYear.is_active == True
-                )
-            ).order_by(FinancialYear.start_date.desc())
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="No financial year found. Please create a financial year first."
         )
-        financial_year = result.scalars().first()
-        
-        if not financial_year:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="No financial year found. Please create a financial year first."
-            )
     
     fy_start_date = financial_year.start_date
     effective_date = min(as_on_date, financial_year.end_date)
     
-    # Get all accounts for this society
-    result = await db.execute(
-        select(AccountCode).where(AccountCode.society_id == current_user.society_id)
-        .order_by(AccountCode.code)
-    )
-    accounts = result.scalars().all()
-    
-    # Get opening balances for this financial year
-    opening_balances_result = await db.execute(
-        select(OpeningBalance, AccountCode).join(
-            AccountCode, OpeningBalance.account_head_id == AccountCode.id
-        ).where(
-            OpeningBalance.financial_year_id == financial_year.id,
-            AccountCode.society_id == current_user.society_id
-        )
+    # All account balances, Balance Sheet sections and the I&E surplus from one
+    # grouped pass over the chart of accounts
+    balance_sheet = await compute_balance_sheet_sections(
+        db, society_id, financial_year.id, fy_start_date, effective_date
     )
-    opening_balances = {}
-    for ob, ac in opening_balances_result.all():
-        opening_balances[ac.code] = ob
+    sections = balance_sheet["sections"]
+    totals = balance_sheet["totals"]
+    surplus_deficit = balance_sheet["surplus_deficit"]
 
-    # Standard Balance Sheet Format for Housing Society
-    # LIABILITIES: A. Capital & Funds, B. Current Liabilities & Provisions
-    # ASSETS: A. Fixed Assets, B. Investments, C. Current Assets
+    capital_funds = sections["capital_funds"]
+    current_liabilities = sections["current_liabilities"]
+    fixed_assets = sections["fixed_assets"]
+    investments = sections["investments"]
+    current_assets = sections["current_assets"]
     
-    # Helper function to categorize accounts
-    def categorize_account(account):
-        """Categorize account for Balance Sheet format"""
-        name_lower = account.name.lower()
-        code = account.code
-        
-        if account.type == AccountType.CAPITAL:
-            return "capital_funds"
-        elif account.type == AccountType.LIABILITY:
-            return "current_liabilities"
-        elif account.type == AccountType.ASSET:
-            # Fixed Assets (typically 2000-2999 range or contains keywords)
-            if any(keyword in name_lower for keyword in ['building', 'lift', 'generator', 'electrical', 'equipment', 'furniture', 'fixture', 'depreciation']):
-                return "fixed_assets"
-            # Investments (Fixed Deposits)
-            elif 'fixed deposit' in name_lower or 'fd' in name_lower:
-                return "investments"
-            # Current Assets (everything else)
-            else:
-                return "current_assets"
-        return None
-    
-    # Calculate balances for all accounts
-    account_balances = {}
-    
-    for account in accounts:
-        # Skip Income and Expense accounts (they contribute to Surplus/Deficit which goes to Capital)
-        if account.type in [AccountType.INCOME, AccountType.EXPENSE]:
-            continue
-            
-        # Start with opening balance
-        balance = Decimal("0.00")
-        ob = opening_balances.get(account.code)
-        if ob:
-            ob_val = Decimal(str(ob.opening_balance))
-            if ob.balance_type == BalanceType.DEBIT:
-                balance = ob_val
-            else:  # credit
-                balance = -ob_val  # Credit stored as negative
-        else:
-            # Fallback to account's opening_balance field
-            balance = Decimal(str(account.opening_balance or 0.0))
-            if account.type in [AccountType.LIABILITY, AccountType.CAPITAL]:
-                balance = -balance  # Credit balance (negative)
-        
-        # Get all transactions for this account from FY start to as_on_date
-        transactions_result = await db.execute(
-            select(Transaction).where(
-                and_(
-                    Transaction.society_id == current_user.society_id,
-                    Transaction.account_code == account.code,
-                    Transaction.date >= fy_start_date,
-                    Transaction.date <= effective_date
-                )
-            ).order_by(Transaction.date, Transaction.id)
-        )
-        transactions = transactions_result.scalars().all()
-        
-        # Calculate balance from transactions
-        for txn in transactions:
-            debit = Decimal(str(txn.debit_amount or 0.0))
-            credit = Decimal(str(txn.credit_amount or 0.0))
-            
-            if account.type == AccountType.ASSET:
-                # Asset: Debit increases, Credit decreases
-                balance += debit
-                balance -= credit
-            else:  # liability, capital
-                # Liability/Capital: Credit increases (negative), Debit decreases
-                balance += debit  # Debit decreases credit balance
-                balance -= credit  # Credit increases (more negative)
-        
-        # Store balance with category
-        category = categorize_account(account)
-        if category:
-            if account.type == AccountType.ASSET:
-                # Assets: positive balance = asset
-                if balance > Decimal("0.01"):
-                    if category not in account_balances:
-                        account_balances[category] = []
-                    account_balances[category].append({
-                        "code": account.code,
-                        "name": account.name,
-                        "balance": float(balance.quantize(Decimal("0.01")))
-                    })
-            else:  # liability, capital
-                # Liabilities/Capital: negative balance = positive liability/capital (credit balance)
-                if balance < -Decimal("0.01"):
-                    if category not in account_balances:
-                        account_balances[category] = []
-                    account_balances[category].append({
-                        "code": account.code,
-                        "name": account.name,
-                        "balance": float(abs(balance).quantize(Decimal("0.01")))
-                    })
-    
-    # Calculate Income & Expenditure Surplus/Deficit
-    # This will be added to "Retained Surplus" or shown as "Surplus/Deficit" in Capital & Funds
-    income_expense_accounts_result = await db.execute(
-        select(AccountCode).where(
-            and_(
-                AccountCode.society_id == current_user.society_id,
-                or_(
-                    AccountCode.type == AccountType.INCOME,
-                    AccountCode.type == AccountType.EXPENSE
-                )
-            )
-        )
-    )
-    income_expense_accounts = income_expense_accounts_result.scalars().all()
-    income_expense_codes = [acc.code for acc in income_expense_accounts]
-    
-    total_income = Decimal("0.00")
-    total_expenses = Decimal("0.00")
-    
-    if income_expense_codes:
-        # Get all income/expense transactions from FY start to as_on_date
-        ie_transactions_result = await db.execute(
-            select(Transaction, AccountCode).join(
-                AccountCode, Transaction.account_code == AccountCode.code
-            ).where(
-                and_(
-                    Transaction.society_id == current_user.society_id,
-                    Transaction.account_code.in_(income_expense_codes),
-                    Transaction.date >= fy_start_date,
-                    Transaction.date <= effective_date
-                )
-            )
-        )
-        ie_transactions = ie_transactions_result.all()
-        
-        for txn, account in ie_transactions:
-            debit = Decimal(str(txn.debit_amount or 0.0))
-            credit = Decimal(str(txn.credit_amount or 0.0))
-            
-            if account.type == AccountType.INCOME:
-                total_income += (credit - debit)
-            elif account.type == AccountType.EXPENSE:
-                total_expenses += (debit - credit)
-        
-        # Include opening balances for income/expense accounts
-        for account in income_expense_accounts:
-            ob = opening_balances.get(account.code)
-            if ob:
-                ob_val = Decimal(str(ob.opening_balance))
-                if account.type == AccountType.INCOME:
-                    if ob.balance_type == BalanceType.CREDIT:
-                        total_income += ob_val
-                    else:
-                        total_income -= ob_val
-                elif account.type == AccountType.EXPENSE:
-                    if ob.balance_type == BalanceType.DEBIT:
-                        total_expenses += ob_val
-                    else:
-                        total_expenses -= ob_val
-    
-    # Surplus/Deficit = Income - Expenses
-    surplus_deficit = total_income - total_expenses
-    
-    # Add Surplus/Deficit to Capital & Funds (as "Surplus/Deficit" or add to "Retained Surplus")
-    if abs(surplus_deficit) >= Decimal("0.01"):
-        if "capital_funds" not in account_balances:
-            account_balances["capital_funds"] = []
-        # Check if "Retained Surplus" exists, otherwise add as "Surplus/Deficit"
-        retained_surplus_found = False
-        for item in account_balances["capital_funds"]:
-            if "retained" in item["name"].lower() or "surplus" in item["name"].lower():
-                item["balance"] += float(surplus_deficit.quantize(Decimal("0.01")))
-                retained_surplus_found = True
-                break
-        if not retained_surplus_found:
-            account_balances["capital_funds"].append({
-                "code": "9999",
-                "name": "Surplus/Deficit (Excess of Income over Expenditure)" if surplus_deficit >= 0 else "Deficit (Excess of Expenditure over Income)",
-                "balance": float(abs(surplus_deficit).quantize(Decimal("0.01")))
-            })
-    
-    # Calculate totals for each category
-    def calculate_total(items):
-        """Calculate total from list of items, ensuring Decimal type"""
-        if not items:
-            return Decimal("0.00")
-        total = sum(Decimal(str(item["balance"])) for item in items)
-        return Decimal(str(total))  # Ensure it's a Decimal
-    
-    capital_funds = account_balances.get("capital_funds", [])
-    current_liabilities = account_balances.get("current_liabilities", [])
-    fixed_assets = account_balances.get("fixed_assets", [])
-    investments = account_balances.get("investments", [])
-    current_assets = account_balances.get("current_assets", [])
-    
-    total_capital_funds = calculate_total(capital_funds)
-    total_current_liabilities = calculate_total(current_liabilities)
+    total_capital_funds = totals["capital_funds"]
+    total_current_liabilities = totals["current_liabilities"]
     total_liabilities = total_capital_funds + total_current_liabilities
     
-    total_fixed_assets = calculate_total(fixed_assets)
-    total_investments = calculate_total(investments)
-    total_current_assets = calculate_total(current_assets)
+    total_fixed_assets = totals["fixed_assets"]
+    total_investments = totals["investments"]
+    total_current_assets = totals["current_assets"]
     total_assets = total_fixed_assets + total_investments + total_current_assets
     
     try:
         # Get society info
-        society_info = await get_society_info(current_user.society_id, db)
+        society_info = await get_society_info(society_id, db)
 
         return {
             "report_type": "Balance Sheet",
@@ -1077,11 +801,16 @@ async def balance_sheet_report(
 
 @router.get("/member-dues")
 async def member_dues_report(
+    page: Optional[int] = Query(None, ge=1, description="Page number (omit for all flats)"),
+    page_size: int = Query(50, ge=1, le=500, description="Flats per page when paging"),
+    sort_by: str = Query("flat_number", description="Sort by 'flat_number' or 'outstanding_amount'"),
+    sort_order: str = Query("asc", description="'asc' or 'desc'"),
     current_user: UserResponse = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """
     Member Dues Report - Outstanding dues for all members
+    Supports server-side paging and sorting by outstanding amount
     Restricted to Committee and Auditors
     """
     # RBAC: Only ADM, COM, and AUD roles can view full financial reports
@@ -1111,219 +840,16 @@ async def member_dues_report(
     )
     if not has_permission:
         pass
-    # Get all members for flats - this is the MASTER table with flat_id and name
-    from app.models_db import Member
-    # Filter by society_id to match user's society
-    society_id = current_user.society_id
-    
-    # Get ALL members for this society - SIMPLE query without join (more reliable)
-    # Order by: primary first, then active, then by creation date
-    result_all_members = await db.execute(
-        select(Member)
-        .where(Member.society_id == society_id)
-        .order_by(
-            Member.is_primary.desc(),  # Primary members first
-            case((Member.status == "active", 0), else_=1),  # Active members first
-            Member.created_at.desc()  # Most recent first
-        )
-    )
-    all_members = result_all_members.scalars().all()
-
-    # Create a map of Flat ID -> Member Name
-    # Use the first member found for each flat (prioritized by query order above)
-    # IMPORTANT: Ensure flat_id is an integer for proper matching
-    flat_member_map = {}
-    for member in all_members:
-        if member.flat_id and member.name:
-            # Convert to int to ensure type consistency
-            flat_id_key = int(member.flat_id) if member.flat_id else None
-            if flat_id_key and flat_id_key not in flat_member_map:
-                flat_member_map[flat_id_key] = member.name
-                logger.info(f"Mapped: flat_id={flat_id_key} (type: {type(flat_id_key).__name__}) -> name={member.name}")
-            elif flat_id_key:
-                logger.debug(f"Skipping duplicate: flat_id={flat_id_key}, already mapped to {flat_member_map[flat_id_key]}")
-    
-    # Log for debugging
-    logger.info(f"Member Dues Report: Found {len(all_members)} total members, mapped {len(flat_member_map)} flats with member names")
-    if len(all_members) > 0:
-        logger.info(f"Member Dues Report: Sample members - first 5: {[(m.flat_id, m.name, m.status, m.is_primary) for m in all_members[:5]]}")
-    logger.info(f"Member Dues Report: flat_member_map flat_ids: {sorted(list(flat_member_map.keys()))}")
-    if len(flat_member_map) == 0:
-        logger.warning(f"Member Dues Report: No member names found for society_id={society_id}!")
-        # Try to get count of members in database
-        result_count = await db.execute(select(func.count(Member.id)).where(Member.society_id == society_id))
-        member_count = result_count.scalar() or 0
-        logger.warning(f"Member Dues Report: Total members in database for society_id={society_id}: {member_count}")
-        # Also check if there are any members at all
-        result_all = await db.execute(select(func.count(Member.id)))
-        total_members = result_all.scalar() or 0
-        logger.warning(f"Member Dues Report: Total members in entire database: {total_members}")
-
-    # Get all flats for this society (for iteration)
-    result_flats = await db.execute(
-        select(Flat)
-        .where(Flat.society_id == society_id)
-        .order_by(Flat.flat_number)
-    )
-    flats = result_flats.scalars().all()
-
-    # Get all Users to map to flats (fallback for owner name if no member found)
-    # Filter for residents/members of this society
-    from app.models_db import User
-    result_users = await db.execute(
-        select(User)
-        .where(and_(
-            User.role == UserRole.RESIDENT,
-            User.society_id == society_id
-        ))
+    # Calculate dues directly from GL Account 1100 transactions (the General Ledger)
+    # with grouped queries - the query count does not grow with the number of flats
+    return await get_member_dues_report(
+        db,
+        society_id=current_user.society_id,
+        page=page,
+        page_size=page_size,
+        sort_by=sort_by,
+        sort_order=sort_order
     )
-    users = result_users.scalars().all()
-    
-    # Create a map of Flat Number -> User Name (first one found)
-    flat_user_map = {}
-    for user in users:
-        # Normalize: Remove "Flat " prefix, strip, and uppercase
-        clean_apt = user.apartment_number.replace("Flat ", "").replace("flat ", "").strip().upper()
-        if clean_apt not in flat_user_map:
-            flat_user_map[clean_apt] = user.name
-
-    dues_report = []
-    total_outstanding = Decimal("0.00")
-
-    # Calculate dues directly from GL Account 1100 transactions
-    # This is the source of truth - the General Ledger
-    # For each flat, we calculate: Outstanding = Debits - Credits
-    for flat in flats:
-        # Debits (bills raised) - use flat_id for direct lookup
-        debits_result = await db.execute(
-            select(func.sum(Transaction.debit_amount)).where(
-                and_(
-                    Transaction.account_code == "1100",
-                    Transaction.flat_id == flat.id
-                )
-            )
-        )
-        total_debits = debits_result.scalar() or Decimal("0.00")
-
-        # Credits (payments received) - use flat_id for direct lookup
-        credits_result = await db.execute(
-            select(func.sum(Transaction.credit_amount)).where(
-                and_(
-                    Transaction.account_code == "1100",
-                    Transaction.flat_id == flat.id
-                )
-            )
-        )
-        total_credits = credits_result.scalar() or Decimal("0.00")
-
-        # Outstanding = Debits - Credits
-        outstanding_amount = Decimal(str(total_debits)) - Decimal(str(total_credits))
-        total_outstanding += outstanding_amount
-
-        # Get unpaid posted bills for bill details (for display only, not for calculation)
-        result = await db.execute(
-            select(MaintenanceBillDB).where(
-                and_(
-                    MaintenanceBillDB.flat_id == flat.id,
-                    MaintenanceBillDB.status == BillStatus.UNPAID,
-                    MaintenanceBillDB.is_posted == True
-                )
-            ).order_by(MaintenanceBillDB.year.desc(), MaintenanceBillDB.month.desc())
-        )
-        unpaid_bills = result.scalars().all()
-
-        # Get last payment info from transactions (credits to 1100)
-        last_payment_result = await db.execute(
-            select(Transaction.date).where(
-                and_(
-                    Transaction.account_code == "1100",
-                    Transaction.credit_amount > 0,
-                    or_(
-                        Transaction.description.like(f"%from {flat.flat_number}%"),
-                        Transaction.description.like(f"%Flat: {flat.flat_number}%"),
-                        Transaction.description.like(f"%Flat {flat.flat_number}%")
-                    )
-                )
-            ).order_by(Transaction.date.desc()).limit(1)
-        )
-        last_payment_date = last_payment_result.scalar()
-
-        # Get member name: Priority 1) Member table (MASTER - members are onboarded here), 2) Flat owner_name, 3) User table, 4) Unknown
-        # The members table is the MASTER table where names are stored against flat_id
-        member_name = "Unknown"
-        
-        # Ensure flat.id is an integer for proper matching
-        flat_id_int = int(flat.id) if flat.id else None
-        
-        # Priority 1: Try the pre-built map first (fastest)
-        if flat_id_int and flat_id_int in flat_member_map:
-            member_name = flat_member_map[flat_id_int]
-            logger.info(f"✓ Flat {flat.flat_number} (ID: {flat_id_int}, type: {type(flat_id_int).__name__}): Found in map -> {member_name}")
-        else:
-            # If not in map, query directly from Member table
-            logger.warning(f"⚠ Flat {flat.flat_number} (ID: {flat_id_int}, type: {type(flat_id_int).__name__}): NOT in map (map has keys: {list(flat_member_map.keys())[:5]}), querying directly...")
-            try:
-                direct_member_result = await db.execute(
-                    select(Member.name)
-                    .where(
-                        and_(
-                            Member.flat_id == flat_id_int,
-                            Member.society_id == society_id
-                        )
-                    )
-                    .order_by(Member.is_primary.desc(), Member.created_at.desc())
-                    .limit(1)
-                )
-                direct_member = direct_member_result.scalar_one_or_none()
-                if direct_member:
-                    member_name = direct_member
-                    logger.info(f"✓ Flat {flat.flat_number} (ID: {flat_id_int}): Found via direct query -> {member_name}")
-                else:
-                    logger.warning(f"✗ Flat {flat.flat_number} (ID: {flat_id_int}): Direct query returned None")
-            except Exception as e:
-                logger.error(f"✗ Error querying member for flat {flat.flat_number} (ID: {flat_id_int}): {e}", exc_info=True)
-        
-        # Priority 2: Use flat.owner_name as fallback (legacy data)
-        if member_name == "Unknown" and flat.owner_name:
-            member_name = flat.owner_name
-            logger.info(f"→ Flat {flat.flat_number}: Using flat.owner_name -> {member_name}")
-        # Priority 3: Try User table mapping
-        elif member_name == "Unknown":
-            flat_num_norm = flat.flat_number.strip().upper()
-            if flat_num_norm in flat_user_map:
-                member_name = flat_user_map[flat_num_norm]
-                logger.info(f"→ Flat {flat.flat_number}: Using User table -> {member_name}")
-            else:
-                logger.warning(f"✗ Flat {flat.flat_number} (ID: {flat.id}): All lookups failed, using 'Unknown'")
-
-        # Final check - log what we're actually setting
-        if member_name == "Unknown":
-            logger.warning(f"⚠⚠⚠ Flat {flat.flat_number} (ID: {flat.id}): FINAL member_name is 'Unknown'! Map has {len(flat_member_map)} entries, flat.id={flat.id}, map keys={list(flat_member_map.keys())[:5]}")
-        
-        dues_report.append({
-            "flat_number": flat.flat_number,
-            "owner_name": member_name,
-            "member_name": member_name,  # Also include as member_name for frontend compatibility
-            "outstanding_bills": len(unpaid_bills),
-            "outstanding_amount": float(outstanding_amount),
-            "last_payment": last_payment_date.isoformat() if last_payment_date else "Never",
-            "bills": [
-                {
-                    "month": bill.month,
-                    "year": bill.year,
-                    "amount": float(bill.total_amount)
-                } for bill in unpaid_bills
-            ]
-        })
-
-    return {
-        "report_type": "Member Dues Report",
-        "generated_at": datetime.utcnow(),
-        "total_flats": len(flats),
-        "flats_with_dues": len([d for d in dues_report if d["outstanding_amount"] > 0]),
-        "total_outstanding": float(total_outstanding),
-        "members": dues_report  # Changed from "dues_by_flat" to "members" to match frontend expectation
-    }
 
 
 @router.get("/member-ledger/{flat_id}")
@@ -1332,10 +858,13 @@ async def member_transaction_ledger(
     from_date: date = Query(None, description="Start date (optional)"),
     to_date: date = Query(None, description="End date (optional)"),
     current_user: UserResponse = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    page: Optional[int] = Query(None, ge=1, description="Page number (omit for the whole period)"),
+    page_size: int = Query(50, ge=1, le=500, description="Entries per page when paging")
 ):
     """
     Member Transaction Ledger - Detailed transaction history for a specific flat
+    Bills (Dr) and receipts (Cr) with running balances; supports paging
     Ordinary members can only view their own ledger 
     Committee and Auditors can view any member's ledger
     """
@@ -1400,31 +929,10 @@ async def member_transaction_ledger(
         if current_user.role not in [UserRole.RESIDENT]:
              pass
 
-    # Get bills for this flat
-    result = await db.execute(
-        select(MaintenanceBillDB)
-        .where(MaintenanceBillDB.flat_id == flat_id_int)
-        .order_by(MaintenanceBillDB.year, MaintenanceBillDB.month)
+    # Bills and receipts with running balances, computed in the database
+    ledger = await get_member_ledger(
+        db, current_user.society_id, flat_id_int, from_date, to_date, page, page_size if page else None
     )
-    bills = result.scalars().all()
-
-    transactions = []
-    total_billed = 0.0
-    total_paid = 0.0
-
-    for bill in bills:
-        bill_status = bill.status.value if hasattr(bill.status, 'value') else str(bill.status)
-        transactions.append({
-            "date": f"{bill.year}-{bill.month:02d}",
-            "description": f"Maintenance bill for {bill.month}/{bill.year}",
-            "amount": bill.total_amount,
-            "status": bill_status,
-            "paid_at": bill.paid_date
-        })
-
-        total_billed += bill.total_amount
-        if bill_status == "paid":
-            total_paid += bill.total_amount
 
     return {
         "report_type": "Member Transaction Ledger",
@@ -1438,12 +946,15 @@ async def member_transaction_ledger(
             "from": from_date,
             "to": to_date
         },
-        "transactions": transactions,
+        "opening_balance": ledger["opening_balance"],
+        "transactions": ledger["entries"],
+        "closing_balance": ledger["closing_balance"],
         "summary": {
-            "total_billed": total_billed,
-            "total_paid": total_paid,
-            "outstanding": total_billed - total_paid
-        }
+            "total_billed": ledger["total_debit"],
+            "total_paid": ledger["total_credit"],
+            "outstanding": ledger["closing_balance"]
+        },
+        "pagination": ledger["pagination"]
     }
 
 
@@ -1486,177 +997,40 @@ async def trial_balance_report(
     if not has_permission:
         pass
     
-    # Find the financial year that contains as_on_date
-    # Use first() instead of scalar_one_or_none() to handle cases where multiple years might overlap
-    result = await db.execute(
-        select(FinancialYear).where(
-            and_(
-                FinancialYear.society_id == current_user.society_id,
-                FinancialYear.start_date <= as_on_date,
-                FinancialYear.end_date >= as_on_date
-            )
-        ).order_by(FinancialYear.start_date.desc())
+    return await report_cache.get_or_compute(
+        db, current_user.society_id, "trial_balance",
+        {"as_on_date": as_on_date},
+        lambda: _compute_trial_balance(current_user.society_id, as_on_date, db)
     )
-    financial_year = result.scalars().first()
-    
+
+
+async def _compute_trial_balance(society_id: int, as_on_date: date, db: AsyncSession) -> TrialBalanceResponse:
+    """Trial Balance for a society (cached by ledger version)"""
+    # Find the financial year that contains as_on_date (latest-starting one if years overlap),
+    # falling back to the active financial year
+    financial_year = await society_context.find_financial_year(db, society_id, as_on_date)
+
     if not financial_year:
-        # If no financial year found, try to get active financial year
-        result = await db.execute(
-            select(FinancialYear).where(
-                and_(
-                    FinancialYear.society_id == current_user.society_id,
-                    FinancialYear.is_active == True
-                )
-            ).order_by(FinancialYear.start_date.desc())
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="No financial year found. Please create a financial year first."
         )
-        financial_year = result.scalars().first()
-        
-        if not financial_year:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="No financial year found. Please create a financial year first."
-            )
     
     # Use financial year start date as the beginning point
     fy_start_date = financial_year.start_date
     # Use as_on_date or FY end date, whichever is earlier
     effective_date = min(as_on_date, financial_year.end_date)
     
-    # Get all account codes
-    result = await db.execute(
-        select(AccountCode).where(AccountCode.society_id == current_user.society_id)
-        .order_by(AccountCode.code)
-    )
-    accounts = result.scalars().all()
-    
-    # Get opening balances for this financial year
-    opening_balances_result = await db.execute(
-        select(OpeningBalance, AccountCode).join(
-            AccountCode, OpeningBalance.account_head_id == AccountCode.id
-        ).where(
-            OpeningBalance.financial_year_id == financial_year.id,
-            AccountCode.society_id == current_user.society_id
-        )
-    )
-    opening_balances = {}
-    for ob, ac in opening_balances_result.all():
-        opening_balances[ac.code] = ob
-    
     # GOLDEN RULE 2: Trial Balance must get net balance from General Ledger only
-    # We calculate balances from transactions (which form the General Ledger)
-    # Then extract net debit or credit balance for each account
-    # This ensures Trial Balance is derived from General Ledger (Golden Rule 2)
-    
-    items = []
-    total_debit = Decimal("0.00")
-    total_credit = Decimal("0.00")
-    
-    for account in accounts:
-        # Get opening balance for this account from OpeningBalance table
-        opening_balance = opening_balances.get(account.code)
-        if opening_balance:
-            # Convert opening balance based on balance_type
-            if opening_balance.balance_type == BalanceType.DEBIT:
-                balance = Decimal(str(opening_balance.opening_balance))
-            else:  # credit
-                balance = -Decimal(str(opening_balance.opening_balance))  # Credit stored as negative
-        else:
-            # Fallback to account's opening_balance field if no OpeningBalance record
-            balance = Decimal(str(account.opening_balance or 0.0))
-            # For Liability, Capital, and Income, opening balance is Credit (negative in this logic)
-            if account.type in ['liability', 'capital', 'income']:
-                balance = -balance
-        
-        # Get all transactions for this account from FY start to as_on_date
-        # expense_month is a string (e.g., "December, 2025"), so we can't compare it directly to dates
-        # Instead, use date field for date range filtering, and expense_month for exact month matching
-        # For ledger purposes, we'll use the date field which is more reliable for date range queries
-        transactions_result = await db.execute(
-            select(Transaction).where(
-                and_(
-                    Transaction.society_id == current_user.society_id,
-                    Transaction.account_code == account.code,
-                    Transaction.date >= fy_start_date,
-                    Transaction.date <= effective_date
-                )
-            ).order_by(Transaction.date, Transaction.id)
-        )
-        transactions = transactions_result.scalars().all()
-        
-        # Calculate balance from transactions
-        for txn in transactions:
-            # Update balance based on account type and debit/credit
-            debit = Decimal(str(txn.debit_amount or 0.0))
-            credit = Decimal(str(txn.credit_amount or 0.0))
-            
-            if account.type in ['asset', 'expense']:
-                # Asset/Expense: Debit increases, Credit decreases
-                balance += debit
-                balance -= credit
-            else:  # liability, capital, income
-                # Liability/Capital/Income: Credit increases (negative), Debit decreases
-                balance += debit  # Debit decreases credit balance
-                balance -= credit  # Credit increases (more negative)
-        
-        # Skip accounts with zero balance
-        if abs(balance) < Decimal("0.01"):
-            continue
-        
-        # Determine debit/credit based on account type and calculated balance
-        # Asset and Expense accounts: positive balance = debit, negative balance = credit
-        # Liability, Capital, and Income accounts: positive balance = credit, negative balance = debit
-        
-        if account.type in ['asset', 'expense']:
-            # Asset/Expense accounts normally have debit balances
-            if balance > 0:
-                # Normal debit balance
-                items.append(TrialBalanceItem(
-                    account_code=account.code,
-                    account_name=account.name,
-                    debit_balance=float(balance.quantize(Decimal("0.01"))),
-                    credit_balance=0.0
-                ))
-                total_debit += balance
-            elif balance < 0:
-                # Abnormal credit balance (contra account)
-                items.append(TrialBalanceItem(
-                    account_code=account.code,
-                    account_name=account.name,
-                    debit_balance=0.0,
-                    credit_balance=float(abs(balance).quantize(Decimal("0.01")))
-                ))
-                total_credit += abs(balance)
-        else:  # liability, capital, income
-            # Liability/Capital/Income accounts normally have credit balances (stored as negative)
-            if balance < 0:
-                # Normal credit balance (stored as negative, display as positive credit)
-                items.append(TrialBalanceItem(
-                    account_code=account.code,
-                    account_name=account.name,
-                    debit_balance=0.0,
-                    credit_balance=float(abs(balance).quantize(Decimal("0.01")))
-                ))
-                total_credit += abs(balance)
-            elif balance > 0:
-                # Abnormal debit balance (contra account)
-                items.append(TrialBalanceItem(
-                    account_code=account.code,
-                    account_name=account.name,
-                    debit_balance=float(balance.quantize(Decimal("0.01"))),
-                    credit_balance=0.0
-                ))
-                total_debit += balance
-    
-    difference = abs(total_debit - total_credit)
-    is_balanced = difference < Decimal("0.01")
-    
-    return TrialBalanceResponse(
-        as_on_date=as_on_date,
-        items=items,
-        total_debit=float(total_debit.quantize(Decimal("0.01"))),
-        total_credit=float(total_credit.quantize(Decimal("0.01"))),
-        difference=float(difference.quantize(Decimal("0.01"))),
-        is_balanced=is_balanced
+    # Balances are derived from transactions (which form the General Ledger) with
+    # one grouped aggregate joined to OpeningBalance, instead of one query per account
+    return await compute_trial_balance(
+        db,
+        society_id=society_id,
+        financial_year_id=financial_year.id,
+        fy_start_date=fy_start_date,
+        effective_date=effective_date,
+        as_on_date=as_on_date
     )
 
 
@@ -1671,31 +1045,10 @@ async def generate_account_ledger(
     account_code = account.code
     
     # Find the financial year for the period
-    result = await db.execute(
-        select(FinancialYear).where(
-            and_(
-                FinancialYear.society_id == society_id,
-                FinancialYear.start_date <= from_date,
-                FinancialYear.end_date >= from_date
-            )
-        ).order_by(FinancialYear.start_date.desc())
-    )
-    financial_year = result.scalars().first()
-    
+    financial_year = await society_context.find_financial_year(db, society_id, from_date)
+
     if not financial_year:
-        # Fallback to active financial year
-        result = await db.execute(
-            select(FinancialYear).where(
-                and_(
-                    FinancialYear.society_id == society_id,
-                    FinancialYear.is_active == True
-                )
-            ).order_by(FinancialYear.start_date.desc())
-        )
-        financial_year = result.scalars().first()
-        
-        if not financial_year:
-            return None
+        return None
 
     fy_start_date = financial_year.start_date
     
@@ -1721,26 +1074,11 @@ async def generate_account_ledger(
             balance = -balance
 
     # 2. Add movements between FY start and from_date - 1
-    # Use date field for date range filtering (expense_month is string format, not suitable for range queries)
+    # Read from the ledger snapshot store: two running-balance lookups instead of a transaction scan
     if from_date > fy_start_date:
-        result = await db.execute(
-            select(
-                func.sum(Transaction.debit_amount).label('dr'),
-                func.sum(Transaction.credit_amount).label('cr')
-            ).where(
-                and_(
-                    Transaction.society_id == society_id,
-                    Transaction.account_code == account_code,
-                    Transaction.date >= fy_start_date,
-                    Transaction.date < from_date
-                )
-            )
+        balance += await get_net_movement(
+            db, society_id, account_code, fy_start_date, from_date - timedelta(days=1)
         )
-        movements = result.one_or_none()
-        if movements:
-            dr = Decimal(str(movements.dr or 0.0))
-            cr = Decimal(str(movements.cr or 0.0))
-            balance += (dr - cr)
 
     opening_balance_at_start = balance
 
@@ -1946,18 +1284,37 @@ async def cash_book_ledger(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="You do not have permission to view reports."
         )
-    # Get cash account codes and their opening balances
+
+    return await report_single_flight.run(
+        current_user.society_id, "cash_book",
+        {"from_date": from_date, "to_date": to_date},
+        lambda: _compute_cash_book(current_user.society_id, from_date, to_date, db)
+    )
+
+
+async def _cash_book_scope(society_id: int, db: AsyncSession):
+    """Cash account heads and the filter selecting cash book postings"""
     result = await db.execute(
         select(AccountCode).where(
-            AccountCode.society_id == current_user.society_id,
-            AccountCode.code.like('1010%')  # Cash accounts
+            AccountCode.society_id == society_id,
+            AccountCode.liquidity_class == LIQUIDITY_CASH
         )
     )
     cash_account_records = result.scalars().all()
     cash_accounts = [ac.code for ac in cash_account_records]
-    
+    cash_scope = or_(
+        Transaction.payment_method == 'cash',
+        Transaction.account_code.in_(cash_accounts) if cash_accounts else False
+    )
+    return cash_account_records, cash_scope
+
+
+async def _compute_cash_book(society_id: int, from_date: date, to_date: date, db: AsyncSession) -> Dict[str, Any]:
+    """Cash Book entries and running balance for a society"""
+    cash_account_records, cash_scope = await _cash_book_scope(society_id, db)
+
     # Base opening balance from AccountCode table
-    opening_balance = sum(Decimal(str(ac.opening_balance or 0.0)) for ac in cash_account_records)
+    opening_balance = sum((Decimal(str(ac.opening_balance or 0.0)) for ac in cash_account_records), Decimal("0"))
     
     # Add movements BEFORE from_date to get true opening balance at from_date
     prev_result = await db.execute(
@@ -1966,12 +1323,9 @@ async def cash_book_ledger(
             func.sum(Transaction.credit_amount).label('cr')
         ).where(
             and_(
-                Transaction.society_id == current_user.society_id,
+                Transaction.society_id == society_id,
                 Transaction.date < from_date,
-                or_(
-                    Transaction.payment_method == 'cash',
-                    Transaction.account_code.in_(cash_accounts) if cash_accounts else False
-                )
+                cash_scope
             )
         )
     )
@@ -1983,13 +1337,10 @@ async def cash_book_ledger(
     result = await db.execute(
         select(Transaction).where(
             and_(
-                Transaction.society_id == current_user.society_id,
+                Transaction.society_id == society_id,
                 Transaction.date >= from_date,
                 Transaction.date <= to_date,
-                or_(
-                    Transaction.payment_method == 'cash',
-                    Transaction.account_code.in_(cash_accounts) if cash_accounts else False
-                )
+                cash_scope
             )
         ).order_by(Transaction.date, Transaction.id)
     )
@@ -2019,8 +1370,8 @@ async def cash_book_ledger(
             })
             closing_balance -= cr
     
-    total_receipts = sum(Decimal(str(r["amount"])) for r in receipts)
-    total_payments = sum(Decimal(str(p["amount"])) for p in payments)
+    total_receipts = sum((Decimal(str(r["amount"])) for r in receipts), Decimal("0"))
+    total_payments = sum((Decimal(str(p["amount"])) for p in payments), Decimal("0"))
     
     return {
         "report_type": "Cash Book Ledger",
@@ -2037,6 +1388,43 @@ async def cash_book_ledger(
     }
 
 
+@router.get("/cash-book/page")
+async def cash_book_page(
+    from_date: date = Query(..., description="Start date"),
+    to_date: date = Query(..., description="End date"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page; omit for the first page"),
+    limit: int = Query(100, ge=1, le=1000, description="Entries per page"),
+    current_user: UserResponse = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Cash Book Ledger, one page at a time
+    Entries in (date, id) order with running balances; each page carries the
+    balance brought forward to it, so any page costs the same to fetch.
+    """
+    # Check permission - auditors can view reports
+    user_id_int = int(current_user.id)
+    has_permission = await check_permission(
+        user_id=user_id_int,
+        permission_code="reports.view",
+        db=db
+    )
+    if not has_permission:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You do not have permission to view reports."
+        )
+    cash_account_records, cash_scope = await _cash_book_scope(current_user.society_id, db)
+    base_opening = sum((Decimal(str(ac.opening_balance or 0.0)) for ac in cash_account_records), Decimal("0"))
+    try:
+        page = await get_ledger_page(
+            db, current_user.society_id, cash_scope, base_opening, from_date, to_date, cursor, limit
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return {"report_type": "Cash Book Ledger", **page}
+
+
 @router.get("/general-ledger")
 async def general_ledger_report(
     from_date: date = Query(..., description="Start date"),
@@ -2062,46 +1450,23 @@ async def general_ledger_report(
             detail="You do not have permission to view reports."
         )
     
-    # Get society info
-    society_info = await get_society_info(current_user.society_id, db)
-    
-    # Get ALL account codes
-    result = await db.execute(
-        select(AccountCode).where(AccountCode.society_id == current_user.society_id).order_by(AccountCode.code)
-    )
-    account_codes = result.scalars().all()
-    
-    # Find the financial year for the period
-    result = await db.execute(
-        select(FinancialYear).where(
-            and_(
-                FinancialYear.society_id == current_user.society_id,
-                FinancialYear.start_date <= from_date,
-                FinancialYear.end_date >= from_date
-            )
-        ).order_by(FinancialYear.start_date.desc())
+    return await report_single_flight.run(
+        current_user.society_id, "general_ledger",
+        {"from_date": from_date, "to_date": to_date},
+        lambda: _compute_general_ledger(current_user.society_id, from_date, to_date, db)
     )
-    financial_year = result.scalars().first()
-    
-    if not financial_year:
-        # Fallback to active financial year
-        result = await db.execute(
-            select(FinancialYear).where(
-                and_(
-                    FinancialYear.society_id == current_user.society_id,
-                    FinancialYear.is_active == True
-                )
-            ).order_by(FinancialYear.start_date.desc())
-        )
-        financial_year = result.scalars().first()
-    
-    fy_start_date = financial_year.start_date if financial_year else from_date
+
+
+async def _compute_general_ledger(society_id: int, from_date: date, to_date: date, db: AsyncSession) -> Dict[str, Any]:
+    """General Ledger of all account heads for a society"""
+    # Get society info
+    society_info = await get_society_info(society_id, db)
     
     # Get all transactions in the period
     result = await db.execute(
         select(Transaction).where(
             and_(
-                Transaction.society_id == current_user.society_id,
+                Transaction.society_id == society_id,
                 Transaction.date >= from_date,
                 Transaction.date <= to_date
             )
@@ -2111,70 +1476,16 @@ async def general_ledger_report(
     )
     transactions = result.scalars().all()
     
-    # Pre-fetch opening balances for all accounts if FY exists
-    opening_balances_map = {}
-    if financial_year:
-        ob_res = await db.execute(
-            select(OpeningBalance).where(OpeningBalance.financial_year_id == financial_year.id)
-        )
-        for ob in ob_res.scalars().all():
-            opening_balances_map[ob.account_head_id] = ob
-            
+    # Account heads with FY opening balance + movements up to from_date (shared with the streaming export)
     ledger_by_account = {}
-    
-    # 2. Optimized: Pre-calculate opening balance movements for ALL accounts in one query
-    opening_movements = {}
-    if from_date > fy_start_date:
-        m_res = await db.execute(
-            select(
-                Transaction.account_code,
-                func.sum(Transaction.debit_amount).label('dr'),
-                func.sum(Transaction.credit_amount).label('cr')
-            ).where(
-                and_(
-                    Transaction.society_id == current_user.society_id,
-                    Transaction.date >= fy_start_date,
-                    Transaction.date < from_date
-                )
-            ).group_by(Transaction.account_code)
-        )
-        for row in m_res.all():
-            opening_movements[row.account_code] = (Decimal(str(row.dr or 0.0)), Decimal(str(row.cr or 0.0)))
-
-    # Initialize ledger entries for each account
-    for account in account_codes:
-        # 1. Start with FY opening balance
-        ob_record = opening_balances_map.get(account.id)
-        if ob_record:
-            if ob_record.balance_type == BalanceType.DEBIT:
-                balance = Decimal(str(ob_record.opening_balance))
-            else:
-                balance = -Decimal(str(ob_record.opening_balance))
-        else:
-            balance = Decimal(str(account.opening_balance or 0.0))
-            if account.type in ['liability', 'capital', 'income']:
-                balance = -balance
-        
-        # 2. Add movements between FY start and from_date - 1 (from optimized map)
-        if from_date > fy_start_date:
-            dr_m, cr_m = opening_movements.get(account.code, (Decimal("0.00"), Decimal("0.00")))
-            balance += (dr_m - cr_m)
-        
-        # Display balance logic (convert internal credit-as-negative to display format)
-        display_opening = balance
-        if account.type in ['liability', 'capital', 'income']:
-            display_opening = -balance
-            
-        ledger_by_account[account.code] = {
-            "account_code": account.code,
-            "account_name": account.name,
-            "account_type": account.type.value if hasattr(account.type, 'value') else str(account.type),
-            "internal_balance": balance, # Use this for ongoing calculations
-            "opening_balance": display_opening,
+    accounts = await get_general_ledger_accounts(db, society_id, from_date)
+    for account in accounts.values():
+        ledger_by_account[account["account_code"]] = {
+            **account,
             "transactions": [],
             "total_debit": Decimal("0.00"),
             "total_credit": Decimal("0.00"),
-            "closing_balance": display_opening # Will be updated after transactions
+            "closing_balance": account["opening_balance"] # Will be updated after transactions
         }
     
     # Process transactions
@@ -2335,26 +1646,44 @@ async def bank_ledger(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="You do not have permission to view reports."
         )
-    # Get bank account records and codes
+
+    return await report_single_flight.run(
+        current_user.society_id, "bank_ledger",
+        {"from_date": from_date, "to_date": to_date, "account_code": account_code},
+        lambda: _compute_bank_ledger(current_user.society_id, from_date, to_date, account_code, db)
+    )
+
+
+async def _bank_ledger_scope(society_id: int, account_code: Optional[str], db: AsyncSession):
+    """Bank account heads (one, or all) and the filter selecting bank ledger postings"""
     if account_code:
         result = await db.execute(
             select(AccountCode).where(
-                AccountCode.society_id == current_user.society_id,
+                AccountCode.society_id == society_id,
                 AccountCode.code == account_code
             )
         )
     else:
         result = await db.execute(
             select(AccountCode).where(
-                AccountCode.society_id == current_user.society_id,
-                AccountCode.code.like('100%'),  # Bank accounts
-                AccountCode.type == 'asset'
+                AccountCode.society_id == society_id,
+                AccountCode.liquidity_class == LIQUIDITY_BANK
             )
         )
     bank_account_records = result.scalars().all()
     bank_accounts = [ac.code for ac in bank_account_records]
-    
-    if not bank_accounts:
+    bank_scope = or_(
+        Transaction.payment_method == 'bank',
+        Transaction.account_code.in_(bank_accounts)
+    )
+    return bank_account_records, bank_scope
+
+
+async def _compute_bank_ledger(society_id: int, from_date: date, to_date: date, account_code: Optional[str], db: AsyncSession) -> Dict[str, Any]:
+    """Bank Ledger entries for a society, optionally limited to one bank account"""
+    bank_account_records, bank_scope = await _bank_ledger_scope(society_id, account_code, db)
+
+    if not bank_account_records:
         return {
             "report_type": "Bank Ledger",
             "period": {"from": from_date, "to": to_date},
@@ -2375,12 +1704,9 @@ async def bank_ledger(
             func.sum(Transaction.credit_amount).label('cr')
         ).where(
             and_(
-                Transaction.society_id == current_user.society_id,
+                Transaction.society_id == society_id,
                 Transaction.date < from_date,
-                or_(
-                    Transaction.payment_method == 'bank',
-                    Transaction.account_code.in_(bank_accounts)
-                )
+                bank_scope
             )
         )
     )
@@ -2392,13 +1718,10 @@ async def bank_ledger(
     result = await db.execute(
         select(Transaction).where(
             and_(
-                Transaction.society_id == current_user.society_id,
+                Transaction.society_id == society_id,
                 Transaction.date >= from_date,
                 Transaction.date <= to_date,
-                or_(
-                    Transaction.payment_method == 'bank',
-                    Transaction.account_code.in_(bank_accounts)
-                )
+                bank_scope
             )
         ).order_by(Transaction.date, Transaction.id)
     )
@@ -2439,8 +1762,93 @@ async def bank_ledger(
     }
 
 
+@router.get("/bank-ledger/page")
+async def bank_ledger_page(
+    from_date: date = Query(..., description="Start date"),
+    to_date: date = Query(..., description="End date"),
+    account_code: Optional[str] = Query(None, description="Specific bank account code"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page; omit for the first page"),
+    limit: int = Query(100, ge=1, le=1000, description="Entries per page"),
+    current_user: UserResponse = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Bank Ledger, one page at a time
+    Same entries as /bank-ledger in (date, id) order, with a running balance
+    carried forward from the previous pages.
+    """
+    # Check permission - auditors can view reports
+    user_id_int = int(current_user.id)
+    has_permission = await check_permission(
+        user_id=user_id_int,
+        permission_code="reports.view",
+        db=db
+    )
+    if not has_permission:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You do not have permission to view reports."
+        )
+    bank_account_records, bank_scope = await _bank_ledger_scope(current_user.society_id, account_code, db)
+    if not bank_account_records:
+        return {
+            "report_type": "Bank Ledger",
+            "period": {"from": from_date, "to": to_date},
+            "account_code": account_code,
+            "opening_balance": 0.0,
+            "entries": [],
+            "closing_balance": 0.0,
+            "limit": limit,
+            "has_more": False,
+            "next_cursor": None
+        }
+
+    base_opening = sum((Decimal(str(ac.opening_balance or 0.0)) for ac in bank_account_records), Decimal("0"))
+    try:
+        page = await get_ledger_page(
+            db, current_user.society_id, bank_scope, base_opening, from_date, to_date, cursor, limit
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return {"report_type": "Bank Ledger", "account_code": account_code, **page}
+
+
 # ==================== EXPORT ENDPOINTS ====================
 
+
+@router.get("/render-stats")
+async def get_render_stats(
+    current_user: UserResponse = Depends(get_current_admin_user)
+):
+    """PDF/Excel render pool counters and per-renderer timings for this worker (admin only)"""
+    return render_executor.stats()
+
+
+@router.get("/cache-stats")
+async def get_report_cache_stats(
+    current_user: UserResponse = Depends(get_current_admin_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Report result cache backend usage and per-report hit/miss counters (admin only)"""
+    return await report_cache.stats(db)
+
+
+@router.get("/single-flight-stats")
+async def get_single_flight_stats(
+    current_user: UserResponse = Depends(get_current_admin_user)
+):
+    """Report how many concurrent identical report requests were collapsed into one computation (admin only)"""
+    return report_single_flight.stats()
+
+
+@router.get("/society-context-stats")
+async def get_society_context_stats(
+    current_user: UserResponse = Depends(get_current_admin_user)
+):
+    """Financial year / society header cache counters for this worker (admin only)"""
+    return society_context.stats()
+
+
 @router.get("/general-ledger/export/excel")
 async def export_general_ledger_excel(
     from_date: date = Query(..., description="Start date"),
@@ -2464,50 +1872,49 @@ async def export_general_ledger_excel(
             detail="You do not have permission to export reports."
         )
     
-    # Get report data (reuse existing logic)
-    report_data = await general_ledger_report(from_date, to_date, current_user, db)
-    society_info = await get_society_info(current_user.society_id, db)
-    
-    # Format data for export
-    export_data = {
-        "from_date": str(from_date),
-        "to_date": str(to_date),
-        "ledger": {}
-    }
-    
-    for entry in report_data["ledger_entries"]:
-        account_code = entry["account_code"]
-        export_data["ledger"][account_code] = {
-            "account_name": entry["account_name"],
-            "account_type": entry["account_type"],
-            "opening_balance": entry["opening_balance"],
-            "total_debit": entry["total_debit"],
-            "total_credit": entry["total_credit"],
-            "closing_balance": entry["closing_balance"],
-            "transactions": [
-                {
-                    "date": str(txn["date"]),
-                    "description": txn["description"],
-                    "debit": txn["debit"],
-                    "credit": txn["credit"],
-                    "balance": txn.get("balance", 0)
-                }
-                for txn in entry["transactions"]
-            ]
-        }
-    
-    # Generate Excel file
-    excel_file = ExcelExporter.create_general_ledger_excel(export_data, society_info)
+    society_info = await get_society_info(current_user.society_id, db, include_logo=True)
     
-    # Return as streaming response
+    # Rows are streamed from a server-side cursor into a write-only workbook (bounded memory)
     filename = f"General_Ledger_{from_date}_to_{to_date}.xlsx"
     return StreamingResponse(
-        excel_file,
+        stream_general_ledger_excel(current_user.society_id, from_date, to_date, society_info),
         media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
         headers={"Content-Disposition": f"attachment; filename={filename}"}
     )
 
 
+@router.get("/general-ledger/export/csv")
+async def export_general_ledger_csv(
+    from_date: date = Query(..., description="Start date"),
+    to_date: date = Query(..., description="End date"),
+    current_user: UserResponse = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Export General Ledger Report to CSV format
+    Streamed batch by batch; suited to multi-year periods
+    """
+    # Check permission
+    user_id_int = int(current_user.id)
+    has_permission = await check_permission(
+        user_id=user_id_int,
+        permission_code="reports.view",
+        db=db
+    )
+    if not has_permission:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You do not have permission to export reports."
+        )
+    
+    filename = f"General_Ledger_{from_date}_to_{to_date}.csv"
+    return StreamingResponse(
+        stream_general_ledger_csv(current_user.society_id, from_date, to_date),
+        media_type="text/csv",
+        headers={"Content-Disposition": f"attachment; filename={filename}"}
+    )
+
+
 @router.get("/general-ledger/export/pdf")
 async def export_general_ledger_pdf(
     from_date: date = Query(..., description="Start date"),
@@ -2533,7 +1940,7 @@ async def export_general_ledger_pdf(
     
     # Get report data
     report_data = await general_ledger_report(from_date, to_date, current_user, db)
-    society_info = await get_society_info(current_user.society_id, db)
+    society_info = await get_society_info(current_user.society_id, db, include_logo=True)
     
     # Format data for export
     export_data = {
@@ -2564,7 +1971,7 @@ async def export_general_ledger_pdf(
         }
     
     # Generate PDF file
-    pdf_file = PDFExporter.create_general_ledger_pdf(export_data, society_info)
+    pdf_file = await render_document(PDFExporter.create_general_ledger_pdf, export_data, society_info)
     
     # Return as streaming response
     filename = f"General_Ledger_{from_date}_to_{to_date}.pdf"
@@ -2600,7 +2007,7 @@ async def export_receipts_payments_excel(
     
     # Get report data
     report_data = await receipts_and_payments_report(from_date, to_date, current_user, db)
-    society_info = await get_society_info(current_user.society_id, db)
+    society_info = await get_society_info(current_user.society_id, db, include_logo=True)
     
     # Format for simple table export
     export_data = {
@@ -2613,7 +2020,8 @@ async def export_receipts_payments_excel(
     }
     
     # Generate Excel (using simple report template)
-    excel_file = ExcelExporter.create_simple_report_excel(
+    excel_file = await render_document(
+        ExcelExporter.create_simple_report_excel,
         export_data,
         society_info,
         "Receipts & Payments Report",
@@ -2654,7 +2062,7 @@ async def export_receipts_payments_pdf(
     
     # Get report data
     report_data = await receipts_and_payments_report(from_date, to_date, current_user, db)
-    society_info = await get_society_info(current_user.society_id, db)
+    society_info = await get_society_info(current_user.society_id, db, include_logo=True)
     
     # Format for export
     export_data = {
@@ -2665,7 +2073,8 @@ async def export_receipts_payments_pdf(
     }
     
     # Generate PDF
-    pdf_file = PDFExporter.create_simple_report_pdf(
+    pdf_file = await render_document(
+        PDFExporter.create_simple_report_pdf,
         export_data,
         society_info,
         "Receipts & Payments Report",
@@ -2706,7 +2115,7 @@ async def export_cash_book_excel(
     
     # Get report data
     report_data = await cash_book_ledger(from_date, to_date, current_user, db)
-    society_info = await get_society_info(current_user.society_id, db)
+    society_info = await get_society_info(current_user.society_id, db, include_logo=True)
     
     # Format for export - combine receipts and payments
     all_transactions = []
@@ -2744,7 +2153,8 @@ async def export_cash_book_excel(
     }
     
     # Generate Excel
-    excel_file = ExcelExporter.create_simple_report_excel(
+    excel_file = await render_document(
+        ExcelExporter.create_simple_report_excel,
         export_data,
         society_info,
         "Cash Book Ledger",
@@ -2785,7 +2195,7 @@ async def export_cash_book_pdf(
     
     # Get report data
     report_data = await cash_book_ledger(from_date, to_date, current_user, db)
-    society_info = await get_society_info(current_user.society_id, db)
+    society_info = await get_society_info(current_user.society_id, db, include_logo=True)
     
     # Format for export
     all_transactions = []
@@ -2820,7 +2230,8 @@ async def export_cash_book_pdf(
     }
     
     # Generate PDF
-    pdf_file = PDFExporter.create_simple_report_pdf(
+    pdf_file = await render_document(
+        PDFExporter.create_simple_report_pdf,
         export_data,
         society_info,
         "Cash Book Ledger",
@@ -2862,7 +2273,7 @@ async def export_bank_ledger_excel(
     
     # Get report data
     report_data = await bank_ledger(from_date, to_date, account_code, current_user, db)
-    society_info = await get_society_info(current_user.society_id, db)
+    society_info = await get_society_info(current_user.society_id, db, include_logo=True)
     
     export_data = {
         "from_date": str(from_date),
@@ -2871,7 +2282,8 @@ async def export_bank_ledger_excel(
     }
     
     # Generate Excel
-    excel_file = ExcelExporter.create_simple_report_excel(
+    excel_file = await render_document(
+        ExcelExporter.create_simple_report_excel,
         export_data,
         society_info,
         "Bank Ledger",
@@ -2913,7 +2325,7 @@ async def export_bank_ledger_pdf(
     
     # Get report data
     report_data = await bank_ledger(from_date, to_date, account_code, current_user, db)
-    society_info = await get_society_info(current_user.society_id, db)
+    society_info = await get_society_info(current_user.society_id, db, include_logo=True)
     
     export_data = {
         "from_date": str(from_date),
@@ -2922,7 +2334,8 @@ async def export_bank_ledger_pdf(
     }
     
     # Generate PDF
-    pdf_file = PDFExporter.create_simple_report_pdf(
+    pdf_file = await render_document(
+        PDFExporter.create_simple_report_pdf,
         export_data,
         society_info,
         "Bank Ledger",
@@ -2963,8 +2376,8 @@ async def export_member_ledger_excel(
         )
     
     # Get report data
-    report_data = await member_transaction_ledger(flat_id, from_date, to_date, current_user, db)
-    society_info = await get_society_info(current_user.society_id, db)
+    report_data = await member_transaction_ledger(flat_id, from_date, to_date, current_user, db, page=None, page_size=None)
+    society_info = await get_society_info(current_user.society_id, db, include_logo=True)
     
     export_data = {
         "from_date": str(from_date) if from_date else "All Time",
@@ -2975,11 +2388,12 @@ async def export_member_ledger_excel(
     }
     
     # Generate Excel
-    excel_file = ExcelExporter.create_simple_report_excel(
+    excel_file = await render_document(
+        ExcelExporter.create_simple_report_excel,
         export_data,
         society_info,
         f"Member Ledger - {report_data['flat']['flat_number']}",
-        ["Date", "Description", "Amount", "Status"],
+        ["Date", "Description", "Debit", "Credit", "Balance", "Status"],
         "transactions"
     )
     
@@ -3016,8 +2430,8 @@ async def export_member_ledger_pdf(
         )
     
     # Get report data
-    report_data = await member_transaction_ledger(flat_id, from_date, to_date, current_user, db)
-    society_info = await get_society_info(current_user.society_id, db)
+    report_data = await member_transaction_ledger(flat_id, from_date, to_date, current_user, db, page=None, page_size=None)
+    society_info = await get_society_info(current_user.society_id, db, include_logo=True)
     
     export_data = {
         "from_date": str(from_date) if from_date else "All Time",
@@ -3028,11 +2442,12 @@ async def export_member_ledger_pdf(
     }
     
     # Generate PDF
-    pdf_file = PDFExporter.create_simple_report_pdf(
+    pdf_file = await render_document(
+        PDFExporter.create_simple_report_pdf,
         export_data,
         society_info,
         f"Member Ledger - {report_data['flat']['flat_number']}",
-        ["Date", "Description", "Amount", "Status"],
+        ["Date", "Description", "Debit", "Credit", "Balance", "Status"],
         "transactions"
     )
     
@@ -3058,8 +2473,10 @@ async def export_trial_balance_excel(
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="No permission")
         
     report_data = await trial_balance_report(as_on_date, current_user, db)
-    society_info = await get_society_info(current_user.society_id, db)
-    excel_file = ExcelExporter.create_trial_balance_excel(report_data, society_info)
+    society_info = await get_society_info(current_user.society_id, db, include_logo=True)
+    # Convert Pydantic model to dict for Excel export
+    report_dict = report_data.model_dump() if hasattr(report_data, 'model_dump') else report_data.dict()
+    excel_file = await render_document(ExcelExporter.create_trial_balance_excel, report_dict, society_info)
     
     filename = f"Trial_Balance_{as_on_date}.xlsx"
     return StreamingResponse(
@@ -3082,10 +2499,10 @@ async def export_trial_balance_pdf(
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="No permission")
         
     report_data = await trial_balance_report(as_on_date, current_user, db)
-    society_info = await get_society_info(current_user.society_id, db)
+    society_info = await get_society_info(current_user.society_id, db, include_logo=True)
     # Convert Pydantic model to dict for PDF export
     report_dict = report_data.model_dump() if hasattr(report_data, 'model_dump') else report_data.dict()
-    pdf_file = PDFExporter.create_trial_balance_pdf(report_dict, society_info)
+    pdf_file = await render_document(PDFExporter.create_trial_balance_pdf, report_dict, society_info)
     
     filename = f"Trial_Balance_{as_on_date}.pdf"
     return StreamingResponse(
@@ -3109,8 +2526,8 @@ async def export_income_expenditure_excel(
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="No permission")
         
     report_data = await income_and_expenditure_report(from_date, to_date, current_user, db)
-    society_info = await get_society_info(current_user.society_id, db)
-    excel_file = ExcelExporter.create_income_and_expenditure_excel(report_data, society_info)
+    society_info = await get_society_info(current_user.society_id, db, include_logo=True)
+    excel_file = await render_document(ExcelExporter.create_income_and_expenditure_excel, report_data, society_info)
     
     filename = f"Income_Expenditure_{from_date}_to_{to_date}.xlsx"
     return StreamingResponse(
@@ -3134,7 +2551,7 @@ async def export_income_expenditure_pdf(
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="No permission")
         
     report_data = await income_and_expenditure_report(from_date, to_date, current_user, db)
-    society_info = await get_society_info(current_user.society_id, db)
+    society_info = await get_society_info(current_user.society_id, db, include_logo=True)
     # Convert Pydantic model to dict for PDF export if needed
     if hasattr(report_data, 'model_dump'):
         report_dict = report_data.model_dump()
@@ -3142,7 +2559,7 @@ async def export_income_expenditure_pdf(
         report_dict = report_data.dict()
     else:
         report_dict = report_data
-    pdf_file = PDFExporter.create_income_and_expenditure_pdf(report_dict, society_info)
+    pdf_file = await render_document(PDFExporter.create_income_and_expenditure_pdf, report_dict, society_info)
     
     filename = f"Income_Expenditure_{from_date}_to_{to_date}.pdf"
     return StreamingResponse(
@@ -3165,8 +2582,8 @@ async def export_balance_sheet_excel(
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="No permission")
         
     report_data = await balance_sheet_report(as_on_date, current_user, db)
-    society_info = await get_society_info(current_user.society_id, db)
-    excel_file = ExcelExporter.create_balance_sheet_excel(report_data, society_info)
+    society_info = await get_society_info(current_user.society_id, db, include_logo=True)
+    excel_file = await render_document(ExcelExporter.create_balance_sheet_excel, report_data, society_info)
     
     filename = f"Balance_Sheet_{as_on_date}.xlsx"
     return StreamingResponse(
@@ -3189,7 +2606,7 @@ async def export_balance_sheet_pdf(
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="No permission")
         
     report_data = await balance_sheet_report(as_on_date, current_user, db)
-    society_info = await get_society_info(current_user.society_id, db)
+    society_info = await get_society_info(current_user.society_id, db, include_logo=True)
     # Convert Pydantic model to dict for PDF export if needed
     if hasattr(report_data, 'model_dump'):
         report_dict = report_data.model_dump()
@@ -3197,7 +2614,7 @@ async def export_balance_sheet_pdf(
         report_dict = report_data.dict()
     else:
         report_dict = report_data
-    pdf_file = PDFExporter.create_balance_sheet_pdf(report_dict, society_info)
+    pdf_file = await render_document(PDFExporter.create_balance_sheet_pdf, report_dict, society_info)
     
     filename = f"Balance_Sheet_{as_on_date}.pdf"
     return StreamingResponse(
@@ -3210,6 +2627,8 @@ async def member_ledger_report(
     flat_id: Optional[int] = Query(None, description="Filter by Flat ID"),
     from_date: Optional[date] = Query(None, description="Start Date"),
     to_date: Optional[date] = Query(None, description="End Date"),
+    page: Optional[int] = Query(None, ge=1, description="Page number (omit for the whole period)"),
+    page_size: int = Query(50, ge=1, le=500, description="Entries per page when paging"),
     current_user: UserResponse = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
@@ -3227,129 +2646,291 @@ async def member_ledger_report(
     if not flat:
         raise HTTPException(status_code=404, detail="Flat not found")
 
-    # 1. Opening Balance (Sum of all bills - payments before from_date)
-    opening_balance = 0.0
-    if from_date:
-        # Bills before from_date
-        bill_res = await db.execute(
-            select(func.sum(MaintenanceBillDB.total_amount)).where(
-                and_(
-                    MaintenanceBillDB.flat_id == flat_id,
-                    MaintenanceBillDB.created_at < datetime.combine(from_date, datetime.min.time())
-                )
-            )
-        )
-        total_billed_prev = bill_res.scalar() or 0.0
-
-        # Payments before from_date (linked to bills of this flat)
-        # Note: Need Payment model import
-        from app.models_db import Payment
-        pay_res = await db.execute(
-            select(func.sum(Payment.amount)).where(
-                and_(
-                    Payment.flat_id == flat_id,
-                    Payment.payment_date < from_date
-                )
-            )
-        )
-        total_paid_prev = pay_res.scalar() or 0.0
-        opening_balance = total_billed_prev - total_paid_prev
-
-    # 2. Transactions during period
-    ledger_entries = []
-    
-    # Get Bills
-    bills_query = select(MaintenanceBillDB).where(
-        and_(
-            MaintenanceBillDB.flat_id == flat_id,
-            MaintenanceBillDB.society_id == current_user.society_id
-        )
-    )
-    if from_date:
-        bills_query = bills_query.where(MaintenanceBillDB.created_at >= datetime.combine(from_date, datetime.min.time()))
-    if to_date:
-        bills_query = bills_query.where(MaintenanceBillDB.created_at <= datetime.combine(to_date, datetime.max.time()))
-    
-    bills_result = await db.execute(bills_query)
-    bills = bills_result.scalars().all()
-
-    for bill in bills:
-        ledger_entries.append({
-            "date": bill.created_at.date(),
-            "description": f"Bill #{bill.bill_number} - {calendar.month_name[bill.month]} {bill.year}",
-            "type": "DEBIT",
-            "amount": bill.total_amount,
-            "ref_id": bill.id
-        })
-
-    # Get Payments
-    from app.models_db import Payment
-    pay_query = select(Payment).where(
-        and_(
-            Payment.flat_id == flat_id,
-            Payment.society_id == current_user.society_id
-        )
+    # Running balances come from a window function over bills and receipts;
+    # the opening balance of the period (or page) comes from the same query
+    ledger = await get_member_ledger(
+        db, current_user.society_id, flat_id, from_date, to_date, page, page_size if page else None
     )
-    if from_date:
-        pay_query = pay_query.where(Payment.payment_date >= from_date)
-    if to_date:
-        pay_query = pay_query.where(Payment.payment_date <= to_date)
-        
-    pay_result = await db.execute(pay_query)
-    payments = pay_result.scalars().all()
-
-    for pay in payments:
-        ledger_entries.append({
-            "date": pay.payment_date,
-            "description": f"Receipt #{pay.receipt_number} ({pay.payment_mode})",
-            "type": "CREDIT",
-            "amount": pay.amount,
-            "ref_id": pay.id
-        })
 
-    # Sort entries by date
-    ledger_entries.sort(key=lambda x: x['date'])
-
-    # Calculate running balance
-    running_balance = opening_balance
-    final_entries = []
-    
-    # Add opening balance row
-    if from_date:
-        final_entries.append({
+    entries = [
+        {key: entry[key] for key in ("date", "description", "type", "debit", "credit", "balance")}
+        for entry in ledger["entries"]
+    ]
+    # Opening balance row heads the first page
+    if from_date and (page or 1) == 1:
+        entries.insert(0, {
             "date": from_date,
             "description": "Opening Balance",
             "type": "OB",
             "debit": 0,
             "credit": 0,
-            "balance": opening_balance
-        })
-
-    total_debit = 0
-    total_credit = 0
-
-    for entry in ledger_entries:
-        debit = entry['amount'] if entry['type'] == 'DEBIT' else 0
-        credit = entry['amount'] if entry['type'] == 'CREDIT' else 0
-        running_balance += (debit - credit)
-        
-        total_debit += debit
-        total_credit += credit
-
-        final_entries.append({
-            "date": entry['date'],
-            "description": entry['description'],
-            "type": entry['type'],
-            "debit": debit,
-            "credit": credit,
-            "balance": running_balance
+            "balance": ledger["opening_balance"]
         })
 
     return {
         "flat_number": flat.flat_number,
-        "opening_balance": opening_balance,
-        "entries": final_entries,
-        "closing_balance": running_balance,
-        "total_debit": total_debit,
-        "total_credit": total_credit
+        "opening_balance": ledger["opening_balance"],
+        "entries": entries,
+        "closing_balance": ledger["closing_balance"],
+        "total_debit": ledger["total_debit"],
+        "total_credit": ledger["total_credit"],
+        "pagination": ledger["pagination"]
+    }
+
+
+# ============= REPORT JOBS =============
+# Long exports (multi-year General Ledger PDFs, every member's ledger, year-end
+# statements) run as background jobs so they are not cut off by the hosting
+# platform's request timeout. A job calls the export endpoint function below
+# with the submitted parameters and persists the file for download.
+
+async def export_all_member_ledgers(
+    output_format: str,
+    from_date: Optional[date],
+    to_date: Optional[date],
+    current_user: UserResponse,
+    db: AsyncSession,
+    progress=None
+):
+    """
+    Export the ledger of every flat in the society as one document (job only).
+    progress(done, total) is awaited after each flat.
+    """
+    flats = (await db.execute(
+        select(Flat).where(Flat.society_id == current_user.society_id).order_by(Flat.flat_number)
+    )).scalars().all()
+    if not flats:
+        raise HTTPException(status_code=404, detail="No flats found in this society")
+
+    transactions = []
+    for index, flat in enumerate(flats, 1):
+        ledger = await get_member_ledger(db, current_user.society_id, flat.id, from_date, to_date)
+        if from_date:
+            transactions.append({
+                "flat": flat.flat_number,
+                "date": from_date,
+                "description": "Opening Balance",
+                "debit": 0,
+                "credit": 0,
+                "balance": ledger["opening_balance"],
+                "status": ""
+            })
+        for entry in ledger["entries"]:
+            transactions.append({"flat": flat.flat_number, **entry})
+        if progress:
+            await progress(index, len(flats))
+
+    society_info = await get_society_info(current_user.society_id, db, include_logo=True)
+    export_data = {
+        "from_date": str(from_date) if from_date else "All Time",
+        "to_date": str(to_date) if to_date else "All Time",
+        "transactions": transactions
     }
+    columns = ["Flat", "Date", "Description", "Debit", "Credit", "Balance", "Status"]
+
+    if output_format == "pdf":
+        document = await render_document(
+            PDFExporter.create_simple_report_pdf, export_data, society_info, "Member Ledgers", columns, "transactions"
+        )
+        media_type, extension = "application/pdf", "pdf"
+    else:
+        document = await render_document(
+            ExcelExporter.create_simple_report_excel, export_data, society_info, "Member Ledgers", columns, "transactions"
+        )
+        media_type, extension = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", "xlsx"
+
+    period = f"_{from_date or 'start'}_to_{to_date or date.today()}" if from_date or to_date else ""
+    filename = f"Member_Ledgers{period}.{extension}"
+    return StreamingResponse(
+        document,
+        media_type=media_type,
+        headers={"Content-Disposition": f"attachment; filename={filename}"}
+    )
+
+
+# (report, format) -> (export function, required parameters, optional parameters)
+REPORT_JOB_EXPORTS = {
+    ("general-ledger", "excel"): (export_general_ledger_excel, ("from_date", "to_date"), ()),
+    ("general-ledger", "csv"): (export_general_ledger_csv, ("from_date", "to_date"), ()),
+    ("general-ledger", "pdf"): (export_general_ledger_pdf, ("from_date", "to_date"), ()),
+    ("receipts-and-payments", "excel"): (export_receipts_payments_excel, ("from_date", "to_date"), ()),
+    ("receipts-and-payments", "pdf"): (export_receipts_payments_pdf, ("from_date", "to_date"), ()),
+    ("income-and-expenditure", "excel"): (export_income_expenditure_excel, ("from_date", "to_date"), ()),
+    ("income-and-expenditure", "pdf"): (export_income_expenditure_pdf, ("from_date", "to_date"), ()),
+    ("balance-sheet", "excel"): (export_balance_sheet_excel, ("as_on_date",), ()),
+    ("balance-sheet", "pdf"): (export_balance_sheet_pdf, ("as_on_date",), ()),
+    ("trial-balance", "excel"): (export_trial_balance_excel, ("as_on_date",), ()),
+    ("trial-balance", "pdf"): (export_trial_balance_pdf, ("as_on_date",), ()),
+    ("cash-book", "excel"): (export_cash_book_excel, ("from_date", "to_date"), ()),
+    ("cash-book", "pdf"): (export_cash_book_pdf, ("from_date", "to_date"), ()),
+    ("bank-ledger", "excel"): (export_bank_ledger_excel, ("from_date", "to_date"), ("account_code",)),
+    ("bank-ledger", "pdf"): (export_bank_ledger_pdf, ("from_date", "to_date"), ("account_code",)),
+    ("member-ledger", "excel"): (export_member_ledger_excel, ("flat_id",), ("from_date", "to_date")),
+    ("member-ledger", "pdf"): (export_member_ledger_pdf, ("flat_id",), ("from_date", "to_date")),
+}
+MEMBER_LEDGERS_JOB_FORMATS = ("excel", "pdf")
+
+
+def _report_job_runner(request: ReportJobRequest, current_user: UserResponse):
+    """Validate a job request; returns (JSON-safe parameters, runner(db, progress))"""
+    if request.report == "member-ledgers":
+        if request.format not in MEMBER_LEDGERS_JOB_FORMATS:
+            raise HTTPException(status_code=400, detail="Member ledgers can be exported as excel or pdf")
+        params = {"from_date": request.from_date, "to_date": request.to_date}
+
+        async def run_member_ledgers(db: AsyncSession, progress):
+            return await export_all_member_ledgers(
+                request.format, request.from_date, request.to_date, current_user, db, progress
+            )
+        return jsonable_encoder(params), run_member_ledgers
+
+    export = REPORT_JOB_EXPORTS.get((request.report, request.format))
+    if export is None:
+        raise HTTPException(status_code=400, detail=f"{request.report} cannot be exported as {request.format}")
+    export_function, required, optional = export
+    missing = [name for name in required if getattr(request, name) is None]
+    if missing:
+        raise HTTPException(status_code=400, detail=f"{request.report} requires {', '.join(missing)}")
+    if request.from_date and request.to_date and request.from_date > request.to_date:
+        raise HTTPException(status_code=400, detail="from_date must be on or before to_date")
+
+    # Every parameter is passed explicitly: the endpoints' Query() defaults only resolve inside a request
+    params = {name: getattr(request, name) for name in required + optional}
+    if "flat_id" in params:
+        params["flat_id"] = str(params["flat_id"])
+
+    async def run_export(db: AsyncSession, progress):
+        return await export_function(**params, current_user=current_user, db=db)
+    return jsonable_encoder(params), run_export
+
+
+async def _require_reports_permission(current_user: UserResponse, db: AsyncSession, detail: str):
+    """403 unless the user holds reports.view; every report job endpoint is gated like POST /jobs"""
+    has_permission = await check_permission(
+        user_id=int(current_user.id),
+        permission_code="reports.view",
+        db=db
+    )
+    if not has_permission:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=detail)
+
+
+def _is_report_admin(current_user: UserResponse) -> bool:
+    return current_user.role in [UserRole.ADMIN, UserRole.SUPER_ADMIN]
+
+
+def _report_job_or_404(job_id: str, current_user: UserResponse):
+    """The job, if it belongs to the caller's society and the caller requested it or is an admin"""
+    job = report_jobs.get(job_id, current_user.society_id)
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Report job not found or expired"
+        )
+    if job.requested_by != int(current_user.id) and not _is_report_admin(current_user):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only the requester or an admin can access this report job."
+        )
+    return job
+
+
+@router.post("/jobs", response_model=ReportJobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def create_report_job(
+    request: ReportJobRequest,
+    current_user: UserResponse = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Export a report in the background.
+    Poll GET /jobs/{job_id} (or stream GET /jobs/{job_id}/events) for progress and
+    download the file from GET /jobs/{job_id}/download once the job completes.
+    An identical job that is still running is returned instead of starting a new one.
+    """
+    await _require_reports_permission(current_user, db, "You do not have permission to export reports.")
+
+    params, runner = _report_job_runner(request, current_user)
+    job = report_jobs.submit(
+        society_id=current_user.society_id,
+        requested_by=int(current_user.id),
+        report=request.report,
+        output_format=request.format,
+        params=params,
+        runner=runner
+    )
+    return ReportJobResponse(**job.to_dict())
+
+
+@router.get("/jobs", response_model=List[ReportJobResponse])
+async def list_report_jobs(
+    current_user: UserResponse = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """The caller's report jobs held by this server (every job of the society for admins), newest first"""
+    await _require_reports_permission(current_user, db, "You do not have permission to view reports.")
+    requested_by = None if _is_report_admin(current_user) else int(current_user.id)
+    jobs = report_jobs.list(current_user.society_id, requested_by)
+    return [ReportJobResponse(**job.to_dict()) for job in reversed(jobs)]
+
+
+@router.get("/jobs/{job_id}", response_model=ReportJobResponse)
+async def get_report_job(
+    job_id: str,
+    current_user: UserResponse = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Progress of a report job"""
+    await _require_reports_permission(current_user, db, "You do not have permission to view reports.")
+    job = _report_job_or_404(job_id, current_user)
+    return ReportJobResponse(**job.to_dict())
+
+
+@router.get("/jobs/{job_id}/events")
+async def stream_report_job_events(
+    job_id: str,
+    current_user: UserResponse = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Progress of a report job as server-sent events, until the job finishes"""
+    await _require_reports_permission(current_user, db, "You do not have permission to view reports.")
+    job = _report_job_or_404(job_id, current_user)
+    return StreamingResponse(
+        report_jobs.events(job),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.get("/jobs/{job_id}/download")
+async def download_report_job(
+    job_id: str,
+    current_user: UserResponse = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Download the file of a completed report job"""
+    await _require_reports_permission(current_user, db, "You do not have permission to download reports.")
+    job = _report_job_or_404(job_id, current_user)
+    if job.status == "failed":
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Report job failed: {job.error}"
+        )
+    if job.status != "completed":
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Report is still being generated",
+            headers={"Retry-After": "2"}
+        )
+    return FileResponse(report_jobs.result_path(job), media_type=job.media_type, filename=job.filename)
+
+
+@router.delete("/jobs/{job_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_report_job(
+    job_id: str,
+    current_user: UserResponse = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Cancel a running report job or delete a completed report"""
+    await _require_reports_permission(current_user, db, "You do not have permission to manage report jobs.")
+    job = _report_job_or_404(job_id, current_user)
+    await report_jobs.delete(job)
@@ -12,7 +12,7 @@ from app.models_db import (
     User, Society
 )
 from app.dependencies import get_current_admin_user
-from app.utils.permissions import SYSTEM_PERMISSIONS, initialize_permissions
+from app.utils.permissions import SYSTEM_PERMISSIONS, initialize_permissions, permission_cache
 from app.utils.audit import log_action
 
 router = APIRouter()
@@ -309,6 +309,7 @@ async def update_role(
     
     role.updated_at = datetime.utcnow()
     await db.commit()
+    permission_cache.invalidate_role(role_id)
     await db.refresh(role)
     
     return {
@@ -369,6 +370,7 @@ async def delete_role(
     
     await db.delete(role)
     await db.commit()
+    permission_cache.invalidate_role(role_id)
     
     return {"message": "Role deleted successfully"}
 
@@ -399,6 +401,7 @@ async def toggle_role_status(
     role.is_active = not role.is_active
     role.updated_at = datetime.utcnow()
     await db.commit()
+    permission_cache.invalidate_role(role_id)
     await db.refresh(role)
     
     return {
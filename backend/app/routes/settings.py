@@ -11,6 +11,7 @@ from app.models.settings import SocietySettingsCreate, SocietySettingsResponse
 from app.models.user import UserResponse
 from app.models_db import SocietySettings, Society
 from app.dependencies import get_current_admin_user, get_optional_current_user
+from app.services.society_context_cache import society_context
 
 router = APIRouter()
 
@@ -269,6 +270,7 @@ async def create_or_update_society_settings_impl(
             if settings_dict.get('gst_registration_applicable') is not None:
                 society.gst_registration_applicable = settings_dict['gst_registration_applicable']
             await db.commit()
+            society_context.invalidate(current_user.society_id)
             await db.refresh(society)
             
     # Auto-generate Flats based on blocks_config
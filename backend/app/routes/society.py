@@ -14,6 +14,7 @@ from app.models_db import Society, User, UserRole, SocietySettings
 from app.utils.security import get_password_hash, create_access_token
 from app.database import get_db
 from app.dependencies import get_current_user, get_current_admin_user
+from app.services.society_context_cache import society_context
 
 UPLOAD_DIR_SOCIETY = "uploads/society"
 ALLOW_EXTENSIONS_SOCIETY = {".pdf", ".jpg", ".jpeg", ".png", ".docx"}
@@ -257,6 +258,7 @@ async def update_society_settings(
     
     society.updated_at = datetime.utcnow()
     await db.commit()
+    society_context.invalidate(current_user.society_id)
     await db.refresh(society)
     
     return SocietyResponse(
@@ -374,6 +376,8 @@ async def upload_society_logo(
         # Store the file path as logo_url
         society.logo_url = file_path.replace("\\", "/")
         await db.commit()
+        # The file name is reused per society, so the cached logo bytes go even if logo_url is unchanged
+        society_context.invalidate(current_user.society_id)
 
     # 6. Return the URL/Path
     return {
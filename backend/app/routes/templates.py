@@ -24,7 +24,11 @@ from app.models_db import (
     Flat
 )
 from app.dependencies import get_current_user, get_current_admin_user
-from app.services.pdf_generator import pdf_generator
+from app.services.pdf_generator import (
+    generate_document as render_template_document,
+    html_to_pdf as render_html_document
+)
+from app.services.render_executor import render_document
 
 router = APIRouter(prefix="/api/templates", tags=["templates"])
 
@@ -266,7 +270,7 @@ async def download_blank_template(
     
     # Generate PDF with placeholders still there and header
     # (Member will fill manually)
-    pdf_bytes = pdf_generator.html_to_pdf(html_content, header_data)
+    pdf_bytes = await render_document(render_html_document, html_content, header_data)
     
     # Log usage (optional - statistics only)
     await log_template_usage(
@@ -396,7 +400,8 @@ async def generate_document(
     }
     
     # Generate PDF (in memory!) with header
-    pdf_bytes = pdf_generator.generate_document(
+    pdf_bytes = await render_document(
+        render_template_document,
         template.template_html,
         complete_data,
         header_data
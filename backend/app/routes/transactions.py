@@ -41,9 +41,12 @@ from app.utils.document_numbering import (
     generate_payment_voucher_number
 )
 from app.utils.permissions import check_permission
+from app.utils.lazy_import import lazy_attribute
 from fastapi import Request
 from fastapi.responses import StreamingResponse
-from app.utils.export_utils import PDFExporter
+from app.services.render_executor import render_document
+
+PDFExporter = lazy_attribute("app.utils.export_utils", "PDFExporter")  # reportlab loads on the first voucher PDF
 
 router = APIRouter()
 
@@ -1177,7 +1180,9 @@ async def get_voucher_pdf(
     
     # 5. Generate PDF using the utility function
     try:
-        pdf_buffer = PDFExporter.create_voucher_pdf(voucher_data, society_info)
+        pdf_buffer = await render_document(PDFExporter.create_voucher_pdf, voucher_data, society_info)
+    except HTTPException:
+        raise  # Render pool busy / timed out
     except Exception as e:
         import traceback
         with open("pdf_error.log", "a") as f:
@@ -12,6 +12,7 @@ from app.models_db import (
 )
 from app.dependencies import get_current_admin_user
 from app.utils.audit import log_action
+from app.utils.permissions import permission_cache
 
 router = APIRouter()
 
@@ -89,6 +90,7 @@ async def assign_role_to_user(
     )
     db.add(assignment)
     await db.commit()
+    permission_cache.invalidate_user(user_id)
     await db.refresh(assignment)
     
     # Log action with warning if auditor role
@@ -176,6 +178,7 @@ async def remove_role_from_user(
     # Deactivate assignment (soft delete)
     assignment.is_active = False
     await db.commit()
+    permission_cache.invalidate_user(user_id)
     
     # Log action
     await log_action(
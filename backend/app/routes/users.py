@@ -8,7 +8,8 @@ from sqlalchemy import select, func, delete
 from app.database import get_db
 from app.models.user import UserResponse, UserRole
 from app.models_db import User
-from app.dependencies import get_current_user, get_current_admin_user
+from app.dependencies import get_current_user, get_current_admin_user, principal_cache
+from app.utils.permissions import permission_cache
 
 router = APIRouter()
 
@@ -130,6 +131,8 @@ async def update_user_role(
     user.role = new_role
     user.updated_at = datetime.utcnow()
     await db.commit()
+    permission_cache.invalidate_user(user_id_int)
+    principal_cache.invalidate_user(user_id_int)
     await db.refresh(user)
 
     return UserResponse(
@@ -173,6 +176,8 @@ async def delete_user(
         )
     )
     await db.commit()
+    permission_cache.invalidate_user(user_id_int)
+    principal_cache.invalidate_user(user_id_int)
 
     if result.rowcount == 0:
         raise HTTPException(
@@ -67,7 +67,7 @@ class YearEndClosingRequest(BaseModel):
 
 class YearEndClosingSummary(BaseModel):
     """Schema for year-end closing summary"""
-    financial_year_id: UUID
+    financial_year_id: int
     year_name: str
     closing_date: datetime
     bank_balance: float
@@ -78,6 +78,10 @@ class YearEndClosingSummary(BaseModel):
     opening_balances_created: bool
     next_year_activated: bool
     message: str
+    accounts_closed: int = 0
+    opening_balances_inserted: int = 0
+    opening_balances_updated: int = 0
+    timings_ms: Dict[str, float] = {}
 
 
 class ProvisionalClosingRequest(BaseModel):
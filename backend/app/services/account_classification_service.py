@@ -0,0 +1,191 @@
+"""
+Account classification service
+Derives the report classification stored on `account_codes`:
+
+- liquidity_class: 'cash' or 'bank' for the heads that make up the cash book,
+  bank ledger and Receipts & Payments account, NULL for everything else
+- balance_sheet_group: the Balance Sheet section an account is shown under
+  (capital_funds, current_liabilities, fixed_assets, investments,
+  current_assets), NULL for income and expense heads
+- schedule: the heading of that section, or of the Income & Expenditure side
+
+Reports filter on these columns with equality predicates instead of matching
+code prefixes and account names on every request. Mapper hooks classify an
+account when it is created and reclassify it whenever its code, name or type
+is edited. Core inserts bypass the mapper, so bulk loaders must call
+classify_accounts() afterwards.
+"""
+from typing import NamedTuple, Optional
+
+from sqlalchemy import event, select, update, bindparam, inspect as sa_inspect
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models_db import AccountCode, AccountType
+
+LIQUIDITY_CASH = "cash"
+LIQUIDITY_BANK = "bank"
+LIQUIDITY_CLASSES = (LIQUIDITY_CASH, LIQUIDITY_BANK)
+
+CAPITAL_FUNDS = "capital_funds"
+CURRENT_LIABILITIES = "current_liabilities"
+FIXED_ASSETS = "fixed_assets"
+INVESTMENTS = "investments"
+CURRENT_ASSETS = "current_assets"
+
+SCHEDULES = {
+    CAPITAL_FUNDS: "Liabilities A - Capital & Funds",
+    CURRENT_LIABILITIES: "Liabilities B - Current Liabilities & Provisions",
+    FIXED_ASSETS: "Assets A - Fixed Assets",
+    INVESTMENTS: "Assets B - Investments",
+    CURRENT_ASSETS: "Assets C - Current Assets",
+}
+INCOME_SCHEDULE = "Income"
+EXPENDITURE_SCHEDULE = "Expenditure"
+
+# Standard chart: 1000-1069 are cash in hand, petty cash and bank accounts
+LIQUID_CODE_PREFIXES = ("100", "101", "102", "103", "104", "105", "106")
+PETTY_CASH_PREFIX = "1010"
+FIXED_ASSET_KEYWORDS = (
+    "building", "lift", "generator", "electrical", "equipment", "furniture", "fixture", "depreciation"
+)
+
+CLASSIFIED_FIELDS = ("code", "name", "type")
+
+
+class AccountClassification(NamedTuple):
+    liquidity_class: Optional[str]
+    balance_sheet_group: Optional[str]
+    schedule: Optional[str]
+
+
+def _account_type(value) -> Optional[AccountType]:
+    if value is None or isinstance(value, AccountType):
+        return value
+    try:
+        return AccountType(str(value).lower())
+    except ValueError:
+        return None
+
+
+def classify_account(code: Optional[str], name: Optional[str], account_type) -> AccountClassification:
+    """
+    Classify one account head from its code, name and type.
+
+    Liquid accounts are asset heads in the standard 1000-1069 range; charts
+    that do not use the standard 1xxx asset codes fall back to 'cash'/'bank'
+    in the account name. A liquid head is 'cash' when it is petty cash or
+    named as cash, otherwise 'bank'.
+    """
+    code = (code or "").strip()
+    name_lower = (name or "").lower()
+    account_type = _account_type(account_type)
+
+    liquidity_class = None
+    if account_type == AccountType.ASSET:
+        standard_chart = code.isdigit() and code.startswith("1")
+        if code.startswith(LIQUID_CODE_PREFIXES) or (
+            not standard_chart and ("cash" in name_lower or "bank" in name_lower)
+        ):
+            is_cash = code.startswith(PETTY_CASH_PREFIX) or ("cash" in name_lower and "bank" not in name_lower)
+            liquidity_class = LIQUIDITY_CASH if is_cash else LIQUIDITY_BANK
+
+    if account_type == AccountType.CAPITAL:
+        group = CAPITAL_FUNDS
+    elif account_type == AccountType.LIABILITY:
+        group = CURRENT_LIABILITIES
+    elif account_type == AccountType.ASSET:
+        if any(keyword in name_lower for keyword in FIXED_ASSET_KEYWORDS):
+            group = FIXED_ASSETS
+        elif "fixed deposit" in name_lower or "fd" in name_lower:
+            group = INVESTMENTS
+        else:
+            group = CURRENT_ASSETS
+    else:
+        group = None
+
+    if group:
+        schedule = SCHEDULES[group]
+    elif account_type == AccountType.INCOME:
+        schedule = INCOME_SCHEDULE
+    elif account_type == AccountType.EXPENSE:
+        schedule = EXPENDITURE_SCHEDULE
+    else:
+        schedule = None
+    return AccountClassification(liquidity_class, group, schedule)
+
+
+def apply_classification(account: AccountCode) -> None:
+    """Set the classification columns of an AccountCode instance"""
+    classification = classify_account(account.code, account.name, account.type)
+    account.liquidity_class = classification.liquidity_class
+    account.balance_sheet_group = classification.balance_sheet_group
+    account.schedule = classification.schedule
+
+
+@event.listens_for(AccountCode, "before_insert")
+def _classify_new_account(mapper, connection, target: AccountCode) -> None:
+    apply_classification(target)
+
+
+@event.listens_for(AccountCode, "before_update")
+def _reclassify_edited_account(mapper, connection, target: AccountCode) -> None:
+    state = sa_inspect(target)
+    if any(state.attrs[field].history.has_changes() for field in CLASSIFIED_FIELDS):
+        apply_classification(target)
+
+
+class AccountClassificationService:
+    """Service for (re)classifying account heads in bulk."""
+
+    @staticmethod
+    async def classify_accounts(db: AsyncSession, society_id: Optional[int] = None, only_missing: bool = False) -> int:
+        """
+        Recompute the classification columns from code, name and type.
+
+        Args:
+            db: Database session (caller commits)
+            society_id: Classify a single society, or all societies when None
+            only_missing: Only touch accounts that have never been classified
+
+        Returns:
+            Number of accounts whose classification changed
+        """
+        table = AccountCode.__table__
+        query = select(
+            table.c.id, table.c.code, table.c.name, table.c.type,
+            table.c.liquidity_class, table.c.balance_sheet_group, table.c.schedule
+        )
+        if society_id is not None:
+            query = query.where(table.c.society_id == society_id)
+        if only_missing:
+            query = query.where(table.c.schedule.is_(None))
+
+        changed = []
+        for row in (await db.execute(query)).all():
+            classification = classify_account(row.code, row.name, row.type)
+            if classification != (row.liquidity_class, row.balance_sheet_group, row.schedule):
+                changed.append({
+                    "account_id": row.id,
+                    "new_liquidity_class": classification.liquidity_class,
+                    "new_balance_sheet_group": classification.balance_sheet_group,
+                    "new_schedule": classification.schedule,
+                })
+        if changed:
+            await db.execute(
+                update(table)
+                .where(table.c.id == bindparam("account_id"))
+                .values(
+                    liquidity_class=bindparam("new_liquidity_class"),
+                    balance_sheet_group=bindparam("new_balance_sheet_group"),
+                    schedule=bindparam("new_schedule"),
+                ),
+                changed
+            )
+        return len(changed)
+
+
+# Create service instance
+account_classification_service = AccountClassificationService()
+
+# Export functions for backward compatibility
+classify_accounts = account_classification_service.classify_accounts
@@ -0,0 +1,125 @@
+"""
+Balance sheet service
+Builds the Balance Sheet sections from one grouped pass over the chart of
+accounts instead of one transaction scan per account head: opening balances
+and period movements come from get_account_balances() (chart LEFT JOIN
+opening balances LEFT JOIN per-account daily snapshot totals), each account
+lands in its persisted balance_sheet_group, and the Income & Expenditure
+surplus is summed from the income and expense rows of the same result.
+"""
+from datetime import date
+from decimal import Decimal
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.services.account_classification_service import (
+    CAPITAL_FUNDS, CURRENT_LIABILITIES, FIXED_ASSETS, INVESTMENTS, CURRENT_ASSETS
+)
+from app.services.trial_balance_service import get_account_balances
+
+ZERO = Decimal("0.00")
+CENT = Decimal("0.01")
+
+BALANCE_SHEET_SECTIONS = (CAPITAL_FUNDS, CURRENT_LIABILITIES, FIXED_ASSETS, INVESTMENTS, CURRENT_ASSETS)
+SURPLUS_ACCOUNT_CODE = "9999"
+
+
+def _account_type_value(account_type) -> str:
+    return getattr(account_type, "value", account_type)
+
+
+def _section_total(items: List[Dict[str, Any]]) -> Decimal:
+    return sum((Decimal(str(item["balance"])) for item in items), ZERO)
+
+
+def _add_surplus(capital_funds: List[Dict[str, Any]], surplus_deficit: Decimal) -> None:
+    """Carry the I&E result into a retained surplus head, or show it as its own line"""
+    if abs(surplus_deficit) < CENT:
+        return
+    for item in capital_funds:
+        name_lower = item["name"].lower()
+        if "retained" in name_lower or "surplus" in name_lower:
+            item["balance"] += float(surplus_deficit.quantize(CENT))
+            return
+    capital_funds.append({
+        "code": SURPLUS_ACCOUNT_CODE,
+        "name": "Surplus/Deficit (Excess of Income over Expenditure)" if surplus_deficit >= 0 else "Deficit (Excess of Expenditure over Income)",
+        "balance": float(abs(surplus_deficit).quantize(CENT))
+    })
+
+
+class BalanceSheetService:
+    """Service for computing Balance Sheet sections and totals."""
+
+    @staticmethod
+    async def compute_sections(
+        db: AsyncSession,
+        society_id: int,
+        financial_year_id: Optional[int],
+        fy_start_date: date,
+        effective_date: date
+    ) -> Dict[str, Any]:
+        """
+        Balance Sheet sections, section totals and the I&E surplus/deficit.
+
+        Args:
+            db: Database session
+            society_id: Society ID for filtering
+            financial_year_id: Financial year whose opening balances apply
+            fy_start_date: Financial year start date
+            effective_date: Last date included (as_on_date capped at FY end)
+
+        Returns:
+            Dict with 'sections' ({section: [{code, name, balance}]} in code
+            order), 'totals' ({section: Decimal}) and 'surplus_deficit'
+        """
+        rows = await get_account_balances(db, society_id, financial_year_id, fy_start_date, effective_date)
+
+        sections: Dict[str, List[Dict[str, Any]]] = {section: [] for section in BALANCE_SHEET_SECTIONS}
+        total_income = ZERO
+        total_expenses = ZERO
+
+        for row in rows:
+            account = row["account"]
+            account_type = _account_type_value(account.type)
+
+            if account_type in ("income", "expense"):
+                # Income and expense heads only feed the surplus; their opening
+                # balance counts only when recorded for the financial year
+                movement = row["debit_total"] - row["credit_total"]
+                if row["opening_recorded"]:
+                    movement += row["opening"]
+                if account_type == "income":
+                    total_income -= movement
+                else:
+                    total_expenses += movement
+                continue
+
+            items = sections.get(account.balance_sheet_group)
+            if items is None:
+                continue
+            balance = row["balance"]
+            if account_type == "asset":
+                # Assets: positive (debit) balance = asset
+                if balance > CENT:
+                    items.append({"code": account.code, "name": account.name, "balance": float(balance.quantize(CENT))})
+            elif balance < -CENT:
+                # Liabilities/Capital: negative (credit) balance = liability/capital
+                items.append({"code": account.code, "name": account.name, "balance": float(abs(balance).quantize(CENT))})
+
+        surplus_deficit = total_income - total_expenses
+        _add_surplus(sections[CAPITAL_FUNDS], surplus_deficit)
+
+        return {
+            "sections": sections,
+            "totals": {section: _section_total(items) for section, items in sections.items()},
+            "surplus_deficit": surplus_deficit,
+        }
+
+
+# Create service instance
+balance_sheet_service = BalanceSheetService()
+
+# Export functions for backward compatibility
+compute_balance_sheet_sections = balance_sheet_service.compute_sections
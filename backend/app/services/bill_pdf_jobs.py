@@ -0,0 +1,368 @@
+"""
+Bulk bill PDF job service
+Renders every maintenance bill of a (month, year) into one ZIP (one PDF per
+flat) or one merged PDF, as a background job.
+
+- Society, flats, bills and payment modes are loaded once (4 queries) and the society header
+  is shipped to render workers once per batch instead of per bill.
+- ZIP jobs split the bills into batches rendered concurrently on the render
+  process pool; each finished batch is appended to the archive immediately,
+  so a download started while the job is running streams the ZIP as it is
+  built. If a batch fails the archive is left unterminated and the download
+  is aborted, so a client never receives a valid ZIP that lacks bills; a
+  saturated render pool (503) is retried RENDER_BUSY_RETRIES times first.
+- Merged PDF jobs render in a single worker call (reportlab cannot append to
+  a document built in another process) and become downloadable when done.
+
+Jobs live in memory on the API worker that created them and expire after
+BILL_PDF_JOB_TTL_SECONDS.
+"""
+import asyncio
+import calendar
+import logging
+import time
+import uuid
+import zipfile
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional
+
+from fastapi import HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import database
+from app.config import settings
+from app.models_db import Flat, MaintenanceBill, Society, BillStatus, Payment, PaymentStatus
+from app.services.render_executor import render_executor, render_document
+from app.services.report_jobs import RENDER_BUSY_RETRIES
+
+logger = logging.getLogger(__name__)
+
+JOB_FORMATS = ("zip", "pdf")
+
+
+def build_bill_pdf_data(bill: MaintenanceBill, member_name: Optional[str], payment_method: Optional[str] = None) -> Dict[str, Any]:
+    """Bill fields used by create_maintenance_bill_pdf"""
+    return {
+        'bill_number': bill.bill_number or f"BILL-{bill.year}-{bill.month:02d}-{bill.flat_id}",
+        'flat_number': bill.flat_number or "N/A",
+        'member_name': member_name or "N/A",
+        'month': bill.month,
+        'year': bill.year,
+        'amount': bill.total_amount,
+        'breakdown': bill.breakdown or {},
+        'status': bill.status.value if hasattr(bill.status, 'value') else str(bill.status),
+        'is_posted': bill.is_posted,
+        'created_at': bill.created_at.isoformat(),
+        'paid_at': bill.paid_date.isoformat() if bill.paid_date else None,
+        'payment_method': payment_method
+    }
+
+
+async def get_bill_payment_methods(db: AsyncSession, bill_ids: Iterable[int]) -> Dict[int, str]:
+    """Payment mode of the latest completed payment per bill (bills keep no payment method themselves)"""
+    bill_ids = list(bill_ids)
+    if not bill_ids:
+        return {}
+    result = await db.execute(
+        select(Payment.bill_id, Payment.payment_mode).where(
+            Payment.bill_id.in_(bill_ids),
+            Payment.status == PaymentStatus.COMPLETED
+        ).order_by(Payment.bill_id, Payment.payment_date, Payment.id)
+    )
+    # Later payments overwrite earlier ones
+    return {bill_id: mode.value if hasattr(mode, 'value') else str(mode) for bill_id, mode in result.all()}
+
+
+def build_bill_society_info(society: Society) -> Dict[str, Any]:
+    """Society header used on every bill PDF"""
+    return {
+        'name': society.name,
+        'address': society.address or "No address provided",
+        'logo_url': None  # Can be added later
+    }
+
+
+def bill_pdf_filename(flat_number: str, month: int, year: int) -> str:
+    return f"Maintenance_Bill_{flat_number}_{calendar.month_name[month]}_{year}.pdf"
+
+
+class _ChunkSink:
+    """
+    Write-only, non-seekable file object for zipfile.
+    Without seek/tell zipfile emits data descriptors and never rewrites earlier
+    bytes, so every chunk can be handed to the client as soon as it is written.
+    """
+
+    def __init__(self, job: "BillPdfJob"):
+        self.job = job
+
+    def write(self, data) -> int:
+        if data:
+            self.job.chunks.append(bytes(data))
+            self.job.size_bytes += len(data)
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+
+class BillPdfJob:
+    """State and output of one bulk bill PDF job"""
+
+    def __init__(self, society_id: int, month: int, year: int, output_format: str, requested_by: int):
+        self.job_id = uuid.uuid4().hex
+        self.society_id = society_id
+        self.month = month
+        self.year = year
+        self.format = output_format
+        self.requested_by = requested_by
+        self.status = "queued"  # queued -> running -> completed | failed
+        self.error: Optional[str] = None
+        self.total_bills = 0
+        self.rendered_bills = 0
+        self.size_bytes = 0
+        self.chunks: List[bytes] = []
+        self.created_at = datetime.utcnow()
+        self.started_at: Optional[datetime] = None
+        self.finished_at: Optional[datetime] = None
+        self.expires_at = time.monotonic() + settings.BILL_PDF_JOB_TTL_SECONDS
+        self.task: Optional[asyncio.Task] = None
+        self._changed = asyncio.Condition()
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ("completed", "failed")
+
+    @property
+    def filename(self) -> str:
+        month_name = calendar.month_name[self.month]
+        extension = "zip" if self.format == "zip" else "pdf"
+        return f"Maintenance_Bills_{month_name}_{self.year}.{extension}"
+
+    @property
+    def media_type(self) -> str:
+        return "application/zip" if self.format == "zip" else "application/pdf"
+
+    async def notify(self) -> None:
+        async with self._changed:
+            self._changed.notify_all()
+
+    def to_dict(self) -> Dict[str, Any]:
+        elapsed_ms = None
+        if self.started_at:
+            end = self.finished_at or datetime.utcnow()
+            elapsed_ms = round((end - self.started_at).total_seconds() * 1000, 2)
+        return {
+            "job_id": self.job_id,
+            "status": self.status,
+            "format": self.format,
+            "month": self.month,
+            "year": self.year,
+            "total_bills": self.total_bills,
+            "rendered_bills": self.rendered_bills,
+            "progress_percent": round(self.rendered_bills * 100 / self.total_bills, 1) if self.total_bills else (100.0 if self.finished else 0.0),
+            "size_bytes": self.size_bytes,
+            "elapsed_ms": elapsed_ms,
+            "error": self.error,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+            # A ZIP can be downloaded while it is still being built
+            "download_ready": self.status == "completed" or (self.format == "zip" and self.status == "running")
+        }
+
+    async def stream(self) -> AsyncIterator[bytes]:
+        """Yield output chunks as they are produced, until the job finishes"""
+        sent = 0
+        while True:
+            async with self._changed:
+                await self._changed.wait_for(lambda: len(self.chunks) > sent or self.finished)
+                pending = self.chunks[sent:]
+                done = self.finished
+            sent += len(pending)
+            for chunk in pending:
+                yield chunk
+            if done and sent >= len(self.chunks):
+                if self.status == "failed":
+                    # Abort the response: a ZIP that ends here has no central directory, so the
+                    # client sees an incomplete download instead of an archive missing bills
+                    logger.warning(f"Bill PDF job {self.job_id} failed after {sent} chunks were streamed")
+                    raise RuntimeError(f"Bill PDF job {self.job_id} failed: {self.error}")
+                return
+
+
+class BillPdfJobManager:
+    """In-memory registry that creates, runs and expires bulk bill PDF jobs"""
+
+    def __init__(self, max_jobs: int = 50):
+        self.max_jobs = max_jobs
+        self._jobs: "OrderedDict[str, BillPdfJob]" = OrderedDict()
+
+    def _purge(self) -> None:
+        now = time.monotonic()
+        for job_id in [j.job_id for j in self._jobs.values() if j.finished and j.expires_at <= now]:
+            del self._jobs[job_id]
+        # Drop the oldest finished jobs when over capacity; running jobs are never dropped
+        while len(self._jobs) > self.max_jobs:
+            oldest = next((j for j in self._jobs.values() if j.finished), None)
+            if oldest is None:
+                break
+            del self._jobs[oldest.job_id]
+
+    def get(self, job_id: str, society_id: int) -> Optional[BillPdfJob]:
+        self._purge()
+        job = self._jobs.get(job_id)
+        if job is None or job.society_id != society_id:
+            return None
+        return job
+
+    def find_active(self, society_id: int, month: int, year: int, output_format: str) -> Optional[BillPdfJob]:
+        """A queued/running job for the same bills, so repeated clicks share one render"""
+        for job in self._jobs.values():
+            if (job.society_id, job.month, job.year, job.format) == (society_id, month, year, output_format) and not job.finished:
+                return job
+        return None
+
+    def submit(self, society_id: int, month: int, year: int, output_format: str, requested_by: int) -> BillPdfJob:
+        self._purge()
+        job = self.find_active(society_id, month, year, output_format)
+        if job is not None:
+            return job
+        job = BillPdfJob(society_id, month, year, output_format, requested_by)
+        self._jobs[job.job_id] = job
+        job.task = asyncio.create_task(self._run(job))
+        return job
+
+    async def _run(self, job: BillPdfJob) -> None:
+        job.status = "running"
+        job.started_at = datetime.utcnow()
+        await job.notify()
+        try:
+            if database.AsyncSessionLocal is None:
+                database.create_engine_instance()
+            async with database.AsyncSessionLocal() as db:
+                society_info, bills = await self._load_bills(db, job)
+            job.total_bills = len(bills)
+            await job.notify()
+
+            if job.format == "zip":
+                await self._render_zip(job, society_info, bills)
+            else:
+                await self._render_merged(job, society_info, bills)
+
+            job.status = "completed"
+        except asyncio.CancelledError:
+            job.status = "failed"
+            job.error = "Job was cancelled"
+            raise
+        except Exception as e:
+            logger.error(f"Bill PDF job {job.job_id} failed: {e}", exc_info=True)
+            job.status = "failed"
+            job.error = getattr(e, "detail", None) or str(e)
+        finally:
+            job.finished_at = datetime.utcnow()
+            job.expires_at = time.monotonic() + settings.BILL_PDF_JOB_TTL_SECONDS
+            await job.notify()
+            logger.info(
+                f"Bill PDF job {job.job_id} {job.status}: {job.rendered_bills}/{job.total_bills} bills, "
+                f"{job.size_bytes} bytes in {job.to_dict()['elapsed_ms']} ms"
+            )
+
+    @staticmethod
+    async def _load_bills(db: AsyncSession, job: BillPdfJob):
+        society = (await db.execute(
+            select(Society).where(Society.id == job.society_id)
+        )).scalar_one_or_none()
+        if not society:
+            raise ValueError("Society not found")
+
+        bills = (await db.execute(
+            select(MaintenanceBill).where(
+                MaintenanceBill.society_id == job.society_id,
+                MaintenanceBill.month == job.month,
+                MaintenanceBill.year == job.year
+            ).order_by(MaintenanceBill.flat_number, MaintenanceBill.id)
+        )).scalars().all()
+
+        owner_names = dict((await db.execute(
+            select(Flat.id, Flat.owner_name).where(Flat.society_id == job.society_id)
+        )).all())
+
+        payment_methods = await get_bill_payment_methods(
+            db, [bill.id for bill in bills if bill.status == BillStatus.PAID]
+        )
+
+        bill_data = [
+            build_bill_pdf_data(bill, owner_names.get(bill.flat_id), payment_methods.get(bill.id))
+            for bill in bills
+        ]
+        return build_bill_society_info(society), bill_data
+
+    @staticmethod
+    async def _render_batch(render_function, bills: List[Dict[str, Any]], society_info: Dict[str, Any]):
+        """Render on the process pool, waiting out 503s while interactive downloads hold every slot"""
+        for attempt in range(RENDER_BUSY_RETRIES + 1):
+            try:
+                return await render_document(render_function, bills, society_info)
+            except HTTPException as e:
+                if e.status_code != status.HTTP_503_SERVICE_UNAVAILABLE or attempt == RENDER_BUSY_RETRIES:
+                    raise
+                await asyncio.sleep(int((e.headers or {}).get("Retry-After", 5)))
+
+    @classmethod
+    async def _render_zip(cls, job: BillPdfJob, society_info: Dict[str, Any], bills: List[Dict[str, Any]]) -> None:
+        from app.utils.export_utils import create_maintenance_bill_pdfs
+
+        batch_size = max(1, settings.BILL_PDF_BATCH_SIZE)
+        batches = [bills[i:i + batch_size] for i in range(0, len(bills), batch_size)]
+        # Leave the remaining render slots to interactive downloads
+        window = max(1, render_executor.pool_size)
+
+        used_names = set()
+        archive = zipfile.ZipFile(_ChunkSink(job), mode="w", compression=zipfile.ZIP_DEFLATED)
+        pending: Dict[asyncio.Task, List[Dict[str, Any]]] = {}
+        next_batch = 0
+        try:
+            while next_batch < len(batches) or pending:
+                while next_batch < len(batches) and len(pending) < window:
+                    batch = batches[next_batch]
+                    task = asyncio.create_task(cls._render_batch(create_maintenance_bill_pdfs, batch, society_info))
+                    pending[task] = batch
+                    next_batch += 1
+
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    batch = pending.pop(task)
+                    for bill_data, pdf_bytes in zip(batch, task.result()):
+                        name = bill_pdf_filename(bill_data['flat_number'], job.month, job.year)
+                        if name in used_names:
+                            name = name[:-4] + f"_{bill_data['bill_number']}.pdf"
+                        used_names.add(name)
+                        archive.writestr(name, pdf_bytes)
+                    job.rendered_bills += len(batch)
+                await job.notify()
+        except BaseException:
+            # Leave the archive unterminated: closing it would hand out a valid ZIP without these bills
+            for task in pending:
+                task.cancel()
+            raise
+        archive.close()  # Writes the central directory
+
+    @classmethod
+    async def _render_merged(cls, job: BillPdfJob, society_info: Dict[str, Any], bills: List[Dict[str, Any]]) -> None:
+        from app.utils.export_utils import create_merged_maintenance_bills_pdf
+
+        if not bills:
+            raise ValueError(f"No bills found for {calendar.month_name[job.month]} {job.year}")
+        pdf_file = await cls._render_batch(create_merged_maintenance_bills_pdf, bills, society_info)
+        job.rendered_bills = len(bills)
+        _ChunkSink(job).write(pdf_file.getvalue())
+
+    def shutdown(self) -> None:
+        for job in self._jobs.values():
+            if job.task is not None and not job.task.done():
+                job.task.cancel()
+
+
+bill_pdf_jobs = BillPdfJobManager()
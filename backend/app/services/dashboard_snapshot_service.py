@@ -0,0 +1,213 @@
+"""
+Dashboard snapshot service
+Stores the last computed dashboard summary per society in `dashboard_snapshots`
+together with the version of the data it was computed from, so the polled home
+screen is recomputed only after a relevant write and unchanged responses can be
+answered with 304 Not Modified.
+
+Snapshot version: "<ledger version>.<data_version>". The ledger version (see
+report_cache_service) covers transactions, bills and account heads; data_version
+is bumped in the same transaction as every ORM write to the other tables the
+dashboard reads (complaints, members, flats, payments). A snapshot older than
+DASHBOARD_SNAPSHOT_MAX_AGE_SECONDS is recomputed even when nothing changed,
+because the summary also shows relative times ("5 mins ago") and date-based
+figures. The ETag is a hash of the serialized payload, so a recompute that
+produces the same body keeps the client's copy valid.
+"""
+import hashlib
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Iterable, Optional, Set, Tuple
+
+from pydantic import BaseModel
+from sqlalchemy import event, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from app.config import settings
+from app.models_db import Complaint, Member, Flat, DashboardSnapshot
+from app.models.payment import Payment
+from app.services.report_cache_service import get_ledger_version, GLOBAL_LEDGER_SCOPE
+from app.services.single_flight import report_single_flight
+
+# Non-ledger models shown on the dashboard, and the attribute holding their society id
+ACTIVITY_MODELS = {
+    Complaint: "society_id",
+    Member: "society_id",
+    Flat: "society_id",
+    Payment: "society_id",
+}
+ACTIVITY_TABLES = {model.__table__.name: attr for model, attr in ACTIVITY_MODELS.items()}
+
+
+# ============ DATA VERSION MAINTENANCE ============
+
+def _bump_data_versions_sync(connection, society_ids: Iterable[int]) -> None:
+    """Increment (or create) the data_version of the given societies' snapshots"""
+    table = DashboardSnapshot.__table__
+    society_ids = set(society_ids)
+    if GLOBAL_LEDGER_SCOPE in society_ids:
+        connection.execute(update(table).values(data_version=table.c.data_version + 1))
+        society_ids.discard(GLOBAL_LEDGER_SCOPE)
+    rows = [{"society_id": sid, "data_version": 1, "updated_at": datetime.utcnow()} for sid in sorted(society_ids)]
+    if not rows:
+        return
+    dialect_insert = pg_insert if connection.dialect.name == "postgresql" else sqlite_insert
+    stmt = dialect_insert(table)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c.society_id],
+        set_={"data_version": table.c.data_version + 1, "updated_at": stmt.excluded.updated_at}
+    )
+    connection.execute(stmt, rows)
+
+
+def _collect_flushed_societies(session: Session) -> Set[int]:
+    societies: Set[int] = set()
+    for obj in list(session.new) + list(session.deleted):
+        attr = ACTIVITY_MODELS.get(type(obj))
+        if attr and getattr(obj, attr, None) is not None:
+            societies.add(getattr(obj, attr))
+    for obj in session.dirty:
+        attr = ACTIVITY_MODELS.get(type(obj))
+        if attr and getattr(obj, attr, None) is not None and session.is_modified(obj, include_collections=False):
+            societies.add(getattr(obj, attr))
+    return societies
+
+
+@event.listens_for(Session, "after_flush")
+def _bump_data_versions_after_flush(session: Session, flush_context) -> None:
+    """Bump dashboard data versions in the same transaction as the flushed rows"""
+    societies = _collect_flushed_societies(session)
+    if societies:
+        _bump_data_versions_sync(session.connection(), societies)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _bump_data_versions_for_bulk_statements(orm_execute_state) -> None:
+    """Bulk insert/update/delete statements do not flush objects; bump from the statement instead"""
+    if not (orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    table = getattr(orm_execute_state.statement, "table", None)
+    attr = ACTIVITY_TABLES.get(getattr(table, "name", None))
+    if attr is None:
+        return
+
+    societies: Set[int] = set()
+    params = orm_execute_state.parameters
+    if orm_execute_state.is_insert and params:
+        rows = params if isinstance(params, list) else [params]
+        if all(isinstance(row, dict) and row.get(attr) is not None for row in rows):
+            societies = {row[attr] for row in rows}
+    if not societies:
+        societies = {GLOBAL_LEDGER_SCOPE}
+    _bump_data_versions_sync(orm_execute_state.session.connection(), societies)
+
+
+# ============ SNAPSHOTS ============
+
+def _etag(payload: bytes) -> str:
+    return '"' + hashlib.sha256(payload).hexdigest()[:32] + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header value names the given entity tag (weak comparison)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return etag in candidates
+
+
+class DashboardSnapshotService:
+    """Versioned per-society store of the last computed dashboard summary"""
+
+    @property
+    def enabled(self) -> bool:
+        return settings.DASHBOARD_SNAPSHOT_MAX_AGE_SECONDS > 0
+
+    async def get_or_compute(
+        self,
+        db: AsyncSession,
+        society_id: int,
+        compute: Callable[[], Awaitable[BaseModel]],
+        if_none_match: Optional[str] = None
+    ) -> Tuple[str, Optional[bytes]]:
+        """
+        Current dashboard of a society as (etag, JSON payload).
+
+        The payload is None when if_none_match already names the current etag,
+        in which case the caller answers 304 and nothing is loaded or computed.
+        """
+        if not self.enabled:
+            payload = (await compute()).model_dump_json().encode("utf-8")
+            etag = _etag(payload)
+            return etag, None if etag_matches(if_none_match, etag) else payload
+
+        ledger_version = await get_ledger_version(db, society_id)
+        snapshot = (await db.execute(
+            select(
+                DashboardSnapshot.data_version,
+                DashboardSnapshot.snapshot_version,
+                DashboardSnapshot.etag,
+                DashboardSnapshot.computed_at,
+            ).where(DashboardSnapshot.society_id == society_id)
+        )).one_or_none()
+        version = f"{ledger_version}.{snapshot.data_version if snapshot else 0}"
+
+        max_age = timedelta(seconds=settings.DASHBOARD_SNAPSHOT_MAX_AGE_SECONDS)
+        fresh = (
+            snapshot is not None
+            and snapshot.snapshot_version == version
+            and snapshot.computed_at is not None
+            and datetime.utcnow() - snapshot.computed_at < max_age
+        )
+        if fresh:
+            if etag_matches(if_none_match, snapshot.etag):
+                return snapshot.etag, None
+            payload = (await db.execute(
+                select(DashboardSnapshot.payload).where(DashboardSnapshot.society_id == society_id)
+            )).scalar()
+            if payload is not None:
+                return snapshot.etag, payload
+
+        async def compute_and_store() -> bytes:
+            payload = (await compute()).model_dump_json().encode("utf-8")
+            await self._store(db, society_id, version, _etag(payload), payload)
+            return payload
+
+        # Concurrent polls of a stale dashboard wait on one computation
+        payload = await report_single_flight.run(
+            society_id, "dashboard_summary", {"version": version}, compute_and_store
+        )
+        etag = _etag(payload)
+        return etag, None if etag_matches(if_none_match, etag) else payload
+
+    async def _store(self, db: AsyncSession, society_id: int, version: str, etag: str, payload: bytes) -> None:
+        """
+        Save a computed snapshot under the version it was computed from. A write
+        racing with the computation changes the version, so such a snapshot is
+        never served. The upsert goes through the request's session and commits with it.
+        """
+        table = DashboardSnapshot.__table__
+        now = datetime.utcnow()
+        conn = await db.connection()
+        dialect_insert = pg_insert if conn.dialect.name == "postgresql" else sqlite_insert
+        stmt = dialect_insert(table).values(
+            society_id=society_id, data_version=0, snapshot_version=version,
+            etag=etag, payload=payload, computed_at=now, updated_at=now
+        )
+        await db.execute(stmt.on_conflict_do_update(
+            index_elements=[table.c.society_id],
+            set_={
+                "snapshot_version": stmt.excluded.snapshot_version,
+                "etag": stmt.excluded.etag,
+                "payload": stmt.excluded.payload,
+                "computed_at": stmt.excluded.computed_at,
+                "updated_at": stmt.excluded.updated_at,
+            }
+        ))
+
+
+dashboard_snapshots = DashboardSnapshotService()
@@ -0,0 +1,446 @@
+"""
+General Ledger export service
+Streams the General Ledger to Excel or CSV without materializing the period.
+
+- Account heads and their opening balances are computed with a fixed number of
+  grouped queries (shared with the General Ledger report).
+- Transactions are pulled through a server-side cursor ordered by
+  (account_code, date, id), EXPORT_BATCH_ROWS at a time, with the voucher
+  number joined in instead of pre-fetching a JV map.
+- Excel is written with openpyxl write-only mode (rows go to a temporary file,
+  not a DOM); CSV chunks are yielded as they are produced. Either way memory
+  stays bounded by one batch regardless of the period length.
+"""
+import asyncio
+import csv
+import io
+import logging
+import tempfile
+from collections import OrderedDict
+from datetime import date
+from decimal import Decimal
+from typing import Any, AsyncIterator, Dict, List, NamedTuple, Optional
+
+from sqlalchemy import select, func, and_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import database
+from app.models_db import (
+    Transaction, AccountCode, OpeningBalance, BalanceType, JournalEntry
+)
+from app.services.society_context_cache import society_context
+
+logger = logging.getLogger(__name__)
+
+EXPORT_BATCH_ROWS = 2000  # Transactions fetched (and written) per round trip
+FILE_CHUNK_BYTES = 64 * 1024
+CREDIT_NATURE_TYPES = ('liability', 'capital', 'income')
+ZERO = Decimal("0.00")
+CENT = Decimal("0.01")
+
+
+async def get_general_ledger_accounts(
+    db: AsyncSession,
+    society_id: int,
+    from_date: date
+) -> "OrderedDict[str, Dict[str, Any]]":
+    """
+    Account heads keyed by code (sorted) with their balance as of from_date.
+    internal_balance is debit-positive; opening_balance is in display sign
+    (credit-nature accounts shown positive when in credit).
+    """
+    result = await db.execute(
+        select(AccountCode).where(AccountCode.society_id == society_id).order_by(AccountCode.code)
+    )
+    account_codes = result.scalars().all()
+
+    # Find the financial year for the period
+    financial_year = await society_context.find_financial_year(db, society_id, from_date)
+
+    fy_start_date = financial_year.start_date if financial_year else from_date
+
+    # Pre-fetch opening balances for all accounts if FY exists
+    opening_balances_map = {}
+    if financial_year:
+        ob_res = await db.execute(
+            select(OpeningBalance).where(OpeningBalance.financial_year_id == financial_year.id)
+        )
+        for ob in ob_res.scalars().all():
+            opening_balances_map[ob.account_head_id] = ob
+
+    # Movements between FY start and from_date - 1 for ALL accounts in one query
+    opening_movements = {}
+    if from_date > fy_start_date:
+        m_res = await db.execute(
+            select(
+                Transaction.account_code,
+                func.sum(Transaction.debit_amount).label('dr'),
+                func.sum(Transaction.credit_amount).label('cr')
+            ).where(
+                and_(
+                    Transaction.society_id == society_id,
+                    Transaction.date >= fy_start_date,
+                    Transaction.date < from_date
+                )
+            ).group_by(Transaction.account_code)
+        )
+        for row in m_res.all():
+            opening_movements[row.account_code] = (Decimal(str(row.dr or 0.0)), Decimal(str(row.cr or 0.0)))
+
+    accounts = OrderedDict()
+    for account in account_codes:
+        # 1. Start with FY opening balance
+        ob_record = opening_balances_map.get(account.id)
+        if ob_record:
+            if ob_record.balance_type == BalanceType.DEBIT:
+                balance = Decimal(str(ob_record.opening_balance))
+            else:
+                balance = -Decimal(str(ob_record.opening_balance))
+        else:
+            balance = Decimal(str(account.opening_balance or 0.0))
+            if account.type in CREDIT_NATURE_TYPES:
+                balance = -balance
+
+        # 2. Add movements between FY start and from_date - 1
+        if from_date > fy_start_date:
+            dr_m, cr_m = opening_movements.get(account.code, (ZERO, ZERO))
+            balance += (dr_m - cr_m)
+
+        display_opening = -balance if account.type in CREDIT_NATURE_TYPES else balance
+
+        accounts[account.code] = {
+            "account_code": account.code,
+            "account_name": account.name,
+            "account_type": account.type.value if hasattr(account.type, 'value') else str(account.type),
+            "internal_balance": balance,
+            "opening_balance": display_opening,
+        }
+    return accounts
+
+
+class LedgerLine(NamedTuple):
+    """One output line of the streamed General Ledger"""
+    kind: str  # account | opening | txn | total
+    account_code: str
+    account_name: str
+    date: Optional[date] = None
+    reference: str = ""
+    description: str = ""
+    debit: Optional[float] = None
+    credit: Optional[float] = None
+    balance: Optional[float] = None
+
+
+def _display(account_type: str, internal_balance: Decimal) -> Decimal:
+    return -internal_balance if account_type in CREDIT_NATURE_TYPES else internal_balance
+
+
+def _money(value: Decimal) -> float:
+    return float(value.quantize(CENT))
+
+
+async def iter_general_ledger_lines(
+    db: AsyncSession,
+    society_id: int,
+    from_date: date,
+    to_date: date
+) -> AsyncIterator[List[LedgerLine]]:
+    """
+    Yield batches of ledger lines in report order: for each account with
+    transactions or a non-zero opening/closing balance, a header, the opening
+    balance, its transactions with running balance, and a total line.
+    """
+    accounts = await get_general_ledger_accounts(db, society_id, from_date)
+
+    # Accounts without transactions in the period still appear when their (unchanged) balance is non-zero
+    active_codes = set((await db.execute(
+        select(Transaction.account_code).where(
+            and_(
+                Transaction.society_id == society_id,
+                Transaction.date >= from_date,
+                Transaction.date <= to_date
+            )
+        ).distinct()
+    )).scalars().all())
+    quiet_accounts = [
+        account for code, account in accounts.items()
+        if code not in active_codes and abs(account["opening_balance"]) > CENT
+    ]
+    quiet_index = 0
+
+    def quiet_account_lines(account: Dict[str, Any]) -> List[LedgerLine]:
+        code, name = account["account_code"], account["account_name"]
+        opening = _money(account["opening_balance"])
+        return [
+            LedgerLine("account", code, name),
+            LedgerLine("opening", code, name, balance=opening),
+            LedgerLine("total", code, name, debit=0.0, credit=0.0, balance=opening),
+        ]
+
+    stmt = (
+        select(
+            Transaction.account_code,
+            Transaction.category,
+            Transaction.type,
+            Transaction.date,
+            Transaction.description,
+            Transaction.document_number,
+            JournalEntry.entry_number,
+            Transaction.debit_amount,
+            Transaction.credit_amount
+        )
+        .outerjoin(JournalEntry, JournalEntry.id == Transaction.journal_entry_id)
+        .where(
+            and_(
+                Transaction.society_id == society_id,
+                Transaction.date >= from_date,
+                Transaction.date <= to_date
+            )
+        )
+        .order_by(Transaction.account_code, Transaction.date, Transaction.id)
+        .execution_options(yield_per=EXPORT_BATCH_ROWS)
+    )
+
+    current: Optional[Dict[str, Any]] = None
+    lines: List[LedgerLine] = []
+
+    def close_current() -> None:
+        lines.append(LedgerLine(
+            "total", current["account_code"], current["account_name"],
+            debit=_money(current["total_debit"]), credit=_money(current["total_credit"]),
+            balance=_money(_display(current["account_type"], current["balance"]))
+        ))
+
+    result = await db.stream(stmt)
+    async for partition in result.partitions():
+        for row in partition:
+            if current is None or row.account_code != current["account_code"]:
+                if current is not None:
+                    close_current()
+                while quiet_index < len(quiet_accounts) and quiet_accounts[quiet_index]["account_code"] < (row.account_code or ""):
+                    lines.extend(quiet_account_lines(quiet_accounts[quiet_index]))
+                    quiet_index += 1
+
+                account = accounts.get(row.account_code)
+                if account is None:
+                    # Transaction on a code that has no account head (same fallback as the report)
+                    account = {
+                        "account_code": row.account_code,
+                        "account_name": row.category or row.account_code,
+                        "account_type": row.type.value if hasattr(row.type, 'value') else str(row.type),
+                        "internal_balance": ZERO,
+                        "opening_balance": ZERO,
+                    }
+                current = {
+                    **account,
+                    "balance": account["internal_balance"],
+                    "total_debit": ZERO,
+                    "total_credit": ZERO,
+                }
+                lines.append(LedgerLine("account", current["account_code"], current["account_name"]))
+                lines.append(LedgerLine(
+                    "opening", current["account_code"], current["account_name"],
+                    balance=_money(current["opening_balance"])
+                ))
+
+            dr = Decimal(str(row.debit_amount or 0.0))
+            cr = Decimal(str(row.credit_amount or 0.0))
+            current["total_debit"] += dr
+            current["total_credit"] += cr
+            current["balance"] += (dr - cr)
+            lines.append(LedgerLine(
+                "txn", current["account_code"], current["account_name"],
+                date=row.date,
+                reference=row.document_number or row.entry_number or "",
+                description=row.description,
+                debit=_money(dr),
+                credit=_money(cr),
+                balance=_money(_display(current["account_type"], current["balance"]))
+            ))
+
+        yield lines
+        lines = []
+
+    if current is not None:
+        close_current()
+    for account in quiet_accounts[quiet_index:]:
+        lines.extend(quiet_account_lines(account))
+    if lines:
+        yield lines
+
+
+async def _export_session():
+    if database.AsyncSessionLocal is None:
+        database.create_engine_instance()
+    return database.AsyncSessionLocal()
+
+
+# ============ CSV ============
+
+CSV_HEADERS = ['Account Code', 'Account Name', 'Date', 'Reference', 'Description', 'Debit', 'Credit', 'Balance']
+
+
+def _csv_row(line: LedgerLine) -> list:
+    if line.kind == "account":
+        return [line.account_code, line.account_name, '', '', '', '', '', '']
+    if line.kind == "opening":
+        return [line.account_code, line.account_name, '', '', 'Opening Balance', '', '', f"{line.balance:.2f}"]
+    if line.kind == "total":
+        return [line.account_code, line.account_name, '', '', 'TOTAL', f"{line.debit:.2f}", f"{line.credit:.2f}", f"{line.balance:.2f}"]
+    return [
+        line.account_code, line.account_name, str(line.date), line.reference, line.description,
+        f"{line.debit:.2f}", f"{line.credit:.2f}", f"{line.balance:.2f}"
+    ]
+
+
+async def stream_general_ledger_csv(society_id: int, from_date: date, to_date: date) -> AsyncIterator[bytes]:
+    """General Ledger as CSV, one chunk per fetched batch"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(CSV_HEADERS)
+    async with await _export_session() as db:
+        async for lines in iter_general_ledger_lines(db, society_id, from_date, to_date):
+            writer.writerows(_csv_row(line) for line in lines)
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate(0)
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+# ============ Excel (write-only) ============
+
+class _GeneralLedgerSheetWriter:
+    """Same layout and styles as ExcelExporter.create_general_ledger_excel, appended row by row"""
+
+    def __init__(self, society_info: Dict[str, Any], from_date: date, to_date: date):
+        # openpyxl is imported on first export, not when the API starts
+        import openpyxl
+        from openpyxl.cell import WriteOnlyCell
+        from openpyxl.styles import Font, Alignment, PatternFill, Border, Side
+        from openpyxl.utils import get_column_letter
+
+        self.wb = openpyxl.Workbook(write_only=True)
+        self.ws = self.wb.create_sheet("General Ledger")
+        self.row = 0
+
+        self.header_font = Font(name='Arial', size=14, bold=True)
+        self.title_font = Font(name='Arial', size=12, bold=True)
+        self.subheader_font = Font(name='Arial', size=10, bold=True)
+        self.normal_font = Font(name='Arial', size=10)
+        self.center = Alignment(horizontal='center')
+        self._write_only_cell = WriteOnlyCell
+        self.header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
+        self.account_fill = PatternFill(start_color="E7E6E6", end_color="E7E6E6", fill_type="solid")
+        self.total_fill = PatternFill(start_color="D9E1F2", end_color="D9E1F2", fill_type="solid")
+        self.border = Border(
+            left=Side(style='thin'),
+            right=Side(style='thin'),
+            top=Side(style='thin'),
+            bottom=Side(style='thin')
+        )
+
+        # Column widths must be set before the first row in write-only mode
+        for col in range(1, 7):
+            self.ws.column_dimensions[get_column_letter(col)].width = 18
+        self.ws.column_dimensions['C'].width = 40  # Description column
+
+        self._merged_title(society_info.get('name', 'Society Name'), self.header_font)
+        self._merged_title("GENERAL LEDGER REPORT", self.title_font)
+        self._merged_title(f"Period: {from_date} to {to_date}", self.normal_font)
+        self._append([])
+
+        headers = ['Account', 'Date', 'Description', 'Debit', 'Credit', 'Balance']
+        self._append([
+            self._cell(header, font=Font(name='Arial', size=10, bold=True, color="FFFFFF"),
+                       fill=self.header_fill, alignment=self.center)
+            for header in headers
+        ])
+
+    def _cell(self, value, font=None, fill=None, number_format=None, alignment=None, border=True):
+        cell = self._write_only_cell(self.ws, value=value)
+        if font is not None:
+            cell.font = font
+        if fill is not None:
+            cell.fill = fill
+        if number_format is not None:
+            cell.number_format = number_format
+        if alignment is not None:
+            cell.alignment = alignment
+        if border:
+            cell.border = self.border
+        return cell
+
+    def _append(self, cells) -> None:
+        self.row += 1
+        self.ws.append(cells)
+
+    def _merged_title(self, value, font) -> None:
+        self._append([self._cell(value, font=font, alignment=self.center, border=False)])
+        self.ws.merged_cells.add(f"A{self.row}:F{self.row}")
+
+    def _amount(self, value, font):
+        return self._cell(value, font=font, number_format='#,##0.00')
+
+    def write_lines(self, lines: List[LedgerLine]) -> None:
+        for line in lines:
+            if line.kind == "account":
+                self._append([self._cell(
+                    f"{line.account_code} - {line.account_name or ''}",
+                    font=self.subheader_font, fill=self.account_fill
+                )])
+                self.ws.merged_cells.add(f"A{self.row}:F{self.row}")
+            elif line.kind == "opening":
+                self._append([
+                    self._cell("Opening Balance", font=self.normal_font),
+                    None, None, None, None,
+                    self._amount(line.balance, self.normal_font)
+                ])
+            elif line.kind == "txn":
+                self._append([
+                    None,
+                    self._cell(str(line.date), font=self.normal_font),
+                    self._cell(line.description, font=self.normal_font),
+                    self._amount(line.debit, self.normal_font),
+                    self._amount(line.credit, self.normal_font),
+                    self._amount(line.balance, self.normal_font)
+                ])
+            else:
+                total = dict(font=self.subheader_font, fill=self.total_fill, number_format='#,##0.00')
+                self._append([
+                    self._cell("TOTAL", font=self.subheader_font, fill=self.total_fill),
+                    None, None,
+                    self._cell(line.debit, **total),
+                    self._cell(line.credit, **total),
+                    self._cell(line.balance, **total)
+                ])
+                self._append([])
+
+    def save(self, fileobj) -> None:
+        self.wb.save(fileobj)
+
+
+async def stream_general_ledger_excel(
+    society_id: int,
+    from_date: date,
+    to_date: date,
+    society_info: Dict[str, Any]
+) -> AsyncIterator[bytes]:
+    """
+    General Ledger as .xlsx. Rows are written batch by batch in a worker thread;
+    the finished file is streamed from disk in FILE_CHUNK_BYTES chunks.
+    """
+    sheet = _GeneralLedgerSheetWriter(society_info, from_date, to_date)
+    with tempfile.TemporaryFile(suffix=".xlsx") as output:
+        async with await _export_session() as db:
+            async for lines in iter_general_ledger_lines(db, society_id, from_date, to_date):
+                await asyncio.to_thread(sheet.write_lines, lines)
+        await asyncio.to_thread(sheet.save, output)
+        logger.debug(f"General Ledger export: {sheet.row} rows, {output.tell()} bytes")
+
+        output.seek(0)
+        while True:
+            chunk = await asyncio.to_thread(output.read, FILE_CHUNK_BYTES)
+            if not chunk:
+                break
+            yield chunk
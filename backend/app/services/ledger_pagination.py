@@ -0,0 +1,124 @@
+"""
+Keyset pagination for running-balance ledgers (cash book, bank ledger)
+Pages are ordered by (date, id) and addressed by an opaque cursor holding the
+last row of the previous page, so fetching page N costs the same as page 1:
+one aggregate for the balance carried forward up to the cursor, plus one
+LIMITed range scan on ix_transactions_society_date_id. Nothing outside the
+page is loaded into memory.
+"""
+import base64
+from datetime import date
+from decimal import Decimal
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import select, func, and_, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models_db import Transaction
+
+
+def encode_cursor(txn_date: date, txn_id: int) -> str:
+    """Opaque cursor for the row (txn_date, txn_id)"""
+    raw = f"{txn_date.isoformat()}:{txn_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[date, int]:
+    """Inverse of encode_cursor; raises ValueError for malformed cursors"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        date_part, id_part = raw.split(":")
+        return date.fromisoformat(date_part), int(id_part)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
+async def get_ledger_page(
+    db: AsyncSession,
+    society_id: int,
+    scope,
+    base_opening_balance: Decimal,
+    from_date: date,
+    to_date: date,
+    cursor: Optional[str],
+    limit: int
+) -> Dict[str, Any]:
+    """
+    One page of a running-balance ledger.
+
+    `scope` is the WHERE clause selecting the ledger's postings (e.g. cash
+    accounts or payment_method == 'cash'); `base_opening_balance` is the sum
+    of the ledger accounts' opening balances. Returns the balance carried into
+    the page, its entries with running balances, and the cursor for the next
+    page (None on the last page).
+    """
+    society_scope = and_(Transaction.society_id == society_id, scope)
+
+    if cursor:
+        cursor_date, cursor_id = decode_cursor(cursor)
+        if not from_date <= cursor_date <= to_date:
+            raise ValueError("Cursor is outside the requested period")
+        # Everything up to and including the cursor row, from the beginning of the books
+        before_page = or_(
+            Transaction.date < cursor_date,
+            and_(Transaction.date == cursor_date, Transaction.id <= cursor_id)
+        )
+        after_cursor = or_(
+            Transaction.date > cursor_date,
+            and_(Transaction.date == cursor_date, Transaction.id > cursor_id)
+        )
+    else:
+        before_page = Transaction.date < from_date
+        after_cursor = Transaction.date >= from_date
+
+    carried = (await db.execute(
+        select(
+            func.sum(Transaction.debit_amount).label("dr"),
+            func.sum(Transaction.credit_amount).label("cr")
+        ).where(society_scope, before_page)
+    )).one_or_none()
+    opening_balance = base_opening_balance
+    if carried and carried.dr is not None:
+        opening_balance += Decimal(str(carried.dr)) - Decimal(str(carried.cr or 0))
+
+    rows = (await db.execute(
+        select(
+            Transaction.id,
+            Transaction.date,
+            Transaction.description,
+            Transaction.account_code,
+            Transaction.debit_amount,
+            Transaction.credit_amount
+        )
+        .where(society_scope, after_cursor, Transaction.date <= to_date)
+        .order_by(Transaction.date, Transaction.id)
+        .limit(limit + 1)
+    )).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    entries = []
+    balance = opening_balance
+    for row in rows:
+        dr = Decimal(str(row.debit_amount or 0.0))
+        cr = Decimal(str(row.credit_amount or 0.0))
+        balance += dr - cr
+        entries.append({
+            "id": row.id,
+            "date": row.date,
+            "description": row.description,
+            "account_code": row.account_code,
+            "debit": float(dr.quantize(Decimal("0.01"))),
+            "credit": float(cr.quantize(Decimal("0.01"))),
+            "balance": float(balance.quantize(Decimal("0.01"))),
+        })
+
+    return {
+        "period": {"from": from_date, "to": to_date},
+        "opening_balance": float(opening_balance.quantize(Decimal("0.01"))),
+        "entries": entries,
+        "closing_balance": float(balance.quantize(Decimal("0.01"))),
+        "limit": limit,
+        "has_more": has_more,
+        "next_cursor": encode_cursor(rows[-1].date, rows[-1].id) if has_more else None,
+    }
@@ -0,0 +1,357 @@
+"""
+Ledger snapshot service
+Maintains the account_daily_balances table (per-account, per-day debit/credit
+totals with a cumulative running balance) and answers "balance as on date"
+lookups from it instead of scanning transactions.
+
+The table is kept in step with `transactions` by an after_flush hook on the ORM
+session: every flush that inserts, edits or deletes Transaction rows re-derives
+the touched (society, account, date) buckets from `transactions` and shifts the
+running balance of later days by the difference. Bulk Core statements
+(delete(Transaction)...) bypass the ORM, so callers using them must call
+refresh_account_days() for the affected days. rebuild() regenerates the table
+from scratch.
+"""
+import logging
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import event, select, insert, update, delete, func, and_, literal
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from sqlalchemy import inspect as sa_inspect
+
+from app.models_db import Transaction, AccountDailyBalance
+
+logger = logging.getLogger(__name__)
+
+ZERO = Decimal("0.00")
+CENT = Decimal("0.01")
+
+# Transaction attributes that affect a daily bucket
+_TRACKED_ATTRIBUTES = ("society_id", "account_code", "date", "debit_amount", "credit_amount")
+
+AccountDay = Tuple[int, str, date]
+
+
+def _to_decimal(value) -> Decimal:
+    if value is None:
+        return ZERO
+    if isinstance(value, Decimal):
+        return value
+    return Decimal(str(value))
+
+
+def _bucket_key(society_id, account_code, txn_date) -> Optional[AccountDay]:
+    if society_id is None or not account_code or txn_date is None:
+        return None
+    return (society_id, account_code, txn_date)
+
+
+def _previous_value(state, attr: str):
+    """Value of an attribute before the pending change (or current value if unchanged)"""
+    history = state.attrs[attr].history
+    if history.deleted:
+        return history.deleted[0]
+    return getattr(state.object, attr)
+
+
+def _collect_touched_days(session: Session) -> Set[AccountDay]:
+    """(society_id, account_code, date) buckets affected by the pending flush"""
+    touched: Set[AccountDay] = set()
+
+    for obj in list(session.new) + list(session.deleted):
+        if isinstance(obj, Transaction):
+            key = _bucket_key(obj.society_id, obj.account_code, obj.date)
+            if key:
+                touched.add(key)
+
+    for obj in session.dirty:
+        if not isinstance(obj, Transaction):
+            continue
+        state = sa_inspect(obj)
+        if not any(state.attrs[attr].history.has_changes() for attr in _TRACKED_ATTRIBUTES):
+            continue
+        for key in (
+            _bucket_key(obj.society_id, obj.account_code, obj.date),
+            _bucket_key(
+                _previous_value(state, "society_id"),
+                _previous_value(state, "account_code"),
+                _previous_value(state, "date"),
+            ),
+        ):
+            if key:
+                touched.add(key)
+
+    return touched
+
+
+def _refresh_account_days_sync(conn, account_days: Iterable[AccountDay]) -> None:
+    """
+    Re-derive the given daily buckets from `transactions` and propagate the
+    change in net movement to the running balance of every later day.
+    Runs on a synchronous Connection (inside a flush or via run_sync).
+    """
+    txn = Transaction.__table__
+    adb = AccountDailyBalance.__table__
+
+    dates_by_account: Dict[Tuple[int, str], Set[date]] = defaultdict(set)
+    for society_id, account_code, txn_date in account_days:
+        dates_by_account[(society_id, account_code)].add(txn_date)
+
+    now = datetime.utcnow()
+    for (society_id, account_code), dates in dates_by_account.items():
+        dates = sorted(dates)
+        account_filter = and_(txn.c.society_id == society_id, txn.c.account_code == account_code)
+        bucket_filter = and_(adb.c.society_id == society_id, adb.c.account_code == account_code)
+
+        actual = {
+            row.date: (_to_decimal(row.debit_total), _to_decimal(row.credit_total), row.txn_count)
+            for row in conn.execute(
+                select(
+                    txn.c.date,
+                    func.coalesce(func.sum(txn.c.debit_amount), 0).label("debit_total"),
+                    func.coalesce(func.sum(txn.c.credit_amount), 0).label("credit_total"),
+                    func.count(txn.c.id).label("txn_count"),
+                )
+                .where(account_filter, txn.c.date.in_(dates))
+                .group_by(txn.c.date)
+            )
+        }
+        stored = {
+            row.date: row
+            for row in conn.execute(
+                select(adb.c.id, adb.c.date, adb.c.debit_total, adb.c.credit_total)
+                .where(bucket_filter, adb.c.date.in_(dates))
+            )
+        }
+
+        for day in dates:
+            new_debit, new_credit, txn_count = actual.get(day, (ZERO, ZERO, 0))
+            old = stored.get(day)
+            old_net = (_to_decimal(old.debit_total) - _to_decimal(old.credit_total)) if old else ZERO
+            delta = ((new_debit - new_credit) - old_net).quantize(CENT)
+
+            if old is None:
+                if txn_count == 0:
+                    continue
+                previous_running = conn.execute(
+                    select(adb.c.running_balance)
+                    .where(bucket_filter, adb.c.date < day)
+                    .order_by(adb.c.date.desc())
+                    .limit(1)
+                ).scalar()
+                conn.execute(insert(adb).values(
+                    society_id=society_id,
+                    account_code=account_code,
+                    date=day,
+                    debit_total=new_debit,
+                    credit_total=new_credit,
+                    running_balance=_to_decimal(previous_running) + delta,
+                    updated_at=now,
+                ))
+            elif txn_count == 0:
+                conn.execute(delete(adb).where(adb.c.id == old.id))
+            else:
+                conn.execute(
+                    update(adb).where(adb.c.id == old.id).values(
+                        debit_total=new_debit,
+                        credit_total=new_credit,
+                        running_balance=adb.c.running_balance + delta,
+                        updated_at=now,
+                    )
+                )
+
+            if delta != ZERO:
+                conn.execute(
+                    update(adb)
+                    .where(bucket_filter, adb.c.date > day)
+                    .values(running_balance=adb.c.running_balance + delta)
+                )
+
+
+@event.listens_for(Session, "after_flush")
+def _maintain_account_daily_balances(session: Session, flush_context) -> None:
+    """Keep account_daily_balances in step with every ORM write to transactions"""
+    if session.info.get("skip_ledger_snapshots"):
+        return
+    touched = _collect_touched_days(session)
+    if touched:
+        _refresh_account_days_sync(session.connection(), touched)
+
+
+class LedgerSnapshotService:
+    """Service for reading and maintaining the per-account daily balance store."""
+
+    @staticmethod
+    async def refresh_account_days(
+        db: AsyncSession,
+        society_id: int,
+        account_days: Iterable[Tuple[str, date]]
+    ) -> None:
+        """
+        Re-derive specific (account_code, date) buckets after Core bulk writes
+        that the ORM flush hook cannot see (e.g. delete(Transaction).where(...)).
+
+        Args:
+            db: Database session
+            society_id: Society ID
+            account_days: (account_code, date) pairs to refresh
+        """
+        keys = [(society_id, code, day) for code, day in account_days if code and day]
+        if keys:
+            await db.run_sync(lambda sync_session: _refresh_account_days_sync(sync_session.connection(), keys))
+
+    @staticmethod
+    async def rebuild(db: AsyncSession, society_id: Optional[int] = None) -> int:
+        """
+        Regenerate account_daily_balances from `transactions`.
+
+        Args:
+            db: Database session (caller commits)
+            society_id: Rebuild a single society, or all societies when None
+
+        Returns:
+            Number of daily rows written
+        """
+        txn = Transaction.__table__
+        adb = AccountDailyBalance.__table__
+
+        delete_stmt = delete(adb)
+        if society_id is not None:
+            delete_stmt = delete_stmt.where(adb.c.society_id == society_id)
+        await db.execute(delete_stmt)
+
+        daily_filter = [txn.c.account_code.isnot(None), txn.c.account_code != ""]
+        if society_id is not None:
+            daily_filter.append(txn.c.society_id == society_id)
+        daily = (
+            select(
+                txn.c.society_id,
+                txn.c.account_code,
+                txn.c.date,
+                func.coalesce(func.sum(txn.c.debit_amount), 0).label("debit_total"),
+                func.coalesce(func.sum(txn.c.credit_amount), 0).label("credit_total"),
+            )
+            .where(*daily_filter)
+            .group_by(txn.c.society_id, txn.c.account_code, txn.c.date)
+            .subquery()
+        )
+        running = func.sum(daily.c.debit_total - daily.c.credit_total).over(
+            partition_by=(daily.c.society_id, daily.c.account_code),
+            order_by=daily.c.date,
+        )
+        await db.execute(
+            insert(adb).from_select(
+                ["society_id", "account_code", "date", "debit_total", "credit_total",
+                 "running_balance", "updated_at"],
+                select(
+                    daily.c.society_id,
+                    daily.c.account_code,
+                    daily.c.date,
+                    daily.c.debit_total,
+                    daily.c.credit_total,
+                    running,
+                    literal(datetime.utcnow()),
+                ),
+            )
+        )
+
+        count_stmt = select(func.count(adb.c.id))
+        if society_id is not None:
+            count_stmt = count_stmt.where(adb.c.society_id == society_id)
+        return (await db.execute(count_stmt)).scalar() or 0
+
+    @staticmethod
+    async def get_balances_as_on(
+        db: AsyncSession,
+        society_id: int,
+        as_on_date: date,
+        account_codes: Optional[List[str]] = None
+    ) -> Dict[str, Decimal]:
+        """
+        Cumulative (debit - credit) movement per account up to and including a date.
+
+        Each account's value is the running_balance of its latest bucket on or
+        before as_on_date - an index seek per account rather than a transaction scan.
+        Accounts with no movement are absent from the result (treat as zero).
+        """
+        adb = AccountDailyBalance.__table__
+        filters = [adb.c.society_id == society_id, adb.c.date <= as_on_date]
+        if account_codes is not None:
+            if not account_codes:
+                return {}
+            filters.append(adb.c.account_code.in_(account_codes))
+
+        latest = (
+            select(adb.c.account_code, func.max(adb.c.date).label("last_date"))
+            .where(*filters)
+            .group_by(adb.c.account_code)
+            .subquery()
+        )
+        result = await db.execute(
+            select(adb.c.account_code, adb.c.running_balance)
+            .join(latest, and_(
+                adb.c.account_code == latest.c.account_code,
+                adb.c.date == latest.c.last_date,
+            ))
+            .where(adb.c.society_id == society_id)
+        )
+        return {row.account_code: _to_decimal(row.running_balance) for row in result}
+
+    @staticmethod
+    async def get_net_movement(
+        db: AsyncSession,
+        society_id: int,
+        account_code: str,
+        from_date: date,
+        to_date: date
+    ) -> Decimal:
+        """Net (debit - credit) movement of one account between two dates, inclusive"""
+        if to_date < from_date:
+            return ZERO
+        closing = await LedgerSnapshotService.get_balances_as_on(db, society_id, to_date, [account_code])
+        opening = await LedgerSnapshotService.get_balances_as_on(
+            db, society_id, from_date - timedelta(days=1), [account_code]
+        )
+        return closing.get(account_code, ZERO) - opening.get(account_code, ZERO)
+
+    @staticmethod
+    async def get_period_totals(
+        db: AsyncSession,
+        society_id: int,
+        from_date: date,
+        to_date: date
+    ) -> Dict[str, Tuple[Decimal, Decimal]]:
+        """Gross (debit_total, credit_total) per account for a date range, summed over daily buckets"""
+        adb = AccountDailyBalance.__table__
+        result = await db.execute(
+            select(
+                adb.c.account_code,
+                func.coalesce(func.sum(adb.c.debit_total), 0).label("debit_total"),
+                func.coalesce(func.sum(adb.c.credit_total), 0).label("credit_total"),
+            )
+            .where(
+                adb.c.society_id == society_id,
+                adb.c.date >= from_date,
+                adb.c.date <= to_date,
+            )
+            .group_by(adb.c.account_code)
+        )
+        return {
+            row.account_code: (_to_decimal(row.debit_total), _to_decimal(row.credit_total))
+            for row in result
+        }
+
+
+# Create service instance
+ledger_snapshot_service = LedgerSnapshotService()
+
+# Export functions for backward compatibility
+refresh_account_days = ledger_snapshot_service.refresh_account_days
+rebuild_ledger_snapshots = ledger_snapshot_service.rebuild
+get_balances_as_on = ledger_snapshot_service.get_balances_as_on
+get_net_movement = ledger_snapshot_service.get_net_movement
+get_period_totals = ledger_snapshot_service.get_period_totals
@@ -0,0 +1,274 @@
+"""
+Member dues service
+Builds the Member Dues Register with a fixed number of grouped queries
+(independent of the number of flats) and supports server-side paging/sorting
+"""
+import logging
+import math
+from collections import defaultdict
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, func, and_, case
+from fastapi import HTTPException, status
+
+from app.models_db import (
+    Flat, Member, User, UserRole, Transaction,
+    MaintenanceBill, BillStatus
+)
+
+logger = logging.getLogger(__name__)
+
+RECEIVABLE_ACCOUNT_CODE = "1100"  # Maintenance Dues Receivable (member sub-ledger)
+SORT_FIELDS = ("flat_number", "outstanding_amount")
+SORT_ORDERS = ("asc", "desc")
+
+# Description markers used by payment paths that predate Transaction.flat_id
+LEGACY_PAYMENT_MARKERS = ("from ", "Flat: ", "Flat ")
+
+
+def _match_legacy_flat_numbers(description: str, flat_numbers: set, max_len: int) -> set:
+    """
+    Flat numbers referenced by a legacy payment description.
+    Equivalent to LIKE '%from {no}%' / '%Flat: {no}%' / '%Flat {no}%' for every flat,
+    but done with one pass per description instead of one query per flat.
+    """
+    matched = set()
+    for marker in LEGACY_PAYMENT_MARKERS:
+        start = description.find(marker)
+        while start != -1:
+            remainder = description[start + len(marker):start + len(marker) + max_len]
+            for length in range(1, len(remainder) + 1):
+                candidate = remainder[:length]
+                if candidate in flat_numbers:
+                    matched.add(candidate)
+            start = description.find(marker, start + 1)
+    return matched
+
+
+class MemberDuesService:
+    """Service for computing member-wise outstanding dues."""
+
+    @staticmethod
+    async def get_member_dues_report(
+        db: AsyncSession,
+        society_id: int,
+        page: Optional[int] = None,
+        page_size: Optional[int] = None,
+        sort_by: str = "flat_number",
+        sort_order: str = "asc"
+    ) -> Dict[str, Any]:
+        """
+        Outstanding dues for every flat, derived from GL account 1100.
+
+        Outstanding = SUM(debits) - SUM(credits) on 1100 per flat, computed in one
+        grouped query. Paging and sorting are applied in SQL, and bill/member/
+        payment details are fetched only for the flats on the requested page.
+
+        Args:
+            db: Database session
+            society_id: Society ID for filtering
+            page: 1-based page number (None = all flats)
+            page_size: Flats per page (required when page is given)
+            sort_by: 'flat_number' or 'outstanding_amount'
+            sort_order: 'asc' or 'desc'
+
+        Returns:
+            Report dict (same keys as before plus 'pagination')
+        """
+        if sort_by not in SORT_FIELDS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"sort_by must be one of: {', '.join(SORT_FIELDS)}"
+            )
+        if sort_order not in SORT_ORDERS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="sort_order must be 'asc' or 'desc'"
+            )
+
+        # 1. Debits/credits on 1100 for every flat of the society, in one grouped pass
+        dues = (
+            select(
+                Transaction.flat_id.label("flat_id"),
+                func.coalesce(func.sum(Transaction.debit_amount), 0).label("total_debits"),
+                func.coalesce(func.sum(Transaction.credit_amount), 0).label("total_credits"),
+            )
+            .where(
+                and_(
+                    Transaction.account_code == RECEIVABLE_ACCOUNT_CODE,
+                    Transaction.flat_id.isnot(None),
+                    Transaction.society_id == society_id
+                )
+            )
+            .group_by(Transaction.flat_id)
+            .subquery()
+        )
+        outstanding = (
+            func.coalesce(dues.c.total_debits, 0) - func.coalesce(dues.c.total_credits, 0)
+        ).label("outstanding_amount")
+
+        # 2. Society-wide totals (independent of paging)
+        totals_row = (await db.execute(
+            select(
+                func.count(Flat.id),
+                func.coalesce(func.sum(outstanding), 0),
+                func.coalesce(func.sum(case((outstanding > 0, 1), else_=0)), 0),
+            )
+            .select_from(Flat)
+            .outerjoin(dues, dues.c.flat_id == Flat.id)
+            .where(Flat.society_id == society_id)
+        )).one()
+        total_flats = int(totals_row[0] or 0)
+        total_outstanding = Decimal(str(totals_row[1] or 0))
+        flats_with_dues = int(totals_row[2] or 0)
+
+        # 3. The requested page of flats, sorted in SQL
+        sort_column = outstanding if sort_by == "outstanding_amount" else Flat.flat_number
+        primary_order = sort_column.desc() if sort_order == "desc" else sort_column.asc()
+        page_query = (
+            select(Flat.id, Flat.flat_number, Flat.owner_name, outstanding)
+            .outerjoin(dues, dues.c.flat_id == Flat.id)
+            .where(Flat.society_id == society_id)
+            .order_by(primary_order, Flat.flat_number, Flat.id)
+        )
+        if page is not None:
+            page_query = page_query.limit(page_size).offset((page - 1) * page_size)
+        page_flats = (await db.execute(page_query)).all()
+        flat_ids = [row.id for row in page_flats]
+
+        # 4. Unpaid posted bills for the page, one query
+        bills_by_flat: Dict[int, List[MaintenanceBill]] = defaultdict(list)
+        if flat_ids:
+            bills_result = await db.execute(
+                select(MaintenanceBill).where(
+                    and_(
+                        MaintenanceBill.flat_id.in_(flat_ids),
+                        MaintenanceBill.status == BillStatus.UNPAID,
+                        MaintenanceBill.is_posted == True
+                    )
+                ).order_by(MaintenanceBill.year.desc(), MaintenanceBill.month.desc())
+            )
+            for bill in bills_result.scalars().all():
+                bills_by_flat[bill.flat_id].append(bill)
+
+        # 5. Last payment date: credits to 1100 linked by flat_id ...
+        last_payment: Dict[Any, Any] = {}
+        if flat_ids:
+            payments_result = await db.execute(
+                select(Transaction.flat_id, func.max(Transaction.date))
+                .where(
+                    and_(
+                        Transaction.account_code == RECEIVABLE_ACCOUNT_CODE,
+                        Transaction.credit_amount > 0,
+                        Transaction.flat_id.in_(flat_ids)
+                    )
+                )
+                .group_by(Transaction.flat_id)
+            )
+            last_payment = {flat_id: paid_on for flat_id, paid_on in payments_result.all()}
+
+        # ... plus legacy credits that only name the flat in their description
+        flat_numbers = {row.flat_number for row in page_flats if row.flat_number}
+        legacy_last_payment: Dict[str, Any] = {}
+        if flat_numbers:
+            max_len = max(len(n) for n in flat_numbers)
+            legacy_result = await db.execute(
+                select(Transaction.description, func.max(Transaction.date))
+                .where(
+                    and_(
+                        Transaction.society_id == society_id,
+                        Transaction.account_code == RECEIVABLE_ACCOUNT_CODE,
+                        Transaction.credit_amount > 0,
+                        Transaction.flat_id.is_(None)
+                    )
+                )
+                .group_by(Transaction.description)
+            )
+            for description, paid_on in legacy_result.all():
+                for flat_number in _match_legacy_flat_numbers(description or "", flat_numbers, max_len):
+                    if flat_number not in legacy_last_payment or paid_on > legacy_last_payment[flat_number]:
+                        legacy_last_payment[flat_number] = paid_on
+
+        # 6. Member names (MASTER table): primary first, then active, then most recent
+        flat_member_map: Dict[int, str] = {}
+        if flat_ids:
+            members_result = await db.execute(
+                select(Member.flat_id, Member.name)
+                .where(and_(Member.society_id == society_id, Member.flat_id.in_(flat_ids)))
+                .order_by(
+                    Member.is_primary.desc(),
+                    case((Member.status == "active", 0), else_=1),
+                    Member.created_at.desc()
+                )
+            )
+            for member_flat_id, member_name in members_result.all():
+                if member_flat_id and member_name and int(member_flat_id) not in flat_member_map:
+                    flat_member_map[int(member_flat_id)] = member_name
+
+        # Fallback: resident users mapped by apartment number
+        flat_user_map: Dict[str, str] = {}
+        if flat_ids and len(flat_member_map) < len(flat_ids):
+            users_result = await db.execute(
+                select(User.apartment_number, User.name).where(
+                    and_(User.role == UserRole.RESIDENT, User.society_id == society_id)
+                )
+            )
+            for apartment_number, user_name in users_result.all():
+                clean_apt = apartment_number.replace("Flat ", "").replace("flat ", "").strip().upper()
+                if clean_apt not in flat_user_map:
+                    flat_user_map[clean_apt] = user_name
+
+        members = []
+        for row in page_flats:
+            # Priority: 1) Member table, 2) Flat owner_name, 3) User table, 4) Unknown
+            member_name = flat_member_map.get(row.id)
+            if not member_name:
+                member_name = row.owner_name or flat_user_map.get(row.flat_number.strip().upper(), "Unknown")
+
+            paid_on = last_payment.get(row.id)
+            legacy_paid_on = legacy_last_payment.get(row.flat_number)
+            if legacy_paid_on and (paid_on is None or legacy_paid_on > paid_on):
+                paid_on = legacy_paid_on
+
+            unpaid_bills = bills_by_flat.get(row.id, [])
+            members.append({
+                "flat_number": row.flat_number,
+                "owner_name": member_name,
+                "member_name": member_name,  # Also include as member_name for frontend compatibility
+                "outstanding_bills": len(unpaid_bills),
+                "outstanding_amount": float(Decimal(str(row.outstanding_amount or 0))),
+                "last_payment": paid_on.isoformat() if paid_on else "Never",
+                "bills": [
+                    {
+                        "month": bill.month,
+                        "year": bill.year,
+                        "amount": float(bill.total_amount)
+                    } for bill in unpaid_bills
+                ]
+            })
+
+        return {
+            "report_type": "Member Dues Report",
+            "generated_at": datetime.utcnow(),
+            "total_flats": total_flats,
+            "flats_with_dues": flats_with_dues,
+            "total_outstanding": float(total_outstanding),
+            "members": members,
+            "pagination": {
+                "page": page or 1,
+                "page_size": page_size if page is not None else total_flats,
+                "total_pages": math.ceil(total_flats / page_size) if page is not None and page_size else 1,
+                "sort_by": sort_by,
+                "sort_order": sort_order
+            }
+        }
+
+
+# Create service instance
+member_dues_service = MemberDuesService()
+
+# Export functions for backward compatibility
+get_member_dues_report = member_dues_service.get_member_dues_report
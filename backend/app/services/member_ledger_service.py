@@ -0,0 +1,217 @@
+"""
+Member ledger service
+Builds a flat's ledger (bills as debits, receipts as credits) in the database:
+a UNION ALL of the period's maintenance bills and payments with a
+SUM() OVER (ORDER BY date, kind, id) running balance on top of the balance
+carried in from before the period. The opening balance, the running balances
+and the period totals come from one statement, and only the requested page is
+returned to Python.
+
+Window functions need SQLite >= 3.25 (bundled with Python 3.8+) or Postgres.
+"""
+import calendar
+import math
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from typing import Any, Dict, Optional
+
+from sqlalchemy import select, func, cast, literal, null, type_coerce, union_all, Date, Integer, Numeric
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models_db import MaintenanceBill, Payment
+
+# Bills sort ahead of receipts dated the same day
+KIND_BILL = 0
+KIND_PAYMENT = 1
+MONTH_NAMES = tuple(calendar.month_name)
+
+
+def _day_start(day: date) -> datetime:
+    return datetime.combine(day, datetime.min.time())
+
+
+def _opening_balance(society_id: int, flat_id: int, from_date: Optional[date]):
+    """Scalar subquery: bills less receipts dated before from_date"""
+    if not from_date:
+        return cast(literal(0), Numeric(18, 2))
+    billed = select(func.coalesce(func.sum(MaintenanceBill.total_amount), 0)).where(
+        MaintenanceBill.society_id == society_id,
+        MaintenanceBill.flat_id == flat_id,
+        MaintenanceBill.created_at < _day_start(from_date)
+    ).scalar_subquery()
+    received = select(func.coalesce(func.sum(Payment.amount), 0)).where(
+        Payment.society_id == society_id,
+        Payment.flat_id == flat_id,
+        Payment.payment_date < from_date
+    ).scalar_subquery()
+    return cast(billed - received, Numeric(18, 2))
+
+
+def _period_entries(society_id: int, flat_id: int, from_date: Optional[date], to_date: Optional[date]):
+    """Bills and payments of one flat dated within the period, as one UNION ALL"""
+    zero = cast(literal(0), Numeric(18, 2))
+    bills = select(
+        literal(KIND_BILL, Integer).label("kind"),
+        MaintenanceBill.id.label("ref_id"),
+        func.date(MaintenanceBill.created_at, type_=Date).label("entry_date"),
+        cast(MaintenanceBill.total_amount, Numeric(18, 2)).label("debit"),
+        zero.label("credit"),
+        MaintenanceBill.bill_number.label("ref_number"),
+        MaintenanceBill.month.label("month"),
+        MaintenanceBill.year.label("year"),
+        MaintenanceBill.status.label("bill_status"),
+        MaintenanceBill.paid_date.label("paid_date"),
+        type_coerce(null(), Payment.payment_mode.type).label("payment_mode"),
+    ).where(
+        MaintenanceBill.society_id == society_id,
+        MaintenanceBill.flat_id == flat_id
+    )
+    payments = select(
+        literal(KIND_PAYMENT, Integer).label("kind"),
+        Payment.id.label("ref_id"),
+        Payment.payment_date.label("entry_date"),
+        zero.label("debit"),
+        cast(Payment.amount, Numeric(18, 2)).label("credit"),
+        Payment.receipt_number.label("ref_number"),
+        cast(null(), Integer).label("month"),
+        cast(null(), Integer).label("year"),
+        type_coerce(null(), MaintenanceBill.status.type).label("bill_status"),
+        cast(null(), Date).label("paid_date"),
+        Payment.payment_mode.label("payment_mode"),
+    ).where(
+        Payment.society_id == society_id,
+        Payment.flat_id == flat_id
+    )
+    # Bounds go on the raw columns so both branches are index range scans
+    if from_date:
+        bills = bills.where(MaintenanceBill.created_at >= _day_start(from_date))
+        payments = payments.where(Payment.payment_date >= from_date)
+    if to_date:
+        bills = bills.where(MaintenanceBill.created_at < _day_start(to_date + timedelta(days=1)))
+        payments = payments.where(Payment.payment_date <= to_date)
+    return union_all(bills, payments).subquery("member_entries")
+
+
+def _money(value) -> Decimal:
+    return Decimal(str(value or 0))
+
+
+def _entry(row) -> Dict[str, Any]:
+    """API shape of one windowed ledger row"""
+    balance = round(float(row.balance), 2)
+    if row.kind == KIND_BILL:
+        debit = float(row.debit)
+        return {
+            "date": row.entry_date,
+            "description": f"Bill #{row.ref_number} - {MONTH_NAMES[row.month]} {row.year}",
+            "type": "DEBIT",
+            "debit": debit,
+            "credit": 0.0,
+            "balance": balance,
+            "ref_id": row.ref_id,
+            "amount": debit,
+            "status": row.bill_status.value if hasattr(row.bill_status, "value") else str(row.bill_status),
+            "paid_at": row.paid_date,
+        }
+    credit = float(row.credit)
+    payment_mode = row.payment_mode.value if hasattr(row.payment_mode, "value") else str(row.payment_mode)
+    return {
+        "date": row.entry_date,
+        "description": f"Receipt #{row.ref_number} ({payment_mode})",
+        "type": "CREDIT",
+        "debit": 0.0,
+        "credit": credit,
+        "balance": balance,
+        "ref_id": row.ref_id,
+        "amount": credit,
+        "status": "received",
+        "paid_at": row.entry_date,
+    }
+
+
+async def get_member_ledger(
+    db: AsyncSession,
+    society_id: int,
+    flat_id: int,
+    from_date: Optional[date] = None,
+    to_date: Optional[date] = None,
+    page: Optional[int] = None,
+    page_size: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Ledger of one flat for a period, optionally one page at a time.
+
+    Args:
+        db: Database session
+        society_id: Society ID for filtering
+        flat_id: Flat whose bills and receipts make up the ledger
+        from_date: First day of the period (None = from the first entry)
+        to_date: Last day of the period (None = up to the last entry)
+        page: 1-based page number (None = the whole period)
+        page_size: Entries per page (required when page is given)
+
+    Returns:
+        Dict with the period's opening balance, totals and closing balance,
+        the entries of the requested slice with running balances, and
+        'pagination' (including the balance brought forward to the page)
+    """
+    opening = _opening_balance(society_id, flat_id, from_date)
+    entries = _period_entries(society_id, flat_id, from_date, to_date)
+
+    # Running balance and period totals are window functions over the period's
+    # entries, evaluated before LIMIT/OFFSET, so one statement yields the page,
+    # the balance carried into it and the period figures
+    order = (entries.c.entry_date, entries.c.kind, entries.c.ref_id)
+    page_query = (
+        select(
+            *entries.c,
+            (opening + func.sum(entries.c.debit - entries.c.credit).over(order_by=order)).label("balance"),
+            opening.label("period_opening"),
+            func.count().over().label("total_entries"),
+            func.sum(entries.c.debit).over().label("total_debit"),
+            func.sum(entries.c.credit).over().label("total_credit"),
+        )
+        .order_by(*order)
+    )
+    if page is not None:
+        page_query = page_query.limit(page_size).offset((page - 1) * page_size)
+    rows = (await db.execute(page_query)).all()
+
+    if rows:
+        first = rows[0]
+        total_entries = int(first.total_entries)
+        opening_balance = _money(first.period_opening)
+        total_debit = _money(first.total_debit)
+        total_credit = _money(first.total_credit)
+        brought_forward = _money(first.balance) - _money(first.debit) + _money(first.credit)
+    else:
+        # Empty period, or a page past the end: same entries, aggregated instead
+        summary = (await db.execute(
+            select(
+                opening,
+                select(func.count()).select_from(entries).scalar_subquery(),
+                select(func.sum(entries.c.debit)).scalar_subquery(),
+                select(func.sum(entries.c.credit)).scalar_subquery(),
+            )
+        )).one()
+        opening_balance = _money(summary[0])
+        total_entries = int(summary[1] or 0)
+        total_debit = _money(summary[2])
+        total_credit = _money(summary[3])
+        brought_forward = opening_balance + total_debit - total_credit
+
+    closing_balance = opening_balance + total_debit - total_credit
+    return {
+        "opening_balance": float(opening_balance.quantize(Decimal("0.01"))),
+        "entries": [_entry(row) for row in rows],
+        "closing_balance": float(closing_balance.quantize(Decimal("0.01"))),
+        "total_debit": float(total_debit.quantize(Decimal("0.01"))),
+        "total_credit": float(total_credit.quantize(Decimal("0.01"))),
+        "pagination": {
+            "page": page or 1,
+            "page_size": page_size if page is not None else total_entries,
+            "total_entries": total_entries,
+            "total_pages": math.ceil(total_entries / page_size) if page is not None and page_size else 1,
+            "brought_forward": float(brought_forward.quantize(Decimal("0.01"))),
+        },
+    }
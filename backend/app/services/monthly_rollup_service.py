@@ -0,0 +1,301 @@
+"""
+Monthly rollup service
+Maintains the monthly_account_rollups table (per-account, per-month debit and
+credit totals with a posting count) so dashboards, trend charts and period
+summaries read a few rows per account instead of aggregating transactions.
+
+Like the daily ledger snapshots, the table is kept in step with `transactions`
+by an after_flush hook: every flush that inserts, edits or deletes Transaction
+rows re-derives the touched (society, account, month) buckets. Bulk Core
+statements bypass the ORM, so callers using them must call
+refresh_account_months() for the affected days. rebuild() regenerates the
+table from scratch.
+"""
+import logging
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import event, select, insert, update, delete, func, and_, or_, cast, literal, extract, Integer
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.models_db import Transaction, MonthlyAccountRollup
+from app.services.ledger_snapshot_service import _collect_touched_days, get_period_totals as get_daily_period_totals
+
+logger = logging.getLogger(__name__)
+
+ZERO = Decimal("0.00")
+
+AccountMonth = Tuple[int, str, int, int]
+
+
+def _to_decimal(value) -> Decimal:
+    if value is None:
+        return ZERO
+    if isinstance(value, Decimal):
+        return value
+    return Decimal(str(value))
+
+
+def _month_start(year: int, month: int) -> date:
+    return date(year, month, 1)
+
+
+def _next_month_start(year: int, month: int) -> date:
+    return date(year + 1, 1, 1) if month == 12 else date(year, month + 1, 1)
+
+
+def _month_range_filter(table, start: Tuple[int, int], end: Tuple[int, int]):
+    """(year, month) between start and end inclusive, as index-friendly comparisons"""
+    (start_year, start_month), (end_year, end_month) = start, end
+    return and_(
+        or_(table.c.year > start_year, and_(table.c.year == start_year, table.c.month >= start_month)),
+        or_(table.c.year < end_year, and_(table.c.year == end_year, table.c.month <= end_month)),
+    )
+
+
+def _refresh_account_months_sync(conn, account_months: Iterable[AccountMonth]) -> None:
+    """
+    Re-derive the given monthly buckets from `transactions`.
+    Runs on a synchronous Connection (inside a flush or via run_sync).
+    """
+    txn = Transaction.__table__
+    mar = MonthlyAccountRollup.__table__
+    now = datetime.utcnow()
+
+    for society_id, account_code, year, month in sorted(set(account_months)):
+        actual = conn.execute(
+            select(
+                func.coalesce(func.sum(txn.c.debit_amount), 0).label("debit_total"),
+                func.coalesce(func.sum(txn.c.credit_amount), 0).label("credit_total"),
+                func.count(txn.c.id).label("txn_count"),
+            ).where(
+                txn.c.society_id == society_id,
+                txn.c.account_code == account_code,
+                txn.c.date >= _month_start(year, month),
+                txn.c.date < _next_month_start(year, month),
+            )
+        ).one()
+        bucket_filter = and_(
+            mar.c.society_id == society_id,
+            mar.c.account_code == account_code,
+            mar.c.year == year,
+            mar.c.month == month,
+        )
+        stored_id = conn.execute(select(mar.c.id).where(bucket_filter)).scalar()
+
+        if not actual.txn_count:
+            if stored_id is not None:
+                conn.execute(delete(mar).where(mar.c.id == stored_id))
+        elif stored_id is None:
+            conn.execute(insert(mar).values(
+                society_id=society_id,
+                account_code=account_code,
+                year=year,
+                month=month,
+                debit_total=_to_decimal(actual.debit_total),
+                credit_total=_to_decimal(actual.credit_total),
+                txn_count=actual.txn_count,
+                updated_at=now,
+            ))
+        else:
+            conn.execute(update(mar).where(mar.c.id == stored_id).values(
+                debit_total=_to_decimal(actual.debit_total),
+                credit_total=_to_decimal(actual.credit_total),
+                txn_count=actual.txn_count,
+                updated_at=now,
+            ))
+
+
+@event.listens_for(Session, "after_flush")
+def _maintain_monthly_account_rollups(session: Session, flush_context) -> None:
+    """Keep monthly_account_rollups in step with every ORM write to transactions"""
+    if session.info.get("skip_ledger_snapshots"):
+        return
+    touched = {
+        (society_id, account_code, txn_date.year, txn_date.month)
+        for society_id, account_code, txn_date in _collect_touched_days(session)
+    }
+    if touched:
+        _refresh_account_months_sync(session.connection(), touched)
+
+
+class MonthlyRollupService:
+    """Service for reading and maintaining the per-account monthly rollups."""
+
+    @staticmethod
+    async def refresh_account_months(
+        db: AsyncSession,
+        society_id: int,
+        account_days: Iterable[Tuple[str, date]]
+    ) -> None:
+        """
+        Re-derive the months containing specific (account_code, date) pairs after
+        Core bulk writes that the ORM flush hook cannot see.
+
+        Args:
+            db: Database session
+            society_id: Society ID
+            account_days: (account_code, date) pairs whose months changed
+        """
+        keys = [(society_id, code, day.year, day.month) for code, day in account_days if code and day]
+        if keys:
+            await db.run_sync(lambda sync_session: _refresh_account_months_sync(sync_session.connection(), keys))
+
+    @staticmethod
+    async def rebuild(db: AsyncSession, society_id: Optional[int] = None) -> int:
+        """
+        Regenerate monthly_account_rollups from `transactions`.
+
+        Args:
+            db: Database session (caller commits)
+            society_id: Rebuild a single society, or all societies when None
+
+        Returns:
+            Number of monthly rows written
+        """
+        txn = Transaction.__table__
+        mar = MonthlyAccountRollup.__table__
+
+        delete_stmt = delete(mar)
+        if society_id is not None:
+            delete_stmt = delete_stmt.where(mar.c.society_id == society_id)
+        await db.execute(delete_stmt)
+
+        monthly_filter = [txn.c.account_code.isnot(None), txn.c.account_code != "", txn.c.date.isnot(None)]
+        if society_id is not None:
+            monthly_filter.append(txn.c.society_id == society_id)
+        year = cast(extract("year", txn.c.date), Integer)
+        month = cast(extract("month", txn.c.date), Integer)
+        await db.execute(
+            insert(mar).from_select(
+                ["society_id", "account_code", "year", "month", "debit_total", "credit_total",
+                 "txn_count", "updated_at"],
+                select(
+                    txn.c.society_id,
+                    txn.c.account_code,
+                    year,
+                    month,
+                    func.coalesce(func.sum(txn.c.debit_amount), 0),
+                    func.coalesce(func.sum(txn.c.credit_amount), 0),
+                    func.count(txn.c.id),
+                    literal(datetime.utcnow()),
+                )
+                .where(*monthly_filter)
+                .group_by(txn.c.society_id, txn.c.account_code, year, month)
+            )
+        )
+
+        count_stmt = select(func.count(mar.c.id))
+        if society_id is not None:
+            count_stmt = count_stmt.where(mar.c.society_id == society_id)
+        return (await db.execute(count_stmt)).scalar() or 0
+
+    @staticmethod
+    async def get_monthly_totals(
+        db: AsyncSession,
+        society_id: int,
+        start: Tuple[int, int],
+        end: Tuple[int, int],
+        account_codes: Optional[List[str]] = None
+    ) -> Dict[Tuple[int, int], Dict[str, Tuple[Decimal, Decimal, int]]]:
+        """
+        Monthly (debit_total, credit_total, txn_count) per account.
+
+        Args:
+            db: Database session
+            society_id: Society ID
+            start: First (year, month), inclusive
+            end: Last (year, month), inclusive
+            account_codes: Limit to these accounts (None = all)
+
+        Returns:
+            {(year, month): {account_code: (debit, credit, count)}}; months and
+            accounts without postings are absent
+        """
+        mar = MonthlyAccountRollup.__table__
+        filters = [mar.c.society_id == society_id, _month_range_filter(mar, start, end)]
+        if account_codes is not None:
+            if not account_codes:
+                return {}
+            filters.append(mar.c.account_code.in_(account_codes))
+
+        totals: Dict[Tuple[int, int], Dict[str, Tuple[Decimal, Decimal, int]]] = defaultdict(dict)
+        result = await db.execute(
+            select(mar.c.year, mar.c.month, mar.c.account_code,
+                   mar.c.debit_total, mar.c.credit_total, mar.c.txn_count)
+            .where(*filters)
+        )
+        for row in result:
+            totals[(row.year, row.month)][row.account_code] = (
+                _to_decimal(row.debit_total), _to_decimal(row.credit_total), row.txn_count
+            )
+        return dict(totals)
+
+    @staticmethod
+    async def get_period_totals(
+        db: AsyncSession,
+        society_id: int,
+        from_date: date,
+        to_date: date
+    ) -> Dict[str, Tuple[Decimal, Decimal]]:
+        """
+        Gross (debit_total, credit_total) per account for any date range.
+
+        Whole months come from monthly rollups; the partial months at either
+        end come from the daily ledger snapshots, so a financial year costs
+        one grouped read of at most twelve rows per account.
+        """
+        if to_date < from_date:
+            return {}
+        first_whole = from_date if from_date.day == 1 else _next_month_start(from_date.year, from_date.month)
+        after_last_whole = _next_month_start(to_date.year, to_date.month)
+        if after_last_whole - timedelta(days=1) != to_date:
+            after_last_whole = _month_start(to_date.year, to_date.month)
+
+        if first_whole >= after_last_whole:
+            return await get_daily_period_totals(db, society_id, from_date, to_date)
+
+        mar = MonthlyAccountRollup.__table__
+        last_whole = after_last_whole - timedelta(days=1)
+        result = await db.execute(
+            select(
+                mar.c.account_code,
+                func.coalesce(func.sum(mar.c.debit_total), 0).label("debit_total"),
+                func.coalesce(func.sum(mar.c.credit_total), 0).label("credit_total"),
+            )
+            .where(
+                mar.c.society_id == society_id,
+                _month_range_filter(
+                    mar, (first_whole.year, first_whole.month), (last_whole.year, last_whole.month)
+                ),
+            )
+            .group_by(mar.c.account_code)
+        )
+        totals: Dict[str, Tuple[Decimal, Decimal]] = {
+            row.account_code: (_to_decimal(row.debit_total), _to_decimal(row.credit_total))
+            for row in result
+        }
+
+        edges = []
+        if from_date < first_whole:
+            edges.append((from_date, first_whole - timedelta(days=1)))
+        if after_last_whole <= to_date:
+            edges.append((after_last_whole, to_date))
+        for edge_from, edge_to in edges:
+            for code, (debit, credit) in (await get_daily_period_totals(db, society_id, edge_from, edge_to)).items():
+                prev_debit, prev_credit = totals.get(code, (ZERO, ZERO))
+                totals[code] = (prev_debit + debit, prev_credit + credit)
+        return totals
+
+
+# Create service instance
+monthly_rollup_service = MonthlyRollupService()
+
+# Export functions for backward compatibility
+refresh_account_months = monthly_rollup_service.refresh_account_months
+rebuild_monthly_rollups = monthly_rollup_service.rebuild
+get_monthly_totals = monthly_rollup_service.get_monthly_totals
+get_rollup_period_totals = monthly_rollup_service.get_period_totals
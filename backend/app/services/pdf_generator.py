@@ -4,6 +4,7 @@ Generates PDFs in memory WITHOUT storing them.
 Critical: No file writes, no database storage.
 """
 from io import BytesIO
+from functools import lru_cache
 from typing import Dict
 import logging
 import warnings
@@ -21,28 +22,32 @@ warnings.filterwarnings('ignore', category=RuntimeWarning)
 # On Linux/Mac, try to use WeasyPrint, but fall back to reportlab if it fails
 IS_WINDOWS = platform.system() == 'Windows'
 
-HAS_WEASYPRINT = False
-# Skip WeasyPrint on Windows - it requires system libraries (Pango, Cairo) that are difficult to install
-# On Windows, we'll use reportlab which works without system dependencies
-if not IS_WINDOWS:
-    # Only try WeasyPrint on non-Windows systems
+
+@lru_cache(maxsize=None)
+def has_reportlab() -> bool:
+    """reportlab is importable (checked on the first PDF, not at startup)"""
+    try:
+        import reportlab  # noqa: F401
+        return True
+    except ImportError:
+        logger.warning("reportlab not installed. PDF generation may not work.")
+        return False
+
+
+@lru_cache(maxsize=None)
+def has_weasyprint() -> bool:
+    """
+    WeasyPrint is importable. Only probed when reportlab is missing - loading it
+    tries Pango/Cairo, which is slow and skipped entirely on Windows.
+    """
+    if IS_WINDOWS:
+        return False
     try:
-        from weasyprint import HTML, CSS
-        HAS_WEASYPRINT = True
+        from weasyprint import HTML  # noqa: F401
+        return True
     except (ImportError, OSError, Exception):
         # Silently fail - we'll use reportlab instead
-        HAS_WEASYPRINT = False
-
-try:
-    # Fallback: Try reportlab
-    from reportlab.lib.pagesizes import A4
-    from reportlab.lib.styles import getSampleStyleSheet
-    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
-    from reportlab.lib.units import inch
-    HAS_REPORTLAB = True
-except ImportError:
-    HAS_REPORTLAB = False
-    logger.warning("reportlab not installed. PDF generation may not work.")
+        return False
 
 
 class PDFGenerator:
@@ -81,6 +86,8 @@ class PDFGenerator:
         Returns PDF as bytes (NOT saved to disk).
         """
         try:
+            from weasyprint import HTML
+
             # Generate PDF directly to BytesIO buffer (in-memory file)
             pdf_buffer = BytesIO()
             
@@ -104,6 +111,10 @@ class PDFGenerator:
         This is the recommended method for Windows (no system dependencies).
         """
         try:
+            from reportlab.lib.pagesizes import A4
+            from reportlab.lib.styles import getSampleStyleSheet
+            from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
+            from reportlab.lib.units import inch
             from reportlab.lib.utils import ImageReader
             from reportlab.platypus import Table, TableStyle, Image, KeepTogether
             from reportlab.lib import colors
@@ -254,9 +265,9 @@ class PDFGenerator:
             header_data: Optional dict with 'society_name', 'society_address', 'society_logo_url'
         """
         # Prefer reportlab on Windows (works better without system dependencies)
-        if HAS_REPORTLAB:
+        if has_reportlab():
             return self.html_to_pdf_reportlab(html_content, header_data)
-        elif HAS_WEASYPRINT:
+        elif has_weasyprint():
             # For weasyprint, we need to inject header into HTML
             if header_data:
                 html_content = self._inject_header_to_html(html_content, header_data)
@@ -335,3 +346,12 @@ class PDFGenerator:
 # Singleton instance
 pdf_generator = PDFGenerator()
 
+
+# Module-level entry points for the render process pool (bound methods cannot be shipped to workers)
+def generate_document(template_html: str, form_data: Dict[str, str], header_data: Dict[str, str] = None) -> bytes:
+    return pdf_generator.generate_document(template_html, form_data, header_data)
+
+
+def html_to_pdf(html_content: str, header_data: Dict[str, str] = None) -> bytes:
+    return pdf_generator.html_to_pdf(html_content, header_data)
+
@@ -0,0 +1,234 @@
+"""
+Render executor service
+Runs CPU-bound report rendering (openpyxl, reportlab, WeasyPrint) in a
+dedicated process pool so a large PDF/Excel export does not block the event
+loop that serves every other request on the worker.
+
+Routes call `await render_document(SomeExporter.create_x_pdf, *args)`; the
+target is resolved by import path inside the worker process, so it must be a
+module-level function or a static method. BytesIO results are returned as
+BytesIO, everything else as-is.
+
+Back-pressure: at most RENDER_MAX_PENDING renders may be queued or running per
+API worker. A request that cannot get a slot within RENDER_QUEUE_TIMEOUT_SECONDS
+is rejected with 503 so clients retry instead of piling up behind the pool.
+A render that exceeds RENDER_TIMEOUT_SECONDS returns 504 but keeps its slot
+until the worker actually finishes it.
+"""
+import asyncio
+import importlib
+import logging
+import multiprocessing
+import os
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from io import BytesIO
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from fastapi import HTTPException, status
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def _resolve_target(path: str) -> Callable:
+    """'package.module:Class.method' -> callable"""
+    module_name, _, qualname = path.partition(":")
+    target: Any = importlib.import_module(module_name)
+    for attr in qualname.split("."):
+        target = getattr(target, attr)
+    return target
+
+
+def _run_render(path: str, args: tuple, kwargs: dict) -> Tuple[Any, bool, float]:
+    """Worker-process entry point: render and return (payload, was_bytesio, render_ms)"""
+    started = time.perf_counter()
+    result = _resolve_target(path)(*args, **kwargs)
+    was_bytesio = isinstance(result, BytesIO)
+    if was_bytesio:
+        result = result.getvalue()
+    return result, was_bytesio, (time.perf_counter() - started) * 1000
+
+
+def _import_modules(modules: Tuple[str, ...]) -> None:
+    """Worker-process warm-up: import the render stack before the first real render"""
+    for module in modules:
+        importlib.import_module(module)
+
+
+def _target_path(target: Callable) -> str:
+    qualname = getattr(target, "__qualname__", "")
+    if "<locals>" in qualname or getattr(target, "__self__", None) is not None:
+        raise TypeError(f"{qualname or target!r} is not importable in a worker process; use a module-level function or staticmethod")
+    return f"{target.__module__}:{qualname}"
+
+
+class RenderExecutor:
+    """Process pool plus admission control and timing metrics for document rendering."""
+
+    def __init__(self, pool_size: int, max_pending: int, queue_timeout: float, render_timeout: float):
+        self.pool_size = pool_size
+        self.max_pending = max_pending
+        self.queue_timeout = queue_timeout
+        self.render_timeout = render_timeout
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self.in_flight = 0
+        self.rejected = 0
+        self.timeouts = 0
+        self._metrics: Dict[str, Dict[str, float]] = defaultdict(lambda: {
+            "count": 0, "errors": 0, "total_ms": 0.0, "max_ms": 0.0, "last_ms": 0.0, "queue_wait_ms": 0.0
+        })
+
+    def _get_pool(self) -> Optional[ProcessPoolExecutor]:
+        if self.pool_size <= 0:
+            return None  # Rendering runs in the default thread pool instead
+        if self._pool is None:
+            # spawn: workers start clean (no inherited DB connections or event loop), same on every OS
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.pool_size,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._pool
+
+    def _get_slots(self) -> asyncio.Semaphore:
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_pending)
+        return self._slots
+
+    async def render(self, target: Callable, *args, **kwargs) -> Any:
+        """Render off the event loop and return the target's result"""
+        path = _target_path(target)
+        metrics = self._metrics[path]
+
+        queued_at = time.perf_counter()
+        slots = self._get_slots()
+        try:
+            await asyncio.wait_for(slots.acquire(), timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            self.rejected += 1
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Report rendering is busy. Please retry in a few seconds.",
+                headers={"Retry-After": "5"}
+            )
+
+        self.in_flight += 1
+        metrics["queue_wait_ms"] += (time.perf_counter() - queued_at) * 1000
+        started = time.perf_counter()
+        loop = asyncio.get_running_loop()
+        pool = self._get_pool()
+        try:
+            future = loop.run_in_executor(pool, _run_render, path, args, kwargs)
+        except BaseException:
+            self._release_slot()
+            raise
+        # The slot is held until the render really finishes, not until this request gives up
+        # waiting, so timed-out renders still count against RENDER_MAX_PENDING
+        future.add_done_callback(self._on_render_done)
+        try:
+            payload, was_bytesio, render_ms = await asyncio.wait_for(asyncio.shield(future), timeout=self.render_timeout)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            metrics["errors"] += 1
+            raise HTTPException(
+                status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+                detail="Report rendering timed out"
+            )
+        except BrokenProcessPool:
+            # A worker died (e.g. out of memory); start a fresh pool for the next request
+            metrics["errors"] += 1
+            self._discard_pool(pool)
+            logger.error(f"Render pool broke while rendering {path}; pool will be recreated")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Report rendering failed"
+            )
+        except Exception:
+            metrics["errors"] += 1
+            raise
+
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        metrics["count"] += 1
+        metrics["total_ms"] += elapsed_ms
+        metrics["last_ms"] = elapsed_ms
+        metrics["max_ms"] = max(metrics["max_ms"], elapsed_ms)
+        logger.debug(f"Rendered {path} in {render_ms:.0f} ms ({elapsed_ms:.0f} ms incl. transfer)")
+
+        return BytesIO(payload) if was_bytesio else payload
+
+    def _release_slot(self) -> None:
+        self.in_flight -= 1
+        self._get_slots().release()
+
+    def _on_render_done(self, future: asyncio.Future) -> None:
+        self._release_slot()
+        if not future.cancelled():
+            future.exception()  # Mark retrieved: nobody awaits a render that timed out
+
+    async def warm_up(self, modules: Tuple[str, ...]) -> None:
+        """Start the pool's workers and import modules in each (best effort, no-op without a pool)"""
+        pool = self._get_pool()
+        if pool is None:
+            return
+        loop = asyncio.get_running_loop()
+        results = await asyncio.gather(
+            *(loop.run_in_executor(pool, _import_modules, modules) for _ in range(self.pool_size)),
+            return_exceptions=True
+        )
+        for result in results:
+            if isinstance(result, BaseException):
+                logger.warning(f"Render worker warm-up failed: {result}")
+                break
+
+    def stats(self) -> dict:
+        renders = {}
+        for path, m in self._metrics.items():
+            attempts = m["count"] + m["errors"]
+            renders[path] = {
+                "count": int(m["count"]),
+                "errors": int(m["errors"]),
+                "avg_ms": round(m["total_ms"] / m["count"], 2) if m["count"] else 0.0,
+                "max_ms": round(m["max_ms"], 2),
+                "last_ms": round(m["last_ms"], 2),
+                "avg_queue_wait_ms": round(m["queue_wait_ms"] / attempts, 2) if attempts else 0.0
+            }
+        return {
+            "pool_size": self.pool_size,
+            "max_pending": self.max_pending,
+            "in_flight": self.in_flight,
+            "rejected": self.rejected,
+            "timeouts": self.timeouts,
+            "renders": renders
+        }
+
+    def _discard_pool(self, pool: ProcessPoolExecutor) -> None:
+        """Shut down a broken pool; concurrent failures from the same pool must not drop its replacement"""
+        pool.shutdown(wait=False, cancel_futures=True)
+        if self._pool is pool:
+            self._pool = None
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+
+def _default_pool_size() -> int:
+    if settings.RENDER_POOL_SIZE >= 0:
+        return settings.RENDER_POOL_SIZE
+    return max(1, min(4, (os.cpu_count() or 2) - 1))
+
+
+render_executor = RenderExecutor(
+    pool_size=_default_pool_size(),
+    max_pending=settings.RENDER_MAX_PENDING,
+    queue_timeout=settings.RENDER_QUEUE_TIMEOUT_SECONDS,
+    render_timeout=settings.RENDER_TIMEOUT_SECONDS
+)
+
+# Export functions for convenience
+render_document = render_executor.render
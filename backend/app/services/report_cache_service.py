@@ -0,0 +1,391 @@
+"""
+Report cache service
+Caches computed report results (Balance Sheet, Income & Expenditure, Trial
+Balance) keyed by (society_id, report name, parameters, ledger version).
+
+Ledger version: a per-society counter in `ledger_versions`, bumped inside the
+same transaction as every ORM write to a ledger table (transactions,
+journal_entries, opening_balances, maintenance_bills, plus account_codes,
+financial_years and societies, which also shape report output). Because the
+bump commits or rolls back with the write itself, every API worker sees a new
+version exactly when the new data becomes visible, and stale entries are
+never served - they simply stop being looked up and age out of the LRU.
+
+- Flushed ORM objects bump their own society.
+- Bulk ORM statements (insert/update/delete on a ledger table through
+  session.execute) bump the society named in bulk-insert parameters, or the
+  global version (society_id 0) when the society cannot be determined.
+- Raw SQL through connection.execute() bypasses both hooks; callers doing that
+  must call bump_ledger_version().
+
+Backends (REPORT_CACHE_BACKEND):
+- "memory": in-process LRU capped by REPORT_CACHE_MAX_BYTES / _ENTRIES (per worker)
+- "database": report_cache_entries table, shared by all workers
+- "none": caching disabled (versions are still maintained)
+"""
+import hashlib
+import json
+import logging
+import pickle
+import time
+from collections import OrderedDict, defaultdict
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Set
+
+from sqlalchemy import event, select, update, delete, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from app.config import settings
+from app.services.single_flight import report_single_flight
+from app.models_db import (
+    Transaction, JournalEntry, OpeningBalance, MaintenanceBill, AccountCode,
+    FinancialYear, Society, LedgerVersion, ReportCacheEntry
+)
+
+logger = logging.getLogger(__name__)
+
+GLOBAL_LEDGER_SCOPE = 0  # ledger_versions row bumped when the affected society is unknown
+# A cache hit refreshes last_hit_at (the LRU order of the database backend) at most this often,
+# so hot entries are not rewritten on every read
+LAST_HIT_REFRESH_INTERVAL = timedelta(minutes=5)
+
+# Models whose rows feed the cached reports, and the attribute holding their society id
+LEDGER_MODELS = {
+    Transaction: "society_id",
+    JournalEntry: "society_id",
+    OpeningBalance: "society_id",
+    MaintenanceBill: "society_id",
+    AccountCode: "society_id",
+    FinancialYear: "society_id",
+    Society: "id",
+}
+LEDGER_TABLES = {model.__table__.name: attr for model, attr in LEDGER_MODELS.items()}
+
+
+# ============ LEDGER VERSION MAINTENANCE ============
+
+def _bump_ledger_versions_sync(connection, society_ids: Iterable[int]) -> None:
+    """Increment (or create) the ledger_versions rows for the given societies"""
+    rows = [{"society_id": sid, "version": 1, "updated_at": datetime.utcnow()} for sid in sorted(set(society_ids))]
+    if not rows:
+        return
+    table = LedgerVersion.__table__
+    dialect_insert = pg_insert if connection.dialect.name == "postgresql" else sqlite_insert
+    stmt = dialect_insert(table)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c.society_id],
+        set_={"version": table.c.version + 1, "updated_at": stmt.excluded.updated_at}
+    )
+    connection.execute(stmt, rows)
+
+
+def _collect_flushed_societies(session: Session) -> Set[int]:
+    societies: Set[int] = set()
+    for obj in list(session.new) + list(session.deleted):
+        attr = LEDGER_MODELS.get(type(obj))
+        if attr and getattr(obj, attr, None) is not None:
+            societies.add(getattr(obj, attr))
+    for obj in session.dirty:
+        attr = LEDGER_MODELS.get(type(obj))
+        if attr and getattr(obj, attr, None) is not None and session.is_modified(obj, include_collections=False):
+            societies.add(getattr(obj, attr))
+    return societies
+
+
+@event.listens_for(Session, "after_flush")
+def _bump_versions_after_flush(session: Session, flush_context) -> None:
+    """Bump ledger versions in the same transaction as the flushed rows"""
+    societies = _collect_flushed_societies(session)
+    if societies:
+        _bump_ledger_versions_sync(session.connection(), societies)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _bump_versions_for_bulk_statements(orm_execute_state) -> None:
+    """Bulk insert/update/delete statements do not flush objects; bump from the statement instead"""
+    if not (orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    table = getattr(orm_execute_state.statement, "table", None)
+    attr = LEDGER_TABLES.get(getattr(table, "name", None))
+    if attr is None or table.name == LedgerVersion.__tablename__:
+        return
+
+    societies: Set[int] = set()
+    params = orm_execute_state.parameters
+    if orm_execute_state.is_insert and params:
+        rows = params if isinstance(params, list) else [params]
+        if all(isinstance(row, dict) and row.get(attr) is not None for row in rows):
+            societies = {row[attr] for row in rows}
+    if not societies:
+        societies = {GLOBAL_LEDGER_SCOPE}
+    _bump_ledger_versions_sync(orm_execute_state.session.connection(), societies)
+
+
+async def bump_ledger_version(db: AsyncSession, society_id: Optional[int] = None) -> None:
+    """
+    Invalidate cached reports for a society (or all societies when None) after
+    writes the session hooks cannot see, e.g. raw SQL. Takes effect on commit.
+    """
+    scope = GLOBAL_LEDGER_SCOPE if society_id is None else society_id
+    await db.run_sync(lambda sync_session: _bump_ledger_versions_sync(sync_session.connection(), [scope]))
+
+
+async def get_ledger_version(db: AsyncSession, society_id: int) -> str:
+    """Current ledger version of a society as "<global>.<society>" (one primary-key lookup)"""
+    result = await db.execute(
+        select(LedgerVersion.society_id, LedgerVersion.version).where(
+            LedgerVersion.society_id.in_([GLOBAL_LEDGER_SCOPE, society_id])
+        )
+    )
+    versions = dict(result.all())
+    return f"{versions.get(GLOBAL_LEDGER_SCOPE, 0)}.{versions.get(society_id, 0)}"
+
+
+# ============ CACHE BACKENDS ============
+
+class MemoryReportCacheBackend:
+    """In-process LRU bounded by total payload bytes and entry count"""
+
+    name = "memory"
+
+    def __init__(self, max_bytes: int, max_entries: int):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()  # key -> (society_id, version, payload)
+        self._latest_version: Dict[int, str] = {}
+        self.total_bytes = 0
+        self.evictions = 0
+
+    def _remove(self, key: str) -> None:
+        _, _, payload = self._entries.pop(key)
+        self.total_bytes -= len(payload)
+
+    async def get(self, db: AsyncSession, key: str) -> Optional[bytes]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        self._entries.move_to_end(key)
+        return entry[2]
+
+    async def set(self, db: AsyncSession, key: str, society_id: int, report_name: str, version: str, payload: bytes) -> None:
+        if len(payload) > self.max_bytes:
+            return
+        # A newer ledger version makes the society's older entries unreachable; free them now
+        if self._latest_version.get(society_id) != version:
+            stale = [k for k, (sid, ver, _) in self._entries.items() if sid == society_id and ver != version]
+            for stale_key in stale:
+                self._remove(stale_key)
+            self._latest_version[society_id] = version
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = (society_id, version, payload)
+        self.total_bytes += len(payload)
+        while self._entries and (self.total_bytes > self.max_bytes or len(self._entries) > self.max_entries):
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+
+    async def clear(self, db: AsyncSession = None) -> None:
+        self._entries.clear()
+        self._latest_version.clear()
+        self.total_bytes = 0
+
+    async def stats(self, db: AsyncSession = None) -> Dict[str, Any]:
+        return {
+            "entries": len(self._entries),
+            "bytes": self.total_bytes,
+            "max_bytes": self.max_bytes,
+            "max_entries": self.max_entries,
+            "evictions": self.evictions,
+        }
+
+
+class DatabaseReportCacheBackend:
+    """
+    report_cache_entries table, shared by every API worker.
+    Writes go through the request's session and commit with it.
+    """
+
+    name = "database"
+
+    def __init__(self, max_bytes: int, max_entries: int):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.evictions = 0
+
+    async def get(self, db: AsyncSession, key: str) -> Optional[bytes]:
+        row = (await db.execute(
+            select(ReportCacheEntry.payload, ReportCacheEntry.last_hit_at).where(ReportCacheEntry.cache_key == key)
+        )).one_or_none()
+        if row is None:
+            return None
+        payload, last_hit_at = row
+        now = datetime.utcnow()
+        if last_hit_at is None or now - last_hit_at >= LAST_HIT_REFRESH_INTERVAL:
+            await db.execute(
+                update(ReportCacheEntry).where(ReportCacheEntry.cache_key == key).values(last_hit_at=now)
+            )
+        return payload
+
+    async def set(self, db: AsyncSession, key: str, society_id: int, report_name: str, version: str, payload: bytes) -> None:
+        if len(payload) > self.max_bytes:
+            return
+        now = datetime.utcnow()
+        # Entries of older ledger versions can never be hit again
+        await db.execute(
+            delete(ReportCacheEntry).where(
+                ReportCacheEntry.society_id == society_id,
+                ReportCacheEntry.ledger_version != version
+            )
+        )
+        table = ReportCacheEntry.__table__
+        conn = await db.connection()
+        dialect_insert = pg_insert if conn.dialect.name == "postgresql" else sqlite_insert
+        stmt = dialect_insert(table).values(
+            cache_key=key, society_id=society_id, report_name=report_name, ledger_version=version,
+            payload=payload, size_bytes=len(payload), created_at=now, last_hit_at=now
+        )
+        await db.execute(stmt.on_conflict_do_nothing(index_elements=[table.c.cache_key]))
+        await self._evict(db)
+
+    async def _evict(self, db: AsyncSession) -> None:
+        count, total = (await db.execute(
+            select(func.count(ReportCacheEntry.cache_key), func.coalesce(func.sum(ReportCacheEntry.size_bytes), 0))
+        )).one()
+        if count <= self.max_entries and total <= self.max_bytes:
+            return
+        # Walk least-recently-hit first until back under both caps
+        rows = (await db.execute(
+            select(ReportCacheEntry.cache_key, ReportCacheEntry.size_bytes).order_by(ReportCacheEntry.last_hit_at)
+        )).all()
+        victims = []
+        for cache_key, size in rows:
+            if count <= self.max_entries and total <= self.max_bytes:
+                break
+            victims.append(cache_key)
+            count -= 1
+            total -= size
+        if victims:
+            await db.execute(delete(ReportCacheEntry).where(ReportCacheEntry.cache_key.in_(victims)))
+            self.evictions += len(victims)
+
+    async def clear(self, db: AsyncSession = None) -> None:
+        if db is not None:
+            await db.execute(delete(ReportCacheEntry))
+
+    async def stats(self, db: AsyncSession = None) -> Dict[str, Any]:
+        entries, total = 0, 0
+        if db is not None:
+            entries, total = (await db.execute(
+                select(func.count(ReportCacheEntry.cache_key), func.coalesce(func.sum(ReportCacheEntry.size_bytes), 0))
+            )).one()
+        return {
+            "entries": entries,
+            "bytes": int(total),
+            "max_bytes": self.max_bytes,
+            "max_entries": self.max_entries,
+            "evictions": self.evictions,
+        }
+
+
+# ============ CACHE FACADE ============
+
+def _cache_key(society_id: int, report_name: str, params: Dict[str, Any], version: str) -> str:
+    raw = json.dumps([society_id, report_name, params, version], sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class ReportCache:
+    """Versioned report result cache with per-report hit/miss statistics"""
+
+    def __init__(self, backend):
+        self.backend = backend
+        self._stats: Dict[str, Dict[str, float]] = defaultdict(lambda: {
+            "hits": 0, "misses": 0, "computes": 0, "compute_ms": 0.0, "saved_ms": 0.0
+        })
+        self._last_compute_ms: Dict[str, float] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self.backend is not None
+
+    async def get_or_compute(
+        self,
+        db: AsyncSession,
+        society_id: int,
+        report_name: str,
+        params: Dict[str, Any],
+        compute: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """Return the cached result for the current ledger version, computing and storing it on a miss"""
+        if not self.enabled:
+            return await report_single_flight.run(society_id, report_name, params, compute)
+
+        stats = self._stats[report_name]
+        version = await get_ledger_version(db, society_id)
+        key = _cache_key(society_id, report_name, params, version)
+
+        payload = await self.backend.get(db, key)
+        if payload is not None:
+            stats["hits"] += 1
+            stats["saved_ms"] += self._last_compute_ms.get(report_name, 0.0)
+            # Unpickling also hands every caller its own copy of the result
+            return pickle.loads(payload)
+
+        stats["misses"] += 1
+
+        async def compute_and_store() -> bytes:
+            started = time.perf_counter()
+            result = await compute()
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            stats["computes"] += 1
+            stats["compute_ms"] += elapsed_ms
+            self._last_compute_ms[report_name] = elapsed_ms
+
+            payload = pickle.dumps(result, pickle.HIGHEST_PROTOCOL)
+            await self.backend.set(db, key, society_id, report_name, version, payload)
+            return payload
+
+        # Concurrent misses for the same version wait on one computation and one store
+        payload = await report_single_flight.run(
+            society_id, report_name, {"params": params, "ledger_version": version}, compute_and_store
+        )
+        return pickle.loads(payload)
+
+    async def clear(self, db: AsyncSession = None) -> None:
+        if self.enabled:
+            await self.backend.clear(db)
+
+    async def stats(self, db: AsyncSession = None) -> Dict[str, Any]:
+        reports = {}
+        for name, s in self._stats.items():
+            lookups = s["hits"] + s["misses"]
+            reports[name] = {
+                "hits": int(s["hits"]),
+                "misses": int(s["misses"]),
+                "hit_rate": round(s["hits"] / lookups, 3) if lookups else 0.0,
+                "computes": int(s["computes"]),
+                "avg_compute_ms": round(s["compute_ms"] / s["computes"], 2) if s["computes"] else 0.0,
+                "estimated_saved_ms": round(s["saved_ms"], 2),
+            }
+        return {
+            "backend": self.backend.name if self.enabled else "none",
+            "storage": await self.backend.stats(db) if self.enabled else {},
+            "reports": reports,
+        }
+
+
+def _create_backend():
+    backend = settings.REPORT_CACHE_BACKEND.lower()
+    if backend == "memory":
+        return MemoryReportCacheBackend(settings.REPORT_CACHE_MAX_BYTES, settings.REPORT_CACHE_MAX_ENTRIES)
+    if backend == "database":
+        return DatabaseReportCacheBackend(settings.REPORT_CACHE_MAX_BYTES, settings.REPORT_CACHE_MAX_ENTRIES)
+    if backend != "none":
+        logger.warning(f"Unknown REPORT_CACHE_BACKEND '{settings.REPORT_CACHE_BACKEND}'; report caching disabled")
+    return None
+
+
+report_cache = ReportCache(_create_backend())
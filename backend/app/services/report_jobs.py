@@ -0,0 +1,406 @@
+"""
+Report job service
+Runs report exports (multi-year General Ledger PDFs, whole-society member
+ledgers, year-end statements) as background jobs so they are not cut off by
+the hosting platform's request timeout.
+
+- A job wraps one of the existing export functions in routes/reports.py; the
+  StreamingResponse it returns is drained into a file under REPORT_JOB_DIR.
+- Jobs run on an in-process asyncio worker pool: at most REPORT_JOB_WORKERS
+  jobs per API worker and REPORT_JOB_MAX_PER_SOCIETY per society run at once,
+  the rest wait their turn. A society may have REPORT_JOB_MAX_QUEUED_PER_SOCIETY
+  unfinished jobs; further submissions get 429.
+- An identical unfinished job (same society, report, format and parameters)
+  is returned instead of starting a second one.
+- Finished jobs write a JSON sidecar next to the result, so a completed export
+  stays downloadable for REPORT_JOB_TTL_SECONDS even after a restart or from
+  another worker process sharing the directory. Expired results are deleted.
+"""
+import asyncio
+import json
+import logging
+import os
+import re
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional
+
+from fastapi import HTTPException, status
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import database
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Progress reported for each stage when the export gives no finer figure
+STAGE_PROGRESS = {"queued": 0.0, "computing": 10.0, "writing": 60.0, "done": 100.0}
+RENDER_BUSY_RETRIES = 3
+
+ProgressCallback = Callable[[int, int], Awaitable[None]]
+JobRunner = Callable[[AsyncSession, ProgressCallback], Awaitable[Any]]
+
+
+def _filename_from_headers(headers, default: str) -> str:
+    match = re.search(r'filename="?([^";]+)"?', headers.get("content-disposition", ""))
+    return match.group(1) if match else default
+
+
+class ReportJob:
+    """State and output location of one report job"""
+
+    def __init__(self, society_id: int, requested_by: int, report: str, output_format: str, params: Dict[str, Any]):
+        self.job_id = uuid.uuid4().hex
+        self.society_id = society_id
+        self.requested_by = requested_by
+        self.report = report
+        self.format = output_format
+        self.params = params
+        self.status = "queued"  # queued -> running -> completed | failed
+        self.stage = "queued"  # queued -> computing -> writing -> done
+        self.items_total = 0
+        self.items_done = 0
+        self.size_bytes = 0
+        self.filename: Optional[str] = None
+        self.media_type: Optional[str] = None
+        self.error: Optional[str] = None
+        self.created_at = datetime.utcnow()
+        self.started_at: Optional[datetime] = None
+        self.finished_at: Optional[datetime] = None
+        self.expires_at: Optional[datetime] = None
+        self.task: Optional[asyncio.Task] = None
+        self._changed = asyncio.Condition()
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ("completed", "failed")
+
+    @property
+    def key(self) -> tuple:
+        # Per requester: a shared job would skip the second user's own authorization in the runner
+        return (self.society_id, self.requested_by, self.report, self.format, json.dumps(self.params, sort_keys=True))
+
+    async def notify(self) -> None:
+        async with self._changed:
+            self._changed.notify_all()
+
+    async def wait_for_change(self, timeout: float) -> None:
+        async with self._changed:
+            try:
+                await asyncio.wait_for(self._changed.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    def progress_percent(self) -> float:
+        if self.stage == "computing" and self.items_total:
+            # Item progress (e.g. flats exported) spans the computing stage
+            low, high = STAGE_PROGRESS["computing"], STAGE_PROGRESS["writing"]
+            return round(low + (high - low) * self.items_done / self.items_total, 1)
+        return STAGE_PROGRESS.get(self.stage, 0.0)
+
+    def to_dict(self) -> Dict[str, Any]:
+        elapsed_ms = None
+        if self.started_at:
+            end = self.finished_at or datetime.utcnow()
+            elapsed_ms = round((end - self.started_at).total_seconds() * 1000, 2)
+        return {
+            "job_id": self.job_id,
+            "status": self.status,
+            "stage": self.stage,
+            "report": self.report,
+            "format": self.format,
+            "params": self.params,
+            "progress_percent": self.progress_percent(),
+            "items_total": self.items_total,
+            "items_done": self.items_done,
+            "size_bytes": self.size_bytes,
+            "filename": self.filename,
+            "elapsed_ms": elapsed_ms,
+            "error": self.error,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+            "expires_at": self.expires_at,
+            "download_ready": self.status == "completed",
+        }
+
+    def to_sidecar(self) -> Dict[str, Any]:
+        return jsonable_encoder({
+            **self.to_dict(),
+            "society_id": self.society_id,
+            "requested_by": self.requested_by,
+            "media_type": self.media_type,
+            "started_at": self.started_at,
+        })
+
+    @classmethod
+    def from_sidecar(cls, data: Dict[str, Any]) -> "ReportJob":
+        job = cls(data["society_id"], data["requested_by"], data["report"], data["format"], data["params"])
+        job.job_id = data["job_id"]
+        job.status = data["status"]
+        job.stage = data["stage"]
+        job.items_total = data.get("items_total", 0)
+        job.items_done = data.get("items_done", 0)
+        job.size_bytes = data.get("size_bytes", 0)
+        job.filename = data.get("filename")
+        job.media_type = data.get("media_type")
+        job.error = data.get("error")
+        for field in ("created_at", "started_at", "finished_at", "expires_at"):
+            if data.get(field):
+                setattr(job, field, datetime.fromisoformat(data[field]))
+        return job
+
+
+class ReportJobManager:
+    """Registry and bounded worker pool for report jobs; results are files with a TTL"""
+
+    def __init__(self, max_workers: int, max_per_society: int, max_queued_per_society: int,
+                 result_dir: str, ttl_seconds: int):
+        self.max_workers = max_workers
+        self.max_per_society = max_per_society
+        self.max_queued_per_society = max_queued_per_society
+        self.result_dir = result_dir
+        self.ttl_seconds = ttl_seconds
+        self._jobs: "OrderedDict[str, ReportJob]" = OrderedDict()
+        self._workers: Optional[asyncio.Semaphore] = None
+        self._society_slots: Dict[int, asyncio.Semaphore] = {}
+        self._last_sweep = 0.0
+
+    # ---- storage ----
+
+    def _paths(self, society_id: int, job_id: str):
+        base = os.path.join(self.result_dir, str(society_id), job_id)
+        return base + ".out", base + ".json"
+
+    def result_path(self, job: ReportJob) -> str:
+        return self._paths(job.society_id, job.job_id)[0]
+
+    def _remove_files(self, society_id: int, job_id: str) -> None:
+        for path in self._paths(society_id, job_id):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logger.warning(f"Could not delete report job file {path}: {e}")
+
+    def _write_sidecar(self, job: ReportJob) -> None:
+        _, meta_path = self._paths(job.society_id, job.job_id)
+        tmp_path = meta_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(job.to_sidecar(), f)
+        os.replace(tmp_path, meta_path)
+
+    def _read_sidecar(self, society_id: int, job_id: str) -> Optional[ReportJob]:
+        if not re.fullmatch(r"[0-9a-f]{32}", job_id or ""):
+            return None
+        _, meta_path = self._paths(society_id, job_id)
+        try:
+            with open(meta_path, encoding="utf-8") as f:
+                return ReportJob.from_sidecar(json.load(f))
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Unreadable report job metadata {meta_path}: {e}")
+            return None
+
+    def _sweep_disk(self) -> None:
+        """Delete expired results left by any worker process (at most once a minute)"""
+        now = time.monotonic()
+        if now - self._last_sweep < 60 or not os.path.isdir(self.result_dir):
+            return
+        self._last_sweep = now
+        cutoff = datetime.utcnow()
+        for society_dir in os.scandir(self.result_dir):
+            if not society_dir.is_dir() or not society_dir.name.isdigit():
+                continue
+            for entry in os.scandir(society_dir.path):
+                if not entry.name.endswith(".json"):
+                    continue
+                job = self._read_sidecar(int(society_dir.name), entry.name[:-5])
+                if job is not None and job.expires_at and job.expires_at <= cutoff:
+                    self._remove_files(job.society_id, job.job_id)
+
+    def _purge(self) -> None:
+        now = datetime.utcnow()
+        for job in [j for j in self._jobs.values() if j.finished and j.expires_at and j.expires_at <= now]:
+            del self._jobs[job.job_id]
+            self._remove_files(job.society_id, job.job_id)
+        self._sweep_disk()
+
+    # ---- registry ----
+
+    def get(self, job_id: str, society_id: int) -> Optional[ReportJob]:
+        self._purge()
+        job = self._jobs.get(job_id)
+        if job is None:
+            job = self._read_sidecar(society_id, job_id)
+            if job is not None and job.expires_at and job.expires_at <= datetime.utcnow():
+                self._remove_files(society_id, job_id)
+                return None
+        if job is None or job.society_id != society_id:
+            return None
+        return job
+
+    def list(self, society_id: int, requested_by: Optional[int] = None) -> list:
+        """Jobs of the society held by this server, optionally only those of one requester"""
+        self._purge()
+        return [
+            job for job in self._jobs.values()
+            if job.society_id == society_id and (requested_by is None or job.requested_by == requested_by)
+        ]
+
+    def submit(self, society_id: int, requested_by: int, report: str, output_format: str,
+               params: Dict[str, Any], runner: JobRunner) -> ReportJob:
+        """
+        Queue an export. runner(db, progress) must return the export's
+        StreamingResponse (or bytes); progress(done, total) may be awaited to
+        report item-level progress.
+        """
+        self._purge()
+        job = ReportJob(society_id, requested_by, report, output_format, params)
+        unfinished = [j for j in self._jobs.values() if j.society_id == society_id and not j.finished]
+        for existing in unfinished:
+            if existing.key == job.key:
+                return existing
+        if len(unfinished) >= self.max_queued_per_society:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail=f"This society already has {len(unfinished)} report jobs in progress. Please wait for one to finish.",
+                headers={"Retry-After": "30"}
+            )
+        self._jobs[job.job_id] = job
+        job.task = asyncio.create_task(self._run(job, runner))
+        return job
+
+    async def delete(self, job: ReportJob) -> None:
+        """Cancel an unfinished job, or delete a finished job's result"""
+        if job.task is not None and not job.task.done():
+            job.task.cancel()
+            try:
+                await job.task
+            except (asyncio.CancelledError, Exception):
+                pass
+        self._jobs.pop(job.job_id, None)
+        self._remove_files(job.society_id, job.job_id)
+
+    async def events(self, job: ReportJob, heartbeat_seconds: float = 15.0) -> AsyncIterator[str]:
+        """Server-sent events: the job's status on every change until it finishes"""
+        last = None
+        while True:
+            snapshot = json.dumps(jsonable_encoder(job.to_dict()))
+            if snapshot != last:
+                yield f"event: progress\ndata: {snapshot}\n\n"
+                last = snapshot
+            elif not job.finished:
+                yield ": keep-alive\n\n"
+            if job.finished:
+                return
+            await job.wait_for_change(heartbeat_seconds)
+
+    # ---- execution ----
+
+    def _slots(self, society_id: int):
+        if self._workers is None:
+            self._workers = asyncio.Semaphore(max(1, self.max_workers))
+        if society_id not in self._society_slots:
+            self._society_slots[society_id] = asyncio.Semaphore(max(1, self.max_per_society))
+        return self._society_slots[society_id], self._workers
+
+    async def _run(self, job: ReportJob, runner: JobRunner) -> None:
+        society_slot, worker_slot = self._slots(job.society_id)
+        try:
+            async with society_slot, worker_slot:
+                job.status = "running"
+                job.stage = "computing"
+                job.started_at = datetime.utcnow()
+                await job.notify()
+                await self._execute(job, runner)
+            job.status = "completed"
+            job.stage = "done"
+        except asyncio.CancelledError:
+            job.status = "failed"
+            job.error = "Job was cancelled"
+            self._remove_files(job.society_id, job.job_id)
+            raise
+        except Exception as e:
+            logger.error(f"Report job {job.job_id} ({job.report}/{job.format}) failed: {e}", exc_info=True)
+            job.status = "failed"
+            job.error = getattr(e, "detail", None) or str(e)
+            self._remove_files(job.society_id, job.job_id)
+        finally:
+            job.finished_at = datetime.utcnow()
+            job.expires_at = job.finished_at + timedelta(seconds=self.ttl_seconds)
+            if job.status == "completed":
+                try:
+                    self._write_sidecar(job)
+                except OSError as e:
+                    logger.warning(f"Could not persist report job {job.job_id} metadata: {e}")
+            await job.notify()
+            logger.info(
+                f"Report job {job.job_id} ({job.report}/{job.format}) {job.status}: "
+                f"{job.size_bytes} bytes in {job.to_dict()['elapsed_ms']} ms"
+            )
+
+    async def _execute(self, job: ReportJob, runner: JobRunner) -> None:
+        async def progress(done: int, total: int) -> None:
+            job.items_done, job.items_total = done, total
+            await job.notify()
+
+        if database.AsyncSessionLocal is None:
+            database.create_engine_instance()
+        result_path = self.result_path(job)
+        os.makedirs(os.path.dirname(result_path), exist_ok=True)
+        tmp_path = result_path + ".tmp"
+
+        async with database.AsyncSessionLocal() as db:
+            for attempt in range(RENDER_BUSY_RETRIES + 1):
+                try:
+                    response = await runner(db, progress)
+                    break
+                except HTTPException as e:
+                    # The render pool is saturated by interactive downloads; a job can wait
+                    if e.status_code != status.HTTP_503_SERVICE_UNAVAILABLE or attempt == RENDER_BUSY_RETRIES:
+                        raise
+                    await asyncio.sleep(int((e.headers or {}).get("Retry-After", 5)))
+
+            job.stage = "writing"
+            await job.notify()
+            try:
+                with open(tmp_path, "wb") as f:
+                    if isinstance(response, (bytes, bytearray)):
+                        f.write(response)
+                        job.size_bytes = len(response)
+                    else:
+                        job.media_type = response.media_type
+                        job.filename = _filename_from_headers(response.headers, job.filename or "")
+                        async for chunk in response.body_iterator:
+                            if isinstance(chunk, str):
+                                chunk = chunk.encode(getattr(response, "charset", "utf-8"))
+                            f.write(chunk)
+                            job.size_bytes += len(chunk)
+                os.replace(tmp_path, result_path)
+            finally:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+            # Report cache writes made while computing commit like a request would
+            await db.commit()
+
+        job.filename = job.filename or f"{job.report}_{job.job_id[:8]}.{job.format}"
+        job.media_type = job.media_type or "application/octet-stream"
+
+    def shutdown(self) -> None:
+        for job in self._jobs.values():
+            if job.task is not None and not job.task.done():
+                job.task.cancel()
+
+
+report_jobs = ReportJobManager(
+    max_workers=settings.REPORT_JOB_WORKERS,
+    max_per_society=settings.REPORT_JOB_MAX_PER_SOCIETY,
+    max_queued_per_society=settings.REPORT_JOB_MAX_QUEUED_PER_SOCIETY,
+    result_dir=settings.REPORT_JOB_DIR,
+    ttl_seconds=settings.REPORT_JOB_TTL_SECONDS
+)
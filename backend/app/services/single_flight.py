@@ -0,0 +1,122 @@
+"""
+Single-flight request coalescing
+Concurrent identical report requests - same society, report and parameters -
+share one computation: the first caller (the leader) runs it, every caller
+arriving while it is in flight awaits the leader's result instead of running
+the same queries again.
+
+Coalescing is per API worker process and only spans the in-flight window;
+once the leader finishes, the next request computes afresh (or hits the
+report cache). Callers must do their own authorization before entering the
+group, since followers receive the leader's result as-is.
+
+- Errors raised by the leader (including HTTPException) are shared with the
+  followers, exactly as if each had run the computation itself.
+- If the leader is cancelled (client went away), followers are not failed:
+  one of them takes over and runs the computation.
+- Followers receive the same result object; report results are treated as
+  read-only by the routes and exports that consume them.
+"""
+import asyncio
+import json
+import logging
+from collections import defaultdict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class _LeaderCancelled(Exception):
+    """Signals followers that the leader went away without a result"""
+
+
+class SingleFlightGroup:
+    """Collapses concurrent calls with the same key into one execution"""
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self._in_flight: Dict[Hashable, asyncio.Future] = {}
+        self._waiters: Dict[Hashable, int] = defaultdict(int)
+        self._stats: Dict[str, Dict[str, int]] = defaultdict(lambda: {
+            "calls": 0, "executions": 0, "collapsed": 0, "max_waiters": 0
+        })
+
+    @staticmethod
+    def make_key(society_id: int, report_name: str, params: Dict[str, Any]) -> Tuple[int, str, str]:
+        return society_id, report_name, json.dumps(params, sort_keys=True, default=str)
+
+    async def run(
+        self,
+        society_id: int,
+        report_name: str,
+        params: Dict[str, Any],
+        compute: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """Run compute(), or await the identical computation already in flight"""
+        if not self.enabled:
+            return await compute()
+
+        key = self.make_key(society_id, report_name, params)
+        stats = self._stats[report_name]
+        stats["calls"] += 1
+
+        while True:
+            future = self._in_flight.get(key)
+            if future is None:
+                break
+            stats["collapsed"] += 1
+            self._waiters[key] += 1
+            stats["max_waiters"] = max(stats["max_waiters"], self._waiters[key])
+            try:
+                # shield: a cancelled follower must not cancel the shared future
+                return await asyncio.shield(future)
+            except _LeaderCancelled:
+                # Leader went away; loop round and let one follower take over
+                stats["collapsed"] -= 1
+            finally:
+                self._waiters[key] -= 1
+                if not self._waiters[key]:
+                    del self._waiters[key]
+
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        stats["executions"] += 1
+        try:
+            result = await compute()
+        except asyncio.CancelledError:
+            future.set_exception(_LeaderCancelled())
+            raise
+        except BaseException as exc:
+            future.set_exception(exc)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self._in_flight[key]
+            if future.done():
+                # Marks a shared exception as retrieved even when nobody was waiting
+                future.exception()
+
+    def stats(self) -> Dict[str, Any]:
+        reports = {}
+        totals = {"calls": 0, "executions": 0, "collapsed": 0}
+        for name, s in self._stats.items():
+            reports[name] = {
+                **s,
+                "collapse_rate": round(s["collapsed"] / s["calls"], 3) if s["calls"] else 0.0,
+            }
+            for field in totals:
+                totals[field] += s[field]
+        return {
+            "enabled": self.enabled,
+            "in_flight": len(self._in_flight),
+            **totals,
+            "reports": reports,
+        }
+
+
+# Shared by the report endpoints and the report cache's miss path
+report_single_flight = SingleFlightGroup(enabled=settings.REPORT_SINGLE_FLIGHT_ENABLED)
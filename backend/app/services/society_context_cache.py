@@ -0,0 +1,190 @@
+"""
+Society context cache
+Per-society lookups every report repeats - the financial year containing a
+date (with the active-year fallback), the report header (name, address, logo)
+and the logo image itself - loaded once per society per API worker and served
+without touching the database.
+
+- Financial years are held as an interval index sorted by start date;
+  year_containing() bisects on the start dates instead of running a range
+  query, and returns the latest-starting year that contains the date, like
+  the `start_date <= d <= end_date ORDER BY start_date DESC` queries it replaces.
+- Logo bytes are read (local upload) or downloaded (URL) on the first export
+  and passed to the exporters with the header, so PDFs stop fetching the logo
+  on every render.
+- Contexts expire after SOCIETY_CONTEXT_TTL_SECONDS and are dropped
+  explicitly by the financial year and society settings write routes. Each
+  worker process holds its own cache; the TTL bounds how long another worker
+  can serve a stale calendar or header.
+"""
+import asyncio
+import bisect
+import logging
+import os
+import time
+from datetime import date
+from typing import Any, Dict, List, NamedTuple, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models_db import FinancialYear, Society
+
+logger = logging.getLogger(__name__)
+
+MAX_LOGO_BYTES = 2 * 1024 * 1024  # Same cap as the logo upload route
+
+
+class FinancialYearPeriod(NamedTuple):
+    """Read-only copy of a financial_years row as used by the reports"""
+    id: int
+    year_name: str
+    start_date: date
+    end_date: date
+    is_active: bool
+    is_closed: bool
+    status: Any
+
+
+class SocietyContext:
+    """Financial year calendar and report header of one society"""
+
+    def __init__(self, society_id: int, years: List[FinancialYearPeriod], society_info: Dict[str, Any]):
+        self.society_id = society_id
+        self.years = sorted(years, key=lambda fy: (fy.start_date, fy.id))
+        self._starts = [fy.start_date for fy in self.years]
+        active = [fy for fy in self.years if fy.is_active]
+        self.active_year = active[-1] if active else None
+        self.society_info = society_info
+        self.logo_bytes: Optional[bytes] = None
+        self.logo_loaded = False
+        self.expires_at = 0.0
+
+    def year_containing(self, on_date: date) -> Optional[FinancialYearPeriod]:
+        """Latest-starting financial year with start_date <= on_date <= end_date"""
+        index = bisect.bisect_right(self._starts, on_date)
+        # Years may overlap, so an earlier start can still cover the date
+        for fy in reversed(self.years[:index]):
+            if fy.end_date >= on_date:
+                return fy
+        return None
+
+    def find_year(self, on_date: date, fallback_active: bool = True) -> Optional[FinancialYearPeriod]:
+        """Year containing on_date, else (optionally) the active year"""
+        fy = self.year_containing(on_date)
+        if fy is None and fallback_active:
+            fy = self.active_year
+        return fy
+
+
+# ============ CACHE ============
+
+def _read_logo(logo_url: str) -> Optional[bytes]:
+    """Logo image bytes from a local upload path or an http(s) URL (blocking)"""
+    try:
+        if logo_url.startswith(("http://", "https://")):
+            import requests
+            response = requests.get(logo_url, timeout=5)
+            if response.status_code == 200 and len(response.content) <= MAX_LOGO_BYTES:
+                return response.content
+        elif os.path.isfile(logo_url) and os.path.getsize(logo_url) <= MAX_LOGO_BYTES:
+            with open(logo_url, "rb") as f:
+                return f.read()
+    except Exception as e:
+        logger.warning(f"Could not load society logo {logo_url}: {e}")
+    return None
+
+
+class SocietyContextCache:
+    """Per-worker cache of SocietyContext objects"""
+
+    def __init__(self, ttl_seconds: int):
+        self.ttl_seconds = ttl_seconds
+        self._contexts: Dict[int, SocietyContext] = {}
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    async def get(self, db: AsyncSession, society_id: int) -> SocietyContext:
+        context = self._contexts.get(society_id)
+        if context is not None and context.expires_at > time.monotonic():
+            self.hits += 1
+            return context
+        self.misses += 1
+        context = await self._load(db, society_id)
+        context.expires_at = time.monotonic() + self.ttl_seconds
+        if self.ttl_seconds > 0:
+            self._contexts[society_id] = context
+        return context
+
+    @staticmethod
+    async def _load(db: AsyncSession, society_id: int) -> SocietyContext:
+        """Financial years and report header of a society (two queries)"""
+        years = [
+            FinancialYearPeriod(*row) for row in (await db.execute(
+                select(
+                    FinancialYear.id, FinancialYear.year_name, FinancialYear.start_date, FinancialYear.end_date,
+                    FinancialYear.is_active, FinancialYear.is_closed, FinancialYear.status
+                ).where(FinancialYear.society_id == society_id)
+            )).all()
+        ]
+        society = (await db.execute(
+            select(Society.name, Society.address, Society.logo_url).where(Society.id == society_id)
+        )).one_or_none()
+        if society is None:
+            society_info = {"name": "Unknown Society", "address": "", "logo_url": None}
+        else:
+            society_info = {
+                "name": society.name or "Unknown Society",
+                "address": society.address or "",
+                "logo_url": society.logo_url
+            }
+        return SocietyContext(society_id, years, society_info)
+
+    async def find_financial_year(
+        self, db: AsyncSession, society_id: int, on_date: date, fallback_active: bool = True
+    ) -> Optional[FinancialYearPeriod]:
+        """Financial year containing on_date, falling back to the active year"""
+        return (await self.get(db, society_id)).find_year(on_date, fallback_active)
+
+    async def society_info(self, db: AsyncSession, society_id: int, include_logo: bool = False) -> Dict[str, Any]:
+        """
+        Report header: name, address and logo_url.
+
+        With include_logo the logo image is added as 'logo_bytes' (None if it
+        cannot be read) for the PDF exporters; it is read once per context.
+        Without it the dict stays JSON-serialisable for report payloads.
+        """
+        context = await self.get(db, society_id)
+        if not include_logo:
+            return dict(context.society_info)
+        if not context.logo_loaded:
+            logo_url = context.society_info.get("logo_url")
+            if logo_url:
+                context.logo_bytes = await asyncio.to_thread(_read_logo, logo_url)
+            context.logo_loaded = True
+        return {**context.society_info, "logo_bytes": context.logo_bytes}
+
+    def invalidate(self, society_id: int) -> None:
+        """Drop one society's context (financial years, society details or logo changed)"""
+        if self._contexts.pop(int(society_id), None) is not None:
+            self.invalidations += 1
+
+    def clear(self) -> None:
+        self.invalidations += len(self._contexts)
+        self._contexts.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._contexts),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "invalidations": self.invalidations,
+            "ttl_seconds": self.ttl_seconds
+        }
+
+
+society_context = SocietyContextCache(ttl_seconds=settings.SOCIETY_CONTEXT_TTL_SECONDS)
@@ -0,0 +1,207 @@
+"""
+Trial balance service
+Computes account balances with set-based aggregate queries instead of
+one transaction scan per account head
+"""
+from typing import List, Optional, Dict, Any
+from datetime import date
+from decimal import Decimal
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, func, and_
+
+from app.models_db import AccountCode, AccountDailyBalance, OpeningBalance, BalanceType
+from app.models.journal import TrialBalanceResponse, TrialBalanceItem
+
+
+ZERO = Decimal("0.00")
+CENT = Decimal("0.01")
+CREDIT_NATURE_TYPES = ('liability', 'capital', 'income')
+
+
+def _to_decimal(value) -> Decimal:
+    """Convert a DB numeric (Decimal/float/None) to Decimal without float noise"""
+    if value is None:
+        return ZERO
+    if isinstance(value, Decimal):
+        return value
+    return Decimal(str(value))
+
+
+def _account_type_value(account_type) -> str:
+    """AccountType is a str enum; normalise to its plain value"""
+    return getattr(account_type, "value", account_type)
+
+
+class TrialBalanceService:
+    """Service for computing account balances and the trial balance."""
+
+    @staticmethod
+    async def get_account_balances(
+        db: AsyncSession,
+        society_id: int,
+        financial_year_id: Optional[int],
+        from_date: date,
+        to_date: date
+    ) -> List[Dict[str, Any]]:
+        """
+        Compute every account's balance for a period in a single round trip.
+
+        Daily ledger snapshot buckets are pre-aggregated per account code in a
+        subquery and LEFT JOINed to the chart of accounts together with the
+        financial year's OpeningBalance rows.
+
+        Args:
+            db: Database session
+            society_id: Society ID for filtering
+            financial_year_id: Financial year whose opening balances apply (None = use account field)
+            from_date: First transaction date included
+            to_date: Last transaction date included
+
+        Returns:
+            List of dicts ordered by account code with keys: account (AccountCode),
+            opening (signed Decimal, debit positive), opening_recorded (True when
+            opening came from an OpeningBalance row), debit_total, credit_total,
+            balance (signed Decimal, debit positive)
+        """
+        # Period totals come from the per-day ledger snapshot buckets, which are
+        # far fewer than the underlying transaction rows
+        txn_totals = (
+            select(
+                AccountDailyBalance.account_code.label("account_code"),
+                func.coalesce(func.sum(AccountDailyBalance.debit_total), 0).label("debit_total"),
+                func.coalesce(func.sum(AccountDailyBalance.credit_total), 0).label("credit_total"),
+            )
+            .where(
+                and_(
+                    AccountDailyBalance.society_id == society_id,
+                    AccountDailyBalance.date >= from_date,
+                    AccountDailyBalance.date <= to_date
+                )
+            )
+            .group_by(AccountDailyBalance.account_code)
+            .subquery()
+        )
+
+        ob_join_condition = and_(
+            OpeningBalance.account_head_id == AccountCode.id,
+            OpeningBalance.financial_year_id == financial_year_id
+        )
+
+        result = await db.execute(
+            select(
+                AccountCode,
+                OpeningBalance.opening_balance,
+                OpeningBalance.balance_type,
+                txn_totals.c.debit_total,
+                txn_totals.c.credit_total,
+            )
+            .outerjoin(OpeningBalance, ob_join_condition)
+            .outerjoin(txn_totals, txn_totals.c.account_code == AccountCode.code)
+            .where(AccountCode.society_id == society_id)
+            .order_by(AccountCode.code, AccountCode.id, OpeningBalance.id)
+        )
+
+        # Several OpeningBalance rows for one account: the last one wins,
+        # matching the dict-based lookup used by the reports before.
+        rows_by_account: Dict[int, Dict[str, Any]] = {}
+        for account, ob_amount, ob_type, debit_total, credit_total in result.all():
+            if ob_amount is not None:
+                opening = _to_decimal(ob_amount)
+                if ob_type != BalanceType.DEBIT:
+                    opening = -opening  # Credit stored as negative
+            else:
+                # Fallback to account's opening_balance field if no OpeningBalance record
+                opening = _to_decimal(account.opening_balance)
+                if _account_type_value(account.type) in CREDIT_NATURE_TYPES:
+                    opening = -opening
+
+            debit = _to_decimal(debit_total)
+            credit = _to_decimal(credit_total)
+            rows_by_account[account.id] = {
+                "account": account,
+                "opening": opening,
+                "opening_recorded": ob_amount is not None,
+                "debit_total": debit,
+                "credit_total": credit,
+                "balance": opening + debit - credit,
+            }
+
+        return list(rows_by_account.values())
+
+    @staticmethod
+    async def compute_trial_balance(
+        db: AsyncSession,
+        society_id: int,
+        financial_year_id: Optional[int],
+        fy_start_date: date,
+        effective_date: date,
+        as_on_date: date
+    ) -> TrialBalanceResponse:
+        """
+        Build the trial balance from the grouped account balances.
+
+        Args:
+            db: Database session
+            society_id: Society ID for filtering
+            financial_year_id: Financial year containing as_on_date
+            fy_start_date: Financial year start date
+            effective_date: Last date included (as_on_date capped at FY end)
+            as_on_date: Date reported on the response
+
+        Returns:
+            TrialBalanceResponse identical in shape to the per-account computation
+        """
+        balances = await TrialBalanceService.get_account_balances(
+            db, society_id, financial_year_id, fy_start_date, effective_date
+        )
+
+        items = []
+        total_debit = ZERO
+        total_credit = ZERO
+
+        for row in balances:
+            account = row["account"]
+            balance = row["balance"]
+
+            # Skip accounts with zero balance
+            if abs(balance) < CENT:
+                continue
+
+            # Positive = debit balance, negative = credit balance, for every account
+            # type (contra balances fall out naturally on the other side)
+            if balance > 0:
+                items.append(TrialBalanceItem(
+                    account_code=account.code,
+                    account_name=account.name,
+                    debit_balance=float(balance.quantize(CENT)),
+                    credit_balance=0.0
+                ))
+                total_debit += balance
+            else:
+                items.append(TrialBalanceItem(
+                    account_code=account.code,
+                    account_name=account.name,
+                    debit_balance=0.0,
+                    credit_balance=float(abs(balance).quantize(CENT))
+                ))
+                total_credit += abs(balance)
+
+        difference = abs(total_debit - total_credit)
+        is_balanced = difference < CENT
+
+        return TrialBalanceResponse(
+            as_on_date=as_on_date,
+            items=items,
+            total_debit=float(total_debit.quantize(CENT)),
+            total_credit=float(total_credit.quantize(CENT)),
+            difference=float(difference.quantize(CENT)),
+            is_balanced=is_balanced
+        )
+
+
+# Create service instance
+trial_balance_service = TrialBalanceService()
+
+# Export functions for backward compatibility
+get_account_balances = trial_balance_service.get_account_balances
+compute_trial_balance = trial_balance_service.compute_trial_balance
@@ -0,0 +1,213 @@
+"""
+Year-end close service
+Carries a financial year's closing balances forward as the next year's
+provisional opening balances in a fixed number of statements, whatever the
+size of the chart of accounts:
+
+1. one grouped query for every account's closing balance as at the year end
+   (get_account_balances: chart LEFT JOIN opening balances LEFT JOIN the
+   per-account daily snapshot totals); bank, cash and Income & Expenditure
+   totals are summed from the same rows
+2. one lookup of the opening balances the next year already has
+3. one bulk INSERT ... ON CONFLICT (financial_year_id, account_head_id)
+   DO UPDATE on SQLite and PostgreSQL
+
+Timings and row counts of each stage are returned with the result.
+"""
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models_db import FinancialYear, OpeningBalance, BalanceType, BalanceStatus
+from app.services.account_classification_service import LIQUIDITY_CASH, LIQUIDITY_BANK
+from app.services.trial_balance_service import get_account_balances
+
+ZERO = Decimal("0.00")
+CENT = Decimal("0.01")
+
+
+def _account_type_value(account_type) -> str:
+    return getattr(account_type, "value", account_type)
+
+
+@contextmanager
+def _stage(timings: Dict[str, float], name: str):
+    started = time.perf_counter()
+    yield
+    timings[name] = round((time.perf_counter() - started) * 1000, 2)
+
+
+class YearEndCloseService:
+    """Service for closing a financial year into the next year's opening balances."""
+
+    @staticmethod
+    async def compute_closing_balances(db: AsyncSession, society_id: int, fy: FinancialYear) -> Dict[str, Any]:
+        """
+        Closing balance of every account head as at the financial year end.
+
+        Returns:
+            Dict with 'accounts' ([{account_id, account_code, account_name,
+            closing_balance}] with closing_balance a signed Decimal, debit
+            positive), 'bank_balance', 'cash_balance', 'total_income',
+            'total_expenses' and 'net_surplus_deficit' (Decimals)
+        """
+        rows = await get_account_balances(db, society_id, fy.id, fy.start_date, fy.end_date)
+
+        accounts: List[Dict[str, Any]] = []
+        totals = {LIQUIDITY_BANK: ZERO, LIQUIDITY_CASH: ZERO}
+        total_income = ZERO
+        total_expenses = ZERO
+        for row in rows:
+            account = row["account"]
+            accounts.append({
+                "account_id": account.id,
+                "account_code": account.code,
+                "account_name": account.name,
+                "closing_balance": row["balance"],
+            })
+            if account.liquidity_class in totals:
+                totals[account.liquidity_class] += row["balance"]
+
+            account_type = _account_type_value(account.type)
+            if account_type in ("income", "expense"):
+                # Same basis as the Income & Expenditure account and balance sheet surplus
+                movement = row["debit_total"] - row["credit_total"]
+                if row["opening_recorded"]:
+                    movement += row["opening"]
+                if account_type == "income":
+                    total_income -= movement
+                else:
+                    total_expenses += movement
+
+        return {
+            "accounts": accounts,
+            "bank_balance": totals[LIQUIDITY_BANK],
+            "cash_balance": totals[LIQUIDITY_CASH],
+            "total_income": total_income,
+            "total_expenses": total_expenses,
+            "net_surplus_deficit": total_income - total_expenses,
+        }
+
+    @staticmethod
+    async def carry_forward_opening_balances(
+        db: AsyncSession,
+        society_id: int,
+        next_financial_year_id: int,
+        accounts: List[Dict[str, Any]],
+        created_by: Optional[int] = None
+    ) -> Dict[str, int]:
+        """
+        Upsert the next year's provisional opening balances from closing balances.
+
+        Accounts with a zero closing balance get no opening balance row; an
+        existing row for them is left untouched. Existing rows for the other
+        accounts are overwritten and marked provisional and carried forward.
+
+        Args:
+            db: Database session (caller commits)
+            society_id: Society ID
+            next_financial_year_id: Year receiving the opening balances
+            accounts: Output 'accounts' of compute_closing_balances()
+            created_by: User recorded on newly created rows
+
+        Returns:
+            Dict with 'inserted', 'updated' and 'skipped_zero' row counts
+        """
+        existing = set((await db.execute(
+            select(OpeningBalance.account_head_id).where(
+                OpeningBalance.financial_year_id == next_financial_year_id
+            )
+        )).scalars().all())
+
+        now = datetime.utcnow()
+        rows = []
+        for account in accounts:
+            closing = account["closing_balance"]
+            if abs(closing) <= CENT:
+                continue
+            rows.append({
+                "society_id": society_id,
+                "financial_year_id": next_financial_year_id,
+                "account_head_id": account["account_id"],
+                "account_name": account["account_name"],
+                "opening_balance": abs(closing).quantize(CENT),
+                "balance_type": BalanceType.DEBIT if closing > 0 else BalanceType.CREDIT,
+                "status": BalanceStatus.PROVISIONAL,
+                "calculated_from_previous_year": True,
+                "manual_entry": False,
+                "created_at": now,
+                "created_by": created_by,
+            })
+
+        if rows:
+            table = OpeningBalance.__table__
+            conn = await db.connection()
+            dialect_insert = pg_insert if conn.dialect.name == "postgresql" else sqlite_insert
+            stmt = dialect_insert(table)
+            # Executed with a parameter list so the ledger version hooks see the society
+            await db.execute(stmt.on_conflict_do_update(
+                index_elements=[table.c.financial_year_id, table.c.account_head_id],
+                set_={
+                    "opening_balance": stmt.excluded.opening_balance,
+                    "balance_type": stmt.excluded.balance_type,
+                    "status": stmt.excluded.status,
+                    "calculated_from_previous_year": stmt.excluded.calculated_from_previous_year,
+                }
+            ), rows)
+
+        updated = sum(1 for row in rows if row["account_head_id"] in existing)
+        return {
+            "inserted": len(rows) - updated,
+            "updated": updated,
+            "skipped_zero": len(accounts) - len(rows),
+        }
+
+    async def close_into_next_year(
+        self,
+        db: AsyncSession,
+        society_id: int,
+        fy: FinancialYear,
+        next_fy: FinancialYear,
+        created_by: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Compute closing balances of fy and carry them into next_fy.
+
+        Returns:
+            compute_closing_balances() totals plus 'accounts_closed',
+            'opening_balances_inserted', 'opening_balances_updated',
+            'opening_balances_skipped' and 'timings_ms' per stage
+        """
+        timings: Dict[str, float] = {}
+        with _stage(timings, "closing_balances"):
+            closing = await self.compute_closing_balances(db, society_id, fy)
+        with _stage(timings, "opening_balances"):
+            counts = await self.carry_forward_opening_balances(
+                db, society_id, next_fy.id, closing["accounts"], created_by
+            )
+        timings["total"] = round(sum(timings.values()), 2)
+
+        return {
+            **{key: value for key, value in closing.items() if key != "accounts"},
+            "accounts_closed": len(closing["accounts"]),
+            "opening_balances_inserted": counts["inserted"],
+            "opening_balances_updated": counts["updated"],
+            "opening_balances_skipped": counts["skipped_zero"],
+            "timings_ms": timings,
+        }
+
+
+# Create service instance
+year_end_close_service = YearEndCloseService()
+
+# Export functions for backward compatibility
+compute_closing_balances = year_end_close_service.compute_closing_balances
+carry_forward_opening_balances = year_end_close_service.carry_forward_opening_balances
+close_into_next_year = year_end_close_service.close_into_next_year
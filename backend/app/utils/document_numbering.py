@@ -1,12 +1,124 @@
 """
 Automatic Document Numbering Utility
 Generates unique document numbers for transactions, journal entries, receipts, etc.
+
+Numbers are allocated from the document_sequences table, one counter row per
+(society, prefix, financial year). The counter is advanced with a single
+UPDATE ... RETURNING, which holds the row's write lock until the caller's
+transaction ends, so two concurrent requests never get the same number. On
+SQLite the transaction is opened with BEGIN IMMEDIATE to take the database
+write lock up front. A series is seeded once from the highest number already
+stored in its source table (the old LIKE scan), so existing numbering continues.
 """
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
-from datetime import date
-from typing import Optional
-from app.models_db import Transaction, JournalEntry, Payment
+from sqlalchemy import select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from datetime import date, datetime
+from typing import Awaitable, Callable, List, Optional
+from app.models_db import Transaction, JournalEntry, Payment, DocumentSequence
+
+
+CONTINUOUS_SERIES = 0  # financial_year_id for series that are not reset each financial year
+SHARED_SERIES = 0  # society_id for series shared by all societies (numbers unique across the table)
+
+
+async def _max_existing_number(db: AsyncSession, column, prefix: str, *filters) -> int:
+    """Highest numeric suffix among stored '{prefix}-NNNN' values (used once to seed a series)"""
+    marker = f"{prefix}-"
+    result = await db.execute(select(column).where(column.like(f"{marker}%"), *filters))
+
+    max_num = 0
+    for doc_num in result.scalars().all():
+        if doc_num and doc_num.startswith(marker):
+            try:
+                num = int(doc_num[len(marker):])
+                if num > max_num:
+                    max_num = num
+            except ValueError:
+                continue
+    return max_num
+
+
+async def reserve_document_numbers(
+    db: AsyncSession,
+    society_id: int,
+    prefix: str,
+    count: int = 1,
+    financial_year_id: Optional[int] = None,
+    seed: Optional[Callable[[], Awaitable[int]]] = None
+) -> List[int]:
+    """
+    Atomically reserve the next `count` numbers of a document series.
+
+    Args:
+        db: Database session (numbers are committed with the caller's transaction)
+        society_id: Society ID, or SHARED_SERIES for a series shared by all societies
+        prefix: Series prefix, e.g. "JV"
+        count: Size of the block to reserve (bulk postings reserve all numbers at once)
+        financial_year_id: Financial year the series resets in (None = continuous series)
+        seed: Returns the last number already issued, called only when the series row is created
+
+    Returns:
+        The reserved numbers in ascending order
+    """
+    if count <= 0:
+        return []
+
+    series_year = financial_year_id or CONTINUOUS_SERIES
+    seq = DocumentSequence.__table__
+    series_filter = (
+        seq.c.society_id == society_id,
+        seq.c.prefix == prefix,
+        seq.c.financial_year_id == series_year,
+    )
+
+    conn = await db.connection()
+    dialect = conn.dialect.name
+    if dialect == "sqlite":
+        raw = await conn.get_raw_connection()
+        if not raw.driver_connection.in_transaction:
+            await conn.exec_driver_sql("BEGIN IMMEDIATE")
+
+    advance = (
+        update(seq)
+        .where(*series_filter)
+        .values(last_value=seq.c.last_value + count, updated_at=datetime.utcnow())
+        .returning(seq.c.last_value)
+    )
+    last_value = (await db.execute(advance)).scalar()
+
+    if last_value is None:
+        # First use of this series: start after the highest number already stored
+        start = await seed() if seed else 0
+        insert_fn = pg_insert if dialect == "postgresql" else sqlite_insert
+        await db.execute(
+            insert_fn(seq).values(
+                society_id=society_id,
+                prefix=prefix,
+                financial_year_id=series_year,
+                last_value=start,
+                updated_at=datetime.utcnow(),
+            ).on_conflict_do_nothing(index_elements=["society_id", "prefix", "financial_year_id"])
+        )
+        last_value = (await db.execute(advance)).scalar()
+
+    return list(range(last_value - count + 1, last_value + 1))
+
+
+def format_voucher_number(prefix: str, number: int) -> str:
+    """Voucher number in the PREFIX-0001 format"""
+    return f"{prefix}-{number:04d}"
+
+
+async def _reserve_voucher_numbers(db: AsyncSession, society_id: int, prefix: str, model, attr: str, count: int = 1) -> List[str]:
+    """Reserve `count` PREFIX-NNNN numbers, seeding the series from model.attr on first use"""
+    column = getattr(model, attr)
+    numbers = await reserve_document_numbers(
+        db, society_id, prefix, count=count,
+        seed=lambda: _max_existing_number(db, column, prefix, model.society_id == society_id)
+    )
+    return [format_voucher_number(prefix, n) for n in numbers]
 
 
 async def generate_quick_entry_voucher_number(
@@ -19,32 +131,11 @@ async def generate_quick_entry_voucher_number(
     Format: QV-0001, QV-0002, etc. (sequential across all time)
     
     Args:
-        offset: Additional offset to add (useful for creating multiple transactions in same entry)
+        offset: Additional offset to add (useful for creating multiple transactions in same entry);
+            the skipped numbers are reserved as well
     """
-    # Find the maximum QV number for this society
-    result = await db.execute(
-        select(Transaction.document_number).where(
-            Transaction.society_id == society_id,
-            Transaction.document_number.like("QV-%")
-        ).order_by(Transaction.document_number.desc())
-    )
-    existing_numbers = result.scalars().all()
-    
-    max_num = 0
-    for doc_num in existing_numbers:
-        if doc_num and doc_num.startswith("QV-"):
-            try:
-                num = int(doc_num[3:])  # Extract number after "QV-"
-                if num > max_num:
-                    max_num = num
-            except ValueError:
-                continue
-    
-    # Next number is max_num + 1 + offset
-    next_num = max_num + 1 + offset
-    voucher_number = f"QV-{next_num:04d}"
-    
-    return voucher_number
+    numbers = await _reserve_voucher_numbers(db, society_id, "QV", Transaction, "document_number", count=offset + 1)
+    return numbers[-1]
 
 
 async def generate_journal_voucher_number(
@@ -55,30 +146,7 @@ async def generate_journal_voucher_number(
     Generate sequential voucher number for Journal Voucher entries.
     Format: JV-0001, JV-0002, etc. (sequential across all time)
     """
-    # Find the maximum JV number for this society
-    result = await db.execute(
-        select(JournalEntry.entry_number).where(
-            JournalEntry.society_id == society_id,
-            JournalEntry.entry_number.like("JV-%")
-        ).order_by(JournalEntry.entry_number.desc())
-    )
-    existing_numbers = result.scalars().all()
-    
-    max_num = 0
-    for entry_num in existing_numbers:
-        if entry_num and entry_num.startswith("JV-"):
-            try:
-                num = int(entry_num[3:])  # Extract number after "JV-"
-                if num > max_num:
-                    max_num = num
-            except ValueError:
-                continue
-    
-    # Next number is max_num + 1
-    next_num = max_num + 1
-    voucher_number = f"JV-{next_num:04d}"
-    
-    return voucher_number
+    return (await _reserve_voucher_numbers(db, society_id, "JV", JournalEntry, "entry_number"))[0]
 
 
 async def generate_receipt_voucher_number(
@@ -89,30 +157,8 @@ async def generate_receipt_voucher_number(
     Generate sequential voucher number for Receipt Vouchers (maintenance bill payments).
     Format: RV-0001, RV-0002, etc. (sequential across all time)
     """
-    # Find the maximum RV number for this society from JournalEntry (where receipts are stored)
-    result = await db.execute(
-        select(JournalEntry.entry_number).where(
-            JournalEntry.society_id == society_id,
-            JournalEntry.entry_number.like("RV-%")
-        ).order_by(JournalEntry.entry_number.desc())
-    )
-    existing_numbers = result.scalars().all()
-
-    max_num = 0
-    for entry_num in existing_numbers:
-        if entry_num and entry_num.startswith("RV-"):
-            try:
-                num = int(entry_num[3:])  # Extract number after "RV-"
-                if num > max_num:
-                    max_num = num
-            except ValueError:
-                continue
-
-    # Next number is max_num + 1
-    next_num = max_num + 1
-    voucher_number = f"RV-{next_num:04d}"
-
-    return voucher_number
+    # Receipts are stored as JournalEntry rows
+    return (await _reserve_voucher_numbers(db, society_id, "RV", JournalEntry, "entry_number"))[0]
 
 
 async def generate_payment_voucher_number(
@@ -123,31 +169,7 @@ async def generate_payment_voucher_number(
     Generate sequential voucher number for Payment Vouchers (expense payments).
     Format: PV-0001, PV-0002, etc. (sequential across all time)
     """
-    # Find the maximum PV number for this society
-    # We check both JournalEntry.entry_number and Transaction.document_number
-    result = await db.execute(
-        select(JournalEntry.entry_number).where(
-            JournalEntry.society_id == society_id,
-            JournalEntry.entry_number.like("PV-%")
-        ).order_by(JournalEntry.entry_number.desc())
-    )
-    existing_numbers = result.scalars().all()
-    
-    max_num = 0
-    for entry_num in existing_numbers:
-        if entry_num and entry_num.startswith("PV-"):
-            try:
-                num = int(entry_num[3:])  # Extract number after "PV-"
-                if num > max_num:
-                    max_num = num
-            except ValueError:
-                continue
-    
-    # Next number is max_num + 1
-    next_num = max_num + 1
-    voucher_number = f"PV-{next_num:04d}"
-    
-    return voucher_number
+    return (await _reserve_voucher_numbers(db, society_id, "PV", JournalEntry, "entry_number"))[0]
 
 
 # Legacy functions for backward compatibility
@@ -2,9 +2,10 @@
 Export Utilities for Excel and PDF Generation
 Provides functions to export reports to Excel and PDF formats
 """
+import logging
 from io import BytesIO
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 import openpyxl
 from openpyxl.styles import Font, Alignment, PatternFill, Border, Side
 from openpyxl.utils import get_column_letter
@@ -13,11 +14,26 @@ from reportlab.lib.pagesizes import A4, letter
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
 from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, Image
+from reportlab.platypus import BaseDocTemplate, Frame, PageTemplate, NextPageTemplate, PageBreak
 from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
 
 
 from decimal import Decimal
 
+logger = logging.getLogger(__name__)
+
+
+def _draw_draft_watermark(canvas, doc):
+    """Page callback: diagonal DRAFT watermark for unposted bills"""
+    canvas.saveState()
+    canvas.setFont('Helvetica-Bold', 100)
+    canvas.setFillGray(0.5, 0.2) # Gray color with 20% alpha
+    canvas.translate(A4[0]/2, A4[1]/2)
+    canvas.rotate(45)
+    canvas.drawCentredString(0, 0, "DRAFT")
+    canvas.restoreState()
+
+
 def create_maintenance_bill_pdf(
     bill_data: Dict[str, Any],
     society_info: Dict[str, Any]
@@ -42,18 +58,77 @@ def create_maintenance_bill_pdf(
         bottomMargin=40
     )
     
-    # Watermark for draft bills
-    is_draft = not bill_data.get('is_posted', True) # Default to True (posted) if not provided
+    content, is_draft = _maintenance_bill_flowables(bill_data, society_info)
     
     def on_page(canvas, doc):
         if is_draft:
-            canvas.saveState()
-            canvas.setFont('Helvetica-Bold', 100)
-            canvas.setFillGray(0.5, 0.2) # Gray color with 20% alpha
-            canvas.translate(A4[0]/2, A4[1]/2)
-            canvas.rotate(45)
-            canvas.drawCentredString(0, 0, "DRAFT")
-            canvas.restoreState()
+            _draw_draft_watermark(canvas, doc)
+    
+    # Build PDF
+    doc.build(content, onFirstPage=on_page, onLaterPages=on_page)
+    buffer.seek(0)
+    return buffer
+
+
+def create_maintenance_bill_pdfs(
+    bills: List[Dict[str, Any]],
+    society_info: Dict[str, Any]
+) -> List[bytes]:
+    """
+    Render a batch of maintenance bills, one PDF per bill.
+    Used by the bulk bill PDF job so each render worker call handles many bills.
+    """
+    return [create_maintenance_bill_pdf(bill_data, society_info).getvalue() for bill_data in bills]
+
+
+def create_merged_maintenance_bills_pdf(
+    bills: List[Dict[str, Any]],
+    society_info: Dict[str, Any]
+) -> BytesIO:
+    """
+    Create one PDF containing every bill, each starting on a new page.
+    Draft bills keep their watermark by switching page templates per bill.
+    """
+    buffer = BytesIO()
+    doc = BaseDocTemplate(
+        buffer,
+        pagesize=A4,
+        rightMargin=40,
+        leftMargin=40,
+        topMargin=40,
+        bottomMargin=40
+    )
+    frame = Frame(doc.leftMargin, doc.bottomMargin, doc.width, doc.height, id='normal')
+    templates = {
+        False: PageTemplate(id='posted', frames=[frame]),
+        True: PageTemplate(id='draft', frames=[frame], onPage=_draw_draft_watermark),
+    }
+    
+    story = []
+    first_is_draft = False
+    for index, bill_data in enumerate(bills):
+        content, is_draft = _maintenance_bill_flowables(bill_data, society_info)
+        if index == 0:
+            first_is_draft = is_draft
+        else:
+            story.append(NextPageTemplate(templates[is_draft].id))
+            story.append(PageBreak())
+        story.extend(content)
+    
+    # The first template in the list is used for the first page
+    doc.addPageTemplates([templates[first_is_draft], templates[not first_is_draft]])
+    doc.build(story)
+    buffer.seek(0)
+    return buffer
+
+
+def _maintenance_bill_flowables(
+    bill_data: Dict[str, Any],
+    society_info: Dict[str, Any]
+) -> Tuple[List[Any], bool]:
+    """Build the flowables for one maintenance bill. Returns (content, is_draft)."""
+    # Watermark for draft bills
+    is_draft = not bill_data.get('is_posted', True) # Default to True (posted) if not provided
 
     # Styles
     styles = getSampleStyleSheet()
@@ -278,10 +353,7 @@ def create_maintenance_bill_pdf(
     )
     content.append(Paragraph(footer_text, footer_style))
     
-    # Build PDF
-    doc.build(content, onFirstPage=on_page, onLaterPages=on_page)
-    buffer.seek(0)
-    return buffer
+    return content, is_draft
 
 
 class ExcelExporter:
@@ -1515,8 +1587,17 @@ class PDFExporter:
 
         # Header Construction - Logo centered above society name
         logo_url = society_info.get('logo_url')
+        logo_bytes = society_info.get('logo_bytes')
         logo = None
-        if logo_url:
+        if logo_bytes:
+            try:
+                from reportlab.platypus import Image
+
+                # Already read by the society context cache
+                logo = Image(BytesIO(logo_bytes), width=0.8*inch, height=0.8*inch)
+            except Exception as e:
+                logger.warning(f"Could not load logo: {e}")
+        elif logo_url:
             try:
                 import os
                 import requests
@@ -0,0 +1,64 @@
+"""
+Deferred imports for heavy optional libraries
+Routes that only occasionally export (reportlab, openpyxl, WeasyPrint) bind
+the exporter classes through a LazyAttribute, so importing the route module -
+and starting the API - does not import the export stack. The real object is
+imported on first attribute access or call; warm_up() does it ahead of time.
+"""
+import importlib
+import logging
+import threading
+import time
+from typing import Any, Dict, Iterable
+
+logger = logging.getLogger(__name__)
+
+# Imports reportlab and openpyxl; warm_up() loads it ahead of the first export
+EXPORT_MODULES = (
+    "app.utils.export_utils",
+)
+
+
+class LazyAttribute:
+    """Stand-in for `from module import name` that imports module on first use"""
+
+    def __init__(self, module: str, name: str):
+        self._module = module
+        self._name = name
+        self._target = None
+        self._lock = threading.Lock()
+
+    def resolve(self) -> Any:
+        if self._target is None:
+            with self._lock:
+                if self._target is None:
+                    self._target = getattr(importlib.import_module(self._module), self._name)
+        return self._target
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self.resolve(), attr)
+
+    def __call__(self, *args, **kwargs) -> Any:
+        return self.resolve()(*args, **kwargs)
+
+    def __repr__(self) -> str:
+        state = "loaded" if self._target is not None else "not loaded"
+        return f"<LazyAttribute {self._module}.{self._name} ({state})>"
+
+
+def lazy_attribute(module: str, name: str) -> LazyAttribute:
+    return LazyAttribute(module, name)
+
+
+def warm_up(modules: Iterable[str] = EXPORT_MODULES) -> Dict[str, float]:
+    """Import modules now (blocking); returns milliseconds per module, -1 if it failed"""
+    timings = {}
+    for module in modules:
+        started = time.perf_counter()
+        try:
+            importlib.import_module(module)
+            timings[module] = round((time.perf_counter() - started) * 1000, 2)
+        except Exception as e:
+            logger.warning(f"Warm-up import of {module} failed: {e}")
+            timings[module] = -1.0
+    return timings
@@ -1,10 +1,12 @@
 """Permission checking utilities"""
-from typing import List, Optional
+import time
+from typing import Dict, FrozenSet, List, NamedTuple, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, and_, or_
 
+from app.config import settings
 from app.models_db import (
-    User, CustomRole, RolePermission, Permission, UserRoleAssignment
+    User, UserRole, CustomRole, RolePermission, Permission, UserRoleAssignment
 )
 
 
@@ -68,17 +70,106 @@ async def initialize_permissions(db: AsyncSession):
     await db.commit()
 
 
-async def get_user_permissions(
+class EffectivePermissions(NamedTuple):
+    """A user's resolved access: admin shortcut, active role ids and permission codes"""
+    is_admin: bool
+    role_ids: FrozenSet[int]
+    permissions: FrozenSet[str]
+    expires_at: float
+
+
+class PermissionCache:
+    """
+    In-process cache of effective permissions per user.
+
+    Entries expire after a TTL and are dropped explicitly by the role,
+    permission and role-assignment routes, so a warm check_permission() runs
+    no queries. Each worker process holds its own cache; the TTL bounds how
+    long another worker can serve a stale entry.
+    """
+
+    def __init__(self, ttl_seconds: int):
+        self.ttl_seconds = ttl_seconds
+        self._entries: Dict[int, EffectivePermissions] = {}
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get(self, user_id: int) -> Optional[EffectivePermissions]:
+        entry = self._entries.get(user_id)
+        if entry is not None and entry.expires_at > time.monotonic():
+            self.hits += 1
+            return entry
+        if entry is not None:
+            del self._entries[user_id]
+        self.misses += 1
+        return None
+
+    def set(self, user_id: int, is_admin: bool, role_ids, permissions) -> EffectivePermissions:
+        entry = EffectivePermissions(
+            is_admin=is_admin,
+            role_ids=frozenset(role_ids),
+            permissions=frozenset(permissions),
+            expires_at=time.monotonic() + self.ttl_seconds
+        )
+        if self.ttl_seconds > 0:
+            self._entries[user_id] = entry
+        return entry
+
+    def invalidate_user(self, user_id: int) -> None:
+        """Drop one user's entry (role assignment or user role changed)"""
+        if self._entries.pop(int(user_id), None) is not None:
+            self.invalidations += 1
+
+    def invalidate_role(self, role_id: int) -> None:
+        """Drop every entry that includes a role (role or its permissions changed)"""
+        role_id = int(role_id)
+        stale = [user_id for user_id, entry in self._entries.items() if role_id in entry.role_ids]
+        for user_id in stale:
+            del self._entries[user_id]
+        self.invalidations += len(stale)
+
+    def clear(self) -> None:
+        self.invalidations += len(self._entries)
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "invalidations": self.invalidations,
+            "ttl_seconds": self.ttl_seconds
+        }
+
+
+permission_cache = PermissionCache(settings.PERMISSION_CACHE_TTL_SECONDS)
+
+
+async def get_effective_permissions(
     user_id: int,
     db: AsyncSession
-) -> List[str]:
+) -> EffectivePermissions:
     """
-    Get all permissions for a user based on their role assignments
-    Returns list of permission codes
+    Resolve a user's admin status and permission codes, from the cache when warm.
+    A cold lookup costs two queries: the user's role, and active role
+    assignments joined to their permissions.
     """
-    # Get user's role assignments
+    cached = permission_cache.get(user_id)
+    if cached is not None:
+        return cached
+
+    result = await db.execute(select(User.role).where(User.id == user_id))
+    user_role = result.scalar_one_or_none()
+    is_admin = user_role in [UserRole.ADMIN, UserRole.SUPER_ADMIN]
+
+    # Active role assignments with their permissions (roles without permissions still count)
     result = await db.execute(
-        select(UserRoleAssignment)
+        select(UserRoleAssignment.role_id, Permission.permission_code)
+        .outerjoin(RolePermission, RolePermission.role_id == UserRoleAssignment.role_id)
+        .outerjoin(Permission, RolePermission.permission_id == Permission.id)
         .where(
             and_(
                 UserRoleAssignment.user_id == user_id,
@@ -86,29 +177,30 @@ async def get_user_permissions(
             )
         )
     )
-    assignments = result.scalars().all()
-    
-    if not assignments:
-        return []
-    
-    role_ids = [assignment.role_id for assignment in assignments]
-    
-    # Get permissions for these roles
-    result = await db.execute(
-        select(RolePermission, Permission)
-        .join(Permission, RolePermission.permission_id == Permission.id)
-        .where(RolePermission.role_id.in_(role_ids))
-    )
-    role_permissions = result.all()
-    
+    role_ids = set()
     permissions = set()
-    for role_perm, perm in role_permissions:
-        permissions.add(perm.permission_code)
-        # If user has "all" permission, return all permissions
-        if perm.permission_code == "all":
-            return [p["code"] for p in SYSTEM_PERMISSIONS]
-    
-    return list(permissions)
+    for role_id, permission_code in result.all():
+        role_ids.add(role_id)
+        if permission_code:
+            permissions.add(permission_code)
+
+    # If user has "all" permission, they hold every system permission
+    if "all" in permissions:
+        permissions = {p["code"] for p in SYSTEM_PERMISSIONS}
+
+    return permission_cache.set(user_id, is_admin, role_ids, permissions)
+
+
+async def get_user_permissions(
+    user_id: int,
+    db: AsyncSession
+) -> List[str]:
+    """
+    Get all permissions for a user based on their role assignments
+    Returns list of permission codes
+    """
+    effective = await get_effective_permissions(user_id, db)
+    return list(effective.permissions)
 
 
 async def check_permission(
@@ -123,24 +215,19 @@ async def check_permission(
     
     Note: Admin and Super Admin users have all permissions by default
     """
-    # Get user to check their role
-    from app.models_db import User, UserRole
-    result = await db.execute(select(User).where(User.id == user_id))
-    user = result.scalar_one_or_none()
-    
+    effective = await get_effective_permissions(user_id, db)
+
     # Admin and Super Admin have all permissions
-    if user and user.role in [UserRole.ADMIN, UserRole.SUPER_ADMIN]:
+    if effective.is_admin:
         return True
-    
-    user_permissions = await get_user_permissions(user_id, db)
-    
-    if "all" in user_permissions:
+
+    if "all" in effective.permissions:
         return True
     
     if require_all:
         return False
     
-    return permission_code in user_permissions
+    return permission_code in effective.permissions
 
 
 async def has_any_permission(
@@ -0,0 +1,156 @@
+"""
+Shared helpers for benchmarks: throwaway SQLite databases, seed data and
+SQL statement counting
+"""
+import os
+import random
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import event, insert
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+
+from app.database import Base, import_models
+
+
+async def create_bench_engine(db_path: str = None):
+    """Create a fresh SQLite database with the full schema and return (engine, session_factory, path)"""
+    if db_path is None:
+        fd, db_path = tempfile.mkstemp(prefix="gharmitra_bench_", suffix=".db")
+        os.close(fd)
+        os.remove(db_path)
+
+    import_models()
+    engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}", echo=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    return engine, session_factory, db_path
+
+
+class QueryCounter:
+    """Counts SQL statements executed on an engine while active"""
+
+    def __init__(self, engine):
+        self.sync_engine = engine.sync_engine
+        self.count = 0
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.count += 1
+
+    def __enter__(self):
+        self.count = 0
+        event.listen(self.sync_engine, "before_cursor_execute", self._on_execute)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.sync_engine, "before_cursor_execute", self._on_execute)
+        return False
+
+
+@contextmanager
+def timed(results: dict, key: str):
+    """Record wall-clock milliseconds for the enclosed block into results[key]"""
+    start = time.perf_counter()
+    yield
+    results[key] = (time.perf_counter() - start) * 1000
+
+
+async def seed_society(conn, society_id: int = 1):
+    """Insert a society and an admin user to satisfy foreign keys"""
+    from app.models_db import Society, User, UserRole, AccountingType
+
+    now = datetime.utcnow()
+    await conn.execute(insert(Society.__table__), [{
+        "id": society_id, "name": f"Bench Society {society_id}", "total_flats": 0,
+        "gst_registration_applicable": False, "accounting_type": AccountingType.CASH,
+        "created_at": now, "updated_at": now,
+    }])
+    await conn.execute(insert(User.__table__), [{
+        "id": society_id, "society_id": society_id, "email": f"bench{society_id}@example.com",
+        "password_hash": "x", "name": "Bench Admin", "apartment_number": "ADMIN",
+        "role": UserRole.ADMIN, "terms_accepted": True, "privacy_accepted": True,
+        "created_at": now, "updated_at": now,
+    }])
+
+
+async def seed_ledger(conn, society_id: int, n_accounts: int, n_transactions: int,
+                      fy_start: date, fy_end: date, seed: int = 42, batch_size: int = 20000):
+    """
+    Seed a chart of accounts, a financial year and random balanced postings.
+
+    Returns the financial year id.
+    """
+    from app.models_db import AccountCode, Transaction, FinancialYear, AccountType, TransactionType
+    from app.models.financial_year import YearStatus
+
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    types = [AccountType.ASSET, AccountType.LIABILITY, AccountType.CAPITAL,
+             AccountType.INCOME, AccountType.EXPENSE]
+    prefixes = {AccountType.ASSET: 1, AccountType.LIABILITY: 2, AccountType.CAPITAL: 3,
+                AccountType.INCOME: 4, AccountType.EXPENSE: 5}
+
+    accounts = []
+    for i in range(n_accounts):
+        acc_type = types[i % len(types)]
+        accounts.append({
+            "society_id": society_id,
+            "code": f"{prefixes[acc_type]}{i:04d}",
+            "name": f"Account {i}",
+            "type": acc_type,
+            "opening_balance": round(rng.uniform(0, 10000), 2),
+            "current_balance": 0,
+            "is_fixed_expense": False,
+            "created_at": now,
+            "updated_at": now,
+        })
+    await conn.execute(insert(AccountCode.__table__), accounts)
+
+    result = await conn.execute(insert(FinancialYear.__table__).values(
+        society_id=society_id, year_name=f"FY {fy_start.year}-{fy_end.year}",
+        start_date=fy_start, end_date=fy_end, status=YearStatus.OPEN,
+        is_active=True, is_closed=False, created_at=now, updated_at=now,
+    ))
+    fy_id = result.inserted_primary_key[0]
+
+    codes = [a["code"] for a in accounts]
+    span_days = (fy_end - fy_start).days
+    batch = []
+    for n in range(n_transactions // 2):
+        amount = round(rng.uniform(10, 50000), 2)
+        txn_date = fy_start + timedelta(days=rng.randint(0, span_days))
+        debit_code, credit_code = rng.sample(codes, 2)
+        for code, debit, credit in ((debit_code, amount, 0.0), (credit_code, 0.0, amount)):
+            batch.append({
+                "society_id": society_id, "type": TransactionType.EXPENSE,
+                "category": "Bench", "account_code": code, "amount": amount,
+                "description": f"Bench posting {n}", "date": txn_date, "added_by": society_id,
+                "debit_amount": debit, "credit_amount": credit, "is_reversed": False,
+                "created_at": now, "updated_at": now,
+            })
+        if len(batch) >= batch_size:
+            await conn.execute(insert(Transaction.__table__), batch)
+            batch = []
+    if batch:
+        await conn.execute(insert(Transaction.__table__), batch)
+
+    return fy_id
+
+
+def percentile(samples: list, pct: float) -> float:
+    """Nearest-rank percentile of a list of milliseconds"""
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def print_comparison(title: str, rows: list):
+    """Print a small before/after table: rows of (label, queries, ms)"""
+    print(f"\n{title}")
+    print(f"{'variant':<28}{'queries':>10}{'latency (ms)':>16}")
+    for label, queries, ms in rows:
+        print(f"{label:<28}{queries:>10}{ms:>16.1f}")
@@ -0,0 +1,144 @@
+"""
+Account classification benchmark: code/name pattern scans vs. classification columns
+
+Seeds many societies with the standard chart of accounts (chart_of_accounts.json),
+classifies them with classify_accounts() as the startup migration does, then
+compares the pattern lookups the Receipts & Payments, Cash Book and Bank Ledger
+reports used with the equality lookups on liquidity_class. Checks that the
+Balance Sheet groups equal the old name-keyword categorization and that the
+mapper hooks reclassify an edited account.
+
+Usage (from backend/):
+    python -m benchmarks.bench_account_classification
+    python -m benchmarks.bench_account_classification --societies 2000 --lookups 500
+"""
+import argparse
+import asyncio
+import json
+import os
+from datetime import datetime
+
+from sqlalchemy import select, insert, and_, or_
+
+from app.models_db import AccountCode, AccountType, Society
+from app.services.account_classification_service import (
+    classify_accounts, LIQUIDITY_CASH, LIQUIDITY_BANK, LIQUIDITY_CLASSES
+)
+from benchmarks._common import create_bench_engine, QueryCounter, timed, print_comparison
+
+CHART_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "chart_of_accounts.json")
+
+
+async def seed_societies(conn, n_societies: int):
+    with open(CHART_PATH, encoding="utf-8") as f:
+        chart = json.load(f)
+    now = datetime.utcnow()
+    await conn.execute(insert(Society.__table__), [{
+        "id": sid, "name": f"Bench Society {sid}", "total_flats": 0, "gst_registration_applicable": False,
+        "created_at": now, "updated_at": now,
+    } for sid in range(1, n_societies + 1)])
+    rows = [{
+        "society_id": sid, "code": acc["code"], "name": acc["name"], "type": AccountType(acc["type"]),
+        "category": acc.get("category"), "opening_balance": 0, "current_balance": 0,
+        "is_fixed_expense": False, "created_at": now, "updated_at": now,
+    } for sid in range(1, n_societies + 1) for acc in chart]
+    for i in range(0, len(rows), 20000):
+        await conn.execute(insert(AccountCode.__table__), rows[i:i + 20000])
+    return len(chart)
+
+
+def legacy_category(account):
+    """The name-keyword categorization the balance sheet used"""
+    name_lower = account.name.lower()
+    if account.type == AccountType.CAPITAL:
+        return "capital_funds"
+    if account.type == AccountType.LIABILITY:
+        return "current_liabilities"
+    if account.type == AccountType.ASSET:
+        if any(k in name_lower for k in ['building', 'lift', 'generator', 'electrical', 'equipment', 'furniture', 'fixture', 'depreciation']):
+            return "fixed_assets"
+        if 'fixed deposit' in name_lower or 'fd' in name_lower:
+            return "investments"
+        return "current_assets"
+    return None
+
+
+async def codes(db, *conditions):
+    return sorted((await db.execute(select(AccountCode.code).where(and_(*conditions)))).scalars().all())
+
+
+async def legacy_lookups(db, society_id: int):
+    liquid = await codes(db, AccountCode.society_id == society_id, or_(
+        *(AccountCode.code.like(f"{prefix}%") for prefix in ("100", "101", "102", "103", "104", "105", "106"))
+    ))
+    if not liquid:
+        liquid = await codes(db, AccountCode.society_id == society_id, AccountCode.type == AccountType.ASSET,
+                             or_(AccountCode.name.ilike('%Cash%'), AccountCode.name.ilike('%Bank%')))
+    cash = await codes(db, AccountCode.society_id == society_id, AccountCode.code.like('1010%'))
+    bank = await codes(db, AccountCode.society_id == society_id, AccountCode.code.like('100%'),
+                       AccountCode.type == 'asset')
+    return liquid, cash, bank
+
+
+async def classified_lookups(db, society_id: int):
+    liquid = await codes(db, AccountCode.society_id == society_id, AccountCode.liquidity_class.in_(LIQUIDITY_CLASSES))
+    cash = await codes(db, AccountCode.society_id == society_id, AccountCode.liquidity_class == LIQUIDITY_CASH)
+    bank = await codes(db, AccountCode.society_id == society_id, AccountCode.liquidity_class == LIQUIDITY_BANK)
+    return liquid, cash, bank
+
+
+async def main(n_societies: int, n_lookups: int, keep_db: bool):
+    engine, session_factory, db_path = await create_bench_engine()
+    try:
+        print(f"Seeding {n_societies} societies with the standard chart into {db_path} ...")
+        async with engine.begin() as conn:
+            chart_size = await seed_societies(conn, n_societies)
+
+        timings = {}
+        async with session_factory() as db:
+            with timed(timings, "classify"):
+                classified = await classify_accounts(db)
+            await db.commit()
+        print(f"Classified {classified} accounts ({chart_size} per society) in {timings['classify']:.0f} ms")
+
+        societies = [1 + (i * 7919) % n_societies for i in range(n_lookups)]
+        async with session_factory() as db:
+            with QueryCounter(engine) as legacy_q, timed(timings, "legacy"):
+                for sid in societies:
+                    legacy = await legacy_lookups(db, sid)
+            with QueryCounter(engine) as new_q, timed(timings, "classified"):
+                for sid in societies:
+                    after = await classified_lookups(db, sid)
+
+            accounts = (await db.execute(select(AccountCode).where(AccountCode.society_id == 1))).scalars().all()
+            groups_match = all(acc.balance_sheet_group == legacy_category(acc) for acc in accounts)
+
+            # Editing a head through the ORM reclassifies it
+            petty_cash = next(acc for acc in accounts if acc.code == "1010")
+            petty_cash.type = AccountType.EXPENSE
+            await db.flush()
+            hook_cleared = petty_cash.liquidity_class is None and petty_cash.schedule == "Expenditure"
+            await db.rollback()
+
+        print_comparison(f"Cash/bank head lookups, {n_lookups} report requests", [
+            ("LIKE / ilike patterns (before)", legacy_q.count, timings["legacy"]),
+            ("liquidity_class equality", new_q.count, timings["classified"]),
+        ])
+        print(f"\nReceipts & Payments heads unchanged: {legacy[0] == after[0]}")
+        print(f"Cash book heads: {legacy[1]} -> {after[1]}")
+        print(f"Bank ledger heads: {legacy[2]} -> {after[2]}")
+        print(f"Balance sheet groups equal the keyword categorization: {groups_match}; "
+              f"edit reclassifies: {hook_cleared}")
+    finally:
+        await engine.dispose()
+        if not keep_db and os.path.exists(db_path):
+            os.remove(db_path)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--societies", type=int, default=500)
+    parser.add_argument("--lookups", type=int, default=200)
+    parser.add_argument("--keep-db", action="store_true", help="Do not delete the seeded database")
+    args = parser.parse_args()
+    asyncio.run(main(args.societies, args.lookups, args.keep_db))
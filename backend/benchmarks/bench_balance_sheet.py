@@ -0,0 +1,231 @@
+"""
+Balance sheet benchmark and regression check: per-account scans vs. one grouped pass
+
+Seeds the standard chart of accounts (chart_of_accounts.json) with opening
+balances and random balanced postings, then runs the previous Balance Sheet
+algorithm (one select(Transaction) per account head plus a second pass over
+income/expense postings) next to the balance sheet service and compares every
+section, total and the surplus. Exits with status 1 when the outputs differ.
+
+Usage (from backend/):
+    python -m benchmarks.bench_balance_sheet
+    python -m benchmarks.bench_balance_sheet --transactions 500000
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+from sqlalchemy import select, insert, and_, or_
+
+from app.models_db import (
+    AccountCode, AccountType, Transaction, TransactionType, FinancialYear, OpeningBalance, BalanceType
+)
+from app.models.financial_year import YearStatus
+from app.services.account_classification_service import classify_accounts
+from app.services.ledger_snapshot_service import rebuild_ledger_snapshots
+from app.services.balance_sheet_service import compute_balance_sheet_sections
+from benchmarks._common import create_bench_engine, QueryCounter, timed, seed_society, print_comparison
+
+CHART_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "chart_of_accounts.json")
+
+
+async def seed_chart_ledger(conn, society_id: int, fy_start: date, fy_end: date, n_transactions: int, seed: int = 17):
+    """Standard chart, opening balances for a third of the heads and balanced postings; returns the FY id"""
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    with open(CHART_PATH, encoding="utf-8") as f:
+        chart = json.load(f)
+    await conn.execute(insert(AccountCode.__table__), [{
+        "society_id": society_id, "code": acc["code"], "name": acc["name"], "type": AccountType(acc["type"]),
+        "category": acc.get("category"), "opening_balance": round(rng.uniform(0, 50000), 2),
+        "current_balance": 0, "is_fixed_expense": False, "created_at": now, "updated_at": now,
+    } for acc in chart])
+    result = await conn.execute(insert(FinancialYear.__table__).values(
+        society_id=society_id, year_name=f"FY {fy_start.year}-{fy_end.year}", start_date=fy_start,
+        end_date=fy_end, status=YearStatus.OPEN, is_active=True, is_closed=False,
+        created_at=now, updated_at=now,
+    ))
+    fy_id = result.inserted_primary_key[0]
+
+    accounts = (await conn.execute(
+        select(AccountCode.id, AccountCode.code, AccountCode.name).where(AccountCode.society_id == society_id)
+    )).all()
+    await conn.execute(insert(OpeningBalance.__table__), [{
+        "society_id": society_id, "financial_year_id": fy_id, "account_head_id": acc_id,
+        "account_name": name, "opening_balance": round(rng.uniform(100, 200000), 2),
+        "balance_type": rng.choice((BalanceType.DEBIT, BalanceType.CREDIT)), "created_at": now,
+    } for acc_id, code, name in accounts if rng.random() < 0.33])
+
+    codes = [code for _, code, _ in accounts]
+    span = (fy_end - fy_start).days
+    batch = []
+    for n in range(n_transactions // 2):
+        amount = round(rng.uniform(10, 50000), 2)
+        txn_date = fy_start + timedelta(days=rng.randint(0, span))
+        debit_code, credit_code = rng.sample(codes, 2)
+        for code, debit, credit in ((debit_code, amount, 0.0), (credit_code, 0.0, amount)):
+            batch.append({
+                "society_id": society_id, "type": TransactionType.EXPENSE, "category": "Bench",
+                "account_code": code, "amount": amount, "description": f"Bench posting {n}",
+                "date": txn_date, "added_by": society_id, "debit_amount": debit, "credit_amount": credit,
+                "is_reversed": False, "created_at": now, "updated_at": now,
+            })
+        if len(batch) >= 20000:
+            await conn.execute(insert(Transaction.__table__), batch)
+            batch = []
+    if batch:
+        await conn.execute(insert(Transaction.__table__), batch)
+    return fy_id
+
+
+async def legacy_balance_sheet_sections(db, society_id: int, financial_year_id: int, fy_start_date: date, effective_date: date):
+    """The previous algorithm: one transaction scan per account, then a pass over I&E postings"""
+    accounts = (await db.execute(
+        select(AccountCode).where(AccountCode.society_id == society_id).order_by(AccountCode.code)
+    )).scalars().all()
+    opening_balances = {}
+    for ob, ac in (await db.execute(
+        select(OpeningBalance, AccountCode).join(AccountCode, OpeningBalance.account_head_id == AccountCode.id)
+        .where(OpeningBalance.financial_year_id == financial_year_id, AccountCode.society_id == society_id)
+    )).all():
+        opening_balances[ac.code] = ob
+
+    account_balances = {}
+    for account in accounts:
+        if account.type in [AccountType.INCOME, AccountType.EXPENSE]:
+            continue
+        ob = opening_balances.get(account.code)
+        if ob:
+            ob_val = Decimal(str(ob.opening_balance))
+            balance = ob_val if ob.balance_type == BalanceType.DEBIT else -ob_val
+        else:
+            balance = Decimal(str(account.opening_balance or 0.0))
+            if account.type in [AccountType.LIABILITY, AccountType.CAPITAL]:
+                balance = -balance
+        transactions = (await db.execute(
+            select(Transaction).where(and_(
+                Transaction.society_id == society_id, Transaction.account_code == account.code,
+                Transaction.date >= fy_start_date, Transaction.date <= effective_date
+            )).order_by(Transaction.date, Transaction.id)
+        )).scalars().all()
+        for txn in transactions:
+            balance += Decimal(str(txn.debit_amount or 0.0))
+            balance -= Decimal(str(txn.credit_amount or 0.0))
+        category = account.balance_sheet_group
+        if category:
+            if account.type == AccountType.ASSET:
+                if balance > Decimal("0.01"):
+                    account_balances.setdefault(category, []).append(
+                        {"code": account.code, "name": account.name, "balance": float(balance.quantize(Decimal("0.01")))})
+            elif balance < -Decimal("0.01"):
+                account_balances.setdefault(category, []).append(
+                    {"code": account.code, "name": account.name, "balance": float(abs(balance).quantize(Decimal("0.01")))})
+
+    ie_accounts = (await db.execute(select(AccountCode).where(and_(
+        AccountCode.society_id == society_id,
+        or_(AccountCode.type == AccountType.INCOME, AccountCode.type == AccountType.EXPENSE)
+    )))).scalars().all()
+    total_income = Decimal("0.00")
+    total_expenses = Decimal("0.00")
+    for txn, account in (await db.execute(
+        select(Transaction, AccountCode).join(AccountCode, Transaction.account_code == AccountCode.code).where(and_(
+            Transaction.society_id == society_id,
+            Transaction.account_code.in_([acc.code for acc in ie_accounts]),
+            Transaction.date >= fy_start_date, Transaction.date <= effective_date
+        ))
+    )).all():
+        debit = Decimal(str(txn.debit_amount or 0.0))
+        credit = Decimal(str(txn.credit_amount or 0.0))
+        if account.type == AccountType.INCOME:
+            total_income += credit - debit
+        else:
+            total_expenses += debit - credit
+    for account in ie_accounts:
+        ob = opening_balances.get(account.code)
+        if ob:
+            ob_val = Decimal(str(ob.opening_balance))
+            if account.type == AccountType.INCOME:
+                total_income += ob_val if ob.balance_type == BalanceType.CREDIT else -ob_val
+            else:
+                total_expenses += ob_val if ob.balance_type == BalanceType.DEBIT else -ob_val
+
+    surplus_deficit = total_income - total_expenses
+    if abs(surplus_deficit) >= Decimal("0.01"):
+        capital = account_balances.setdefault("capital_funds", [])
+        for item in capital:
+            if "retained" in item["name"].lower() or "surplus" in item["name"].lower():
+                item["balance"] += float(surplus_deficit.quantize(Decimal("0.01")))
+                break
+        else:
+            capital.append({
+                "code": "9999",
+                "name": "Surplus/Deficit (Excess of Income over Expenditure)" if surplus_deficit >= 0 else "Deficit (Excess of Expenditure over Income)",
+                "balance": float(abs(surplus_deficit).quantize(Decimal("0.01")))
+            })
+
+    sections = {s: account_balances.get(s, []) for s in
+                ("capital_funds", "current_liabilities", "fixed_assets", "investments", "current_assets")}
+    totals = {s: sum((Decimal(str(i["balance"])) for i in items), Decimal("0.00")) for s, items in sections.items()}
+    return {"sections": sections, "totals": totals, "surplus_deficit": surplus_deficit}
+
+
+def _rounded(result):
+    """Compare at reported precision (cents)"""
+    return (
+        result["sections"],
+        {s: t.quantize(Decimal("0.01")) for s, t in result["totals"].items()},
+        result["surplus_deficit"].quantize(Decimal("0.01")),
+    )
+
+
+async def main(n_transactions: int, keep_db: bool) -> bool:
+    today = date.today()
+    fy_start = date(today.year - 1, 4, 1) if today.month < 4 else date(today.year, 4, 1)
+    fy_end = date(fy_start.year + 1, 3, 31)
+    engine, session_factory, db_path = await create_bench_engine()
+    try:
+        print(f"Seeding the standard chart and {n_transactions} transactions into {db_path} ...")
+        async with engine.begin() as conn:
+            await seed_society(conn)
+            fy_id = await seed_chart_ledger(conn, 1, fy_start, fy_end, n_transactions)
+        # Core inserts bypass the ORM hooks, so derive classification and snapshots explicitly
+        async with session_factory() as db:
+            await classify_accounts(db)
+            await rebuild_ledger_snapshots(db)
+            await db.commit()
+
+        timings = {}
+        matches = []
+        for label, as_on in (("mid-year", fy_start + timedelta(days=200)), ("year end", fy_end)):
+            async with session_factory() as db:
+                with QueryCounter(engine) as legacy_q, timed(timings, f"legacy {label}"):
+                    legacy = await legacy_balance_sheet_sections(db, 1, fy_id, fy_start, as_on)
+                with QueryCounter(engine) as grouped_q, timed(timings, f"grouped {label}"):
+                    grouped = await compute_balance_sheet_sections(db, 1, fy_id, fy_start, as_on)
+            matches.append((label, _rounded(legacy) == _rounded(grouped)))
+            print_comparison(f"Balance sheet as on {as_on} ({label})", [
+                ("per-account scans (before)", legacy_q.count, timings[f"legacy {label}"]),
+                ("grouped pass (after)", grouped_q.count, timings[f"grouped {label}"]),
+            ])
+            print(f"Totals: {', '.join(f'{s} {t:.2f}' for s, t in grouped['totals'].items())}; "
+                  f"surplus {grouped['surplus_deficit']:.2f}")
+
+        print("\n" + "; ".join(f"{label} output matches: {ok}" for label, ok in matches))
+        return all(ok for _, ok in matches)
+    finally:
+        await engine.dispose()
+        if not keep_db and os.path.exists(db_path):
+            os.remove(db_path)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--transactions", type=int, default=200000)
+    parser.add_argument("--keep-db", action="store_true", help="Do not delete the seeded database")
+    args = parser.parse_args()
+    sys.exit(0 if asyncio.run(main(args.transactions, args.keep_db)) else 1)
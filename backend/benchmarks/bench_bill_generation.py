@@ -0,0 +1,152 @@
+"""
+Bill generation benchmark: per-flat flush/refresh vs. bulk INSERT ... RETURNING
+
+Seeds flats, maintenance account heads, society settings and approved
+supplementary charges, then runs the generate-bills route in bulk mode and a
+replica of the legacy write pattern (arrears lookup, add + flush + refresh per
+flat, supplementary links updated one object at a time) on a separate database.
+
+Usage (from backend/):
+    python -m benchmarks.bench_bill_generation                # 1k flats, mixed method
+    python -m benchmarks.bench_bill_generation --flats 5000 --method sqft
+"""
+import argparse
+import asyncio
+import os
+from datetime import date, datetime
+from decimal import Decimal
+
+from sqlalchemy import select, func, insert
+
+from app.models_db import (
+    Flat, OccupancyStatus, AccountCode, AccountType, SocietySettings,
+    MaintenanceBill, BillStatus, SupplementaryBill, SupplementaryBillFlat
+)
+from app.models.maintenance import BillGenerationRequest
+from app.models.user import UserResponse
+from app.routes.maintenance import generate_bills, get_flat_balance
+from benchmarks._common import create_bench_engine, QueryCounter, timed, seed_society, print_comparison
+
+
+def previous_month(today: date):
+    """generate_bills only accepts the previous calendar month on an empty ledger"""
+    return (12, today.year - 1) if today.month == 1 else (today.month - 1, today.year)
+
+
+async def seed_billing(conn, society_id: int, n_flats: int, method: str):
+    """Flats, required account heads, settings and supplementary charges for 10% of flats"""
+    now = datetime.utcnow()
+    await conn.execute(insert(AccountCode.__table__), [
+        {"society_id": society_id, "code": code, "name": name, "type": acc_type,
+         "utility_type": utility_type, "opening_balance": 0, "current_balance": 0,
+         "is_fixed_expense": False, "created_at": now, "updated_at": now}
+        for code, name, acc_type, utility_type in (
+            ("1100", "Maintenance Dues Receivable", AccountType.ASSET, "maintenance_receivable"),
+            ("4000", "Maintenance Charges", AccountType.INCOME, "maintenance_income"),
+            ("5110", "Water Charges - Tanker", AccountType.EXPENSE, "water_tanker"),
+        )
+    ])
+    await conn.execute(insert(SocietySettings.__table__).values(
+        society_id=society_id, maintenance_calculation_logic=method, maintenance_rate_sqft=2.5,
+        maintenance_rate_flat=1500, sinking_fund_rate=25000, created_at=now, updated_at=now,
+    ))
+    await conn.execute(insert(Flat.__table__), [{
+        "society_id": society_id, "flat_number": f"T{i // 100 + 1}-{i % 100 + 1:03d}",
+        "area_sqft": 900 + (i % 5) * 150, "occupants": i % 5,
+        "occupancy_status": OccupancyStatus.VACANT if i % 5 == 0 else OccupancyStatus.OWNER_OCCUPIED,
+        "created_at": now, "updated_at": now,
+    } for i in range(n_flats)])
+    flat_ids = (await conn.execute(select(Flat.id).where(Flat.society_id == society_id))).scalars().all()
+
+    result = await conn.execute(insert(SupplementaryBill.__table__).values(
+        society_id=society_id, title="Lift repair", date=date.today(), status="approved",
+        created_at=now, updated_at=now,
+    ))
+    supp_bill_id = result.inserted_primary_key[0]
+    await conn.execute(insert(SupplementaryBillFlat.__table__), [
+        {"supplementary_bill_id": supp_bill_id, "flat_id": flat_id, "amount": 750,
+         "is_included_in_monthly": False, "status": "unpaid"}
+        for flat_id in flat_ids[::10]
+    ])
+
+
+async def legacy_write_bills(db, society_id: int, month: int, year: int, with_arrears: bool):
+    """The pre-bulk write pattern: arrears, add + flush + refresh and supplementary links per flat"""
+    flats = (await db.execute(select(Flat).where(Flat.society_id == society_id))).scalars().all()
+    supp = (await db.execute(
+        select(SupplementaryBillFlat).where(SupplementaryBillFlat.is_included_in_monthly == False)
+    )).scalars().all()
+    flat_to_supp = {}
+    for sc in supp:
+        flat_to_supp.setdefault(sc.flat_id, []).append(sc)
+
+    for flat in flats:
+        if with_arrears:
+            await get_flat_balance(db, society_id, flat.id, date(year, month, 1))
+        new_bill = MaintenanceBill(
+            society_id=society_id, flat_id=flat.id, flat_number=flat.flat_number,
+            month=month, year=year, amount=Decimal("2500.00"), maintenance_amount=Decimal("2500.00"),
+            water_amount=Decimal("0.00"), total_amount=Decimal("2500.00"), breakdown={},
+            status=BillStatus.UNPAID, is_posted=False, created_at=datetime.utcnow(), paid_date=None
+        )
+        db.add(new_bill)
+        await db.flush()
+        await db.refresh(new_bill)
+        for sc in flat_to_supp.get(flat.id, []):
+            sc.is_included_in_monthly = True
+            sc.maintenance_bill_id = new_bill.id
+            db.add(sc)
+    await db.commit()
+
+
+async def run(n_flats: int, method: str, keep_db: bool):
+    month, year = previous_month(date.today())
+    admin = UserResponse(
+        id="1", email="bench1@example.com", name="Bench Admin", apartment_number="ADMIN",
+        role="admin", society_id=1, created_at=datetime.utcnow()
+    )
+    timings, counts, paths = {}, {}, []
+    try:
+        for variant in ("legacy", "bulk"):
+            engine, session_factory, db_path = await create_bench_engine()
+            paths.append(db_path)
+            try:
+                async with engine.begin() as conn:
+                    await seed_society(conn)
+                    await seed_billing(conn, 1, n_flats, method)
+                async with session_factory() as db:
+                    with QueryCounter(engine) as counter, timed(timings, variant):
+                        if variant == "legacy":
+                            await legacy_write_bills(db, 1, month, year, with_arrears=(method == "mixed"))
+                        else:
+                            response = await generate_bills(
+                                BillGenerationRequest(month=month, year=year, override_water_charges=120000),
+                                current_user=admin, db=db
+                            )
+                    counts[variant] = counter.count
+                async with session_factory() as db:
+                    linked = (await db.execute(
+                        select(func.count(SupplementaryBillFlat.id)).where(SupplementaryBillFlat.maintenance_bill_id.isnot(None))
+                    )).scalar()
+            finally:
+                await engine.dispose()
+
+        print_comparison(f"Bill generation ({n_flats} flats, {method})", [
+            ("per-flat flush (before)", counts["legacy"], timings["legacy"]),
+            ("bulk insert (after)", counts["bulk"], timings["bulk"]),
+        ])
+        print(f"Bills generated: {response.total_bills_generated}, supplementary links: {linked}")
+        print(f"Phase timings (ms): {response.phase_timings}")
+    finally:
+        for db_path in paths:
+            if not keep_db and os.path.exists(db_path):
+                os.remove(db_path)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--flats", type=int, default=1000)
+    parser.add_argument("--method", choices=["sqft", "fixed", "mixed", "water_based"], default="mixed")
+    parser.add_argument("--keep-db", action="store_true", help="Do not delete the seeded databases")
+    args = parser.parse_args()
+    asyncio.run(run(args.flats, args.method, args.keep_db))
@@ -0,0 +1,116 @@
+"""
+Bulk bill PDF benchmark: one download_bill_pdf call per bill vs. a bulk job
+
+Seeds flats and generates a month of bills, then renders every bill PDF
+(a) by calling the single-bill download route once per bill, as a client
+distributing a month's bills does today, and (b) through the bulk bill PDF job
+as a streamed ZIP and as one merged PDF, on the render process pool.
+
+Usage (from backend/):
+    python -m benchmarks.bench_bulk_bill_pdfs                 # 1k flats
+    python -m benchmarks.bench_bulk_bill_pdfs --flats 300 --pool-size 4
+"""
+import argparse
+import asyncio
+import io
+import os
+import zipfile
+from datetime import date, datetime
+
+from sqlalchemy import select
+
+from app import database
+from app.models_db import MaintenanceBill
+from app.models.maintenance import BillGenerationRequest
+from app.models.user import UserResponse
+from app.routes.maintenance import generate_bills, download_bill_pdf
+from app.services.bill_pdf_jobs import bill_pdf_jobs
+from app.services.render_executor import render_executor
+from benchmarks._common import create_bench_engine, QueryCounter, timed, seed_society, print_comparison
+from benchmarks.bench_bill_generation import seed_billing, previous_month
+
+
+async def drain(job) -> bytes:
+    """Consume the job's download stream the way StreamingResponse would"""
+    chunks = []
+    async for chunk in job.stream():
+        chunks.append(chunk)
+    return b"".join(chunks)
+
+
+async def run(n_flats: int, pool_size: int, keep_db: bool):
+    month, year = previous_month(date.today())
+    admin = UserResponse(
+        id="1", email="bench1@example.com", name="Bench Admin", apartment_number="ADMIN",
+        role="admin", society_id=1, created_at=datetime.utcnow()
+    )
+    if pool_size >= 0:
+        render_executor.pool_size = pool_size
+
+    engine, session_factory, db_path = await create_bench_engine()
+    database.AsyncSessionLocal = session_factory  # Jobs open their own session
+    timings, counts = {}, {}
+    try:
+        async with engine.begin() as conn:
+            await seed_society(conn)
+            await seed_billing(conn, 1, n_flats, "fixed")
+        async with session_factory() as db:
+            await generate_bills(
+                BillGenerationRequest(month=month, year=year, override_water_charges=120000),
+                current_user=admin, db=db
+            )
+        async with session_factory() as db:
+            bill_ids = (await db.execute(
+                select(MaintenanceBill.id).where(MaintenanceBill.month == month, MaintenanceBill.year == year)
+            )).scalars().all()
+
+        # Warm the pool so process start-up is not billed to either variant
+        async with session_factory() as db:
+            await download_bill_pdf(str(bill_ids[0]), current_user=admin, db=db)
+
+        with QueryCounter(engine) as counter, timed(timings, "per_bill"):
+            per_bill_bytes = 0
+            for bill_id in bill_ids:
+                async with session_factory() as db:
+                    response = await download_bill_pdf(str(bill_id), current_user=admin, db=db)
+                    async for chunk in response.body_iterator:
+                        per_bill_bytes += len(chunk)
+        counts["per_bill"] = counter.count
+
+        results = {}
+        for output_format in ("zip", "pdf"):
+            with QueryCounter(engine) as counter, timed(timings, output_format):
+                job = bill_pdf_jobs.submit(1, month, year, output_format, requested_by=1)
+                if output_format == "zip":
+                    payload = await drain(job)  # Download starts while the job is running
+                else:
+                    await job.task
+                    payload = await drain(job)
+            counts[output_format] = counter.count
+            results[output_format] = (job, payload)
+
+        print_comparison(f"Bill PDFs ({len(bill_ids)} bills, render pool size {render_executor.pool_size})", [
+            ("download_bill_pdf x N (before)", counts["per_bill"], timings["per_bill"]),
+            ("bulk job, streamed ZIP (after)", counts["zip"], timings["zip"]),
+            ("bulk job, merged PDF (after)", counts["pdf"], timings["pdf"]),
+        ])
+        zip_job, zip_bytes = results["zip"]
+        with zipfile.ZipFile(io.BytesIO(zip_bytes)) as archive:
+            assert archive.testzip() is None
+            print(f"ZIP: {len(archive.namelist())} PDFs, {len(zip_bytes)} bytes, status {zip_job.status}")
+        pdf_job, pdf_bytes = results["pdf"]
+        print(f"Merged PDF: {len(pdf_bytes)} bytes, status {pdf_job.status}; per-bill total {per_bill_bytes} bytes")
+    finally:
+        render_executor.shutdown()
+        await engine.dispose()
+        if not keep_db and os.path.exists(db_path):
+            os.remove(db_path)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--flats", type=int, default=1000)
+    parser.add_argument("--pool-size", type=int, default=-1, help="Render worker processes (default: RENDER_POOL_SIZE)")
+    parser.add_argument("--keep-db", action="store_true", help="Do not delete the seeded database")
+    args = parser.parse_args()
+    asyncio.run(run(args.flats, args.pool_size, args.keep_db))
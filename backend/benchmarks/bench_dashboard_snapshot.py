@@ -0,0 +1,127 @@
+"""
+Dashboard snapshot benchmark: recomputing /dashboard/summary vs. serving the snapshot
+
+Seeds a ledger with flats, members and complaints, then times the summary
+computed from the live tables against a fresh snapshot read and a conditional
+poll answered with 304. Also checks that ORM writes to complaints and
+transactions invalidate the snapshot and that an unchanged recompute keeps
+the ETag.
+
+Usage (from backend/):
+    python -m benchmarks.bench_dashboard_snapshot
+    python -m benchmarks.bench_dashboard_snapshot --transactions 500000 --polls 200
+"""
+import argparse
+import asyncio
+import os
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import insert, update
+
+from app.config import settings
+from app.models_db import (
+    Transaction, TransactionType, Flat, Member, MemberType, Complaint, ComplaintType, DashboardSnapshot
+)
+from app.routes.dashboard import _compute_dashboard_summary
+from app.services.dashboard_snapshot_service import dashboard_snapshots
+from benchmarks._common import (
+    create_bench_engine, QueryCounter, timed, seed_society, seed_ledger, print_comparison
+)
+
+
+async def seed_residents(conn, society_id: int, n_flats: int):
+    now = datetime.utcnow()
+    await conn.execute(insert(Flat.__table__), [{
+        "society_id": society_id, "flat_number": f"B-{i + 1:03d}", "area_sqft": 1000,
+        "created_at": now, "updated_at": now,
+    } for i in range(n_flats)])
+    await conn.execute(insert(Member.__table__), [{
+        "society_id": society_id, "flat_id": i + 1, "name": f"Member {i + 1}",
+        "phone_number": f"90000{i:05d}", "email": f"member{i + 1}@example.com",
+        "member_type": MemberType.OWNER, "status": "active",
+        "move_in_date": date(2020, 1, 1), "created_at": now, "updated_at": now,
+    } for i in range(n_flats)])
+    await conn.execute(insert(Complaint.__table__), [{
+        "society_id": society_id, "user_id": society_id, "type": ComplaintType.OTHER,
+        "title": f"Complaint {i}", "description": "Bench", "created_at": now - timedelta(hours=i),
+        "updated_at": now,
+    } for i in range(n_flats // 4)])
+
+
+async def poll(db, if_none_match=None):
+    return await dashboard_snapshots.get_or_compute(
+        db, 1, lambda: _compute_dashboard_summary(1, db), if_none_match
+    )
+
+
+async def main(n_transactions: int, n_polls: int, keep_db: bool):
+    today = date.today()
+    engine, session_factory, db_path = await create_bench_engine()
+    try:
+        print(f"Seeding 200 flats and {n_transactions} transactions into {db_path} ...")
+        async with engine.begin() as conn:
+            await seed_society(conn)
+            await seed_ledger(conn, 1, 200, n_transactions, today - timedelta(days=365), today)
+            await seed_residents(conn, 1, 200)
+
+        timings = {}
+        async with session_factory() as db:
+            with QueryCounter(engine) as compute_q, timed(timings, "compute"):
+                for _ in range(n_polls):
+                    await _compute_dashboard_summary(1, db)
+            with QueryCounter(engine) as first_q, timed(timings, "first"):
+                etag, _ = await poll(db)
+            await db.commit()
+            with QueryCounter(engine) as hit_q, timed(timings, "hit"):
+                for _ in range(n_polls):
+                    hit_etag, payload = await poll(db)
+            with QueryCounter(engine) as not_modified_q, timed(timings, "not_modified"):
+                for _ in range(n_polls):
+                    _, not_modified = await poll(db, etag)
+
+        print_comparison(f"Dashboard summary, {n_polls} polls", [
+            ("recompute every poll (before)", compute_q.count, timings["compute"]),
+            ("first poll, compute + store", first_q.count, timings["first"]),
+            ("snapshot hit, 200 + body", hit_q.count, timings["hit"]),
+            ("If-None-Match, 304", not_modified_q.count, timings["not_modified"]),
+        ])
+        print(f"\nSnapshot hits keep the ETag: {hit_etag == etag and payload is not None}; "
+              f"conditional polls answered 304: {not_modified is None}")
+
+        # Invalidation: an ORM complaint, then an ORM posting, must each change the dashboard
+        async with session_factory() as db:
+            db.add(Complaint(society_id=1, user_id=1, type=ComplaintType.OTHER, title="Lift", description="Stuck"))
+            await db.commit()
+            complaint_etag, complaint_payload = await poll(db, etag)
+            await db.commit()
+            db.add(Transaction(
+                society_id=1, type=TransactionType.INCOME, category="Maintenance Bill", account_code="4000",
+                amount=999.0, description="Bench ORM posting", date=today, added_by=1,
+                debit_amount=0, credit_amount=999.0,
+            ))
+            await db.commit()
+            posting_etag, _ = await poll(db, complaint_etag)
+            await db.commit()
+
+            # An expired snapshot with unchanged data recomputes to the same body
+            await db.execute(update(DashboardSnapshot).values(
+                computed_at=datetime.utcnow() - timedelta(seconds=settings.DASHBOARD_SNAPSHOT_MAX_AGE_SECONDS + 1)
+            ))
+            await db.commit()
+            _, expired_payload = await poll(db, posting_etag)
+        print(f"Complaint write invalidates: {complaint_payload is not None and complaint_etag != etag}; "
+              f"transaction write invalidates: {posting_etag != complaint_etag}; "
+              f"unchanged recompute still 304: {expired_payload is None}")
+    finally:
+        await engine.dispose()
+        if not keep_db and os.path.exists(db_path):
+            os.remove(db_path)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--transactions", type=int, default=100000)
+    parser.add_argument("--polls", type=int, default=100)
+    parser.add_argument("--keep-db", action="store_true", help="Do not delete the seeded database")
+    args = parser.parse_args()
+    asyncio.run(main(args.transactions, args.polls, args.keep_db))
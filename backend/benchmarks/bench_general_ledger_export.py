@@ -0,0 +1,139 @@
+"""
+General Ledger export benchmark: in-memory workbook vs. streamed export
+
+Seeds a ledger, then exports the General Ledger for the given period
+(a) the previous way: general_ledger_report materializes every transaction,
+the route copies it into export_data and ExcelExporter builds a full workbook,
+and (b) through the streaming pipeline (server-side cursor + openpyxl
+write-only mode, and CSV). Reports wall time and peak Python heap
+(tracemalloc, measured in a separate pass) and checks that the streamed
+workbook has the same cell values as the in-memory one.
+
+Usage (from backend/):
+    python -m benchmarks.bench_general_ledger_export                   # 200k postings
+    python -m benchmarks.bench_general_ledger_export --transactions 1000000
+"""
+import argparse
+import asyncio
+import io
+import os
+import time
+import tracemalloc
+from datetime import date, datetime
+
+import openpyxl
+
+from app import database
+from app.models.user import UserResponse
+from app.routes.reports import general_ledger_report, get_society_info
+from app.services.general_ledger_export import stream_general_ledger_excel, stream_general_ledger_csv
+from app.utils.export_utils import ExcelExporter
+from benchmarks._common import create_bench_engine, seed_society, seed_ledger
+
+
+async def legacy_export(session_factory, admin, from_date, to_date) -> bytes:
+    """The previous export route body"""
+    async with session_factory() as db:
+        report_data = await general_ledger_report(from_date, to_date, admin, db)
+        society_info = await get_society_info(1, db)
+    export_data = {"from_date": str(from_date), "to_date": str(to_date), "ledger": {}}
+    for entry in report_data["ledger_entries"]:
+        export_data["ledger"][entry["account_code"]] = {
+            "account_name": entry["account_name"],
+            "account_type": entry["account_type"],
+            "opening_balance": entry["opening_balance"],
+            "total_debit": entry["total_debit"],
+            "total_credit": entry["total_credit"],
+            "closing_balance": entry["closing_balance"],
+            "transactions": [
+                {
+                    "date": str(txn["date"]),
+                    "description": txn["description"],
+                    "debit": txn["debit"],
+                    "credit": txn["credit"],
+                    "balance": txn.get("balance", 0)
+                }
+                for txn in entry["transactions"]
+            ]
+        }
+    return ExcelExporter.create_general_ledger_excel(export_data, society_info).getvalue()
+
+
+async def streamed_export(stream) -> bytes:
+    chunks = []
+    async for chunk in stream:
+        chunks.append(chunk)
+    return b"".join(chunks)
+
+
+async def measure(label, make_coro, results):
+    started = time.perf_counter()
+    payload = await make_coro()
+    elapsed = (time.perf_counter() - started) * 1000
+
+    tracemalloc.start()
+    await make_coro()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    results.append((label, elapsed, peak / (1024 * 1024), len(payload)))
+    return payload
+
+
+def sheet_values(payload: bytes):
+    wb = openpyxl.load_workbook(io.BytesIO(payload), read_only=True)
+    return [row for row in wb.active.iter_rows(values_only=True)]
+
+
+async def run(n_transactions: int, keep_db: bool):
+    fy_start, fy_end = date(2023, 4, 1), date(2026, 3, 31)
+    # Start after the FY start so opening balances include prior movements
+    from_date, to_date = date(2023, 7, 1), fy_end
+    admin = UserResponse(
+        id="1", email="bench1@example.com", name="Bench Admin", apartment_number="ADMIN",
+        role="admin", society_id=1, created_at=datetime.utcnow()
+    )
+
+    engine, session_factory, db_path = await create_bench_engine()
+    database.AsyncSessionLocal = session_factory  # Streaming exports open their own session
+    try:
+        async with engine.begin() as conn:
+            await seed_society(conn)
+            await seed_ledger(conn, 1, n_accounts=300, n_transactions=n_transactions, fy_start=fy_start, fy_end=fy_end)
+        async with session_factory() as db:
+            society_info = await get_society_info(1, db)
+
+        results = []
+        legacy = await measure("report + in-memory workbook (before)",
+                               lambda: legacy_export(session_factory, admin, from_date, to_date), results)
+        streamed = await measure("streamed write-only xlsx (after)",
+                                 lambda: streamed_export(stream_general_ledger_excel(1, from_date, to_date, society_info)), results)
+        await measure("streamed csv (after)",
+                      lambda: streamed_export(stream_general_ledger_csv(1, from_date, to_date)), results)
+
+        print(f"\nGeneral Ledger export ({n_transactions} postings, {from_date} to {to_date})")
+        print(f"{'variant':40} {'latency (ms)':>13} {'peak heap (MB)':>15} {'bytes':>12}")
+        for label, elapsed, peak_mb, size in results:
+            print(f"{label:40} {elapsed:13.1f} {peak_mb:15.1f} {size:12}")
+
+        legacy_rows, streamed_rows = sheet_values(legacy), sheet_values(streamed)
+        # Trailing empty rows are not written in write-only mode
+        while legacy_rows and not any(v is not None for v in legacy_rows[-1]):
+            legacy_rows.pop()
+        while streamed_rows and not any(v is not None for v in streamed_rows[-1]):
+            streamed_rows.pop()
+        normalize = lambda rows: [tuple(v for v in row) + (None,) * (6 - len(row)) for row in rows]
+        identical = normalize(legacy_rows) == normalize(streamed_rows)
+        print(f"Cell values identical: {identical} ({len(streamed_rows)} rows)")
+    finally:
+        await engine.dispose()
+        if not keep_db and os.path.exists(db_path):
+            os.remove(db_path)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--transactions", type=int, default=200000)
+    parser.add_argument("--keep-db", action="store_true", help="Do not delete the seeded database")
+    args = parser.parse_args()
+    asyncio.run(run(args.transactions, args.keep_db))
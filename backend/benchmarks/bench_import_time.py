@@ -0,0 +1,113 @@
+"""
+Cold-start benchmark: import time of app.main from `python -X importtime`
+
+Imports app.main in fresh interpreters (the same work a sleeping free-tier
+instance redoes on wake-up), parses the -X importtime report and prints the
+median total, the app modules and third-party packages that cost the most,
+and how long the deferred export stack (reportlab, openpyxl, WeasyPrint) takes
+to load on the first export. Fails if any export library is imported at
+startup, or if the median exceeds --max-ms when given, so it can run as a
+regression check.
+
+Usage (from backend/):
+    python -m benchmarks.bench_import_time
+    python -m benchmarks.bench_import_time --runs 7 --top 20 --max-ms 4000
+"""
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+from typing import Dict, List, NamedTuple
+
+EXPORT_PACKAGES = ("reportlab", "openpyxl", "weasyprint")
+LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|\s*(\S+)\s*$")
+
+
+class ImportRecord(NamedTuple):
+    module: str
+    self_us: int
+    cumulative_us: int
+
+
+def profile_imports(statement: str) -> List[ImportRecord]:
+    """Run statement in a fresh interpreter with -X importtime and parse its report"""
+    backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE="0")
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=backend_dir, env=env, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"'{statement}' failed:\n{result.stderr[-2000:]}")
+    records = []
+    for line in result.stderr.splitlines():
+        match = LINE.match(line)
+        if match:
+            self_us, cumulative_us, module = match.groups()
+            records.append(ImportRecord(module, int(self_us), int(cumulative_us)))
+    return records
+
+
+def total_ms(records: List[ImportRecord], module: str) -> float:
+    return next((r.cumulative_us for r in records if r.module == module), 0) / 1000
+
+
+def package_self_ms(records: List[ImportRecord]) -> Dict[str, float]:
+    """Self time summed per top-level package (app modules are kept separate)"""
+    totals = defaultdict(float)
+    for r in records:
+        key = r.module if r.module.startswith("app.") else r.module.split(".")[0]
+        totals[key] += r.self_us / 1000
+    return totals
+
+
+def main(runs: int, top: int, max_ms: float) -> bool:
+    startup = [profile_imports("import app.main") for _ in range(runs)]
+    totals = [total_ms(records, "app.main") for records in startup]
+    median = statistics.median(totals)
+
+    # Self time per package, median across runs
+    per_run = [package_self_ms(records) for records in startup]
+    packages = {key: statistics.median(run.get(key, 0.0) for run in per_run) for key in per_run[0]}
+
+    print(f"\nimport app.main over {runs} fresh interpreters")
+    print(f"  median {median:.0f} ms (min {min(totals):.0f}, max {max(totals):.0f})")
+    print(f"\nTop {top} by self time (ms, median):")
+    for key, ms in sorted(packages.items(), key=lambda kv: kv[1], reverse=True)[:top]:
+        print(f"  {key:<48}{ms:>10.1f}")
+
+    loaded_at_startup = sorted({
+        r.module.split(".")[0] for r in startup[0] if r.module.split(".")[0] in EXPORT_PACKAGES
+    })
+
+    # What the first export pays once the stack is deferred
+    first_export = profile_imports(
+        "import app.main; from app.routes import reports; reports.ExcelExporter.create_trial_balance_excel"
+    )
+    deferred_ms = sum(r.self_us for r in first_export if r.module.split(".")[0] in EXPORT_PACKAGES
+                      or r.module == "app.utils.export_utils") / 1000
+    print(f"\nExport stack loaded on first export: {deferred_ms:.0f} ms")
+
+    checks = {
+        "no export library imported at startup": not loaded_at_startup,
+    }
+    if max_ms:
+        checks[f"median import time <= {max_ms:.0f} ms"] = median <= max_ms
+    print()
+    if loaded_at_startup:
+        print(f"imported at startup: {', '.join(loaded_at_startup)}")
+    for name, ok in checks.items():
+        print(f"{name}: {ok}")
+    return all(checks.values())
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--max-ms", type=float, default=0.0, help="Fail when the median import time exceeds this")
+    args = parser.parse_args()
+    sys.exit(0 if main(args.runs, args.top, args.max_ms) else 1)
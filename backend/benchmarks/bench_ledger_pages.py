@@ -0,0 +1,111 @@
+"""
+Cash book / bank ledger benchmark: full report vs. keyset-paginated pages
+
+Seeds a multi-year ledger, then fetches the bank ledger and cash book
+(a) as one full report, as the mobile app does today, and (b) page by page
+through /bank-ledger/page and /cash-book/page. Reports latency and peak Python
+heap for the full report and for the first and last page, and checks that the
+pages, concatenated, reproduce the full report's entries and closing balance.
+
+Usage (from backend/):
+    python -m benchmarks.bench_ledger_pages                        # 300k postings, 200 per page
+    python -m benchmarks.bench_ledger_pages --transactions 1000000 --limit 500
+"""
+import argparse
+import asyncio
+import os
+import time
+import tracemalloc
+from datetime import date, datetime
+
+from app.models.user import UserResponse
+from app.routes.reports import bank_ledger, bank_ledger_page, cash_book_ledger, cash_book_page
+from app.services.account_classification_service import classify_accounts
+from benchmarks._common import create_bench_engine, QueryCounter, seed_society, seed_ledger
+
+
+async def measure(make_coro):
+    """(result, ms, peak heap MB, queries) of one call"""
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = await make_coro()
+    elapsed = (time.perf_counter() - started) * 1000
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak / (1024 * 1024)
+
+
+async def walk_pages(session_factory, page_fn, args, admin, limit):
+    """Fetch every page; returns (entries, first page stats, last page stats, pages, closing)"""
+    entries, cursor, pages = [], None, 0
+    first = last = None
+    while True:
+        async with session_factory() as db:
+            page, ms, peak = await measure(lambda: page_fn(*args, cursor=cursor, limit=limit, current_user=admin, db=db))
+        pages += 1
+        if first is None:
+            first = (ms, peak)
+        last = (ms, peak)
+        entries.extend(page["entries"])
+        if not page["has_more"]:
+            return entries, first, last, pages, page["closing_balance"]
+        cursor = page["next_cursor"]
+
+
+async def run(n_transactions: int, limit: int, keep_db: bool):
+    fy_start, fy_end = date(2021, 4, 1), date(2026, 3, 31)
+    from_date, to_date = date(2022, 4, 1), fy_end
+    admin = UserResponse(
+        id="1", email="bench1@example.com", name="Bench Admin", apartment_number="ADMIN",
+        role="admin", society_id=1, created_at=datetime.utcnow()
+    )
+
+    engine, session_factory, db_path = await create_bench_engine()
+    try:
+        async with engine.begin() as conn:
+            await seed_society(conn)
+            await seed_ledger(conn, 1, n_accounts=300, n_transactions=n_transactions, fy_start=fy_start, fy_end=fy_end)
+        # Core inserts bypass the ORM hooks, so classify the accounts explicitly
+        async with session_factory() as db:
+            await classify_accounts(db)
+            await db.commit()
+
+        print(f"\nLiquid-account ledgers ({n_transactions} postings, {from_date} to {to_date}, {limit} per page)")
+        print(f"{'variant':36} {'latency (ms)':>13} {'peak heap (MB)':>15}")
+        for name, full_fn, page_fn in (("bank ledger", bank_ledger, bank_ledger_page),
+                                       ("cash book", cash_book_ledger, cash_book_page)):
+            args = (from_date, to_date, None) if full_fn is bank_ledger else (from_date, to_date)
+            async with session_factory() as db:
+                full, full_ms, full_peak = await measure(lambda: full_fn(*args, current_user=admin, db=db))
+            with QueryCounter(engine) as counter:
+                entries, first, last, pages, closing = await walk_pages(session_factory, page_fn, args, admin, limit)
+
+            print(f"{name + ', full report (before)':36} {full_ms:13.1f} {full_peak:15.1f}")
+            print(f"{name + ', first page (after)':36} {first[0]:13.1f} {first[1]:15.1f}")
+            print(f"{name + ', last page (after)':36} {last[0]:13.1f} {last[1]:15.1f}")
+
+            if full_fn is bank_ledger:
+                full_rows = [(t["date"], t["debit"], t["credit"]) for t in full["transactions"]]
+            else:
+                full_rows = sorted(
+                    [(r["date"], r["amount"], 0.0) for r in full["receipts"]] +
+                    [(p["date"], 0.0, p["amount"]) for p in full["payments"]],
+                    key=lambda r: r[0]
+                )
+            page_rows = [(e["date"], e["debit"], e["credit"]) for e in entries]
+            same_rows = sorted(full_rows) == sorted(page_rows)
+            print(f"  {pages} pages, {counter.count} queries; entries match: {same_rows} ({len(entries)}), "
+                  f"closing {closing:.2f} vs full {full['closing_balance']:.2f}")
+    finally:
+        await engine.dispose()
+        if not keep_db and os.path.exists(db_path):
+            os.remove(db_path)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--transactions", type=int, default=300000)
+    parser.add_argument("--limit", type=int, default=200)
+    parser.add_argument("--keep-db", action="store_true", help="Do not delete the seeded database")
+    args = parser.parse_args()
+    asyncio.run(run(args.transactions, args.limit, args.keep_db))
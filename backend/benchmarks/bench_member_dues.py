@@ -0,0 +1,160 @@
+"""
+Member Dues benchmark: per-flat queries vs. grouped dues engine
+
+Seeds flats, members, monthly bills and 1100 (Maintenance Dues Receivable)
+postings, then compares the legacy per-flat loop (debit sum, credit sum,
+unpaid bills and last payment per flat) with MemberDuesService, both for the
+full register and for one sorted page.
+
+Usage (from backend/):
+    python -m benchmarks.bench_member_dues                 # 1k and 5k flats
+    python -m benchmarks.bench_member_dues --flats 2000
+"""
+import argparse
+import asyncio
+import os
+import random
+from datetime import date, datetime
+from decimal import Decimal
+
+from sqlalchemy import select, func, and_, or_, insert
+
+from app.models_db import (
+    Flat, Member, MemberType, MaintenanceBill, BillStatus, Transaction, TransactionType
+)
+from app.services.member_dues_service import get_member_dues_report
+from benchmarks._common import create_bench_engine, QueryCounter, timed, seed_society, print_comparison
+
+
+async def seed_dues(conn, society_id: int, n_flats: int, months: int = 12, seed: int = 7):
+    """Flats with one member each, monthly posted bills and matching 1100 postings"""
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+
+    await conn.execute(insert(Flat.__table__), [{
+        "society_id": society_id, "flat_number": f"T{i // 100 + 1}-{i % 100 + 1:03d}",
+        "area_sqft": 900 + (i % 5) * 150, "created_at": now, "updated_at": now,
+    } for i in range(n_flats)])
+    flats = (await conn.execute(
+        select(Flat.id, Flat.flat_number).where(Flat.society_id == society_id)
+    )).all()
+
+    await conn.execute(insert(Member.__table__), [{
+        "society_id": society_id, "flat_id": flat_id, "name": f"Member {flat_number}",
+        "phone_number": f"9{flat_id:09d}", "email": f"m{flat_id}@example.com",
+        "member_type": MemberType.OWNER, "move_in_date": date(2024, 4, 1), "status": "active",
+        "created_at": now, "updated_at": now,
+    } for flat_id, flat_number in flats])
+
+    bills, postings = [], []
+    for flat_id, flat_number in flats:
+        for month in range(1, months + 1):
+            amount = round(rng.uniform(2500, 6000), 2)
+            paid = rng.random() < 0.8
+            bill_date = date(2025, month, 1)
+            bills.append({
+                "society_id": society_id, "flat_id": flat_id, "flat_number": flat_number,
+                "month": month, "year": 2025, "amount": amount, "total_amount": amount,
+                "status": BillStatus.PAID if paid else BillStatus.UNPAID, "is_posted": True,
+                "created_at": now, "updated_at": now,
+            })
+            postings.append({
+                "society_id": society_id, "type": TransactionType.INCOME, "category": "Maintenance",
+                "account_code": "1100", "amount": amount, "description": f"Maintenance bill {flat_number}",
+                "date": bill_date, "added_by": society_id, "debit_amount": amount, "credit_amount": 0,
+                "flat_id": flat_id, "created_at": now, "updated_at": now,
+            })
+            if paid:
+                postings.append({
+                    "society_id": society_id, "type": TransactionType.INCOME, "category": "Receipt",
+                    "account_code": "1100", "amount": amount,
+                    "description": f"Payment received - Flat: {flat_number}",
+                    "date": date(2025, month, 10), "added_by": society_id, "debit_amount": 0,
+                    "credit_amount": amount, "flat_id": flat_id, "created_at": now, "updated_at": now,
+                })
+    for start in range(0, len(bills), 20000):
+        await conn.execute(insert(MaintenanceBill.__table__), bills[start:start + 20000])
+    for start in range(0, len(postings), 20000):
+        await conn.execute(insert(Transaction.__table__), postings[start:start + 20000])
+
+
+async def legacy_member_dues(db, society_id: int):
+    """The pre-batching algorithm: separate queries for every flat"""
+    flats = (await db.execute(
+        select(Flat).where(Flat.society_id == society_id).order_by(Flat.flat_number)
+    )).scalars().all()
+    members = (await db.execute(select(Member).where(Member.society_id == society_id))).scalars().all()
+    names = {}
+    for m in members:
+        names.setdefault(m.flat_id, m.name)
+
+    total_outstanding = Decimal("0.00")
+    for flat in flats:
+        debits = (await db.execute(select(func.sum(Transaction.debit_amount)).where(
+            and_(Transaction.account_code == "1100", Transaction.flat_id == flat.id)))).scalar() or 0
+        credits = (await db.execute(select(func.sum(Transaction.credit_amount)).where(
+            and_(Transaction.account_code == "1100", Transaction.flat_id == flat.id)))).scalar() or 0
+        total_outstanding += Decimal(str(debits)) - Decimal(str(credits))
+        (await db.execute(select(MaintenanceBill).where(and_(
+            MaintenanceBill.flat_id == flat.id,
+            MaintenanceBill.status == BillStatus.UNPAID,
+            MaintenanceBill.is_posted == True
+        )))).scalars().all()
+        (await db.execute(select(Transaction.date).where(and_(
+            Transaction.account_code == "1100",
+            Transaction.credit_amount > 0,
+            or_(
+                Transaction.description.like(f"%from {flat.flat_number}%"),
+                Transaction.description.like(f"%Flat: {flat.flat_number}%"),
+                Transaction.description.like(f"%Flat {flat.flat_number}%")
+            )
+        )).order_by(Transaction.date.desc()).limit(1))).scalar()
+    return total_outstanding
+
+
+async def run(n_flats: int, keep_db: bool):
+    engine, session_factory, db_path = await create_bench_engine()
+    try:
+        print(f"\nSeeding {n_flats} flats x 12 months of bills into {db_path} ...")
+        async with engine.begin() as conn:
+            await seed_society(conn)
+            await seed_dues(conn, 1, n_flats)
+
+        timings = {}
+        async with session_factory() as db:
+            with QueryCounter(engine) as legacy_q, timed(timings, "legacy"):
+                legacy_total = await legacy_member_dues(db, 1)
+        async with session_factory() as db:
+            with QueryCounter(engine) as full_q, timed(timings, "full"):
+                report = await get_member_dues_report(db, society_id=1)
+        async with session_factory() as db:
+            with QueryCounter(engine) as page_q, timed(timings, "page"):
+                await get_member_dues_report(
+                    db, society_id=1, page=1, page_size=50,
+                    sort_by="outstanding_amount", sort_order="desc"
+                )
+
+        print_comparison(f"Member Dues ({n_flats} flats)", [
+            ("per-flat loop (before)", legacy_q.count, timings["legacy"]),
+            ("grouped, all flats", full_q.count, timings["full"]),
+            ("grouped, page of 50", page_q.count, timings["page"]),
+        ])
+        new_total = Decimal(str(report["total_outstanding"])).quantize(Decimal("0.01"))
+        print(f"Totals match: {legacy_total.quantize(Decimal('0.01')) == new_total} (outstanding={new_total})")
+    finally:
+        await engine.dispose()
+        if not keep_db and os.path.exists(db_path):
+            os.remove(db_path)
+
+
+async def main(flat_counts, keep_db: bool):
+    for n_flats in flat_counts:
+        await run(n_flats, keep_db)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--flats", type=int, nargs="*", default=[1000, 5000])
+    parser.add_argument("--keep-db", action="store_true", help="Do not delete the seeded databases")
+    args = parser.parse_args()
+    asyncio.run(main(args.flats, args.keep_db))
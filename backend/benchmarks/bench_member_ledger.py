@@ -0,0 +1,152 @@
+"""
+Member ledger benchmark: Python merge of bills and payments vs. SQL window function
+
+Seeds one flat with a long history of monthly bills and receipts (plus
+neighbouring flats so the indexes matter), then compares the legacy algorithm
+(load every bill and payment, sort and accumulate in Python) with
+get_member_ledger for the whole period, a date-bounded period and one page.
+Checks that running balances agree.
+
+Usage (from backend/):
+    python -m benchmarks.bench_member_ledger                     # 5k bills + 5k receipts
+    python -m benchmarks.bench_member_ledger --entries 20000 --page-size 50
+"""
+import argparse
+import asyncio
+import os
+import random
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+from sqlalchemy import select, func, and_, insert
+
+from app.models_db import Flat, MaintenanceBill, BillStatus, Payment, PaymentMode
+from app.services.member_ledger_service import get_member_ledger
+from benchmarks._common import create_bench_engine, QueryCounter, timed, seed_society, print_comparison
+
+
+async def seed_member_history(conn, society_id: int, n_entries: int, n_flats: int = 50, seed: int = 11):
+    """n_entries monthly bills and receipts for every one of n_flats flats; returns the first flat id"""
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    await conn.execute(insert(Flat.__table__), [{
+        "society_id": society_id, "flat_number": f"A-{i + 1:03d}", "area_sqft": 1000,
+        "created_at": now, "updated_at": now,
+    } for i in range(n_flats)])
+    flat_ids = (await conn.execute(
+        select(Flat.id, Flat.flat_number).where(Flat.society_id == society_id).order_by(Flat.id)
+    )).all()
+
+    start = date(2000, 1, 1)
+    bills, payments = [], []
+    bill_no = 0
+    for flat_id, flat_number in flat_ids:
+        for n in range(n_entries):
+            bill_no += 1
+            amount = round(rng.uniform(2500, 6000), 2)
+            billed_on = start + timedelta(days=n * 2)
+            bills.append({
+                "id": bill_no, "society_id": society_id, "flat_id": flat_id, "flat_number": flat_number,
+                "bill_number": f"BILL-{bill_no}", "month": billed_on.month, "year": billed_on.year,
+                "amount": amount, "total_amount": amount, "status": BillStatus.PAID, "is_posted": True,
+                "created_at": datetime.combine(billed_on, datetime.min.time()) + timedelta(hours=9),
+                "updated_at": now,
+            })
+            payments.append({
+                "society_id": society_id, "bill_id": bill_no, "flat_id": flat_id, "member_id": society_id,
+                "receipt_number": f"RCT-{bill_no}", "payment_date": billed_on + timedelta(days=1),
+                "payment_mode": PaymentMode.UPI, "amount": round(amount * rng.choice((1, 1, 0.5)), 2),
+                "created_at": now, "created_by": society_id, "recorded_by": society_id, "updated_at": now,
+            })
+    for i in range(0, len(bills), 20000):
+        await conn.execute(insert(MaintenanceBill.__table__), bills[i:i + 20000])
+    for i in range(0, len(payments), 20000):
+        await conn.execute(insert(Payment.__table__), payments[i:i + 20000])
+    return flat_ids[0][0]
+
+
+async def legacy_member_ledger(db, society_id: int, flat_id: int, from_date=None, to_date=None):
+    """The pre-window algorithm: every bill and payment loaded, merged and accumulated in Python"""
+    opening = 0.0
+    if from_date:
+        billed = (await db.execute(select(func.sum(MaintenanceBill.total_amount)).where(and_(
+            MaintenanceBill.flat_id == flat_id,
+            MaintenanceBill.created_at < datetime.combine(from_date, datetime.min.time()))))).scalar() or 0.0
+        paid = (await db.execute(select(func.sum(Payment.amount)).where(and_(
+            Payment.flat_id == flat_id, Payment.payment_date < from_date)))).scalar() or 0.0
+        opening = float(billed) - float(paid)
+
+    bills_query = select(MaintenanceBill).where(MaintenanceBill.flat_id == flat_id)
+    pay_query = select(Payment).where(Payment.flat_id == flat_id)
+    if from_date:
+        bills_query = bills_query.where(MaintenanceBill.created_at >= datetime.combine(from_date, datetime.min.time()))
+        pay_query = pay_query.where(Payment.payment_date >= from_date)
+    if to_date:
+        bills_query = bills_query.where(MaintenanceBill.created_at <= datetime.combine(to_date, datetime.max.time()))
+        pay_query = pay_query.where(Payment.payment_date <= to_date)
+    entries = [(b.created_at.date(), 0, b.id, float(b.total_amount)) for b in (await db.execute(bills_query)).scalars()]
+    entries += [(p.payment_date, 1, p.id, -float(p.amount)) for p in (await db.execute(pay_query)).scalars()]
+    entries.sort()
+
+    balance, balances = opening, []
+    for entry in entries:
+        balance += entry[3]
+        balances.append(round(balance, 2))
+    return balances
+
+
+async def run(n_entries: int, page_size: int, keep_db: bool):
+    engine, session_factory, db_path = await create_bench_engine()
+    try:
+        print(f"\nSeeding 50 flats x {n_entries} bills and receipts into {db_path} ...")
+        async with engine.begin() as conn:
+            await seed_society(conn)
+            flat_id = await seed_member_history(conn, 1, n_entries)
+
+        last_day = date(2000, 1, 1) + timedelta(days=n_entries * 2)
+        from_date, to_date = last_day - timedelta(days=365), last_day
+        timings = {}
+        async with session_factory() as db:
+            with QueryCounter(engine) as legacy_q, timed(timings, "legacy"):
+                legacy = await legacy_member_ledger(db, 1, flat_id)
+        async with session_factory() as db:
+            with QueryCounter(engine) as full_q, timed(timings, "full"):
+                full = await get_member_ledger(db, 1, flat_id)
+        async with session_factory() as db:
+            with QueryCounter(engine) as legacy_year_q, timed(timings, "legacy_year"):
+                legacy_year = await legacy_member_ledger(db, 1, flat_id, from_date, to_date)
+        async with session_factory() as db:
+            with QueryCounter(engine) as year_q, timed(timings, "year"):
+                year = await get_member_ledger(db, 1, flat_id, from_date, to_date)
+        async with session_factory() as db:
+            with QueryCounter(engine) as page_q, timed(timings, "page"):
+                page = await get_member_ledger(db, 1, flat_id, from_date, to_date, page=2, page_size=page_size)
+
+        print_comparison(f"Member ledger ({2 * n_entries} entries for the flat)", [
+            ("python merge, all (before)", legacy_q.count, timings["legacy"]),
+            ("window, all", full_q.count, timings["full"]),
+            ("python merge, 1 year", legacy_year_q.count, timings["legacy_year"]),
+            ("window, 1 year", year_q.count, timings["year"]),
+            (f"window, page 2 of {page_size}", page_q.count, timings["page"]),
+        ])
+        window_balances = [e["balance"] for e in full["entries"]]
+        year_balances = [e["balance"] for e in year["entries"]]
+        page_balances = [e["balance"] for e in page["entries"]]
+        print(f"Balances match: all {legacy == window_balances}, 1 year {legacy_year == year_balances}, "
+              f"page {year_balances[page_size:2 * page_size] == page_balances}")
+        brought_forward = Decimal(str(year_balances[page_size - 1])) if year_balances else Decimal("0")
+        print(f"Page brought forward {page['pagination']['brought_forward']:.2f} vs {brought_forward:.2f}; "
+              f"closing {full['closing_balance']:.2f}")
+    finally:
+        await engine.dispose()
+        if not keep_db and os.path.exists(db_path):
+            os.remove(db_path)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--entries", type=int, default=5000, help="Bills (and as many receipts) per flat")
+    parser.add_argument("--page-size", type=int, default=50)
+    parser.add_argument("--keep-db", action="store_true", help="Do not delete the seeded database")
+    args = parser.parse_args()
+    asyncio.run(run(args.entries, args.page_size, args.keep_db))
@@ -0,0 +1,177 @@
+"""
+Monthly rollup benchmark: transaction aggregates vs. monthly_account_rollups
+
+Seeds a year of postings (plus maintenance income on account 4000), then
+compares the queries the dashboard trend and the society summary used to run
+against the monthly rollup reads that replace them. Also checks that the
+after_flush hook keeps the rollups equal to a full rebuild after ORM writes.
+
+Usage (from backend/):
+    python -m benchmarks.bench_monthly_rollups
+    python -m benchmarks.bench_monthly_rollups --accounts 500 --transactions 500000
+"""
+import argparse
+import asyncio
+import os
+import random
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+from sqlalchemy import select, func, and_, case, insert
+
+from app.models_db import Transaction, TransactionType
+from app.services.ledger_snapshot_service import rebuild_ledger_snapshots
+from app.services.monthly_rollup_service import (
+    rebuild_monthly_rollups, get_monthly_totals, get_rollup_period_totals
+)
+from benchmarks._common import (
+    create_bench_engine, QueryCounter, timed, seed_society, seed_ledger, print_comparison
+)
+
+
+def last_six_months(today: date):
+    months = []
+    for i in range(5, -1, -1):
+        y, m = today.year, today.month - i
+        while m <= 0:
+            m += 12
+            y -= 1
+        months.append((y, m))
+    return months
+
+
+async def seed_maintenance_income(conn, society_id: int, fy_start: date, fy_end: date, n: int, seed: int = 5):
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    span = (fy_end - fy_start).days
+    await conn.execute(insert(Transaction.__table__), [{
+        "society_id": society_id, "type": TransactionType.INCOME, "category": "Maintenance Bill",
+        "account_code": "4000", "amount": amount, "description": f"Bill {i}",
+        "date": fy_start + timedelta(days=rng.randint(0, span)), "added_by": society_id,
+        "debit_amount": 0, "credit_amount": amount, "is_reversed": False,
+        "created_at": now, "updated_at": now,
+    } for i, amount in ((i, round(rng.uniform(2000, 6000), 2)) for i in range(n))])
+
+
+async def legacy_trend(db, society_id: int, today: date):
+    """One SUM(amount) per month, as the dashboard did"""
+    trend = []
+    for y, m in last_six_months(today):
+        m_start = date(y, m, 1)
+        m_end = (date(y + 1, 1, 1) if m == 12 else date(y, m + 1, 1)) - timedelta(days=1)
+        amount = (await db.execute(
+            select(func.coalesce(func.sum(Transaction.amount), 0)).where(and_(
+                Transaction.society_id == society_id,
+                Transaction.type == "income",
+                Transaction.category.like("%Maintenance%"),
+                Transaction.date >= m_start,
+                Transaction.date <= m_end
+            ))
+        )).scalar()
+        trend.append(round(float(amount or 0), 2))
+    return trend
+
+
+async def rollup_trend(db, society_id: int, today: date):
+    months = last_six_months(today)
+    totals = await get_monthly_totals(db, society_id, months[0], months[-1], ["4000"])
+    return [round(float(totals.get(ym, {}).get("4000", (0, 0, 0))[1]), 2) for ym in months]
+
+
+async def legacy_summary_totals(db, society_id: int, fy_start: date, from_date: date, to_date: date):
+    """The society summary's FY-to-date grouped transaction scan"""
+    in_period = and_(Transaction.date >= from_date, Transaction.date <= to_date)
+    rows = (await db.execute(
+        select(
+            Transaction.account_code,
+            func.sum(Transaction.debit_amount), func.sum(Transaction.credit_amount),
+            func.sum(case((in_period, Transaction.debit_amount), else_=0)),
+            func.sum(case((in_period, Transaction.credit_amount), else_=0)),
+        ).where(and_(
+            Transaction.society_id == society_id,
+            Transaction.date >= fy_start,
+            Transaction.date <= to_date,
+            Transaction.is_reversed == False
+        )).group_by(Transaction.account_code)
+    )).all()
+    return {r[0]: tuple(Decimal(str(v or 0)).quantize(Decimal("0.01")) for v in r[1:]) for r in rows}
+
+
+async def rollup_summary_totals(db, society_id: int, fy_start: date, from_date: date, to_date: date):
+    cumulative = await get_rollup_period_totals(db, society_id, fy_start, to_date)
+    period = await get_rollup_period_totals(db, society_id, from_date, to_date)
+    zero = (Decimal("0"), Decimal("0"))
+    return {
+        code: tuple(Decimal(str(v)).quantize(Decimal("0.01")) for v in (*totals, *period.get(code, zero)))
+        for code, totals in cumulative.items()
+    }
+
+
+async def main(n_accounts: int, n_transactions: int, keep_db: bool):
+    today = date.today()
+    fy_start = date(today.year - 1, today.month, 1)
+    from_date, to_date = today - timedelta(days=75), today
+    engine, session_factory, db_path = await create_bench_engine()
+    try:
+        print(f"Seeding {n_accounts} accounts x {n_transactions} transactions into {db_path} ...")
+        async with engine.begin() as conn:
+            await seed_society(conn)
+            await seed_ledger(conn, 1, n_accounts, n_transactions, fy_start, today)
+            await seed_maintenance_income(conn, 1, fy_start, today, n_transactions // 20)
+
+        timings = {}
+        # Seeding uses Core inserts, so build the derived tables explicitly
+        async with session_factory() as db:
+            await rebuild_ledger_snapshots(db)
+            with timed(timings, "rebuild"):
+                monthly_rows = await rebuild_monthly_rollups(db)
+            await db.commit()
+        print(f"Monthly rollup rebuild: {monthly_rows} rows in {timings['rebuild']:.0f} ms")
+
+        async with session_factory() as db:
+            with QueryCounter(engine) as legacy_trend_q, timed(timings, "legacy_trend"):
+                before_trend = await legacy_trend(db, 1, today)
+            with QueryCounter(engine) as trend_q, timed(timings, "trend"):
+                after_trend = await rollup_trend(db, 1, today)
+            with QueryCounter(engine) as legacy_sum_q, timed(timings, "legacy_summary"):
+                before_summary = await legacy_summary_totals(db, 1, fy_start, from_date, to_date)
+            with QueryCounter(engine) as sum_q, timed(timings, "summary"):
+                after_summary = await rollup_summary_totals(db, 1, fy_start, from_date, to_date)
+
+        print_comparison("Dashboard trend and society summary", [
+            ("trend, 6 SUMs (before)", legacy_trend_q.count, timings["legacy_trend"]),
+            ("trend, rollups (after)", trend_q.count, timings["trend"]),
+            ("summary, FY scan (before)", legacy_sum_q.count, timings["legacy_summary"]),
+            ("summary, rollups (after)", sum_q.count, timings["summary"]),
+        ])
+        print(f"\nTrend match: {before_trend == after_trend}; summary match: {before_summary == after_summary}")
+
+        # Incremental maintenance: ORM writes through the flush hook vs. a full rebuild
+        async with session_factory() as db:
+            txn = Transaction(
+                society_id=1, type=TransactionType.INCOME, category="Maintenance Bill", account_code="4000",
+                amount=1234.5, description="Bench ORM posting", date=today, added_by=1,
+                debit_amount=0, credit_amount=1234.5,
+            )
+            db.add(txn)
+            await db.commit()
+            txn.date = fy_start
+            await db.commit()
+            incremental = await get_monthly_totals(db, 1, (fy_start.year, fy_start.month), (today.year, today.month))
+            await rebuild_monthly_rollups(db)
+            rebuilt = await get_monthly_totals(db, 1, (fy_start.year, fy_start.month), (today.year, today.month))
+            await db.rollback()
+        print(f"Incremental rollups equal a rebuild after ORM insert + edit: {incremental == rebuilt}")
+    finally:
+        await engine.dispose()
+        if not keep_db and os.path.exists(db_path):
+            os.remove(db_path)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--accounts", type=int, default=300)
+    parser.add_argument("--transactions", type=int, default=300000)
+    parser.add_argument("--keep-db", action="store_true", help="Do not delete the seeded database")
+    args = parser.parse_args()
+    asyncio.run(main(args.accounts, args.transactions, args.keep_db))
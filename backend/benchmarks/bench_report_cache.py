@@ -0,0 +1,95 @@
+"""
+Report cache benchmark: recomputed vs. cached Balance Sheet, I&E and Trial Balance
+
+Seeds a ledger, then opens the three committee reports repeatedly for the same
+dates (a) computing each one from scratch and (b) through the report cache,
+with one posting added halfway so the ledger version moves and the cache has
+to recompute once. Run once per cache backend.
+
+Usage (from backend/):
+    python -m benchmarks.bench_report_cache                       # 50k postings, 20 opens
+    python -m benchmarks.bench_report_cache --transactions 200000 --opens 50
+"""
+import argparse
+import asyncio
+import os
+from datetime import date, datetime
+
+from app.models_db import Transaction, TransactionType
+from app.models.user import UserResponse
+from app.routes import reports
+from app.services.report_cache_service import (
+    ReportCache, MemoryReportCacheBackend, DatabaseReportCacheBackend
+)
+from benchmarks._common import create_bench_engine, QueryCounter, timed, seed_society, seed_ledger, print_comparison
+
+
+async def open_reports(session_factory, admin, from_date, to_date, opens: int, cached: bool):
+    """Open the three reports `opens` times, posting one transaction halfway through"""
+    for i in range(opens):
+        if i == opens // 2:
+            async with session_factory() as db:
+                db.add(Transaction(
+                    society_id=1, type=TransactionType.EXPENSE, category="Bench", account_code="10000",
+                    amount=100, description="Mid-run posting", date=to_date, added_by=1,
+                    debit_amount=100, credit_amount=0
+                ))
+                await db.commit()
+        async with session_factory() as db:
+            if cached:
+                await reports.balance_sheet_report(to_date, admin, db)
+                await reports.income_and_expenditure_report(from_date, to_date, admin, db)
+                await reports.trial_balance_report(to_date, admin, db)
+            else:
+                await reports._compute_balance_sheet(1, to_date, db)
+                await reports._compute_income_and_expenditure(1, from_date, to_date, db)
+                await reports._compute_trial_balance(1, to_date, db)
+            await db.commit()
+
+
+async def run(n_transactions: int, opens: int, keep_db: bool):
+    fy_start, fy_end = date(2024, 4, 1), date(2025, 3, 31)
+    admin = UserResponse(
+        id="1", email="bench1@example.com", name="Bench Admin", apartment_number="ADMIN",
+        role="admin", society_id=1, created_at=datetime.utcnow()
+    )
+
+    engine, session_factory, db_path = await create_bench_engine()
+    timings, counts = {}, {}
+    try:
+        async with engine.begin() as conn:
+            await seed_society(conn)
+            await seed_ledger(conn, 1, n_accounts=300, n_transactions=n_transactions, fy_start=fy_start, fy_end=fy_end)
+
+        variants = [("uncached", False, None),
+                    ("memory", True, MemoryReportCacheBackend(64 * 1024 * 1024, 2000)),
+                    ("database", True, DatabaseReportCacheBackend(64 * 1024 * 1024, 2000))]
+        for key, cached, backend in variants:
+            if backend is not None:
+                reports.report_cache = ReportCache(backend)
+            with QueryCounter(engine) as counter, timed(timings, key):
+                await open_reports(session_factory, admin, fy_start, fy_end, opens, cached)
+            counts[key] = counter.count
+
+        print_comparison(f"3 reports x {opens} opens ({n_transactions} postings, 1 write mid-run)", [
+            ("recompute every open (before)", counts["uncached"], timings["uncached"]),
+            ("memory cache (after)", counts["memory"], timings["memory"]),
+            ("database cache (after)", counts["database"], timings["database"]),
+        ])
+        async with session_factory() as db:
+            stats = await reports.report_cache.stats(db)
+        for name, report_stats in stats["reports"].items():
+            print(f"{name}: {report_stats}")
+    finally:
+        await engine.dispose()
+        if not keep_db and os.path.exists(db_path):
+            os.remove(db_path)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--transactions", type=int, default=50000)
+    parser.add_argument("--opens", type=int, default=20)
+    parser.add_argument("--keep-db", action="store_true", help="Do not delete the seeded database")
+    args = parser.parse_args()
+    asyncio.run(run(args.transactions, args.opens, args.keep_db))
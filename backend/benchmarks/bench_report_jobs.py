@@ -0,0 +1,167 @@
+"""
+Report job benchmark: exports held open in the request vs. background report jobs
+
+Seeds several societies with a ledger and a month of member bills, then
+(a) calls the export endpoints directly, as a client downloading the General
+Ledger PDF and every member's ledger does today (the request stays open for the
+whole computation), and (b) submits the same exports as report jobs and
+measures time to 202, time to completion and the worker pool bounds. Checks
+that completed files are persisted, readable from disk after the in-memory
+registry is cleared, and deleted once their TTL expires.
+
+Usage (from backend/):
+    python -m benchmarks.bench_report_jobs
+    python -m benchmarks.bench_report_jobs --societies 4 --transactions 40000 --flats 300
+"""
+import argparse
+import asyncio
+import os
+import shutil
+import sys
+import tempfile
+from datetime import date, datetime, timedelta
+
+from app import database
+from app.models.maintenance import BillGenerationRequest
+from app.models.report_job import ReportJobRequest
+from app.models.user import UserResponse
+from app.routes.maintenance import generate_bills
+from app.routes.reports import export_general_ledger_pdf, export_all_member_ledgers, _report_job_runner
+from app.services.render_executor import render_executor
+from app.services.report_jobs import report_jobs
+from benchmarks._common import create_bench_engine, QueryCounter, timed, seed_society, seed_ledger, print_comparison
+from benchmarks.bench_bill_generation import seed_billing, previous_month
+
+
+def bench_user(society_id: int) -> UserResponse:
+    return UserResponse(
+        id=str(society_id), email=f"bench{society_id}@example.com", name="Bench Admin",
+        apartment_number="ADMIN", role="admin", society_id=society_id, created_at=datetime.utcnow()
+    )
+
+
+async def drain(response) -> int:
+    size = 0
+    async for chunk in response.body_iterator:
+        size += len(chunk)
+    return size
+
+
+async def main(n_societies: int, n_transactions: int, n_flats: int, keep_db: bool) -> bool:
+    today = date.today()
+    fy_start, fy_end = date(today.year - 2, 4, 1), today
+    month, year = previous_month(today)
+    engine, session_factory, db_path = await create_bench_engine()
+    database.AsyncSessionLocal = session_factory  # Jobs open their own session
+    report_jobs.result_dir = tempfile.mkdtemp(prefix="gharmitra_report_jobs_")
+    timings, counts = {}, {}
+    checks = {}
+    try:
+        print(f"Seeding {n_societies} societies ({n_transactions} postings, {n_flats} flats each) into {db_path} ...")
+        async with engine.begin() as conn:
+            for sid in range(1, n_societies + 1):
+                await seed_society(conn, sid)
+                await seed_ledger(conn, sid, 120, n_transactions, fy_start, fy_end, seed=sid)
+                await seed_billing(conn, sid, n_flats, "fixed")
+        for sid in range(1, n_societies + 1):
+            async with session_factory() as db:
+                await generate_bills(
+                    BillGenerationRequest(month=month, year=year, override_water_charges=120000),
+                    current_user=bench_user(sid), db=db
+                )
+
+        # Before: the client holds the request open for each export
+        admin = bench_user(1)
+        with QueryCounter(engine) as counter, timed(timings, "direct"):
+            async with session_factory() as db:
+                await drain(await export_general_ledger_pdf(fy_start, fy_end, admin, db))
+                await drain(await export_all_member_ledgers("excel", None, None, admin, db))
+        counts["direct"] = counter.count
+
+        # After: every society submits the same exports as jobs
+        running, peak = {}, {"all": 0}
+        submitted = []
+        with QueryCounter(engine) as counter, timed(timings, "submit"):
+            for sid in range(1, n_societies + 1):
+                user = bench_user(sid)
+                for request in (
+                    ReportJobRequest(report="general-ledger", format="pdf", from_date=fy_start, to_date=fy_end),
+                    ReportJobRequest(report="member-ledgers", format="excel"),
+                    ReportJobRequest(report="trial-balance", format="excel", as_on_date=fy_end),
+                ):
+                    params, runner = _report_job_runner(request, user)
+
+                    async def tracked(db, progress, runner=runner, sid=sid):
+                        running[sid] = running.get(sid, 0) + 1
+                        peak[sid] = max(peak.get(sid, 0), running[sid])
+                        peak["all"] = max(peak["all"], sum(running.values()))
+                        try:
+                            return await runner(db, progress)
+                        finally:
+                            running[sid] -= 1
+
+                    submitted.append(report_jobs.submit(sid, sid, request.report, request.format, params, tracked))
+        submit_counts = counter.count
+        duplicate = report_jobs.submit(1, 1, submitted[0].report, submitted[0].format, submitted[0].params, None)
+        checks["identical unfinished job deduplicated"] = duplicate is submitted[0]
+
+        with QueryCounter(engine) as counter, timed(timings, "jobs"):
+            await asyncio.gather(*(job.task for job in submitted))
+        counts["jobs"] = counter.count
+
+        print_comparison(f"General Ledger PDF + all member ledgers, {n_societies} societies", [
+            ("in request, 1 society", counts["direct"], timings["direct"]),
+            ("submit all jobs (202)", submit_counts, timings["submit"]),
+            ("all jobs to completion", counts["jobs"], timings["jobs"]),
+        ])
+        for job in submitted[:3]:
+            info = job.to_dict()
+            print(f"{job.report}/{job.format}: {info['status']}, {info['size_bytes']} bytes, "
+                  f"{info['elapsed_ms']} ms, {job.filename or job.error}")
+        per_society = max(v for k, v in peak.items() if k != "all")
+        print(f"Peak running jobs: {peak['all']} overall (limit {report_jobs.max_workers}), "
+              f"{per_society} per society (limit {report_jobs.max_per_society})")
+
+        checks["all jobs completed"] = all(job.status == "completed" for job in submitted)
+        checks["pool bounds held"] = peak["all"] <= report_jobs.max_workers and per_society <= report_jobs.max_per_society
+        checks["files persisted"] = all(
+            os.path.getsize(report_jobs.result_path(job)) == job.size_bytes > 0 for job in submitted
+        )
+
+        # Another worker (or a restart) finds completed jobs through their sidecars
+        report_jobs._jobs.clear()
+        reloaded = report_jobs.get(submitted[0].job_id, submitted[0].society_id)
+        checks["reloaded from disk"] = reloaded is not None and reloaded.filename == submitted[0].filename
+        checks["other society cannot see job"] = report_jobs.get(submitted[0].job_id, submitted[0].society_id + 1) is None
+
+        # Expired results are deleted
+        for job in submitted:
+            job.expires_at = datetime.utcnow() - timedelta(seconds=1)
+            report_jobs._jobs[job.job_id] = job
+        report_jobs._last_sweep = 0.0
+        report_jobs.get(submitted[0].job_id, submitted[0].society_id)
+        checks["expired files deleted"] = not any(
+            os.path.exists(report_jobs.result_path(job)) for job in submitted
+        )
+
+        print()
+        for name, ok in checks.items():
+            print(f"{name}: {ok}")
+        return all(checks.values())
+    finally:
+        report_jobs.shutdown()
+        render_executor.shutdown()
+        await engine.dispose()
+        shutil.rmtree(report_jobs.result_dir, ignore_errors=True)
+        if not keep_db and os.path.exists(db_path):
+            os.remove(db_path)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--societies", type=int, default=3)
+    parser.add_argument("--transactions", type=int, default=20000)
+    parser.add_argument("--flats", type=int, default=200)
+    parser.add_argument("--keep-db", action="store_true", help="Do not delete the seeded database")
+    args = parser.parse_args()
+    sys.exit(0 if asyncio.run(main(args.societies, args.transactions, args.flats, args.keep_db)) else 1)
@@ -0,0 +1,175 @@
+"""
+Society context benchmark: per-request financial year / society lookups vs. the cache
+
+Seeds a society with a long financial year calendar (including a gap and an
+overlapping year) and a logo, then serves a burst of report + export requests'
+lookups (a) the way the report handlers did - a range query for the year
+containing the date, an active-year query when none matched, and a Society
+query per get_society_info call, plus a logo read per PDF - and (b) from the
+society context cache. Checks that the cached lookups pick the same year as the
+range queries for every date, that the hot path runs no queries, and that the
+financial year and society settings write routes drop the cached context.
+
+Usage (from backend/):
+    python -m benchmarks.bench_society_context
+    python -m benchmarks.bench_society_context --years 100 --requests 5000
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import select, and_, insert
+
+from app.models_db import FinancialYear, Society
+from app.models.financial_year import YearStatus
+from app.models.society import SocietyUpdate
+from app.models.user import UserResponse
+from app.routes.financial_year_enhanced import create_financial_year
+from app.routes.society import update_society_settings
+from app.schemas.financial_year import FinancialYearCreate
+from app.services.society_context_cache import society_context
+from benchmarks._common import create_bench_engine, QueryCounter, timed, seed_society, print_comparison
+
+
+async def legacy_find_year(db, society_id: int, on_date: date):
+    """The previous lookup: range query, then the active year"""
+    financial_year = (await db.execute(
+        select(FinancialYear).where(and_(
+            FinancialYear.society_id == society_id,
+            FinancialYear.start_date <= on_date,
+            FinancialYear.end_date >= on_date
+        )).order_by(FinancialYear.start_date.desc())
+    )).scalars().first()
+    if not financial_year:
+        financial_year = (await db.execute(
+            select(FinancialYear).where(and_(
+                FinancialYear.society_id == society_id,
+                FinancialYear.is_active == True
+            )).order_by(FinancialYear.start_date.desc())
+        )).scalars().first()
+    return financial_year
+
+
+async def legacy_society_info(db, society_id: int, include_logo: bool = False):
+    society = (await db.execute(select(Society).where(Society.id == society_id))).scalar_one_or_none()
+    info = {"name": society.name, "address": society.address or "", "logo_url": society.logo_url}
+    if include_logo and society.logo_url:
+        with open(society.logo_url, "rb") as f:
+            info["logo_bytes"] = f.read()
+    return info
+
+
+async def seed_years(conn, society_id: int, n_years: int) -> date:
+    """April-March years from 2000, skipping one (a gap) and adding one overlapping year"""
+    now = datetime.utcnow()
+    rows = []
+    for i in range(n_years):
+        if i == n_years // 2:
+            continue
+        start = date(2000 + i, 4, 1)
+        rows.append({
+            "society_id": society_id, "year_name": f"FY {start.year}-{str(start.year + 1)[-2:]}",
+            "start_date": start, "end_date": date(start.year + 1, 3, 31), "status": YearStatus.OPEN,
+            "is_active": i == n_years - 1, "is_closed": False, "created_at": now, "updated_at": now,
+        })
+    overlap = date(2000 + n_years // 3, 10, 1)
+    rows.append({
+        "society_id": society_id, "year_name": "Overlap", "start_date": overlap,
+        "end_date": overlap + timedelta(days=200), "status": YearStatus.OPEN,
+        "is_active": False, "is_closed": False, "created_at": now, "updated_at": now,
+    })
+    await conn.execute(insert(FinancialYear.__table__), rows)
+    return date(2000 + n_years, 3, 31)
+
+
+async def main(n_years: int, n_requests: int, keep_db: bool) -> bool:
+    engine, session_factory, db_path = await create_bench_engine()
+    fd, logo_path = tempfile.mkstemp(prefix="gharmitra_bench_logo_", suffix=".png")
+    os.write(fd, os.urandom(64 * 1024))
+    os.close(fd)
+    timings, checks = {}, {}
+    try:
+        async with engine.begin() as conn:
+            await seed_society(conn, 1)
+            await conn.execute(Society.__table__.update().values(logo_url=logo_path, address="1 Bench Road"))
+            last_day = await seed_years(conn, 1, n_years)
+        dates = [date(2000, 1, 1) + timedelta(days=(i * 37) % (last_day - date(2000, 1, 1)).days + 400)
+                 for i in range(n_requests)]
+
+        # One report request = year lookup + header; its export repeats the header with the logo
+        async with session_factory() as db:
+            with QueryCounter(engine) as legacy_q, timed(timings, "legacy"):
+                legacy_ids = []
+                for d in dates:
+                    fy = await legacy_find_year(db, 1, d)
+                    legacy_ids.append(fy.id)
+                    await legacy_society_info(db, 1)
+                    await legacy_society_info(db, 1, include_logo=True)
+
+        society_context.clear()
+        async with session_factory() as db:
+            with QueryCounter(engine) as cold_q, timed(timings, "cold"):
+                await society_context.find_financial_year(db, 1, dates[0])
+                await society_context.society_info(db, 1, include_logo=True)
+            with QueryCounter(engine) as cached_q, timed(timings, "cached"):
+                cached_ids = []
+                for d in dates:
+                    fy = await society_context.find_financial_year(db, 1, d)
+                    cached_ids.append(fy.id)
+                    await society_context.society_info(db, 1)
+                    info = await society_context.society_info(db, 1, include_logo=True)
+            header = await society_context.society_info(db, 1)
+
+        print_comparison(f"{n_requests} report + export lookups over {n_years} financial years", [
+            ("per-request queries (before)", legacy_q.count, timings["legacy"]),
+            ("society context (first load)", cold_q.count, timings["cold"]),
+            ("society context (cached)", cached_q.count, timings["cached"]),
+        ])
+        print(f"Cache stats: {society_context.stats()}")
+        checks["same financial year for every date"] = legacy_ids == cached_ids
+        checks["hot path runs no queries"] = cached_q.count == 0
+        checks["logo bytes cached"] = info["logo_bytes"] is not None and len(info["logo_bytes"]) == 64 * 1024
+        checks["report header stays JSON-serialisable"] = "logo_bytes" not in header
+
+        # Write routes drop the context without waiting for the TTL
+        admin = UserResponse(
+            id="1", email="bench1@example.com", name="Bench Admin", apartment_number="ADMIN",
+            role="admin", society_id=1, created_at=datetime.utcnow()
+        )
+        new_start = last_day + timedelta(days=1)
+        async with session_factory() as db:
+            await create_financial_year(FinancialYearCreate(
+                year_name="FY new", start_date=new_start, end_date=date(new_start.year + 1, 3, 31)
+            ), current_user=admin, db=db)
+            fy = await society_context.find_financial_year(db, 1, new_start + timedelta(days=10))
+            checks["new financial year visible after create"] = fy is not None and fy.year_name == "FY new"
+            far_future = await society_context.find_financial_year(db, 1, date(2999, 1, 1))
+            checks["active-year fallback follows the new year"] = far_future is not None and far_future.year_name == "FY new"
+
+            await update_society_settings(SocietyUpdate(logo_url="uploads/society/new_logo.png"), current_user=admin, db=db)
+            checks["society settings update visible"] = (
+                (await society_context.society_info(db, 1))["logo_url"] == "uploads/society/new_logo.png"
+            )
+        print(f"Cache stats after writes: {society_context.stats()}")
+
+        print()
+        for name, ok in checks.items():
+            print(f"{name}: {ok}")
+        return all(checks.values())
+    finally:
+        await engine.dispose()
+        os.remove(logo_path)
+        if not keep_db and os.path.exists(db_path):
+            os.remove(db_path)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--years", type=int, default=40)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--keep-db", action="store_true", help="Do not delete the seeded database")
+    args = parser.parse_args()
+    sys.exit(0 if asyncio.run(main(args.years, args.requests, args.keep_db)) else 1)
@@ -0,0 +1,156 @@
+"""
+SQLite engine mode benchmark: shared pool vs. single writer + reader pool
+
+Runs a burst of concurrent postings (each reads an account, inserts a balanced
+pair of transactions, updates the account balance and commits - the shape of a
+receipt or journal entry) alongside report-style readers, against a fresh
+SQLite file through create_engine_instance, once per DATABASE_SQLITE_MODE.
+In the shared mode a posting whose transaction read first and then writes can
+fail with "database is locked"; single_writer queues postings on the one
+writer connection instead. Prints failures and p50/p99 latency per mode.
+
+Usage (from backend/):
+    python -m benchmarks.bench_sqlite_writer
+    python -m benchmarks.bench_sqlite_writer --postings 500 --readers 200 --concurrency 32
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from datetime import date, datetime
+
+from sqlalchemy import select, func, insert
+
+from app import database
+from app.config import settings
+from app.database import Base, import_models
+from app.models_db import AccountCode, AccountType, Transaction, TransactionType
+from benchmarks._common import seed_society, percentile
+
+
+async def seed(engine, n_accounts: int):
+    import_models()
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await seed_society(conn, 1)
+        now = datetime.utcnow()
+        await conn.execute(insert(AccountCode.__table__), [{
+            "society_id": 1, "code": f"{1000 + i}", "name": f"Account {i}", "type": AccountType.ASSET,
+            "opening_balance": 0, "current_balance": 0, "is_fixed_expense": False,
+            "created_at": now, "updated_at": now,
+        } for i in range(n_accounts)])
+
+
+async def posting(i: int, n_accounts: int) -> float:
+    start = time.perf_counter()
+    async with database.AsyncSessionLocal() as db:
+        debit_code, credit_code = f"{1000 + i % n_accounts}", f"{1000 + (i + 1) % n_accounts}"
+        account = (await db.execute(
+            select(AccountCode).where(AccountCode.society_id == 1, AccountCode.code == debit_code)
+        )).scalar_one()
+        for code, dr, cr in ((debit_code, 100, 0), (credit_code, 0, 100)):
+            db.add(Transaction(
+                society_id=1, type=TransactionType.EXPENSE, category="Bench", account_code=code, amount=100,
+                description=f"Bench posting {i}", date=date(2025, 1, 1 + i % 28), added_by=1,
+                debit_amount=dr, credit_amount=cr
+            ))
+        account.current_balance = (account.current_balance or 0) + 100
+        await asyncio.sleep(0)  # Let other requests interleave, as awaits inside a handler do
+        await db.commit()
+    return (time.perf_counter() - start) * 1000
+
+
+async def report_read() -> float:
+    start = time.perf_counter()
+    async with database.AsyncSessionLocal() as db:
+        await db.execute(
+            select(Transaction.account_code, func.sum(Transaction.debit_amount) - func.sum(Transaction.credit_amount))
+            .where(Transaction.society_id == 1).group_by(Transaction.account_code)
+        )
+    return (time.perf_counter() - start) * 1000
+
+
+async def run_mode(mode: str, n_postings: int, n_readers: int, concurrency: int, n_accounts: int) -> dict:
+    fd, db_path = tempfile.mkstemp(prefix="gharmitra_bench_", suffix=".db")
+    os.close(fd)
+    os.remove(db_path)
+    settings.DATABASE_SQLITE_MODE = mode
+    engine = await database.recreate_engine(f"sqlite+aiosqlite:///{db_path}")
+    try:
+        await seed(engine, n_accounts)
+        semaphore = asyncio.Semaphore(concurrency)
+        write_ms, read_ms, errors = [], [], []
+
+        async def limited(coro_factory, samples):
+            async with semaphore:
+                try:
+                    samples.append(await coro_factory())
+                except Exception as e:
+                    errors.append(type(e).__name__ + ": " + str(e).splitlines()[0][:80])
+
+        # Interleave writers and readers
+        tasks = []
+        for i in range(max(n_postings, n_readers)):
+            if i < n_postings:
+                tasks.append(limited(lambda i=i: posting(i, n_accounts), write_ms))
+            if i < n_readers:
+                tasks.append(limited(report_read, read_ms))
+        start = time.perf_counter()
+        await asyncio.gather(*tasks)
+        elapsed = (time.perf_counter() - start) * 1000
+
+        async with database.AsyncSessionLocal() as db:
+            posted = (await db.execute(select(func.count(Transaction.id)))).scalar()
+        return {
+            "mode": mode, "elapsed": elapsed, "errors": errors, "posted": posted // 2,
+            "write_p50": percentile(write_ms, 50) if write_ms else 0.0,
+            "write_p99": percentile(write_ms, 99) if write_ms else 0.0,
+            "read_p50": percentile(read_ms, 50) if read_ms else 0.0,
+            "read_p99": percentile(read_ms, 99) if read_ms else 0.0,
+        }
+    finally:
+        await database.close_db()
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(db_path + suffix):
+                os.remove(db_path + suffix)
+
+
+async def main(n_postings: int, n_readers: int, concurrency: int, n_accounts: int) -> bool:
+    original_mode = settings.DATABASE_SQLITE_MODE
+    try:
+        results = [await run_mode(mode, n_postings, n_readers, concurrency, n_accounts)
+                   for mode in (database.SQLITE_MODE_SHARED, database.SQLITE_MODE_SINGLE_WRITER)]
+    finally:
+        settings.DATABASE_SQLITE_MODE = original_mode
+
+    print(f"\n{n_postings} postings + {n_readers} report reads, {concurrency} concurrent")
+    print(f"{'mode':<15}{'posted':>8}{'errors':>8}{'write p50':>11}{'write p99':>11}"
+          f"{'read p50':>10}{'read p99':>10}{'total (ms)':>12}")
+    for r in results:
+        print(f"{r['mode']:<15}{r['posted']:>8}{len(r['errors']):>8}{r['write_p50']:>11.1f}{r['write_p99']:>11.1f}"
+              f"{r['read_p50']:>10.1f}{r['read_p99']:>10.1f}{r['elapsed']:>12.0f}")
+    for r in results:
+        if r["errors"]:
+            print(f"  {r['mode']} first error: {r['errors'][0]}")
+
+    single_writer = results[1]
+    checks = {
+        "single_writer: no failed postings or reads": not single_writer["errors"],
+        "single_writer: every posting committed": single_writer["posted"] == n_postings,
+    }
+    print()
+    for name, ok in checks.items():
+        print(f"{name}: {ok}")
+    return all(checks.values())
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--postings", type=int, default=300)
+    parser.add_argument("--readers", type=int, default=150)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--accounts", type=int, default=20)
+    args = parser.parse_args()
+    sys.exit(0 if asyncio.run(main(args.postings, args.readers, args.concurrency, args.accounts)) else 1)
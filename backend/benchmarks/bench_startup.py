@@ -0,0 +1,83 @@
+"""
+Startup benchmark: first boot vs. restart with the schema_migrations registry
+
+Boots init_db against a fresh SQLite file (every migration runs and is
+recorded), then restarts it a few times the way a cold-started container
+would (new engine, same database). A restart should run only the version
+check - no create_all, seeding or column introspection. Also checks that a
+migration recorded as applied is skipped and that an unrecorded one runs.
+
+Usage (from backend/):
+    python -m benchmarks.bench_startup
+    python -m benchmarks.bench_startup --restarts 10
+"""
+import argparse
+import asyncio
+import os
+import shutil
+import sys
+import tempfile
+
+from sqlalchemy import delete
+
+from app import database
+from app.config import settings
+from app.models_db import SchemaMigration
+from benchmarks._common import QueryCounter
+
+
+async def boot(url: str):
+    """Restart: drop the engine and run init_db as the app startup does"""
+    await database.recreate_engine(url)
+    with QueryCounter(database.engine) as queries:
+        await database.init_db(retries=1)
+    return dict(database.startup_timings), queries.count
+
+
+async def main(restarts: int) -> bool:
+    work_dir = tempfile.mkdtemp(prefix="gharmitra_bench_startup_")
+    original_url = settings.DATABASE_URL
+    url = f"sqlite+aiosqlite:///{os.path.join(work_dir, 'gharmitra.db')}"
+    settings.DATABASE_URL = url
+    checks = {}
+    try:
+        first, first_queries = await boot(url)
+        warm = [await boot(url) for _ in range(restarts)]
+
+        # Forget one migration: the next boot must run it (and only it) again
+        async with database.AsyncSessionLocal() as db:
+            await db.execute(delete(SchemaMigration).where(SchemaMigration.name == "0009_flats_bedrooms"))
+            await db.commit()
+        partial, _ = await boot(url)
+
+        print(f"\n{'boot':<16}{'writer queries':>16}{'total (ms)':>12}")
+        print(f"{'first':<16}{first_queries:>16}{first['total']:>12.1f}")
+        for i, (timings, count) in enumerate(warm, 1):
+            print(f"{'restart ' + str(i):<16}{count:>16}{timings['total']:>12.1f}")
+        print("\nFirst boot phases (ms):")
+        for phase, ms in first.items():
+            print(f"  {phase:<36}{ms:>10.1f}")
+
+        migration_names = {name for name, _ in database.SCHEMA_MIGRATIONS}
+        checks["first boot runs every migration"] = migration_names <= set(first)
+        checks["restarts skip create_all and migrations"] = all(
+            "create_all" not in t and not migration_names & set(t) for t, _ in warm
+        )
+        checks["unrecorded migration runs again"] = (
+            "0009_flats_bedrooms" in partial and not (migration_names - {"0009_flats_bedrooms"}) & set(partial)
+        )
+        print()
+        for name, ok in checks.items():
+            print(f"{name}: {ok}")
+        return all(checks.values())
+    finally:
+        await database.close_db()
+        settings.DATABASE_URL = original_url
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--restarts", type=int, default=3)
+    args = parser.parse_args()
+    sys.exit(0 if asyncio.run(main(args.restarts)) else 1)
@@ -0,0 +1,129 @@
+"""
+Trial Balance benchmark: per-account queries vs. single grouped aggregate
+
+Seeds a throwaway SQLite database and compares the legacy per-account loop
+(one select(Transaction) per AccountCode) with TrialBalanceService, which
+aggregates the account_daily_balances snapshot store.
+
+Usage (from backend/):
+    python -m benchmarks.bench_trial_balance
+    python -m benchmarks.bench_trial_balance --accounts 500 --transactions 200000
+"""
+import argparse
+import asyncio
+import os
+from datetime import date
+from decimal import Decimal
+
+from sqlalchemy import select, and_
+
+from app.models_db import Transaction, AccountCode, OpeningBalance, BalanceType
+from app.services.trial_balance_service import compute_trial_balance
+from app.services.ledger_snapshot_service import rebuild_ledger_snapshots
+from benchmarks._common import (
+    create_bench_engine, QueryCounter, timed, seed_society, seed_ledger, print_comparison
+)
+
+
+async def legacy_trial_balance(db, society_id, financial_year_id, fy_start_date, effective_date):
+    """The pre-aggregate algorithm: one transaction scan per account head"""
+    result = await db.execute(
+        select(AccountCode).where(AccountCode.society_id == society_id).order_by(AccountCode.code)
+    )
+    accounts = result.scalars().all()
+
+    opening_balances_result = await db.execute(
+        select(OpeningBalance, AccountCode).join(
+            AccountCode, OpeningBalance.account_head_id == AccountCode.id
+        ).where(
+            OpeningBalance.financial_year_id == financial_year_id,
+            AccountCode.society_id == society_id
+        )
+    )
+    opening_balances = {ac.code: ob for ob, ac in opening_balances_result.all()}
+
+    total_debit = Decimal("0.00")
+    total_credit = Decimal("0.00")
+    for account in accounts:
+        ob = opening_balances.get(account.code)
+        if ob:
+            balance = Decimal(str(ob.opening_balance))
+            if ob.balance_type != BalanceType.DEBIT:
+                balance = -balance
+        else:
+            balance = Decimal(str(account.opening_balance or 0.0))
+            if account.type in ['liability', 'capital', 'income']:
+                balance = -balance
+
+        txns = (await db.execute(
+            select(Transaction).where(
+                and_(
+                    Transaction.society_id == society_id,
+                    Transaction.account_code == account.code,
+                    Transaction.date >= fy_start_date,
+                    Transaction.date <= effective_date
+                )
+            ).order_by(Transaction.date, Transaction.id)
+        )).scalars().all()
+        for txn in txns:
+            balance += Decimal(str(txn.debit_amount or 0.0))
+            balance -= Decimal(str(txn.credit_amount or 0.0))
+
+        if abs(balance) < Decimal("0.01"):
+            continue
+        if balance > 0:
+            total_debit += balance
+        else:
+            total_credit += abs(balance)
+
+    return total_debit.quantize(Decimal("0.01")), total_credit.quantize(Decimal("0.01"))
+
+
+async def main(n_accounts: int, n_transactions: int, keep_db: bool):
+    fy_start, fy_end = date(2025, 4, 1), date(2026, 3, 31)
+    engine, session_factory, db_path = await create_bench_engine()
+    try:
+        print(f"Seeding {n_accounts} accounts x {n_transactions} transactions into {db_path} ...")
+        async with engine.begin() as conn:
+            await seed_society(conn)
+            fy_id = await seed_ledger(conn, 1, n_accounts, n_transactions, fy_start, fy_end)
+
+        timings = {}
+        # Seeding uses Core inserts, so build the ledger snapshot store explicitly
+        async with session_factory() as db:
+            with timed(timings, "rebuild"):
+                snapshot_rows = await rebuild_ledger_snapshots(db)
+                await db.commit()
+        print(f"Ledger snapshot rebuild: {snapshot_rows} daily rows in {timings['rebuild']:.0f} ms")
+
+        async with session_factory() as db:
+            with QueryCounter(engine) as legacy_q, timed(timings, "legacy"):
+                legacy_totals = await legacy_trial_balance(db, 1, fy_id, fy_start, fy_end)
+
+        async with session_factory() as db:
+            with QueryCounter(engine) as new_q, timed(timings, "aggregate"):
+                response = await compute_trial_balance(
+                    db, society_id=1, financial_year_id=fy_id,
+                    fy_start_date=fy_start, effective_date=fy_end, as_on_date=fy_end
+                )
+
+        print_comparison("Trial Balance", [
+            ("per-account (before)", legacy_q.count, timings["legacy"]),
+            ("grouped aggregate (after)", new_q.count, timings["aggregate"]),
+        ])
+        new_totals = (Decimal(str(response.total_debit)), Decimal(str(response.total_credit)))
+        print(f"\nTotals match: {legacy_totals == new_totals} "
+              f"(debit={new_totals[0]}, credit={new_totals[1]})")
+    finally:
+        await engine.dispose()
+        if not keep_db and os.path.exists(db_path):
+            os.remove(db_path)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--accounts", type=int, default=500)
+    parser.add_argument("--transactions", type=int, default=200000)
+    parser.add_argument("--keep-db", action="store_true", help="Do not delete the seeded database")
+    args = parser.parse_args()
+    asyncio.run(main(args.accounts, args.transactions, args.keep_db))
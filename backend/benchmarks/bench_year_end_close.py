@@ -0,0 +1,184 @@
+"""
+Year-end close benchmark: per-account opening balance upserts vs. one bulk upsert
+
+Seeds a large chart of accounts and a year of postings, then carries the
+closing balances into the next year (a) the way provisional close did, with a
+select(OpeningBalance) and an ORM insert/update per account, and (b) with the
+year-end close service (one grouped closing balance query, one lookup, one
+INSERT ... ON CONFLICT). Checks that every opening balance equals the account's
+trial balance closing balance, that a second close updates rows in place, and
+that the provisional-close endpoint reports counts and timings.
+
+Usage (from backend/):
+    python -m benchmarks.bench_year_end_close
+    python -m benchmarks.bench_year_end_close --accounts 20000 --transactions 400000
+"""
+import argparse
+import asyncio
+import os
+import sys
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+from sqlalchemy import select, insert, func
+
+from app.models_db import AccountCode, FinancialYear, OpeningBalance, BalanceType, BalanceStatus
+from app.models.financial_year import YearStatus, OpeningBalanceStatus
+from app.models.user import UserResponse
+from app.routes.financial_year_enhanced import provisional_close_financial_year
+from app.schemas.financial_year import ProvisionalClosingRequest
+from app.services.ledger_snapshot_service import rebuild_ledger_snapshots
+from app.services.trial_balance_service import get_account_balances
+from app.services.year_end_close_service import close_into_next_year
+from benchmarks._common import create_bench_engine, QueryCounter, timed, seed_society, seed_ledger, print_comparison
+
+
+async def legacy_carry_forward(db, society_id: int, next_fy_id: int) -> int:
+    """The previous loop: current_balance per account, one OpeningBalance lookup and write per account"""
+    accounts = (await db.execute(select(AccountCode).where(AccountCode.society_id == society_id))).scalars().all()
+    created = 0
+    for account in accounts:
+        closing = float(account.current_balance or 0)
+        if abs(closing) <= 0.01:
+            continue
+        balance_type = BalanceType.DEBIT if closing > 0 else BalanceType.CREDIT
+        existing = (await db.execute(select(OpeningBalance).where(
+            OpeningBalance.financial_year_id == next_fy_id, OpeningBalance.account_head_id == account.id
+        ))).scalar_one_or_none()
+        if existing:
+            existing.opening_balance = abs(closing)
+            existing.balance_type = balance_type
+            existing.status = BalanceStatus.PROVISIONAL
+            existing.calculated_from_previous_year = True
+        else:
+            db.add(OpeningBalance(
+                society_id=society_id, financial_year_id=next_fy_id, account_head_id=account.id,
+                account_name=account.name, opening_balance=abs(closing), balance_type=balance_type,
+                status=BalanceStatus.PROVISIONAL, calculated_from_previous_year=True, manual_entry=False
+            ))
+            created += 1
+    await db.flush()
+    return created
+
+
+async def add_year(conn, society_id: int, start: date, end: date) -> int:
+    now = datetime.utcnow()
+    result = await conn.execute(insert(FinancialYear.__table__).values(
+        society_id=society_id, year_name=f"FY {start.year}-{str(end.year)[-2:]}", start_date=start, end_date=end,
+        status=YearStatus.OPEN, is_active=False, is_closed=False,
+        opening_balances_status=OpeningBalanceStatus.PROVISIONAL, created_at=now, updated_at=now,
+    ))
+    return result.inserted_primary_key[0]
+
+
+async def opening_matches_closing(db, society_id: int, fy, next_fy_id: int) -> bool:
+    """Every non-zero closing balance is the next year's signed opening balance"""
+    rows = await get_account_balances(db, society_id, fy.id, fy.start_date, fy.end_date)
+    openings = {
+        ob.account_head_id: (ob.opening_balance if ob.balance_type == BalanceType.DEBIT else -ob.opening_balance)
+        for ob in (await db.execute(
+            select(OpeningBalance).where(OpeningBalance.financial_year_id == next_fy_id)
+        )).scalars().all()
+    }
+    for row in rows:
+        closing = row["balance"].quantize(Decimal("0.01"))
+        if abs(closing) > Decimal("0.01") and openings.get(row["account"].id) != closing:
+            return False
+    return True
+
+
+async def main(n_accounts: int, n_transactions: int, keep_db: bool) -> bool:
+    fy_start, fy_end = date(2024, 4, 1), date(2025, 3, 31)
+    next_start, next_end = date(2025, 4, 1), date(2026, 3, 31)
+    engine, session_factory, db_path = await create_bench_engine()
+    timings, checks = {}, {}
+    try:
+        print(f"Seeding {n_accounts} accounts and {n_transactions} transactions into {db_path} ...")
+        async with engine.begin() as conn:
+            for sid in (1, 2):
+                await seed_society(conn, sid)
+            fy_id = await seed_ledger(conn, 1, n_accounts, n_transactions, fy_start, fy_end)
+            await seed_ledger(conn, 2, n_accounts, n_transactions // 10, fy_start, fy_end, seed=7)
+            await conn.execute(AccountCode.__table__.update().values(current_balance=AccountCode.opening_balance))
+            legacy_next_id = await add_year(conn, 2, next_start, next_end)
+            next_fy_id = await add_year(conn, 1, next_start, next_end)
+        async with session_factory() as db:
+            await rebuild_ledger_snapshots(db)
+            await db.commit()
+
+        async with session_factory() as db:
+            with QueryCounter(engine) as legacy_q, timed(timings, "legacy"):
+                await legacy_carry_forward(db, 2, legacy_next_id)
+            await db.rollback()
+
+        async with session_factory() as db:
+            fy = await db.get(FinancialYear, fy_id)
+            next_fy = await db.get(FinancialYear, next_fy_id)
+            with QueryCounter(engine) as bulk_q, timed(timings, "bulk"):
+                first = await close_into_next_year(db, 1, fy, next_fy)
+            await db.commit()
+            with QueryCounter(engine) as again_q, timed(timings, "again"):
+                second = await close_into_next_year(db, 1, fy, next_fy)
+            await db.commit()
+            checks["opening balances equal closing balances"] = await opening_matches_closing(db, 1, fy, next_fy_id)
+            row_count = (await db.execute(
+                select(func.count()).select_from(OpeningBalance).where(OpeningBalance.financial_year_id == next_fy_id)
+            )).scalar()
+
+        print_comparison(f"Carry forward {n_accounts} accounts into the next year", [
+            ("per-account loop (before)", legacy_q.count, timings["legacy"]),
+            ("bulk upsert (first close)", bulk_q.count, timings["bulk"]),
+            ("bulk upsert (re-close)", again_q.count, timings["again"]),
+        ])
+        print(f"First close: {first['opening_balances_inserted']} inserted, {first['opening_balances_updated']} updated, "
+              f"{first['opening_balances_skipped']} zero; stages {first['timings_ms']}")
+        print(f"Re-close: {second['opening_balances_inserted']} inserted, {second['opening_balances_updated']} updated")
+        checks["re-close updates in place"] = (
+            second["opening_balances_inserted"] == 0
+            and second["opening_balances_updated"] == first["opening_balances_inserted"] == row_count
+        )
+
+        # The endpoint closes society 2's open year end to end
+        async with session_factory() as db:
+            await db.execute(OpeningBalance.__table__.delete().where(OpeningBalance.financial_year_id == legacy_next_id))
+            society_2_fy = (await db.execute(select(FinancialYear.id).where(
+                FinancialYear.society_id == 2, FinancialYear.start_date == fy_start
+            ))).scalar()
+            await db.commit()
+        admin = UserResponse(
+            id="2", email="bench2@example.com", name="Bench Admin", apartment_number="ADMIN",
+            role="admin", society_id=2, created_at=datetime.utcnow()
+        )
+        async with session_factory() as db:
+            with QueryCounter(engine) as route_q, timed(timings, "route"):
+                summary = await provisional_close_financial_year(
+                    society_2_fy, ProvisionalClosingRequest(closing_date=fy_end + timedelta(days=30)),
+                    current_user=admin, db=db
+                )
+        print(f"\nprovisional-close endpoint: {route_q.count} queries, {timings['route']:.1f} ms; "
+              f"{summary.accounts_closed} accounts, {summary.opening_balances_inserted} opening balances, "
+              f"surplus {summary.net_surplus_deficit}, timings {summary.timings_ms}")
+        async with session_factory() as db:
+            closed = await db.get(FinancialYear, society_2_fy)
+            checks["endpoint closed the year"] = closed.status == YearStatus.PROVISIONAL_CLOSE
+            checks["endpoint opening balances equal closing balances"] = await opening_matches_closing(
+                db, 2, closed, legacy_next_id
+            )
+
+        print()
+        for name, ok in checks.items():
+            print(f"{name}: {ok}")
+        return all(checks.values())
+    finally:
+        await engine.dispose()
+        if not keep_db and os.path.exists(db_path):
+            os.remove(db_path)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--accounts", type=int, default=5000)
+    parser.add_argument("--transactions", type=int, default=200000)
+    parser.add_argument("--keep-db", action="store_true", help="Do not delete the seeded database")
+    args = parser.parse_args()
+    sys.exit(0 if asyncio.run(main(args.accounts, args.transactions, args.keep_db)) else 1)
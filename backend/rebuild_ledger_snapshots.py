@@ -0,0 +1,48 @@
+"""
+Rebuild the account_daily_balances ledger snapshot table and the
+monthly_account_rollups table from transactions.
+
+Run after restoring a backup or editing the transactions table with SQL/fix scripts:
+    python rebuild_ledger_snapshots.py               # all societies
+    python rebuild_ledger_snapshots.py --society 1   # one society
+"""
+import argparse
+import asyncio
+import os
+import sys
+
+# Add the current directory to sys.path so that 'app' module can be found
+sys.path.append(os.getcwd())
+
+from app import database
+from app.database import create_engine_instance, import_models, Base
+from app.services.ledger_snapshot_service import rebuild_ledger_snapshots
+from app.services.monthly_rollup_service import rebuild_monthly_rollups
+
+
+async def main(society_id=None):
+    create_engine_instance()
+    import_models()
+    async with database.engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    scope = f"society {society_id}" if society_id is not None else "all societies"
+    print(f"Rebuilding ledger snapshots for {scope}...")
+    try:
+        async with database.AsyncSessionLocal() as db:
+            rows = await rebuild_ledger_snapshots(db, society_id=society_id)
+            monthly_rows = await rebuild_monthly_rollups(db, society_id=society_id)
+            await db.commit()
+        print(f"Done: {rows} daily rows and {monthly_rows} monthly rows written.")
+    except Exception as e:
+        print(f"Error rebuilding ledger snapshots: {e}")
+        sys.exit(1)
+    finally:
+        await database.engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild account_daily_balances and monthly_account_rollups from transactions")
+    parser.add_argument("--society", type=int, default=None, help="Society ID (default: all)")
+    args = parser.parse_args()
+    asyncio.run(main(args.society))
@@ -2,13 +2,17 @@
 Pytest configuration and shared fixtures for GharMitra backend tests
 """
 import pytest
+import pytest_asyncio
 import asyncio
+from datetime import date, datetime
+from decimal import Decimal
 from typing import Generator, AsyncGenerator
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.orm import sessionmaker
 from fastapi.testclient import TestClient
 
-from app.database import Base, get_db
+from app.database import Base, get_db, import_models
 from app.main import app
 from app.config import settings
 
@@ -43,6 +47,60 @@ async def test_engine():
     await engine.dispose()
 
 
+@pytest_asyncio.fixture
+async def db_engine(tmp_path):
+    """Fresh SQLite database file with the full schema, one per test."""
+    import_models()
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'gharmitra.db'}", echo=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield engine
+    await engine.dispose()
+
+
+@pytest.fixture
+def db_session_factory(db_engine):
+    """Session factory bound to the per-test database."""
+    return async_sessionmaker(db_engine, class_=AsyncSession, expire_on_commit=False)
+
+
+@pytest.fixture
+def create_society(db_engine):
+    """Insert a society and its admin user (id = society id) to satisfy foreign keys."""
+    from app.models_db import Society, User, UserRole, AccountingType
+
+    async def _create(society_id: int = 1):
+        now = datetime.utcnow()
+        async with db_engine.begin() as conn:
+            await conn.execute(insert(Society.__table__), [{
+                "id": society_id, "name": f"Test Society {society_id}", "total_flats": 0,
+                "gst_registration_applicable": False, "accounting_type": AccountingType.CASH,
+                "created_at": now, "updated_at": now,
+            }])
+            await conn.execute(insert(User.__table__), [{
+                "id": society_id, "society_id": society_id, "email": f"admin{society_id}@example.com",
+                "password_hash": "x", "name": "Test Admin", "apartment_number": "ADMIN",
+                "role": UserRole.ADMIN, "terms_accepted": True, "privacy_accepted": True,
+                "created_at": now, "updated_at": now,
+            }])
+    return _create
+
+
+@pytest.fixture
+def make_posting():
+    """Build a single-sided Transaction; amounts may be strings or Decimals, added_by is the society's admin."""
+    from app.models_db import Transaction, TransactionType
+
+    def _make(code: str, debit, credit, on: date, society_id: int = 1):
+        debit, credit = Decimal(str(debit)), Decimal(str(credit))
+        return Transaction(
+            society_id=society_id, type=TransactionType.EXPENSE if debit else TransactionType.INCOME,
+            category="Test", account_code=code, amount=debit or credit, description="Test posting",
+            date=on, added_by=society_id, debit_amount=debit, credit_amount=credit
+        )
+    return _make
+
+
 @pytest.fixture
 async def test_db_session(test_engine):
     """Create test database session."""
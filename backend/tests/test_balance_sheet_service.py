@@ -0,0 +1,144 @@
+"""
+Tests for the balance sheet service: the grouped pass must match the previous
+per-account algorithm section by section, and the expected figures
+"""
+from datetime import date
+from decimal import Decimal
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import select
+
+from app.models_db import (
+    AccountCode, AccountType, FinancialYear, OpeningBalance, BalanceType
+)
+from app.services.balance_sheet_service import compute_balance_sheet_sections
+from benchmarks.bench_balance_sheet import legacy_balance_sheet_sections
+
+
+FY_START = date(2025, 4, 1)
+FY_END = date(2026, 3, 31)
+
+CHART = [
+    # code, name, type, account opening_balance (used when the year has no OpeningBalance row)
+    ("1001", "Cash in Hand", AccountType.ASSET, "1050.00"),
+    ("1020", "Bank - Savings Account", AccountType.ASSET, "0"),
+    ("1100", "Building", AccountType.ASSET, "0"),
+    ("1200", "Fixed Deposit - SBI", AccountType.ASSET, "0"),
+    ("1300", "Maintenance Receivable", AccountType.ASSET, "0"),
+    ("2000", "Sundry Creditors", AccountType.LIABILITY, "1000.00"),
+    ("3000", "Corpus Fund", AccountType.CAPITAL, "0"),
+    ("3100", "Retained Surplus", AccountType.CAPITAL, "0"),
+    ("4000", "Maintenance Charges", AccountType.INCOME, "0"),
+    ("4100", "Interest Income", AccountType.INCOME, "0"),
+    ("5000", "Repairs", AccountType.EXPENSE, "0"),
+    ("5100", "Electricity", AccountType.EXPENSE, "0"),
+]
+
+OPENING_BALANCES = [
+    ("1020", "10000.00", BalanceType.DEBIT),
+    ("1100", "50000.00", BalanceType.DEBIT),
+    ("3000", "55000.00", BalanceType.CREDIT),
+    ("3100", "5000.00", BalanceType.CREDIT),
+    ("4100", "50.00", BalanceType.CREDIT),  # Recorded I&E opening balance counts towards the surplus
+]
+
+POSTINGS = [
+    # date, [(code, debit, credit)]
+    (date(2025, 5, 1), [("1020", "6000.00", "0"), ("4000", "0", "6000.00")]),
+    (date(2025, 6, 15), [("5000", "1500.00", "0"), ("1001", "0", "500.00"), ("2000", "0", "1000.00")]),
+    (date(2025, 7, 1), [("1200", "3000.00", "0"), ("1020", "0", "3000.00")]),
+    # Receivable overpaid: a credit balance on an asset head is left out of the sheet
+    (date(2025, 8, 1), [("1020", "200.00", "0"), ("1300", "0", "200.00")]),
+    (date(2025, 9, 30), [("1020", "100.00", "0"), ("4100", "0", "100.00")]),
+    (date(2026, 1, 15), [("5100", "800.00", "0"), ("1020", "0", "800.00")]),
+    # Before the financial year: outside the period
+    (date(2025, 3, 31), [("5100", "999.00", "0"), ("1020", "0", "999.00")]),
+]
+
+
+@pytest_asyncio.fixture
+async def ledger(db_session_factory, create_society, make_posting):
+    """Small chart with opening balances and postings; returns the financial year id"""
+    await create_society(1)
+    async with db_session_factory() as db:
+        accounts = {}
+        for code, name, account_type, opening in CHART:
+            accounts[code] = AccountCode(
+                society_id=1, code=code, name=name, type=account_type,
+                opening_balance=Decimal(opening), current_balance=0
+            )
+        db.add_all(accounts.values())
+        fy = FinancialYear(society_id=1, year_name="2025-26", start_date=FY_START, end_date=FY_END)
+        db.add(fy)
+        await db.flush()
+        for code, amount, balance_type in OPENING_BALANCES:
+            db.add(OpeningBalance(
+                society_id=1, financial_year_id=fy.id, account_head_id=accounts[code].id,
+                account_name=accounts[code].name, opening_balance=Decimal(amount), balance_type=balance_type
+            ))
+        for on, lines in POSTINGS:
+            db.add_all(make_posting(code, debit, credit, on) for code, debit, credit in lines)
+        await db.commit()
+        return fy.id
+
+
+def _rounded(result):
+    return (
+        result["sections"],
+        {section: total.quantize(Decimal("0.01")) for section, total in result["totals"].items()},
+        result["surplus_deficit"].quantize(Decimal("0.01")),
+    )
+
+
+def _lines(result, section):
+    return [(item["code"], item["balance"]) for item in result["sections"][section]]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("as_on", [date(2025, 12, 31), FY_END])
+async def test_matches_previous_algorithm(db_session_factory, ledger, as_on):
+    async with db_session_factory() as db:
+        grouped = await compute_balance_sheet_sections(db, 1, ledger, FY_START, as_on)
+        legacy = await legacy_balance_sheet_sections(db, 1, ledger, FY_START, as_on)
+    assert _rounded(grouped) == _rounded(legacy)
+
+
+@pytest.mark.asyncio
+async def test_sections_totals_and_surplus(db_session_factory, ledger):
+    async with db_session_factory() as db:
+        result = await compute_balance_sheet_sections(db, 1, ledger, FY_START, date(2025, 12, 31))
+
+    # Income 6000 + interest (50 opening + 100) - repairs 1500
+    assert result["surplus_deficit"] == Decimal("4650.00")
+    assert _lines(result, "capital_funds") == [("3000", 55000.0), ("3100", 9650.0)]
+    assert _lines(result, "current_liabilities") == [("2000", 2000.0)]
+    assert _lines(result, "fixed_assets") == [("1100", 50000.0)]
+    assert _lines(result, "investments") == [("1200", 3000.0)]
+    assert _lines(result, "current_assets") == [("1001", 550.0), ("1020", 13300.0)]
+    assert result["totals"] == {
+        "capital_funds": Decimal("64650.00"),
+        "current_liabilities": Decimal("2000.00"),
+        "fixed_assets": Decimal("50000.00"),
+        "investments": Decimal("3000.00"),
+        "current_assets": Decimal("13850.00"),
+    }
+
+
+@pytest.mark.asyncio
+async def test_deficit_without_surplus_head_gets_its_own_line(db_session_factory, ledger, make_posting):
+    async with db_session_factory() as db:
+        reserve = (await db.execute(select(AccountCode).where(AccountCode.code == "3100"))).scalar_one()
+        reserve.name = "General Reserve"
+        db.add_all([make_posting("5000", "10000.00", "0", date(2026, 2, 1)), make_posting("1020", "0", "10000.00", date(2026, 2, 1))])
+        await db.commit()
+
+        result = await compute_balance_sheet_sections(db, 1, ledger, FY_START, FY_END)
+        legacy = await legacy_balance_sheet_sections(db, 1, ledger, FY_START, FY_END)
+
+    # 6150 income - (1500 + 800 + 10000) expenses
+    assert result["surplus_deficit"] == Decimal("-6150.00")
+    assert result["sections"]["capital_funds"][-1] == {
+        "code": "9999", "name": "Deficit (Excess of Expenditure over Income)", "balance": 6150.0
+    }
+    assert _rounded(result) == _rounded(legacy)
@@ -0,0 +1,72 @@
+"""
+Tests for bulk bill PDF jobs: failed renders must not produce a valid ZIP,
+and a saturated render pool is waited out
+"""
+import io
+import zipfile
+
+import pytest
+from fastapi import HTTPException
+
+from app.config import settings
+from app.services import bill_pdf_jobs as bill_pdf_jobs_module
+from app.services.bill_pdf_jobs import BillPdfJobManager
+
+BILLS = [{"flat_number": f"A-{n}", "bill_number": f"BILL-2026-04-{n:03d}"} for n in range(1, 5)]
+
+
+@pytest.fixture
+def manager(monkeypatch):
+    monkeypatch.setattr(settings, "BILL_PDF_BATCH_SIZE", 1)
+
+    async def load_bills(db, job):
+        return {"name": "Test Society"}, list(BILLS)
+
+    monkeypatch.setattr(BillPdfJobManager, "_load_bills", staticmethod(load_bills))
+    return BillPdfJobManager()
+
+
+def fake_renderer(monkeypatch, failures):
+    """render_document stand-in that raises the queued exceptions first, then renders"""
+    calls = []
+
+    async def render(function, batch, society_info):
+        calls.append(batch)
+        if failures:
+            raise failures.pop(0)
+        return [f"%PDF {bill['flat_number']}".encode() for bill in batch]
+
+    monkeypatch.setattr(bill_pdf_jobs_module, "render_document", render)
+    return calls
+
+
+async def _download(job) -> bytes:
+    return b"".join([chunk async for chunk in job.stream()])
+
+
+@pytest.mark.asyncio
+async def test_failed_batch_aborts_the_download(manager, monkeypatch):
+    fake_renderer(monkeypatch, [HTTPException(status_code=500, detail="Report rendering failed")])
+    job = manager.submit(1, 4, 2026, "zip", requested_by=1)
+    await job.task
+
+    assert job.status == "failed"
+    with pytest.raises(RuntimeError):
+        await _download(job)
+    # Whatever was streamed is not a well-formed archive
+    partial = b"".join(job.chunks)
+    with pytest.raises(zipfile.BadZipFile):
+        zipfile.ZipFile(io.BytesIO(partial))
+
+
+@pytest.mark.asyncio
+async def test_busy_render_pool_is_retried(manager, monkeypatch):
+    busy = HTTPException(status_code=503, detail="busy", headers={"Retry-After": "0"})
+    calls = fake_renderer(monkeypatch, [busy, busy])
+    job = manager.submit(1, 4, 2026, "zip", requested_by=1)
+    await job.task
+
+    assert job.status == "completed"
+    assert len(calls) == len(BILLS) + 2
+    archive = zipfile.ZipFile(io.BytesIO(await _download(job)))
+    assert len(archive.namelist()) == len(BILLS)
@@ -0,0 +1,81 @@
+"""
+Tests for document number allocation from the document_sequences table
+"""
+import pytest
+
+from app.routes.maintenance import reserve_bill_numbers
+from app.utils.document_numbering import (
+    reserve_document_numbers,
+    generate_journal_voucher_number,
+    generate_quick_entry_voucher_number,
+)
+
+
+@pytest.mark.asyncio
+async def test_blocks_are_contiguous_and_never_reused(db_session_factory, create_society):
+    await create_society(1)
+    async with db_session_factory() as db:
+        first = await reserve_document_numbers(db, 1, "JV", count=3)
+        second = await reserve_document_numbers(db, 1, "JV", count=2)
+        await db.commit()
+    assert first == [1, 2, 3]
+    assert second == [4, 5]
+
+
+@pytest.mark.asyncio
+async def test_series_is_seeded_once_from_last_issued(db_session_factory, create_society):
+    await create_society(1)
+    seed_calls = []
+
+    async def last_issued():
+        seed_calls.append(1)
+        return 41
+
+    async with db_session_factory() as db:
+        assert await reserve_document_numbers(db, 1, "JV", seed=last_issued) == [42]
+        assert await reserve_document_numbers(db, 1, "JV", seed=last_issued) == [43]
+        await db.commit()
+    assert len(seed_calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_series_are_separate_per_society_prefix_and_year(db_session_factory, create_society):
+    await create_society(1)
+    await create_society(2)
+    async with db_session_factory() as db:
+        assert await reserve_document_numbers(db, 1, "JV") == [1]
+        assert await reserve_document_numbers(db, 2, "JV") == [1]
+        assert await reserve_document_numbers(db, 1, "RV") == [1]
+        assert await reserve_document_numbers(db, 1, "JV", financial_year_id=7) == [1]
+        assert await reserve_document_numbers(db, 1, "JV") == [2]
+        await db.commit()
+
+
+@pytest.mark.asyncio
+async def test_voucher_numbers_use_the_prefix_format(db_session_factory, create_society):
+    await create_society(1)
+    async with db_session_factory() as db:
+        assert await generate_journal_voucher_number(db, 1) == "JV-0001"
+        # The offset reserves the skipped numbers as well
+        assert await generate_quick_entry_voucher_number(db, 1, offset=2) == "QV-0003"
+        assert await generate_quick_entry_voucher_number(db, 1) == "QV-0004"
+        await db.commit()
+
+
+@pytest.mark.asyncio
+async def test_bill_numbers_are_unique_across_societies(db_session_factory, create_society):
+    await create_society(1)
+    await create_society(2)
+    async with db_session_factory() as db:
+        society_a = await reserve_bill_numbers(db, 1, 4, 2026, 10)
+        society_b = await reserve_bill_numbers(db, 2, 4, 2026, 10)
+        regenerated_a = await reserve_bill_numbers(db, 1, 4, 2026, 1)
+        next_month_b = await reserve_bill_numbers(db, 2, 5, 2026, 1)
+        await db.commit()
+
+    assert society_a[0] == "BILL-2026-04-001" and society_a[-1] == "BILL-2026-04-010"
+    assert society_b[0] == "BILL-2026-04-011" and society_b[-1] == "BILL-2026-04-020"
+    assert regenerated_a == ["BILL-2026-04-021"]
+    assert next_month_b == ["BILL-2026-05-001"]
+    issued = society_a + society_b + regenerated_a
+    assert len(set(issued)) == len(issued)
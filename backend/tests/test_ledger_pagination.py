@@ -0,0 +1,99 @@
+"""
+Tests for keyset-paginated running-balance ledgers
+"""
+import random
+from datetime import date, timedelta
+from decimal import Decimal
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import select
+
+from app.models_db import Transaction
+from app.services.ledger_pagination import get_ledger_page, encode_cursor, decode_cursor
+
+FROM_DATE = date(2025, 4, 1)
+TO_DATE = date(2025, 6, 30)
+CASH_SCOPE = Transaction.account_code == "1001"
+BASE_OPENING = Decimal("250.00")
+
+
+@pytest_asyncio.fixture
+async def cash_book(db_session_factory, create_society, make_posting):
+    """Cash postings before, inside and after the period, several per day, inserted out of date order"""
+    await create_society(1)
+    await create_society(2)
+    rng = random.Random(5)
+    async with db_session_factory() as db:
+        postings = []
+        for _ in range(60):
+            on = FROM_DATE + timedelta(days=rng.randint(-20, 110))
+            amount = Decimal(rng.randint(100, 90000)) / 100
+            debit, credit = (amount, Decimal("0")) if rng.random() < 0.5 else (Decimal("0"), amount)
+            postings.append(make_posting("1001", debit, credit, on))
+        # Same-day postings are ordered by id
+        postings += [make_posting("1001", Decimal("10.00"), Decimal("0"), date(2025, 5, 15)) for _ in range(4)]
+        # Out of scope: other account, other society
+        postings += [
+            make_posting("1020", Decimal("999.00"), Decimal("0"), date(2025, 5, 1)),
+            make_posting("1001", Decimal("999.00"), Decimal("0"), date(2025, 5, 1), society_id=2),
+        ]
+        db.add_all(postings)
+        await db.commit()
+
+
+async def _expected_ledger(db):
+    """Running balance over the whole period computed in Python"""
+    rows = (await db.execute(
+        select(Transaction).where(Transaction.society_id == 1, CASH_SCOPE).order_by(Transaction.date, Transaction.id)
+    )).scalars().all()
+    balance = BASE_OPENING
+    opening = None
+    entries = []
+    for txn in rows:
+        if txn.date < FROM_DATE:
+            balance += Decimal(str(txn.debit_amount)) - Decimal(str(txn.credit_amount))
+            continue
+        if txn.date > TO_DATE:
+            break
+        if opening is None:
+            opening = balance
+        balance += Decimal(str(txn.debit_amount)) - Decimal(str(txn.credit_amount))
+        entries.append((txn.id, float(balance.quantize(Decimal("0.01")))))
+    return float(opening.quantize(Decimal("0.01"))), entries
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("limit", [1, 7, 25, 500])
+async def test_pages_chain_into_the_full_ledger(db_session_factory, cash_book, limit):
+    async with db_session_factory() as db:
+        expected_opening, expected_entries = await _expected_ledger(db)
+
+        pages = []
+        cursor = None
+        while True:
+            page = await get_ledger_page(db, 1, CASH_SCOPE, BASE_OPENING, FROM_DATE, TO_DATE, cursor, limit)
+            pages.append(page)
+            if not page["has_more"]:
+                assert page["next_cursor"] is None
+                break
+            assert len(page["entries"]) == limit
+            cursor = page["next_cursor"]
+
+    assert pages[0]["opening_balance"] == expected_opening
+    for previous, following in zip(pages, pages[1:]):
+        assert following["opening_balance"] == previous["closing_balance"]
+    walked = [(entry["id"], entry["balance"]) for page in pages for entry in page["entries"]]
+    assert walked == expected_entries
+    assert pages[-1]["closing_balance"] == expected_entries[-1][1]
+
+
+@pytest.mark.asyncio
+async def test_invalid_cursors_are_rejected(db_session_factory, cash_book):
+    assert decode_cursor(encode_cursor(date(2025, 5, 15), 42)) == (date(2025, 5, 15), 42)
+    async with db_session_factory() as db:
+        with pytest.raises(ValueError):
+            await get_ledger_page(db, 1, CASH_SCOPE, BASE_OPENING, FROM_DATE, TO_DATE, "not-a-cursor", 10)
+        with pytest.raises(ValueError):
+            outside = encode_cursor(date(2025, 7, 1), 1)
+            await get_ledger_page(db, 1, CASH_SCOPE, BASE_OPENING, FROM_DATE, TO_DATE, outside, 10)
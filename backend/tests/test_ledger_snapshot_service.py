@@ -0,0 +1,120 @@
+"""
+Tests for the account_daily_balances store: the flush hook must keep it equal
+to a rebuild from `transactions` through inserts, edits and deletes
+"""
+import random
+from datetime import date, timedelta
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import select, delete, func
+
+from app.models_db import Transaction, AccountDailyBalance
+from app.services.ledger_snapshot_service import (
+    rebuild_ledger_snapshots, refresh_account_days, get_balances_as_on, get_net_movement, get_period_totals
+)
+
+CODES = ("1001", "1020", "4000", "5000")
+START = date(2025, 4, 1)
+
+
+async def _snapshot_rows(db):
+    adb = AccountDailyBalance.__table__
+    result = await db.execute(
+        select(adb.c.society_id, adb.c.account_code, adb.c.date, adb.c.debit_total, adb.c.credit_total, adb.c.running_balance)
+        .order_by(adb.c.society_id, adb.c.account_code, adb.c.date)
+    )
+    return [tuple(row) for row in result]
+
+
+async def _assert_matches_rebuild(db):
+    incremental = await _snapshot_rows(db)
+    await rebuild_ledger_snapshots(db)
+    assert incremental == await _snapshot_rows(db)
+
+
+async def _balance_from_transactions(db, code: str, as_on: date) -> Decimal:
+    return Decimal(str((await db.execute(
+        select(func.coalesce(func.sum(Transaction.debit_amount - Transaction.credit_amount), 0))
+        .where(Transaction.society_id == 1, Transaction.account_code == code, Transaction.date <= as_on)
+    )).scalar()))
+
+
+@pytest.mark.asyncio
+async def test_backdated_postings_shift_later_running_balances(db_session_factory, create_society, make_posting):
+    await create_society(1)
+    async with db_session_factory() as db:
+        db.add_all([make_posting("1020", "100.00", "0", date(2025, 5, 1)), make_posting("1020", "0", "30.00", date(2025, 6, 1))])
+        await db.commit()
+        db.add(make_posting("1020", "50.00", "0", date(2025, 4, 15)))
+        await db.commit()
+
+        rows = [(row[2], row[5]) for row in await _snapshot_rows(db)]
+        assert rows == [
+            (date(2025, 4, 15), Decimal("50.00")),
+            (date(2025, 5, 1), Decimal("150.00")),
+            (date(2025, 6, 1), Decimal("120.00")),
+        ]
+        assert await get_balances_as_on(db, 1, date(2025, 5, 20)) == {"1020": Decimal("150.00")}
+        assert await get_net_movement(db, 1, "1020", date(2025, 5, 1), date(2025, 6, 30)) == Decimal("70.00")
+        await _assert_matches_rebuild(db)
+
+
+@pytest.mark.asyncio
+async def test_random_edits_match_rebuild(db_session_factory, create_society, make_posting):
+    await create_society(1)
+    await create_society(2)
+    rng = random.Random(11)
+    async with db_session_factory() as db:
+        for step in range(80):
+            live = (await db.execute(select(Transaction))).scalars().all()
+            action = rng.random()
+            if action < 0.5 or not live:
+                amount = f"{rng.randint(1, 50000) / 100:.2f}"
+                debit, credit = (amount, "0") if rng.random() < 0.5 else ("0", amount)
+                db.add(make_posting(rng.choice(CODES), debit, credit, START + timedelta(days=rng.randint(0, 90)), rng.choice((1, 2))))
+            elif action < 0.85:
+                txn = rng.choice(live)
+                change = rng.choice(("date", "account", "amount", "society"))
+                if change == "date":
+                    txn.date = START + timedelta(days=rng.randint(0, 90))
+                elif change == "account":
+                    txn.account_code = rng.choice(CODES)
+                elif change == "amount":
+                    txn.debit_amount = Decimal(rng.randint(0, 20000)) / 100
+                else:
+                    txn.society_id = 2 if txn.society_id == 1 else 1
+            else:
+                await db.delete(rng.choice(live))
+            if step % 7 == 0:
+                await db.commit()
+        await db.commit()
+
+        for code in CODES:
+            for as_on in (START + timedelta(days=30), START + timedelta(days=90)):
+                expected = await _balance_from_transactions(db, code, as_on)
+                assert (await get_balances_as_on(db, 1, as_on)).get(code, Decimal("0.00")) == expected
+        await _assert_matches_rebuild(db)
+
+
+@pytest.mark.asyncio
+async def test_core_delete_is_repaired_by_refresh_account_days(db_session_factory, create_society, make_posting):
+    await create_society(1)
+    async with db_session_factory() as db:
+        db.add_all([
+            make_posting("5000", "100.00", "0", date(2025, 4, 10)),
+            make_posting("5000", "200.00", "0", date(2025, 4, 11)),
+            make_posting("5000", "300.00", "0", date(2025, 4, 12)),
+        ])
+        await db.commit()
+
+        # Core statements bypass the flush hook
+        await db.execute(delete(Transaction).where(Transaction.date == date(2025, 4, 11)))
+        await refresh_account_days(db, 1, [("5000", date(2025, 4, 11))])
+        await db.commit()
+
+        assert await get_balances_as_on(db, 1, date(2025, 4, 30)) == {"5000": Decimal("400.00")}
+        assert await get_period_totals(db, 1, date(2025, 4, 11), date(2025, 4, 30)) == {
+            "5000": (Decimal("300.00"), Decimal("0.00"))
+        }
+        await _assert_matches_rebuild(db)
@@ -0,0 +1,93 @@
+"""
+Tests for monthly_account_rollups: the flush hook must keep it equal to a
+rebuild from `transactions`, and period totals must match a transaction scan
+"""
+import random
+from datetime import date, timedelta
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import select, func
+
+from app.models_db import Transaction, MonthlyAccountRollup
+from app.services.monthly_rollup_service import rebuild_monthly_rollups, get_monthly_totals, get_rollup_period_totals
+
+CODES = ("1001", "1020", "4000", "5000")
+START = date(2025, 1, 1)
+
+
+async def _rollup_rows(db):
+    mar = MonthlyAccountRollup.__table__
+    result = await db.execute(
+        select(mar.c.society_id, mar.c.account_code, mar.c.year, mar.c.month,
+               mar.c.debit_total, mar.c.credit_total, mar.c.txn_count)
+        .order_by(mar.c.society_id, mar.c.account_code, mar.c.year, mar.c.month)
+    )
+    return [tuple(row) for row in result]
+
+
+async def _totals_from_transactions(db, from_date: date, to_date: date):
+    result = await db.execute(
+        select(Transaction.account_code, func.sum(Transaction.debit_amount), func.sum(Transaction.credit_amount))
+        .where(Transaction.society_id == 1, Transaction.date >= from_date, Transaction.date <= to_date)
+        .group_by(Transaction.account_code)
+    )
+    return {code: (Decimal(str(debit)), Decimal(str(credit))) for code, debit, credit in result}
+
+
+@pytest.mark.asyncio
+async def test_monthly_totals_and_counts(db_session_factory, create_society, make_posting):
+    await create_society(1)
+    async with db_session_factory() as db:
+        db.add_all([
+            make_posting("4000", "0", "1000.00", date(2025, 3, 1)),
+            make_posting("4000", "0", "500.00", date(2025, 3, 31)),
+            make_posting("4000", "0", "700.00", date(2025, 4, 1)),
+        ])
+        await db.commit()
+        moved = (await db.execute(select(Transaction).where(Transaction.date == date(2025, 3, 31)))).scalar_one()
+        moved.date = date(2025, 4, 30)
+        await db.commit()
+
+        assert await get_monthly_totals(db, 1, (2025, 3), (2025, 4)) == {
+            (2025, 3): {"4000": (Decimal("0.00"), Decimal("1000.00"), 1)},
+            (2025, 4): {"4000": (Decimal("0.00"), Decimal("1200.00"), 2)},
+        }
+
+
+@pytest.mark.asyncio
+async def test_random_edits_match_rebuild_and_transaction_scan(db_session_factory, create_society, make_posting):
+    await create_society(1)
+    rng = random.Random(23)
+    async with db_session_factory() as db:
+        for step in range(80):
+            live = (await db.execute(select(Transaction))).scalars().all()
+            action = rng.random()
+            if action < 0.55 or not live:
+                amount = f"{rng.randint(1, 50000) / 100:.2f}"
+                debit, credit = (amount, "0") if rng.random() < 0.5 else ("0", amount)
+                db.add(make_posting(rng.choice(CODES), debit, credit, START + timedelta(days=rng.randint(0, 200))))
+            elif action < 0.85:
+                txn = rng.choice(live)
+                if rng.random() < 0.5:
+                    txn.date = START + timedelta(days=rng.randint(0, 200))
+                else:
+                    txn.account_code = rng.choice(CODES)
+            else:
+                await db.delete(rng.choice(live))
+            if step % 5 == 0:
+                await db.commit()
+        await db.commit()
+
+        # Whole months, partial months at either end, and a range inside one month
+        for from_date, to_date in (
+            (date(2025, 2, 1), date(2025, 5, 31)),
+            (date(2025, 1, 17), date(2025, 6, 12)),
+            (date(2025, 3, 5), date(2025, 3, 20)),
+        ):
+            assert await get_rollup_period_totals(db, 1, from_date, to_date) == \
+                await _totals_from_transactions(db, from_date, to_date)
+
+        incremental = await _rollup_rows(db)
+        await rebuild_monthly_rollups(db)
+        assert incremental == await _rollup_rows(db)
@@ -0,0 +1,62 @@
+"""
+Tests for the render executor's admission control
+"""
+import asyncio
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+from fastapi import HTTPException
+
+from app.services.render_executor import RenderExecutor
+
+
+def slow_render(seconds: float) -> str:
+    time.sleep(seconds)
+    return "done"
+
+
+@pytest.mark.asyncio
+async def test_timed_out_render_keeps_its_slot_until_it_finishes():
+    # pool_size 0 renders in the default thread pool, which cannot be interrupted either
+    executor = RenderExecutor(pool_size=0, max_pending=1, queue_timeout=0.1, render_timeout=0.1)
+
+    with pytest.raises(HTTPException) as timed_out:
+        await executor.render(slow_render, 0.6)
+    assert timed_out.value.status_code == 504
+    assert executor.in_flight == 1
+
+    # The abandoned render is still running, so no new render is admitted
+    with pytest.raises(HTTPException) as busy:
+        await executor.render(slow_render, 0)
+    assert busy.value.status_code == 503
+
+    await asyncio.sleep(0.7)
+    assert executor.in_flight == 0
+    assert await executor.render(slow_render, 0) == "done"
+    assert executor.stats()["timeouts"] == 1
+    assert executor.stats()["rejected"] == 1
+
+
+def crash_worker() -> str:
+    os._exit(1)
+
+
+@pytest.mark.asyncio
+async def test_broken_pool_is_shut_down_and_replaced_once():
+    executor = RenderExecutor(pool_size=1, max_pending=2, queue_timeout=1, render_timeout=30)
+    try:
+        with pytest.raises(HTTPException) as failed:
+            await executor.render(crash_worker)
+        assert failed.value.status_code == 500
+        assert executor._pool is None
+
+        assert await executor.render(slow_render, 0) == "done"
+        replacement = executor._pool
+        # A late failure reported by an already discarded pool leaves the replacement alone
+        stale = ProcessPoolExecutor(max_workers=1)
+        executor._discard_pool(stale)
+        assert executor._pool is replacement
+    finally:
+        executor.shutdown()
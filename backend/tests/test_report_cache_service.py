@@ -0,0 +1,36 @@
+"""
+Tests for the database report cache backend's LRU bookkeeping
+"""
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import select, update
+
+from app.models_db import ReportCacheEntry
+from app.services.report_cache_service import DatabaseReportCacheBackend, LAST_HIT_REFRESH_INTERVAL
+
+
+async def _last_hit_at(db, key: str) -> datetime:
+    return (await db.execute(
+        select(ReportCacheEntry.last_hit_at).where(ReportCacheEntry.cache_key == key)
+    )).scalar_one()
+
+
+@pytest.mark.asyncio
+async def test_hits_refresh_last_hit_at_only_when_stale(db_session_factory, create_society):
+    await create_society(1)
+    backend = DatabaseReportCacheBackend(max_bytes=1024 * 1024, max_entries=10)
+    async with db_session_factory() as db:
+        await backend.set(db, "bs:1", 1, "balance_sheet", "1", b"payload")
+        await db.commit()
+        stored = await _last_hit_at(db, "bs:1")
+
+        assert await backend.get(db, "bs:1") == b"payload"
+        assert await _last_hit_at(db, "bs:1") == stored
+
+        stale = datetime.utcnow() - LAST_HIT_REFRESH_INTERVAL - timedelta(seconds=1)
+        await db.execute(update(ReportCacheEntry).where(ReportCacheEntry.cache_key == "bs:1").values(last_hit_at=stale))
+        assert await backend.get(db, "bs:1") == b"payload"
+        assert await _last_hit_at(db, "bs:1") > stale
+
+        assert await backend.get(db, "missing") is None
@@ -0,0 +1,32 @@
+"""
+Tests for report job deduplication and per-requester listing
+"""
+import asyncio
+
+import pytest
+
+from app.services.report_jobs import ReportJobManager
+
+
+@pytest.mark.asyncio
+async def test_identical_requests_are_shared_only_by_the_same_requester(tmp_path):
+    manager = ReportJobManager(max_workers=2, max_per_society=2, max_queued_per_society=10,
+                               result_dir=str(tmp_path), ttl_seconds=60)
+    release = asyncio.Event()
+
+    async def runner(db, progress):
+        await release.wait()
+        return b"report"
+
+    params = {"flat_id": "12"}
+    first = manager.submit(1, 7, "member-ledger", "pdf", params, runner)
+    again = manager.submit(1, 7, "member-ledger", "pdf", dict(params), runner)
+    other_user = manager.submit(1, 8, "member-ledger", "pdf", dict(params), runner)
+
+    assert again is first
+    assert other_user is not first
+    assert [job.job_id for job in manager.list(1, requested_by=8)] == [other_user.job_id]
+    assert {job.job_id for job in manager.list(1)} == {first.job_id, other_user.job_id}
+
+    manager.shutdown()
+    await asyncio.gather(first.task, other_user.task, return_exceptions=True)
@@ -0,0 +1,158 @@
+"""
+Tests for the year-end close: closing balances and the opening balance upsert
+"""
+from datetime import date
+from decimal import Decimal
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import select, text
+
+from app import database
+from app.config import settings
+from app.models_db import (
+    AccountCode, AccountType, FinancialYear, OpeningBalance, BalanceType, BalanceStatus,
+)
+from app.services.year_end_close_service import close_into_next_year
+
+
+CHART = [
+    # code, name, type (classification hooks make 1001 cash and 1020 bank)
+    ("1001", "Cash in Hand", AccountType.ASSET),
+    ("1020", "Bank - Savings Account", AccountType.ASSET),
+    ("1200", "Suspense", AccountType.ASSET),
+    ("3000", "Corpus Fund", AccountType.CAPITAL),
+    ("4000", "Maintenance Charges", AccountType.INCOME),
+    ("5000", "Repairs", AccountType.EXPENSE),
+]
+
+
+@pytest_asyncio.fixture
+async def closing_year(db_session_factory, create_society, make_posting):
+    """FY 2025-26 with opening balances and a receipt and an expense; FY 2026-27 empty"""
+    await create_society(1)
+    async with db_session_factory() as db:
+        accounts = {}
+        for code, name, account_type in CHART:
+            accounts[code] = AccountCode(
+                society_id=1, code=code, name=name, type=account_type, opening_balance=0, current_balance=0
+            )
+            db.add(accounts[code])
+        fy = FinancialYear(society_id=1, year_name="2025-26", start_date=date(2025, 4, 1), end_date=date(2026, 3, 31))
+        next_fy = FinancialYear(society_id=1, year_name="2026-27", start_date=date(2026, 4, 1), end_date=date(2027, 3, 31))
+        db.add_all([fy, next_fy])
+        await db.flush()
+
+        for code, amount, balance_type in (("1020", "1000.00", BalanceType.DEBIT), ("3000", "1000.00", BalanceType.CREDIT)):
+            db.add(OpeningBalance(
+                society_id=1, financial_year_id=fy.id, account_head_id=accounts[code].id,
+                account_name=accounts[code].name, opening_balance=Decimal(amount), balance_type=balance_type
+            ))
+        db.add_all([
+            make_posting("1020", "500.00", "0", date(2025, 5, 10)),
+            make_posting("4000", "0", "500.00", date(2025, 5, 10)),
+            make_posting("5000", "200.00", "0", date(2025, 6, 1)),
+            make_posting("1001", "0", "200.00", date(2025, 6, 1)),
+            # Next year's activity must not affect the close
+            make_posting("1020", "999.00", "0", date(2026, 4, 2)),
+            make_posting("4000", "0", "999.00", date(2026, 4, 2)),
+        ])
+        await db.commit()
+        return fy, next_fy, {code: account.id for code, account in accounts.items()}
+
+
+async def _opening_balances(db, financial_year_id: int):
+    rows = (await db.execute(
+        select(OpeningBalance).where(OpeningBalance.financial_year_id == financial_year_id)
+    )).scalars().all()
+    return {row.account_head_id: row for row in rows}
+
+
+@pytest.mark.asyncio
+async def test_close_carries_closing_balances_forward(db_session_factory, closing_year):
+    fy, next_fy, ids = closing_year
+    async with db_session_factory() as db:
+        result = await close_into_next_year(db, 1, fy, next_fy, created_by=1)
+        await db.commit()
+        opening = await _opening_balances(db, next_fy.id)
+
+    assert result["bank_balance"] == Decimal("1500.00")
+    assert result["cash_balance"] == Decimal("-200.00")
+    assert result["total_income"] == Decimal("500.00")
+    assert result["total_expenses"] == Decimal("200.00")
+    assert result["net_surplus_deficit"] == Decimal("300.00")
+    assert result["accounts_closed"] == len(CHART)
+    assert (result["opening_balances_inserted"], result["opening_balances_updated"], result["opening_balances_skipped"]) == (5, 0, 1)
+
+    expected = {
+        "1001": ("200.00", BalanceType.CREDIT),
+        "1020": ("1500.00", BalanceType.DEBIT),
+        "3000": ("1000.00", BalanceType.CREDIT),
+        "4000": ("500.00", BalanceType.CREDIT),
+        "5000": ("200.00", BalanceType.DEBIT),
+    }
+    assert set(opening) == {ids[code] for code in expected}
+    for code, (amount, balance_type) in expected.items():
+        row = opening[ids[code]]
+        assert (row.opening_balance, row.balance_type) == (Decimal(amount), balance_type)
+        assert row.status == BalanceStatus.PROVISIONAL and row.calculated_from_previous_year
+
+
+@pytest.mark.asyncio
+async def test_reclosing_updates_rows_in_place(db_session_factory, closing_year, make_posting):
+    fy, next_fy, ids = closing_year
+    async with db_session_factory() as db:
+        await close_into_next_year(db, 1, fy, next_fy)
+        await db.commit()
+
+        # A late receipt in the closed year, then close again
+        db.add_all([make_posting("1020", "100.00", "0", date(2026, 3, 31)), make_posting("4000", "0", "100.00", date(2026, 3, 31))])
+        await db.commit()
+        result = await close_into_next_year(db, 1, fy, next_fy)
+        await db.commit()
+        opening = await _opening_balances(db, next_fy.id)
+        row_count = (await db.execute(
+            text("SELECT COUNT(*) FROM opening_balances WHERE financial_year_id = :fy"), {"fy": next_fy.id}
+        )).scalar()
+
+    assert (result["opening_balances_inserted"], result["opening_balances_updated"]) == (0, 5)
+    assert row_count == 5
+    assert opening[ids["1020"]].opening_balance == Decimal("1600.00")
+    assert opening[ids["4000"]].opening_balance == Decimal("600.00")
+
+
+@pytest_asyncio.fixture
+async def app_database(tmp_path):
+    """Point the app's global engine (used by startup migrations) at a scratch SQLite file"""
+    await database.recreate_engine(f"sqlite+aiosqlite:///{tmp_path / 'migrations.db'}")
+    yield database
+    await database.close_db()
+    await database.recreate_engine(settings.DATABASE_URL)
+
+
+async def _unique_index_exists(db_module) -> bool:
+    async with db_module.engine.connect() as conn:
+        rows = (await conn.execute(text("PRAGMA index_list(opening_balances)"))).all()
+    return any(row[1] == "uq_opening_balances_year_account" for row in rows)
+
+
+@pytest.mark.asyncio
+async def test_unique_index_migration_keeps_duplicate_rows(app_database, caplog):
+    async with app_database.engine.begin() as conn:
+        # Table as created before the unique constraint was declared
+        await conn.execute(text(
+            "CREATE TABLE opening_balances (id INTEGER PRIMARY KEY, financial_year_id INTEGER, account_head_id INTEGER)"
+        ))
+        await conn.execute(text("INSERT INTO opening_balances VALUES (1, 7, 3), (2, 7, 3), (3, 7, 4)"))
+
+    await app_database.migrate_opening_balance_unique_index()
+    async with app_database.engine.connect() as conn:
+        remaining = (await conn.execute(text("SELECT id FROM opening_balances ORDER BY id"))).scalars().all()
+    assert remaining == [1, 2, 3]
+    assert not await _unique_index_exists(app_database)
+    assert "ids [1, 2]" in caplog.text
+
+    async with app_database.engine.begin() as conn:
+        await conn.execute(text("DELETE FROM opening_balances WHERE id = 1"))
+    await app_database.migrate_opening_balance_unique_index()
+    assert await _unique_index_exists(app_database)